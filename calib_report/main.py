@@ -5,23 +5,30 @@ from .helpers.paths import calc_paths, ReportPaths
 # from .sections.full_report import FullReport
 from .slides_sections.full_report import FullReport as FullSlidesReport
 from .helpers.logger import get_logger, add_file_handler
-from .config import config
+from .config import CalibReportConfig, run_config
 
 logger = get_logger()
-    
+
+REPORT_DEPTH = 0  # full depth
+
+
+def report_plots(depth: int = REPORT_DEPTH) -> dict[str, list[str]]:
+    """Return the ids of the figures embedded in the report, per plot level (see calibration config.plot_selection)"""
+    return FullSlidesReport.required_plots(depth)
+
 def build_report(input_path: str, output_path: str | None = None) -> None:
     add_file_handler("calibration_report.log")
     report_paths:ReportPaths = calc_paths(input_path, output_path)
-    config.paths = report_paths
-    # Report as a A4 document using platypus
-    # report = FullReport(
-    #     report_paths=report_paths,
-    # )
-    # report.build()
-    report = FullSlidesReport(
-        report_paths=report_paths,
-    )
-    report.build(depth=0)  # full depth
+    with run_config(CalibReportConfig(paths=report_paths)):
+        # Report as a A4 document using platypus
+        # report = FullReport(
+        #     report_paths=report_paths,
+        # )
+        # report.build()
+        report = FullSlidesReport(
+            report_paths=report_paths,
+        )
+        report.build(depth=REPORT_DEPTH)
 
 def gen_report() -> None:
     parser = argparse.ArgumentParser(description="Generate a calibration PDF report")
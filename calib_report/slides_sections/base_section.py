@@ -6,13 +6,16 @@ from ..helpers.data_holders import ReportData
 class BaseSection(ABC):
     """Base class for report sections"""
 
+    # depending on the section depth and the build depth requested
+    # a section will be added or not
+    # to be defined in child classes
+    section_depth = 4
+    # ids of the figures embedded by the section per plot level ('calibration', 'fileset', 'file')
+    report_plots: dict[str, tuple[str, ...]] = {}
+
     def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
         self.report_data = report_data
         self.report = report
-        # depending on the section depth and the build depth requested
-        # a section will be added or not
-        # to be defined in child classes
-        self.section_depth = 4
         self.units = 'uW' if self.report_data.meta.config.use_uW_as_power_units else 'W'
         self.init_x = 10
         self.end_x = 950
@@ -25,9 +28,14 @@ class BaseSection(ABC):
         """Return the last frame of the report"""
         return self.report.last_frame
 
+    @classmethod
+    def is_built(cls, depth: int) -> bool:
+        """Whether the section is part of a report built with the given depth"""
+        return depth == 0 or cls.section_depth <= depth
+
     def build(self, depth: int = 0):
         """Build the section of the report"""
-        if depth == 0 or self.section_depth <= depth:
+        if self.is_built(depth):
             self._build(depth)
     
     @abstractmethod
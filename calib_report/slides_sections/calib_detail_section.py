@@ -9,9 +9,11 @@ from .base_section import BaseSection
 
 
 class CalibDetailSection(BaseSection):
-    def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
-        super().__init__(report_data, report)
-        self.section_depth = 1  # FileSet section is at depth 2
+    section_depth = 1  # FileSet section is at depth 2
+    report_plots = {
+        'calibration': ('timeseries', 'pedestals_timeseries'),
+        'fileset': ('calibrations_evolution',),
+    }
 
     def _build(self, depth):
         """Build the fileset section of the report"""
@@ -6,9 +6,13 @@ from .base_section import BaseSection
 
 
 class FileSetSection(BaseSection):
-    def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
-        super().__init__(report_data, report)
-        self.section_depth = 2  # FileSet section is at depth 2
+    section_depth = 2  # FileSet section is at depth 2
+    report_plots = {
+        'fileset': (
+            'pmVsRefPD_fitSlopes_and_Intercepts_vs_Run_vert', 'pm_vs_RefPD', 'pedestals_timeseries',
+            'Pedestals_Histogram', 'pedestals_vs_run', 'pedestals_points_with_mean', 'timeseries', 'pm_samples_full',
+        ),
+    }
 
     def _build(self, depth):
         """Build the fileset section of the report"""
@@ -12,6 +12,15 @@ from .calib_detail_section import CalibDetailSection
 
 
 class FullReport:
+    # the last section is always the sanity checks one
+    SECTIONS = (
+        SummarySection,
+        ToCSection,
+        CalibDetailSection,
+        FileSetSection,
+        SanityChecksSection,
+    )
+
     def __init__(self, report_paths: ReportPaths) -> None:
         self.report_paths = report_paths
         self._data:ReportData|None = None
@@ -39,17 +48,21 @@ class FullReport:
             json_data = json.load(f)
         self._data = ReportData.from_dict(json_data)
     
+    @classmethod
+    def required_plots(cls, depth=0) -> dict[str, list[str]]:
+        """Return the ids of the figures embedded in a report built with depth, per plot level"""
+        plots = {}
+        for section in cls.SECTIONS:
+            if section.is_built(depth):
+                for level, fig_ids in section.report_plots.items():
+                    level_plots = plots.setdefault(level, [])
+                    level_plots.extend(fig_id for fig_id in fig_ids if fig_id not in level_plots)
+        return plots
+
     def load_sections(self):
         """Load report sections"""
-
-        self.sections.append(SummarySection(self.data, self.report))
-        self.sections.append(ToCSection(self.data, self.report))
-        self.sections.append(CalibDetailSection(self.data, self.report))
-        self.sections.append(FileSetSection(self.data, self.report))
-        # # Load other sections as needed
-
-        # # last section always sanity checks
-        self.sections.append(SanityChecksSection(self.data, self.report))
+        for section in self.SECTIONS:
+            self.sections.append(section(self.data, self.report))
 
     def build(self, depth=0):
         """
@@ -7,9 +7,10 @@ from .base_section import BaseSection
 
 
 class SanityChecksSection(BaseSection):
+    section_depth = 2
+
     def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
         super().__init__(report_data, report)
-        self.section_depth = 2
         margin = 10
         self.sec_padding = 0
         self.col_width = (self.end_x - self.init_x - margin) / 2
@@ -8,10 +8,10 @@ from .base_section import BaseSection
 
 
 class SummarySection(BaseSection):
+    section_depth = 1  # Summary section is at depth 1
+
     def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
         super().__init__(report_data, report)
-        self.section_depth = 1  # Summary section is at depth 1
-
         self.checks_failed = {'calibration': {}, 'fileset': {}, 'file': {}}
         self.check_errors = {'calibration': 0,
                              'fileset': 0, 'file': 0, 'total': 0}
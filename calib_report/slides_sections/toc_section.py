@@ -8,9 +8,7 @@ from .base_section import BaseSection
 
 
 class ToCSection(BaseSection):
-    def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
-        super().__init__(report_data, report)
-        self.section_depth = 2  # FileSet section is at depth 2
+    section_depth = 2  # FileSet section is at depth 2
 
     def _build(self, depth):
         """Build the fileset section of the report"""
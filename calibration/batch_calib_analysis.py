@@ -1,48 +1,17 @@
 from __future__ import annotations
 
 import argparse
-import re
 import shutil
 import subprocess
 import sys
-from dataclasses import dataclass
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
+from typing import Callable
 
-
-DATE_RE = re.compile(r"(?P<day>\d{2})(?P<month>\d{2})(?P<year>\d{4})")
-
-
-@dataclass(frozen=True)
-class DatedFile:
-    path: Path
-    date: datetime
-
-
-def _extract_date_from_name(path: Path) -> datetime | None:
-    match = DATE_RE.search(path.name)
-    if not match:
-        return None
-    day = int(match.group("day"))
-    month = int(match.group("month"))
-    year = int(match.group("year"))
-    try:
-        return datetime(year, month, day)
-    except ValueError:
-        return None
-
-
-def _collect_dated_files(folder: Path, pattern: str) -> list[DatedFile]:
-    out: list[DatedFile] = []
-    for path in sorted(folder.glob(pattern)):
-        if not path.is_file():
-            continue
-        file_date = _extract_date_from_name(path)
-        if file_date is None:
-            print(f"[skip] no DDMMYYYY date found in filename: {path.name}")
-            continue
-        out.append(DatedFile(path=path, date=file_date))
-    return sorted(out, key=lambda item: (item.date, item.path.name))
+from calibration.helpers.batch_manifest import MANIFEST_FILE_NAME, BatchManifest, tool_version
+from calibration.helpers.dated_files import DatedFile, collect_dated_files
 
 
 def _build_calibration_command(args: argparse.Namespace, calibration_zip: Path) -> list[str]:
@@ -76,6 +45,83 @@ def _build_calibration_command(args: argparse.Namespace, calibration_zip: Path)
     return cmd
 
 
+def _build_analysis_command(args: argparse.Namespace, calibration_zip: Path) -> list[str]:
+    """Command of the analysis-only pass: same data options, no plots, report nor zip"""
+    cmd = [arg for arg in _build_calibration_command(args, calibration_zip) if arg not in ("-z", "-n", "--no-gen-report")]
+    return [*cmd, "-n", "--no-gen-report"]
+
+
+def _run_command(cmd: list[str], output_path: Path | None) -> int:
+    if output_path is None:
+        return subprocess.run(cmd, check=False).returncode
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8") as f:
+        return subprocess.run(cmd, stdout=f, stderr=subprocess.STDOUT, check=False).returncode
+
+
+def _run_in_process(cmd: list[str], output_path: Path | None) -> int:
+    """Run a calibration command in this interpreter instead of a new Python process"""
+    from calibration.main import run
+
+    if output_path is not None:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    return run(cmd[cmd.index("calibration.main") + 1:], str(output_path) if output_path else None)
+
+
+def _import_pipeline() -> None:
+    """Worker initializer: load the calibration and report libraries once per worker"""
+    import calibration.main  # noqa: F401
+    import calib_report.main  # noqa: F401
+
+
+def _run_calibrations(
+    calibration_files: list[DatedFile],
+    build_command: Callable[[Path], list[str]],
+    jobs: int,
+    output_dir: Path | None,
+    on_result: Callable[[DatedFile, int], None],
+    stage: str = "",
+    in_process: bool = False,
+) -> None:
+    """Run a calibration command per file with up to `jobs` concurrent processes.
+
+    Progress is printed as runs complete, while `on_result` is called in
+    chronological (list) order: results of runs that finish early are held
+    until every earlier calibration is done. The output of every run goes to
+    `<output_dir>/<zip stem>[_<stage>].log` (to the console if output_dir is None).
+    With in_process, the calibrations run in `jobs` long-lived worker processes
+    instead of a new Python process each.
+    """
+    suffix = f"_{stage}" if stage else ""
+    label = f" [{stage}]" if stage else ""
+    done: dict[int, int] = {}
+    next_index = 0
+    start = time.monotonic()
+    if in_process:
+        pool = ProcessPoolExecutor(max_workers=jobs, initializer=_import_pipeline)
+        run_command = _run_in_process
+    else:
+        pool = ThreadPoolExecutor(max_workers=jobs)
+        run_command = _run_command
+    with pool:
+        futures = {}
+        for i, calibration_file in enumerate(calibration_files):
+            cmd = build_command(calibration_file.path)
+            output_path = output_dir / f"{calibration_file.path.stem}{suffix}.log" if output_dir else None
+            print("Running:", " ".join(cmd))
+            futures[pool.submit(run_command, cmd, output_path)] = i
+        for completed, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            done[i] = future.result()
+            print(
+                f"[{completed}/{len(calibration_files)}]{label} {calibration_files[i].path.name}: "
+                f"exit code {done[i]} ({time.monotonic() - start:.1f} s)"
+            )
+            while next_index in done:
+                on_result(calibration_files[next_index], done.pop(next_index))
+                next_index += 1
+
+
 def _publish_reduced_summary(output_root: Path, calibration_zip: Path) -> Path:
     calib_id = calibration_zip.stem
     source = output_root / calib_id / f"{calib_id}.json"
@@ -86,6 +132,17 @@ def _publish_reduced_summary(output_root: Path, calibration_zip: Path) -> Path:
     return destination
 
 
+def _calibration_outputs(output_root: Path, calibration_zip: Path) -> list[Path]:
+    """Output artefacts of a calibration run that exist (analysis folder or zip, published summary)"""
+    calib_id = calibration_zip.stem
+    candidates = (
+        output_root / f"{calib_id}.json",
+        output_root / calib_id / f"{calib_id}.json",
+        output_root / f"{calib_id}_analysis.zip",
+    )
+    return [path for path in candidates if path.exists()]
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description=(
@@ -120,7 +177,29 @@ def main() -> None:
         help="Use first pedestal measurement in linear regression",
     )
     parser.add_argument("--use-W-as-power-units", "-u", action="store_true", help="Use W as power units instead of uW")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of calibrations processed concurrently (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help=(
+            "Run the calibrations in this interpreter (with --jobs, in long-lived worker processes) "
+            "instead of starting a new Python process for each one"
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"Process every calibration, even those up to date in the {MANIFEST_FILE_NAME} of the output folder",
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be a positive integer")
 
     execution_dt = datetime.now()
     calibration_folder = Path(args.calibration_zip_folder)
@@ -130,13 +209,39 @@ def main() -> None:
     if not calibration_folder.is_dir():
         parser.error(f"Calibration folder does not exist or is not a directory: {calibration_folder}")
 
-    calibration_files = _collect_dated_files(calibration_folder, "*.zip")
+    calibration_files = collect_dated_files(calibration_folder, "*.zip")
     if not calibration_files:
         parser.error(f"No calibration .zip files with parsable DDMMYYYY date found in {calibration_folder}")
 
+    # skip the calibrations processed before with the same zip content, tool version and options
+    manifest = BatchManifest(output_root, tool_version("calibration", "calib_report", "base_report"))
+    fingerprints = {
+        calibration_file.path.name: manifest.fingerprint(
+            calibration_file.path.name,
+            [calibration_file.path],
+            _build_calibration_command(args, calibration_file.path)[1:],
+        )
+        for calibration_file in calibration_files
+    }
+    if not args.no_plots:
+        # the evolution plot of a calibration shows the summaries of the calibrations dated before it
+        for calibration_file in calibration_files:
+            fingerprints[calibration_file.path.name]['depends_on'] = {
+                earlier.path.name: fingerprints[earlier.path.name]['inputs'][0]['sha256']
+                for earlier in calibration_files
+                if earlier.date < calibration_file.date
+            }
+    up_to_date = {
+        calibration_file.path.name
+        for calibration_file in calibration_files
+        if not args.force and manifest.is_up_to_date(calibration_file.path.name, fingerprints[calibration_file.path.name])
+    }
+    pending_files = [calibration_file for calibration_file in calibration_files if calibration_file.path.name not in up_to_date]
+
     print("Calibration files to process:")
     for calibration_file in calibration_files:
-        print(f"  {calibration_file.path.name} ({calibration_file.date.strftime('%Y-%m-%d')})")
+        status = " [up to date, skipped]" if calibration_file.path.name in up_to_date else ""
+        print(f"  {calibration_file.path.name} ({calibration_file.date.strftime('%Y-%m-%d')}){status}")
 
     log_path = output_root / f"batch_calib_analysis_log_{execution_dt.strftime('%Y%m%d_%H%M%S')}.md"
     with log_path.open("w", encoding="utf-8") as f:
@@ -149,24 +254,92 @@ def main() -> None:
         f.write("|---|---:|\n")
         for calibration_file in calibration_files:
             f.write(f"| {calibration_file.path.name} | {calibration_file.date.strftime('%Y-%m-%d')} |\n")
+        if up_to_date:
+            f.write("\n## Skipped Calibrations\n\n")
+            for calibration_file in calibration_files:
+                if calibration_file.path.name in up_to_date:
+                    f.write(f"- {calibration_file.path.name}: up to date in `{MANIFEST_FILE_NAME}` (use --force to rerun)\n")
         f.write("\n## Execution Results\n\n")
 
-    for calibration_file in calibration_files:
-        cmd = _build_calibration_command(args, calibration_file.path)
-        print("\nRunning:", " ".join(cmd))
-        result = subprocess.run(cmd, check=False)
+    def _log_result(calibration_file: DatedFile, returncode: int, publish: bool = True) -> None:
+        key = calibration_file.path.name
         with log_path.open("a", encoding="utf-8") as f:
-            f.write(f"- `{calibration_file.path.name}`: exit code `{result.returncode}`\n")
-            if result.returncode == 0:
+            f.write(f"- `{key}`: exit code `{returncode}`\n")
+            if returncode == 0 and publish:
                 try:
                     published_path = _publish_reduced_summary(output_root, calibration_file.path)
                 except FileNotFoundError as exc:
                     f.write(f"  - failed to publish reduced summary to output root: `{exc}`\n")
                     print(f"[error] {exc}")
+                    manifest.forget(key)
                 else:
                     f.write(f"  - published reduced summary: `{published_path.name}`\n")
-        if result.returncode != 0:
-            print(f"[error] calibration failed for {calibration_file.path.name} (exit={result.returncode})")
+                    manifest.record(key, fingerprints[key], _calibration_outputs(output_root, calibration_file.path))
+            else:
+                manifest.forget(key)
+        if returncode != 0:
+            print(f"[error] calibration failed for {calibration_file.path.name} (exit={returncode})")
+
+    if not pending_files:
+        print("\nEvery calibration is up to date, nothing to process (use --force to rerun)")
+    elif args.jobs == 1:
+        # sequential: every calibration sees the summaries published by the earlier ones
+        run_command = _run_in_process if args.in_process else _run_command
+        for calibration_file in pending_files:
+            cmd = _build_calibration_command(args, calibration_file.path)
+            print("\nRunning:", " ".join(cmd))
+            _log_result(calibration_file, run_command(cmd, None))
+    elif args.no_plots:
+        # without plots the runs do not depend on each other
+        _run_calibrations(
+            pending_files,
+            lambda path: _build_calibration_command(args, path),
+            args.jobs,
+            output_root / "batch_logs",
+            _log_result,
+            in_process=args.in_process,
+        )
+    else:
+        # The calibrations evolution plots read the summaries of the earlier calibrations:
+        # run the analyses first (publishing every reduced summary), then the full runs.
+        order = {calibration_file.path: i for i, calibration_file in enumerate(pending_files)}
+        failed: list[tuple[DatedFile, int]] = []
+
+        def _publish_analysis(calibration_file: DatedFile, returncode: int) -> None:
+            if returncode != 0:
+                failed.append((calibration_file, returncode))
+                return
+            try:
+                _publish_reduced_summary(output_root, calibration_file.path)
+            except FileNotFoundError as exc:
+                print(f"[error] {exc}")
+
+        def _log_full_run(calibration_file: DatedFile, returncode: int) -> None:
+            # failed analyses are logged at their chronological position
+            while failed and order[failed[0][0].path] < order[calibration_file.path]:
+                _log_result(*failed.pop(0), publish=False)
+            _log_result(calibration_file, returncode)
+
+        _run_calibrations(
+            pending_files,
+            lambda path: _build_analysis_command(args, path),
+            args.jobs,
+            output_root / "batch_logs",
+            _publish_analysis,
+            stage="analysis",
+            in_process=args.in_process,
+        )
+        failed_paths = {calibration_file.path for calibration_file, _ in failed}
+        _run_calibrations(
+            [calibration_file for calibration_file in pending_files if calibration_file.path not in failed_paths],
+            lambda path: _build_calibration_command(args, path),
+            args.jobs,
+            output_root / "batch_logs",
+            _log_full_run,
+            in_process=args.in_process,
+        )
+        while failed:
+            _log_result(*failed.pop(0), publish=False)
 
     print(f"\nSaved batch log: {log_path}")
 
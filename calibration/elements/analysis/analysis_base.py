@@ -6,9 +6,32 @@ from matplotlib import pyplot as plt
 
 from ..helpers import SanityCheckResult, MeanStats, PedestalStats
 from calibration.helpers import get_logger
+from calibration.helpers.grouped_stats import GroupedMeans, grouped_means
 
 logger = get_logger()
 
+# (value, std) columns of the pedestal statistics, always the raw (not zeroed) measurements
+PEDESTAL_COLUMNS = (('pm_mean', 'pm_std'), ('ref_pd_mean', 'ref_pd_std'))
+
+
+def analyze_pedestals_batch(analyses: list['BaseAnal']):
+    """Analyze the pedestals of several elements (files, filesets, calibration) with a single grouped_means call"""
+    value_cols = [value_col for value_col, _ in PEDESTAL_COLUMNS]
+    std_cols = [std_col for _, std_col in PEDESTAL_COLUMNS]
+    values = [np.empty((0, len(PEDESTAL_COLUMNS)))]
+    stds = [np.empty((0, len(PEDESTAL_COLUMNS)))]
+    groups = [np.empty(0, dtype=np.intp)]
+    for i, anal in enumerate(analyses):
+        for frame in anal._pedestal_frames():
+            if frame is None or frame.empty:
+                continue
+            values.append(frame[value_cols].to_numpy(dtype=float, na_value=np.nan))
+            stds.append(frame[std_cols].to_numpy(dtype=float, na_value=np.nan))
+            groups.append(np.full(len(frame), i, dtype=np.intp))
+    means = grouped_means(np.concatenate(values), np.concatenate(stds), np.concatenate(groups), len(analyses))
+    for i, anal in enumerate(analyses):
+        anal._set_pedestal_stats(means, i)
+
 
 class BaseAnal(ABC):
     """Abstract base class for analysis components."""
@@ -58,40 +81,50 @@ class BaseAnal(ABC):
             std_col (str): Column name for the standard deviations.
             weighted (bool): Whether to calculate weighted mean and std
         """
-        mean = MeanStats(df[val_col].mean(), df[val_col].std(), df[val_col].size)
+        means = grouped_means(
+            df[val_col].to_numpy(dtype=float, na_value=np.nan),
+            df[std_col].to_numpy(dtype=float, na_value=np.nan),
+        )
+        return self._mean_stats(means, 0, 0, val_col, weighted)
+
+    def _mean_stats(self, means: GroupedMeans, group: int, column: int, val_col: str, weighted: bool = True) -> MeanStats:
+        """Build the MeanStats of one group and column of grouped_means results.
+
+        Points with std=0 are ignored in the weighted mean, which needs at least two points.
+        """
+        mean = MeanStats(float(means.mean[group, column]), float(means.std[group, column]), int(means.samples[group, column]))
         if weighted:
             mean.weighted = True
-            zero_std_points = df[df[std_col]==0]
-            if len(zero_std_points) > 0:
-                logger.warning("[%s] There are %d points with std=0. These points will be ignored in weighted mean", self._data_holder.level_header, len(zero_std_points))
-                df_filtered = df[df[std_col]>0]
-            df = df if len(zero_std_points) == 0 else df_filtered
-            ndof = len(df[val_col]) - 1
+            zero_std_points = int(means.zero_std[group, column])
+            if zero_std_points > 0:
+                logger.warning("[%s] There are %d points with std=0. These points will be ignored in weighted mean", self._data_holder.level_header, zero_std_points)
+            ndof = int(means.ndof[group, column])
             mean.ndof = ndof
             if ndof > 0:
                 # to check, xxxx_chi2_reduced should be in the range  1 +- sqrt(2/ndf)
-                w = 1.0 / df[std_col]**2
-                w_mean = (w * df[val_col]).sum() / w.sum()
-                w_std = np.sqrt(1.0 / w.sum())
-                w_chi2 = np.sum((df[val_col]-w_mean)**2 / df[std_col]**2)
-                w_chi2_reduced = w_chi2 / ndof
-                
-                mean.w_mean = w_mean
-                mean.w_stderr = w_std
-                mean.chi2 = w_chi2
-                mean.chi2_reduced = w_chi2_reduced
-                
+                mean.w_mean = float(means.w_mean[group, column])
+                mean.w_stderr = float(means.w_stderr[group, column])
+                mean.chi2 = float(means.chi2[group, column])
+                mean.chi2_reduced = mean.chi2 / ndof
             else:
                 mean.exec_error = True
                 mean.weighted = False
                 logger.warning(f"[{self._data_holder.level_header}] Not enough data [{val_col}] points to analyze weighted mean")
-            
+
         return mean
 
+    def _pedestal_frames(self) -> list[pd.DataFrame]:
+        """Frames holding the pedestal rows of the element (aggregates return those of their files)"""
+        return [self.df_pedestals]
+
+    def _set_pedestal_stats(self, means: GroupedMeans, group: int):
+        """Set the pedestal statistics from a group of analyze_pedestals_batch results"""
+        (pm_col, _), (refpd_col, _) = PEDESTAL_COLUMNS
+        self._ped_stats = PedestalStats(
+            pm=self._mean_stats(means, group, 0, pm_col),
+            refpd=self._mean_stats(means, group, 1, refpd_col),
+        )
+
     def analyze_pedestals(self):
         """Analyze pedestals across the set of calibration files"""
-        
-        pm_pedestals = self.get_mean(self.df_pedestals, 'pm_mean', 'pm_std', weighted=True)
-        refpd_pedestals = self.get_mean(self.df_pedestals, 'ref_pd_mean', 'ref_pd_std', weighted=True)
-        self._ped_stats = PedestalStats(pm=pm_pedestals, refpd=refpd_pedestals)
-        
+        analyze_pedestals_batch([self])
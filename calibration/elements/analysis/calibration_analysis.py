@@ -5,7 +5,8 @@ from typing import TYPE_CHECKING
 import pandas as pd
 
 from calibration.helpers import get_logger
-from .analysis_base import BaseAnal
+from .analysis_base import BaseAnal, analyze_pedestals_batch
+from .file_analysis import calc_lin_regs_batch
 
 
 if TYPE_CHECKING:
@@ -32,9 +33,12 @@ class CalibrationAnalysis(BaseAnal):
 
     def analyze(self):
         """Analyze all file sets and generate interrelated plots"""
+        # fit the regressions of every calibration file at once, the file analyses reuse them
+        calc_lin_regs_batch([calfile.anal for fileset in self.filesets.values() for calfile in fileset.files])
+        # pedestal statistics of every fileset and of the calibration in one pass over the file pedestals
+        analyze_pedestals_batch([*(fileset.anal for fileset in self.filesets.values()), self])
         for _, fileset in self.filesets.items():
             fileset.analyze()
-        self.analyze_pedestals()
         self.results['pedestals'] = self.pedestal_stats.to_dict()
         self._find_elapsed_time_range()
     #     self._find_sets()
@@ -50,6 +54,9 @@ class CalibrationAnalysis(BaseAnal):
     #         fset[f"{wl}_{fw}"] = tmp
     #     self.results['file_sets'] = fset
     
+    def _pedestal_frames(self) -> list[pd.DataFrame]:
+        return [calfile.df_pedestals for fileset in self.filesets.values() for calfile in fileset.files]
+
     def _find_elapsed_time_range(self) -> tuple[float, float]:
         """Find the overall elapsed time range across all calibration files."""
         min_time = float('inf')
@@ -3,9 +3,10 @@ Docstring for calibration.elements.calib_file_analysis
 """
 
 from typing import TYPE_CHECKING
-from scipy.stats import linregress
 
 from calibration.helpers import get_logger
+from calibration.config import config
+from calibration.helpers.regression import RegressionStats, fit_stats
 
 from ..helpers import CalibLinReg
 from .analysis_base import BaseAnal
@@ -17,6 +18,18 @@ if TYPE_CHECKING:
 logger = get_logger()
 
 
+def calc_lin_regs_batch(analyses: list[CalibFileAnalysis]):
+    """Fit the linear regressions of several calibration files in a single batch"""
+    pending = [anal for anal in analyses if not anal._lin_regs_fitted and anal.df is not None]
+    fits = [fit for anal in pending for fit in anal._lin_reg_data()]
+    if not fits:
+        return
+    stats = fit_stats(fits, weighted=config.fit_mode == 'wls')
+    results = stats.fit()
+    for i, anal in enumerate(pending):
+        anal._set_lin_regs(results[3 * i:3 * i + 3], stats.take([3 * i]))
+
+
 class CalibFileAnalysis(BaseAnal):
     """
     Docstring for CalibFileAnalysis
@@ -31,7 +44,9 @@ class CalibFileAnalysis(BaseAnal):
         
         self.lr_pm_mean_vs_laser = CalibLinReg('laser_setpoint', 'pm_mean', None)
         self.lr_refpd_vs_laser = CalibLinReg('laser_setpoint', 'ref_pd_mean', None)
-
+        # sufficient statistics of the ref PD vs PM fit, merged by the fileset fit
+        self.lr_refpd_vs_pm_stats: RegressionStats | None = None
+        self._lin_regs_fitted = False
 
     def analyze(self):
         """
@@ -42,34 +57,38 @@ class CalibFileAnalysis(BaseAnal):
         self._analyzed = True
 
     def calc_lin_regs(self):
-        """Calculate linear regressions for the calibration file data."""
+        """Calculate linear regressions for the calibration file data (unless already fitted in a batch)."""
         if self.df is None:
             logger.error("Dataframe is not loaded for file: %s", self._data_holder.file_info['filename'])
             return
+        if not self._lin_regs_fitted:
+            calc_lin_regs_batch([self])
 
+    def _lin_reg_data(self) -> list[tuple]:
+        """(x, y, sigma_x, sigma_y) data of the ref PD vs PM, PM vs laser and ref PD vs laser regressions"""
+        df = self.df
+        pm_col = self._data_holder.pm_col
+        refpd_col = self._data_holder.refpd_col
+        pm_std = df[self._data_holder.pm_std_col]
+        refpd_std = df[self._data_holder.refpd_std_col]
+        return [
+            (df[refpd_col], df[pm_col], refpd_std, pm_std),
+            (df['laser_setpoint'], df[pm_col], None, pm_std),
+            (df['laser_setpoint'], df[refpd_col], None, refpd_std),
+        ]
+
+    def _set_lin_regs(self, results: list, refpd_vs_pm_stats: RegressionStats):
         pm_col = self._data_holder.pm_col
         refpd_col = self._data_holder.refpd_col
 
         self._data_info['used_pm_column'] = pm_col
         self._data_info['used_refpd_column'] = refpd_col
 
-        # Perform linear regressions
-        self.lr_refpd_vs_pm = CalibLinReg(
-            refpd_col,
-            pm_col,
-            linregress(self.df[refpd_col], self.df[pm_col])
-        )
-        self.lr_pm_mean_vs_laser = CalibLinReg(
-            'laser_setpoint',
-            pm_col,
-            linregress(self.df['laser_setpoint'], self.df[pm_col])
-        )
-        self.lr_refpd_vs_laser = CalibLinReg(
-            'laser_setpoint',
-            refpd_col,
-            linregress(self.df['laser_setpoint'], self.df[refpd_col])
-        )
-    
+        self.lr_refpd_vs_pm = CalibLinReg(refpd_col, pm_col, results[0])
+        self.lr_pm_mean_vs_laser = CalibLinReg('laser_setpoint', pm_col, results[1])
+        self.lr_refpd_vs_laser = CalibLinReg('laser_setpoint', refpd_col, results[2])
+        self.lr_refpd_vs_pm_stats = refpd_vs_pm_stats
+        self._lin_regs_fitted = True
 
     def to_dict(self):
         """Return analysis results as a dictionary."""
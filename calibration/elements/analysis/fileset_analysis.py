@@ -6,9 +6,10 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
-from scipy.stats import linregress
 
 from calibration.helpers import get_logger
+from calibration.helpers.grouped_stats import grouped_means
+from calibration.helpers.regression import RegressionStats
 from calibration.config import config
 
 from .analysis_base import BaseAnal
@@ -57,6 +58,9 @@ class FileSetAnalysis(BaseAnal):
         """Concatenated DataFrame of all pedestal data in the set."""
         return self.fs.df_pedestals
 
+    def _pedestal_frames(self) -> list[pd.DataFrame]:
+        return [calfile.df_pedestals for calfile in self.fs.files]
+
     @property
     def output_path(self):
         """Output path for the file set analysis."""
@@ -79,7 +83,8 @@ class FileSetAnalysis(BaseAnal):
         # self.analyze_mean_of_lin_regs()
         # self.analyze_weighted_mean_of_lin_regs()
         self.analyze_concatenated_data_sets()
-        self.analyze_pedestals()
+        if self._ped_stats is None:
+            self.analyze_pedestals()
         self.results['pedestals'] = self._ped_stats.to_dict()
         self._analyzed = True
 
@@ -91,46 +96,42 @@ class FileSetAnalysis(BaseAnal):
                 calfile.anal.lr_refpd_vs_pm.intercept)
             self.intercepts_std.append(
                 calfile.anal.lr_refpd_vs_pm.intercept_stderr)
-            self.mean_temp.append(calfile._df['temperature'].mean())
-            self.mean_rh.append(calfile._df['RH'].mean())
+            self.mean_temp.append(calfile.df['temperature'].mean())
+            self.mean_rh.append(calfile.df['RH'].mean())
         self.slopes = np.array(self.slopes)
         self.slopes_std = np.array(self.slopes_std)
         self.intercepts = np.array(self.intercepts)
         self.intercepts_std = np.array(self.intercepts_std)
 
     def analyze_concatenated_data_sets(self):
-        """Analyze the full concatenated data set of the file set."""
+        """Analyze the full concatenated data set of the file set.
+
+        The regression is computed from the merged sufficient statistics of the
+        file fits, the concatenated DataFrame is not needed.
+        """
         x_col = self._data_holder.refpd_col
         y_col = self._data_holder.pm_col
 
-        if self.df is None or self.df.empty:
+        stats = [
+            calfile.anal.lr_refpd_vs_pm_stats for calfile in self.fs.files
+            if calfile.anal.lr_refpd_vs_pm_stats is not None and calfile.anal.lr_refpd_vs_pm_stats.n[0] > 0
+        ]
+        if not stats:
             raise ValueError(f"[{self.fs.level_header}] Empty dataframe for fileset regression")
 
-        linreg = linregress(self.df[x_col], self.df[y_col])
+        linreg, = RegressionStats.merge(stats).fit()
         self.lr_refpd_vs_pm = CalibLinReg(x_col, y_col, linreg)
         self.results['lr_refpd_vs_pm'] = self.lr_refpd_vs_pm.to_dict()
 
     def calc_means_of_lin_regs(self):
         """Analyze weighted mean of linear regressions of the calibration files"""
         # has to be executed after analyze_mean_of_lin_regs
-        self.lr_slopes_mean = self.get_mean(
-            pd.DataFrame({
-                'slope': self.slopes,
-                'slope_std': self.slopes_std
-            }),
-            'slope',
-            'slope_std',
-            weighted=True
-        )
-        self.lr_intercepts_mean = self.get_mean(
-            pd.DataFrame({
-                'intercept': self.intercepts,
-                'intercept_std': self.intercepts_std
-            }),
-            'intercept',
-            'intercept_std',
-            weighted=True
+        means = grouped_means(
+            np.column_stack([self.slopes, self.intercepts]),
+            np.column_stack([self.slopes_std, self.intercepts_std]),
         )
+        self.lr_slopes_mean = self._mean_stats(means, 0, 0, 'slope')
+        self.lr_intercepts_mean = self._mean_stats(means, 0, 1, 'intercept')
 
     # def analyze_weighted_mean_of_lin_regs(self):
     #     """Analyze weighted mean of linear regressions of the calibration files"""
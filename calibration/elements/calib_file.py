@@ -1,18 +1,23 @@
 """Calibration file representation and data handling"""
 
+import io
 import os
 import re
 
 from typing import TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
 
-from calibration.helpers import get_logger
+from calibration.helpers import get_logger, parsed_cache
+from calibration.helpers.file_manage import InputFile
+from calibration.helpers.run_file_parser import CALIB_RUN_COLUMNS, parse_calibration_run
 from calibration.config import config
 
 from .analysis.file_analysis import CalibFileAnalysis
 from .plots import FilePlots
 from .base_element import BaseElement, DataHolderLevel
+from .run_store import RunStore
 
 logger = get_logger()
 
@@ -32,9 +37,10 @@ file_name_pattern = re.compile(
 
 class CalibFile(BaseElement):
     """Calibration file representation and data handling"""
-    def __init__(self, file_path:str, file_set:FileSet|None=None):
+    def __init__(self, source:InputFile|str, file_set:FileSet|None=None):
         super().__init__(DataHolderLevel.FILE)
-        self.file_path = file_path
+        self.source = source if isinstance(source, InputFile) else InputFile.from_path(source)
+        self.file_path = self.source.path
         self.dh_parent = file_set
         self.output_path = self._calc_output_path()
         self.valid = True
@@ -42,8 +48,10 @@ class CalibFile(BaseElement):
         self.plotter = FilePlots(self)
         
         self.file_info = {
-            'filename': os.path.basename(file_path),
+            'filename': self.source.name,
         }
+        self._store: RunStore | None = None
+        self.data_fingerprint: str | None = None  # digest of the raw content and preparation flags
         self.initialize()
         if self.valid:
             self.level_header = self.file_label
@@ -52,27 +60,27 @@ class CalibFile(BaseElement):
     @property
     def base_filename(self) -> str:
         """Return the base filename without path"""
-        return '.'.join(os.path.basename(self.file_path).split('.')[:-1])
+        return '.'.join(self.source.name.split('.')[:-1])
     
     @property
     def df(self)-> pd.DataFrame:
         """Return the main DataFrame with calibration data"""
-        if self._df is not None:
-            return self._df
+        if self._store is not None:
+            return self._store.view('df')
         raise ValueError("DataFrame not loaded yet.")
 
     @property
     def df_pedestals(self) -> pd.DataFrame:
         """Return the pedestal DataFrame with calibration data"""
-        if self._df_pedestals is not None:
-            return self._df_pedestals
+        if self._store is not None:
+            return self._store.view('pedestals')
         raise ValueError("Pedestal DataFrame not loaded yet.")
 
     @property
     def df_full(self) -> pd.DataFrame:
         """Return the full DataFrame with calibration data"""
-        if self._df_full is not None:
-            return self._df_full
+        if self._store is not None:
+            return self._store.frame
         raise ValueError("Full DataFrame not loaded yet.")
 
     def _calc_output_path(self):
@@ -124,43 +132,91 @@ class CalibFile(BaseElement):
         self.anal.analyze_pedestals()
         pm_ped = self.anal.pedestal_stats.pm.w_mean if self.anal.pedestal_stats.pm.weighted else self.anal.pedestal_stats.pm.mean
         ref_pd_ped = self.anal.pedestal_stats.refpd.w_mean if self.anal.pedestal_stats.refpd.weighted else self.anal.pedestal_stats.refpd.mean
-        self._df['pm_zeroed'] = self._df['pm_mean'] - pm_ped
-        self._df['ref_pd_zeroed'] = self._df['ref_pd_mean'] - ref_pd_ped
+        self._store.set_column('pm_zeroed', self._store.frame['pm_mean'] - pm_ped)
+        self._store.set_column('ref_pd_zeroed', self._store.frame['ref_pd_mean'] - ref_pd_ped)
         self.data_prep_info['pedestal_subtraction'] = {
             'pm_pedestal': pm_ped,
             'refpd_pedestal': ref_pd_ped
         }
 
-    def load_data(self):
-        """Load calibration file data into a DataFrame"""
-        self._df = pd.read_csv(self.file_path, delimiter ='\t', header=None)
-        self._df.columns = ['datetime', 'laser_setpoint', 'pm_mean', 'pm_std', 'ref_pd_mean', 'ref_pd_std', 'temperature', 'RH', 'samples']
-        self._df['laser_sp_1064'] = pd.Series([pd.NA] * len(self._df), dtype='Float64')
-        self._df['laser_sp_532'] = pd.Series([pd.NA] * len(self._df), dtype='Float64')
-        self._df[f'laser_sp_{self.wavelength}'] = self._df['laser_setpoint'].astype('Float64')
+    def _read_run_file(self, raw: bytes) -> pd.DataFrame:
+        """Parse the raw run file using the columnar fast path, falling back to pandas for unexpected layouts"""
+        try:
+            cols = parse_calibration_run(raw)
+        except ValueError as e:
+            logger.warning("Fast parser could not read %s (%s), falling back to pandas parser", self.file_info['filename'], str(e))
+            return self._read_run_file_pandas(raw)
+        nrows = len(cols['timestamp'])
+        data = {'datetime': pd.DatetimeIndex(cols['datetime']).tz_localize('UTC')}
+        data.update({col: cols[col] for col in CALIB_RUN_COLUMNS[1:]})
+        data['laser_sp_1064'] = pd.arrays.FloatingArray(np.zeros(nrows), np.ones(nrows, dtype=bool))
+        data['laser_sp_532'] = pd.arrays.FloatingArray(np.zeros(nrows), np.ones(nrows, dtype=bool))
+        data[f'laser_sp_{self.wavelength}'] = pd.arrays.FloatingArray(cols['laser_setpoint'].copy(), np.zeros(nrows, dtype=bool))
+        data['timestamp'] = cols['timestamp']
+        return pd.DataFrame(data)
+
+    def _read_run_file_pandas(self, raw: bytes) -> pd.DataFrame:
+        df = pd.read_csv(io.BytesIO(raw), delimiter ='\t', header=None)
+        df.columns = CALIB_RUN_COLUMNS
+        df['laser_sp_1064'] = pd.Series([pd.NA] * len(df), dtype='Float64')
+        df['laser_sp_532'] = pd.Series([pd.NA] * len(df), dtype='Float64')
+        df[f'laser_sp_{self.wavelength}'] = df['laser_setpoint'].astype('Float64')
+        df["datetime"] = pd.to_datetime(
+            df["datetime"],
+            format="%Y-%m-%d-%H:%M:%S",
+            utc=True
+        ).astype('datetime64[ns, UTC]')
+        df["timestamp"] = df["datetime"].astype("int64") // 1_000_000_000
+        return df
+
+    @staticmethod
+    def _cache_flags() -> dict:
+        """Configuration flags that change the prepared data (part of the parsed-data cache key)"""
+        return {
+            'subtract_pedestals': config.subtract_pedestals,
+            'use_uW_as_power_units': config.use_uW_as_power_units,
+            'replace_zero_pm_stds': config.replace_zero_pm_stds,
+            'power_meter_resolutions': config.power_meter_resolutions,
+        }
+
+    def _prepare_data(self, raw: bytes):
+        """Parse the raw file content and prepare the run store (all rows, first and last as pedestals)"""
+        self._df = self._read_run_file(raw)
         self.data_prep_info['original_num_rows'] = len(self._df)
         self.data_prep_info['use_zeroed_columns'] = config.subtract_pedestals
         self.data_prep_info['use_uW_as_power_units'] = config.use_uW_as_power_units
         if config.use_uW_as_power_units:
             self._df['pm_mean'] = self._df['pm_mean'] * 1e6
             self._df['pm_std'] = self._df['pm_std'] * 1e6
-        self._df["datetime"] = pd.to_datetime(
-            self._df["datetime"],
-            format="%Y-%m-%d-%H:%M:%S",
-            utc=True
-        )
-        self._df["timestamp"] = self._df["datetime"].astype("int64") // 1_000_000_000
         self._subs_pm_zero_stds()
 
-        self._df_pedestals = pd.concat([self._df.iloc[[0]], self._df.iloc[[-1]]], ignore_index=True)
-        self.data_prep_info['original_num_pedestals'] = len(self._df_pedestals)
+        self._store = RunStore(self._df)
+        self._df = None
+        self._store.select('pedestals', np.array([0, len(self._store) - 1]))
+        self.data_prep_info['original_num_pedestals'] = self._store.count('pedestals')
         self._subtract_pedestals()
 
-        self._df_full = self._df.copy()
-        if config.use_first_pedestal_in_linreg:
-            self._df = self._df.iloc[0:-1].reset_index(drop=True)
+    def load_data(self):
+        """Load calibration file data into the run store"""
+        raw = self.source.read_bytes()
+        cache = parsed_cache.get_cache()
+        # the parsed-data cache key also identifies the data in the sanity check results cache
+        cache_key = parsed_cache.ParsedDataCache.make_key(raw, self.source.name, self._cache_flags())
+        self.data_fingerprint = cache_key
+        cached = cache.load(cache_key) if cache else None
+        if cached is not None:
+            frames, meta = cached
+            self._store = RunStore.from_frames(frames)
+            self.data_prep_info = meta['data_prep_info']
+            self.anal.analyze_pedestals()
+            logger.debug("Using cached parsed data for calibration file: %s", self.file_info['filename'])
         else:
-            self._df = self._df.iloc[1:-1].reset_index(drop=True)
+            self._prepare_data(raw)
+            if cache:
+                cache.store(cache_key, self._store.to_frames(), {'data_prep_info': self.data_prep_info})
+
+        # the first and last rows are pedestals, the first one can optionally be used in the regressions
+        self._store.select('df', slice(0, -1) if config.use_first_pedestal_in_linreg else slice(1, -1))
         logger.info("Loaded data for calibration file: %s", self.file_info['filename'])
 
 
@@ -174,8 +230,8 @@ class CalibFile(BaseElement):
 
     def set_file_info(self):
         """Set file info metadata"""
-        self.file_info['num_points'] = len(self._df)
-        self.file_info['file_size_bytes'] = os.path.getsize(self.file_path)
+        self.file_info['num_points'] = self._store.count('df')
+        self.file_info['file_size_bytes'] = self.source.size
 
     @property
     def power(self) -> str:
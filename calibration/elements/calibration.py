@@ -3,19 +3,29 @@ Docstring for calibration.elements.calibration
 """
 import os
 import json
-import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 import pandas as pd
 
-from calibration.helpers import file_manage, get_logger, system_info
+from calibration.helpers import calib_history, file_manage, get_logger, parsed_cache, plot_cache, system_info
+from calibration.helpers.frame_merge import merge_sorted_frames
 from .calib_file import CalibFile
 from .analysis import CalibrationAnalysis
 from .plots.calibration_plots import CalibrationPlots
+from .plots.plot_scheduler import PlotScheduler
 from .calib_fileset import FileSet
 from .base_element import BaseElement, DataHolderLevel
 from calibration.config import config
 
 logger = get_logger()
+
+
+def _init_load_worker(config_values: dict, cache: parsed_cache.ParsedDataCache | None):
+    """Process pool initializer: replicate the parent configuration in the worker"""
+    config.update_from_dict(config_values)
+    parsed_cache.set_cache(cache)
+    file_manage.keep_archives_open()
         
 
 class Calibration(BaseElement):
@@ -31,6 +41,7 @@ class Calibration(BaseElement):
         self.reports_path = opath
         self.plots_path = os.path.join(opath, 'plots')
         self.filesets = {}
+        self.jobs = max(1, int(getattr(call_args, 'jobs', 1) or 1))
         self.meta = {
             'calling_arguments': vars(call_args),
             'calib_id': calib_name,
@@ -47,102 +58,105 @@ class Calibration(BaseElement):
         self.plotter = CalibrationPlots(self)
         self.level_header = calib_name
         self.long_label = calib_name
-        self.past_calibrations: dict[str, dict] = {}
+        self.history: calib_history.CalibrationHistory | None = None
         self.initialize()
     
     def initialize(self):
         os.makedirs(self.plots_path, exist_ok=True)
-        self._load_past_calibrations()
+        self._setup_parsed_cache()
+        self._setup_plot_cache()
+        self._setup_history()
+
+    def _setup_parsed_cache(self):
+        """Enable the parsed run files cache in the output root (unless disabled by configuration)"""
+        if not config.use_parsed_cache:
+            parsed_cache.set_cache(None)
+            return
+        cache_dir = os.path.join(self.root_output_path, parsed_cache.CACHE_DIR_NAME)
+        parsed_cache.set_cache(parsed_cache.ParsedDataCache(cache_dir, config.parsed_cache_max_bytes))
+
+    def _setup_plot_cache(self):
+        """Enable the rendered plots cache in the output root (unless disabled by configuration)"""
+        if not config.use_plot_cache:
+            plot_cache.set_cache(None)
+            return
+        cache_dir = os.path.join(self.root_output_path, plot_cache.CACHE_DIR_NAME)
+        plot_cache.set_cache(plot_cache.PlotRenderCache(cache_dir, config.plot_cache_max_bytes))
 
-    def _load_past_calibrations(self):
-        """Load previously exported reduced calibration json files from output root."""
-        output_root = self.root_output_path
-        file_pattern = re.compile(r"^calibration_\d{8}\.json$")
-        past_calibrations: dict[str, dict] = {}
+    def _setup_history(self):
+        """Open the calibration history index of the output root and import new past reduced summaries"""
         try:
-            for fname in sorted(os.listdir(output_root)):
-                if not file_pattern.match(fname):
-                    continue
-                fpath = os.path.join(output_root, fname)
-                if not os.path.isfile(fpath):
-                    continue
-                key = os.path.splitext(fname)[0]
-                try:
-                    with open(fpath, "r", encoding="utf-8") as f:
-                        past_calibrations[key] = json.load(f)
-                except Exception as e:
-                    logger.warning("Skipping past calibration file %s: %s", fpath, str(e))
-        except Exception as e:
-            logger.warning("Failed to scan output root for past calibrations at %s: %s", output_root, str(e))
-        self.past_calibrations = past_calibrations
+            self.history = calib_history.CalibrationHistory(
+                os.path.join(self.root_output_path, calib_history.HISTORY_FILE_NAME)
+            )
+            self.history.sync_directory(self.root_output_path)
+        except sqlite3.Error as e:
+            logger.warning("Calibration history not available at %s: %s", self.root_output_path, str(e))
+            self.history = None
    
     @property
     def df(self):
-        """Concatenated DataFrame of all calibration files."""
+        """Time ordered DataFrame of all calibration files."""
         if self._df is None:
-            frames = [
-                calfile.df
-                for fileset in self.filesets.values()
-                for calfile in fileset.files
-                if calfile.df is not None and not calfile.df.empty
-            ]
-            if not frames:
-                raise ValueError(f"[{self.level_header}] No non-empty calibration dataframes to concatenate")
-            self._df = pd.concat(frames, ignore_index=True)
-            self._df = self._df.sort_values(by='timestamp').reset_index(drop=True)
+            self._df = self._merge_children('df')
         return self._df
     
     @property
     def df_pedestals(self):
-        """Concatenated DataFrame of all pedestal data."""
+        """Time ordered DataFrame of all pedestal data."""
         if self._df_pedestals is None:
-            frames = [
-                fileset.df_pedestals
-                for fileset in self.filesets.values()
-                if fileset.df_pedestals is not None and not fileset.df_pedestals.empty
-            ]
-            if not frames:
-                raise ValueError(f"[{self.level_header}] No non-empty pedestal dataframes to concatenate")
-            self._df_pedestals = pd.concat(frames, ignore_index=True)
-            self._df_pedestals = self._df_pedestals.sort_values(by='timestamp').reset_index(drop=True)
+            self._df_pedestals = self._merge_children('df_pedestals')
         return self._df_pedestals
     
     @property
     def df_full(self):
-        """Concatenated DataFrame of all full data."""
+        """Time ordered DataFrame of all full data."""
         if self._df_full is None:
-            frames = [
-                fileset.df_full
-                for fileset in self.filesets.values()
-                if fileset.df_full is not None and not fileset.df_full.empty
-            ]
-            if not frames:
-                raise ValueError(f"[{self.level_header}] No non-empty full dataframes to concatenate")
-            self._df_full = pd.concat(frames, ignore_index=True)
-            self._df_full = self._df_full.sort_values(by='timestamp').reset_index(drop=True)
+            self._df_full = self._merge_children('df_full')
         return self._df_full
 
+    def _merge_children(self, kind: str, columns: list[str] | None = None) -> pd.DataFrame:
+        """Merge the (time ordered) frames of the calibration files of every fileset"""
+        frames = [
+            frame
+            for fileset in self.filesets.values()
+            for calfile in fileset.files
+            if not (frame := getattr(calfile, kind)).empty
+        ]
+        if not frames:
+            label = {'df': 'calibration', 'df_pedestals': 'pedestal', 'df_full': 'full'}[kind]
+            raise ValueError(f"[{self.level_header}] No non-empty {label} dataframes to concatenate")
+        return merge_sorted_frames(frames, columns=columns)
+
 
     def load_calibration_files(self):
         """
         Load calibration files from the specified directory or zip file
 
-        Files are grouped into sets based on their wavelength and filter wheel settings
+        Files are grouped into sets based on their wavelength and filter wheel settings.
+        With jobs > 1 the files are parsed and prepared in a process pool; results are
+        collected in the same sorted order so the grouping does not change.
         
         """
         # sorted makes sure that the files are loaded in a consistent order (run1, run2, run3)
-        for file_name in sorted(os.listdir(self.calib_files_path)):
-            file_path = os.path.join(self.calib_files_path, file_name)
-            if os.path.isfile(file_path):
-                # File set itself is the responsible to set the fileset in the calib file
-                # On creation of the CalibFile object the file is loaded to a DataFrame (if valid)
-                calfile = CalibFile(file_path)
-                if calfile.valid:
-                    self.filesets.setdefault((calfile.wavelength, calfile.filter_wheel), FileSet(calfile.wavelength, calfile.filter_wheel, calibration=self)).add_calib_file(calfile)
-                else:
-                    logger.warning("Skipping invalid calibration file: %s", file_name)
-                    continue
-                # logger.info("Loaded calibration file: %s", file_name)
+        input_files = file_manage.list_input_files(self.calib_files_path)
+        # On creation of the CalibFile object the file is loaded to a DataFrame (if valid)
+        if self.jobs > 1 and len(input_files) > 1:
+            workers = min(self.jobs, len(input_files))
+            logger.info("Loading %d calibration files using %d worker processes", len(input_files), workers)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_load_worker,
+                                     initargs=(config.to_dict(), parsed_cache.get_cache())) as pool:
+                calfiles = list(pool.map(CalibFile, input_files))
+        else:
+            with file_manage.open_archives():
+                calfiles = [CalibFile(input_file) for input_file in input_files]
+
+        for input_file, calfile in zip(input_files, calfiles):
+            # File set itself is the responsible to set the fileset in the calib file
+            if calfile.valid:
+                self.filesets.setdefault((calfile.wavelength, calfile.filter_wheel), FileSet(calfile.wavelength, calfile.filter_wheel, calibration=self)).add_calib_file(calfile)
+            else:
+                logger.warning("Skipping invalid calibration file: %s", input_file.name)
     
     def analyze(self):
         """Analyze the calibration data"""
@@ -153,11 +167,14 @@ class Calibration(BaseElement):
     def generate_plots(self):
         """Generate calibration plots"""
         os.makedirs(self.plots_path, exist_ok=True)
+        # the figures of every file, file set and of the calibration are rendered by up to `jobs` processes
+        scheduler = PlotScheduler(self.jobs)
         fs_plots = self.plotter.plots.setdefault('filesets', {})
         for fileset in self.filesets.values():
-            fileset.generate_plots()
+            fileset.plotter.schedule_plots(scheduler)
             fs_plots[fileset.level_header] = fileset.plotter.plots
-        self.plotter.generate_plots()
+        self.plotter.schedule_plots(scheduler)
+        scheduler.run()
     
     def to_dict(self):
         """Convert calibration data to dictionary"""
@@ -204,6 +221,15 @@ class Calibration(BaseElement):
                 logger.error("Failed to serialize reduced calibration summary to JSON: %s", str(e))
                 print(outdata)
         logger.info("Reduced calibration summary saved to %s", results_path)
+        # only archive calibrations (calibration_DDMMYYYY) enter the history, as for the past summaries
+        if self.history is not None and calib_history.SUMMARY_FILE_PATTERN.match(f"{self.meta['calib_id']}.json"):
+            try:
+                self.history.record(
+                    self.meta['calib_id'], outdata, os.stat(results_path),
+                    os.path.relpath(results_path, self.root_output_path),
+                )
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Failed to record calibration %s in the history: %s", self.meta['calib_id'], str(e))
     
 
 #-------------------------------------
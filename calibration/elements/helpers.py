@@ -45,20 +45,39 @@ class CalibLinReg:
             return self.linreg.intercept_stderr
         raise AttributeError("No linear regression result available")
     
+    @property
+    def weighted(self) -> bool:
+        """Whether the result comes from a weighted least squares fit (with chi2)"""
+        return hasattr(self.linreg, 'chi2')
+
+    def to_fit_result(self) -> 'CalibFitResult':
+        """Return the linear regression result as a CalibFitResult"""
+        if not self.linreg:
+            raise AttributeError("No linear regression result available")
+        result = CalibFitResult(
+            self.x_var,
+            self.y_var,
+            float(self.slope),
+            float(self.intercept),
+            float(self.r_value),
+            float(self.p_value),
+            float(self.stderr),
+            float(self.intercept_stderr),
+        )
+        if self.weighted:
+            # slope and intercept come from the same fit, they share its chi2
+            chi2 = float(self.linreg.chi2)
+            ndof = int(self.linreg.ndof)
+            chi2_reduced = chi2 / ndof if ndof > 0 else 0.0
+            result.weighted = True
+            result.slope_chi2 = result.intercept_chi2 = chi2
+            result.slope_chi2_reduced = result.intercept_chi2_reduced = chi2_reduced
+            result.ndof = ndof
+        return result
+
     def to_dict(self):
         """Convert the linear regression result to a dictionary"""
-        if self.linreg:
-            return {
-                'x_var': self.x_var,
-                'y_var': self.y_var,
-                'slope': float(self.slope),
-                'intercept': float(self.intercept),
-                'r_value': float(self.r_value),
-                'p_value': float(self.p_value),
-                'stderr': float(self.stderr),
-                'intercept_stderr': float(self.intercept_stderr),
-            }
-        raise AttributeError("No linear regression result available")
+        return self.to_fit_result().to_dict()
 
 @dataclass
 class CalibFitResult:
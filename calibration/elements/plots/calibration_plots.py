@@ -7,6 +7,7 @@ import pandas as pd
 from calibration.helpers import get_logger
 from calibration.config import config
 from .plot_base import BasePlots
+from .plot_registry import producer
 
 if TYPE_CHECKING:
     from ..calibration import Calibration
@@ -21,6 +22,15 @@ class CalibrationPlots(BasePlots):
 
     Generate plots at Calibration Level
     """
+    plot_level = 'calibration'
+    PLOT_PRODUCERS = (
+        producer('_gen_timeseries_plot', 'timeseries'),
+        producer('_gen_temp_humidity_hists_plot', 'temperature_hist', 'humidity_hist'),
+        producer('_gen_pedestals_timeseries_plot', 'pedestals_timeseries'),
+        producer('_gen_pm_samples_plot_full', 'pm_samples_full'),
+        producer('_gen_pm_samples_plot_pedestals', 'pm_samples_pedestals'),
+    )
+
     def __init__(self, calibration:Calibration):
         super().__init__()
         self._data_holder:Calibration = calibration
@@ -40,9 +50,5 @@ class CalibrationPlots(BasePlots):
         """Generate plots interrelating data from all sets of calibration files."""
         # plot of whole calibration data acquisition temperature and humidity
         if config.generate_plots:
-            self._gen_timeseries_plot()
-            self._gen_temp_humidity_hists_plot()
-            self._gen_pedestals_timeseries_plot()
-            self._gen_pm_samples_plot_full()
-            self._gen_pm_samples_plot_pedestals()            
+            self.render_plots()
 
@@ -5,14 +5,15 @@ Docstring for calibration.elements.calib_file_analysis
 from typing import TYPE_CHECKING
 import pandas as pd
 from scipy.stats import linregress
-import matplotlib.pyplot as plt
 
 
 from calibration.helpers import get_logger
 from calibration.config import config
 
 from ..helpers import CalibLinReg
+from .figures import new_figure
 from .plot_base import BasePlots
+from .plot_registry import producer
 
 if TYPE_CHECKING:
     from ..calib_file import CalibFile
@@ -25,6 +26,17 @@ class FilePlots(BasePlots):
     """
     Docstring for FilePlots
     """
+    plot_level = 'file'
+    PLOT_PRODUCERS = (
+        producer('_gen_temp_humidity_hists_plot', 'temperature_hist', 'humidity_hist'),
+        producer('_gen_timeseries_plot', 'timeseries'),
+        producer('_gen_pm_samples_plot_full', 'pm_samples_full'),
+        producer('_gen_pm_samples_plot_pedestals', 'pm_samples_pedestals'),
+        producer('_gen_pm_vs_laser_plot', 'pm_vs_L'),
+        producer('_gen_refpd_vs_laser_plot', 'refPD_vs_L'),
+        producer('_gen_pm_vs_refpd_plot', 'pm_vs_refPD'),
+    )
+
     def __init__(self, calib_file:CalibFile):
         super().__init__()
         self._data_holder:CalibFile = calib_file
@@ -48,57 +60,57 @@ class FilePlots(BasePlots):
         if self.df is None:
             logger.error("Dataframe is not loaded for file: %s", self.cf.file_info['filename'])
             return
-        
-        self._gen_temp_humidity_hists_plot()
-        self._gen_timeseries_plot()
-        self._gen_pm_samples_plot_full()
-        self._gen_pm_samples_plot_pedestals()
+        self.render_plots()
 
-        # Plot Mean pm vs laser_setpoint
+    def _gen_pm_vs_laser_plot(self):
+        """Plot Mean pm vs laser_setpoint"""
         fig_id = "pm_vs_L"
-        fig = plt.figure(figsize=(10, 6))
-        plt.errorbar(self.df['laser_setpoint'], self.df[self.pm_col], yerr=self.df[self.pm_std_col], 
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        ax.errorbar(self.df['laser_setpoint'], self.df[self.pm_col], yerr=self.df[self.pm_std_col], 
                      fmt='.', markersize=10, linewidth=1, label='Power Meter', color=self.colors['pm'], ecolor=self.colors['pm'])
-        plt.ylabel(f'Power Meter ({self.power_units})')
-        plt.xlabel(self.laser_label)
-        plt.legend()
-        plt.grid()
-        plt.title(f'{self.level_label} - Power Meter vs {self.laser_label}')
-        plt.tight_layout()
+        ax.set_ylabel(f'Power Meter ({self.power_units})')
+        ax.set_xlabel(self.laser_label)
+        ax.legend()
+        ax.grid()
+        ax.set_title(f'{self.level_label} - Power Meter vs {self.laser_label}')
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
         # logger.debug("Plot saved to %s", fig_path)
 
-
+    def _gen_refpd_vs_laser_plot(self):
+        """Plot Mean Ref PD vs laser_setpoint"""
         fig_id = "refPD_vs_L"
-        fig = plt.figure(figsize=(10, 6))
-        plt.errorbar(self.df['laser_setpoint'], self.df[self.refpd_col], yerr=self.df[self.refpd_std_col], 
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        ax.errorbar(self.df['laser_setpoint'], self.df[self.refpd_col], yerr=self.df[self.refpd_std_col], 
                      fmt='.', markersize=10, linewidth=1, label='Ref PD', color=self.colors['refpd'], ecolor=self.colors['refpd'])
-        plt.ylabel('Ref PD (V)')
-        plt.xlabel(self.laser_label)
-        plt.legend()
-        plt.grid()
-        plt.title(f'{self.level_label} - Ref PD vs {self.laser_label}')
-        plt.tight_layout()
+        ax.set_ylabel('Ref PD (V)')
+        ax.set_xlabel(self.laser_label)
+        ax.legend()
+        ax.grid()
+        ax.set_title(f'{self.level_label} - Ref PD vs {self.laser_label}')
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
         # logger.debug("Plot saved to %s", fig_path)
 
+    def _gen_pm_vs_refpd_plot(self):
+        """Plot Mean pm vs Ref PD with the fitted line"""
         intercept = self._anal.lr_refpd_vs_pm.intercept
         slope = self._anal.lr_refpd_vs_pm.slope
         slope_err = self._anal.lr_refpd_vs_pm.stderr
 
         fig_id = "pm_vs_refPD"
-        fig = plt.figure(figsize=(10, 6))
-        plt.errorbar(self.df[self.refpd_col], self.df[self.pm_col], yerr=self.df[self.pm_std_col], 
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        ax.errorbar(self.df[self.refpd_col], self.df[self.pm_col], yerr=self.df[self.pm_std_col], 
                      fmt='.', markersize=10, linewidth=1, label='Power Meter', color=self.colors['pm'], ecolor=self.colors['pm'])
-        plt.plot(self.df[self.refpd_col], intercept + slope*self.df[self.refpd_col], color=self.colors['linreg'], label='fitted line')
-        plt.ylabel(f'Power Meter ({self.power_units})')
-        plt.ticklabel_format(style='sci', axis='y', scilimits=(0,0))
-        plt.xlabel('Ref PD (V)')
-        plt.legend([f'intercept={intercept:.2} ({self.power_units}), slope={slope:.2}+/-{slope_err:.2} ({self.power_units}/V)', 'Power Meter'])
-        plt.grid()
-        plt.title(f'{self.level_label} - Power Meter vs Ref PD')
-        plt.tight_layout()
+        ax.plot(self.df[self.refpd_col], intercept + slope*self.df[self.refpd_col], color=self.colors['linreg'], label='fitted line')
+        ax.set_ylabel(f'Power Meter ({self.power_units})')
+        ax.ticklabel_format(style='sci', axis='y', scilimits=(0,0))
+        ax.set_xlabel('Ref PD (V)')
+        ax.legend([f'intercept={intercept:.2} ({self.power_units}), slope={slope:.2}+/-{slope_err:.2} ({self.power_units}/V)', 'Power Meter'])
+        ax.grid()
+        ax.set_title(f'{self.level_label} - Power Meter vs Ref PD')
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
@@ -4,13 +4,16 @@ from typing import TYPE_CHECKING
 
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from matplotlib.gridspec import GridSpec
 from matplotlib.ticker import ScalarFormatter
 
 
 from calibration.helpers import get_logger
+from calibration.helpers.calib_history import pedestal_value_err
+from .figures import new_figure, new_subplots
 from .plot_base import BasePlots
+from .plot_registry import producer
+from .plot_scheduler import PlotScheduler
 
 if TYPE_CHECKING:
     from ..calibration import Calibration
@@ -21,6 +24,27 @@ logger = get_logger()
 
 class FileSetPlots(BasePlots):
     """Class to do the plots for a set of calibration files."""
+    plot_level = 'fileset'
+    PLOT_PRODUCERS = (
+        producer('_gen_temp_humidity_hists_plot', 'temperature_hist', 'humidity_hist'),
+        producer('_gen_timeseries_plot', 'timeseries'),
+        producer('_gen_plot_conv_factor_slope_method_comparison', 'ConvFactorSlopes_Comparison'),
+        producer('_gen_plot_conv_factor_intercept_method_comparison', 'ConvFactorIntercepts_Comparison'),
+        producer('_gen_calibrations_evolution_plot', 'calibrations_evolution'),
+        producer('_gen_plot_slopes_vs_temperature', 'pmVsRefPD_fitSlope_vs_Temperature'),
+        producer('_gen_plot_slopes_intercepts_vs_index', 'pmVsRefPD_fitSlopes_and_Intercepts_vs_Run'),
+        producer('_gen_plot_slopes_intercepts_vs_index', 'pmVsRefPD_fitSlopes_and_Intercepts_vs_Run_vert',
+                 vertical=True),
+        producer('_gen_plot_pmvsRefPD', 'pm_vs_RefPD'),
+        producer('_gen_plot_pmvsRefPD_all_calfiles', 'pm_vs_RefPD_runs'),
+        producer('_gen_plots_vs_laser_setting', 'pm_vs_LaserSetting', 'RefPD_vs_LaserSetting'),
+        producer('_gen_pedestals_hist_plot', 'Pedestals_Histogram'),
+        producer('_gen_pedestal_points_with_mean_plot', 'pedestals_points_with_mean'),
+        producer('_gen_pedestal_vs_run_plot', 'pedestals_vs_run'),
+        producer('_gen_pedestals_timeseries_plot', 'pedestals_timeseries'),
+        producer('_gen_pm_samples_plot_full', 'pm_samples_full'),
+        producer('_gen_pm_samples_plot_pedestals', 'pm_samples_pedestals'),
+    )
 
     def __init__(self, file_set: FileSet):
         super().__init__()
@@ -41,33 +65,24 @@ class FileSetPlots(BasePlots):
         return self._data_holder.output_path
     
     def generate_plots(self):
+        scheduler = PlotScheduler()
+        self.schedule_plots(scheduler)
+        scheduler.run()
+
+    def schedule_plots(self, scheduler: PlotScheduler):
+        """Add the jobs rendering the plots of the files and then those of the file set."""
         if not self._anal.analyzed:
             logger.warning("FileSetPlot: FileSet %s not analyzed yet. Can't generate plots.", self.level_label)
             return
         fileplots = self.plots.setdefault('files', {})
         for calfile in self._data_holder.files:
-            calfile.plotter.generate_plots()
+            calfile.plotter.schedule_plots(scheduler)
             fileplots[calfile.level_header] = calfile.plotter.plots
+        if self.selected_producers():
+            scheduler.add(self, '_gen_fileset_plots')
 
-        
-        self._gen_temp_humidity_hists_plot()
-        self._gen_timeseries_plot()
-
-        self._gen_plot_conv_factor_slope_method_comparison()
-        self._gen_plot_conv_factor_intercept_method_comparison()
-        self._gen_calibrations_evolution_plot()
-        self._gen_plot_slopes_vs_temperature()
-        self._gen_plot_slopes_intercepts_vs_index()
-        self._gen_plot_slopes_intercepts_vs_index(vertical=True)
-        self._gen_plot_pmvsRefPD()
-        self._gen_plot_pmvsRefPD_all_calfiles()
-        self._gen_plots_vs_laser_setting()
-        self._gen_pedestals_hist_plot()
-        self._gen_pedestal_points_with_mean_plot()
-        self._gen_pedestal_vs_run_plot()
-        self._gen_pedestals_timeseries_plot()
-        self._gen_pm_samples_plot_full()
-        self._gen_pm_samples_plot_pedestals()
+    def _gen_fileset_plots(self):
+        self.render_plots()
         logger.info("Plots for dataset %s generated", self.level_label)
 
     # Anal results
@@ -88,7 +103,7 @@ class FileSetPlots(BasePlots):
 
         fig_id = "ConvFactorSlopes_Comparison"
 
-        fig, (ax1, ax2, ax3) = plt.subplots(
+        fig, (ax1, ax2, ax3) = new_subplots(
             nrows=3, ncols=1, figsize=(10, 9), sharex=True, constrained_layout=True
         )
 
@@ -158,55 +173,21 @@ class FileSetPlots(BasePlots):
         fig.suptitle(f'Conv Factor Slope Comparison for {self.level_label}', y=1.02)
 
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_calibrations_evolution_plot(self):
-        """Plot calibration evolution across past and current calibrations for this fileset."""
+        """Plot calibration evolution across past (dated before) and current calibrations for this fileset."""
         fig_id = f"calibrations_evolution"
         current_calibration = self._data_holder.dh_parent
         fileset_label = self.level_label
 
-        def _pedestal_value_err(ped_data: dict, key: str):
-            p = ped_data.get(key, {}) if isinstance(ped_data, dict) else {}
-            if not isinstance(p, dict):
-                return None, None
-            weighted = bool(p.get("weighted", False))
-            value = p.get("w_mean") if weighted else p.get("mean")
-            err = p.get("w_stderr") if weighted else p.get("std")
-            return value, err
-
-        entries = []
-        past_calibrations = getattr(current_calibration, "past_calibrations", {})
-        for cal_label, cal_data in past_calibrations.items():
-            filesets = cal_data.get("filesets", {})
-            fs_entry = filesets.get(fileset_label, {})
-            linreg = fs_entry.get("full_dataset_linreg")
-            ped = fs_entry.get("pedestals", {})
-            if not isinstance(linreg, dict):
-                continue
-            if "slope" not in linreg or "intercept" not in linreg:
-                continue
-            pm_ped, pm_ped_err = _pedestal_value_err(ped, "pm")
-            refpd_ped, refpd_ped_err = _pedestal_value_err(ped, "refpd")
-            acq_min_ts = cal_data.get("acquisition_time", {}).get("min_ts")
-            entries.append({
-                "label": cal_label,
-                "sort_ts": acq_min_ts if isinstance(acq_min_ts, (int, float)) else float("inf"),
-                "slope": linreg.get("slope"),
-                "slope_err": linreg.get("stderr"),
-                "intercept": linreg.get("intercept"),
-                "intercept_err": linreg.get("intercept_stderr"),
-                "pm_ped": pm_ped,
-                "pm_ped_err": pm_ped_err,
-                "refpd_ped": refpd_ped,
-                "refpd_ped_err": refpd_ped_err,
-            })
-
         current_label = current_calibration.meta.get("calib_id", "current")
+        history = getattr(current_calibration, "history", None)
+        entries = history.fileset_history(fileset_label, before=current_label) if history is not None else []
+
         current_linreg = self._anal.lr_refpd_vs_pm
         current_ped = self._anal.results.get("pedestals", {})
-        current_pm_ped, current_pm_ped_err = _pedestal_value_err(current_ped, "pm")
-        current_refpd_ped, current_refpd_ped_err = _pedestal_value_err(current_ped, "refpd")
+        current_pm_ped, current_pm_ped_err = pedestal_value_err(current_ped, "pm")
+        current_refpd_ped, current_refpd_ped_err = pedestal_value_err(current_ped, "refpd")
         entries = [e for e in entries if e["label"] != current_label]
         entries.append({
             "label": current_label,
@@ -242,7 +223,7 @@ class FileSetPlots(BasePlots):
         refpd_ped = [e["refpd_ped"] for e in entries]
         refpd_ped_err = [e["refpd_ped_err"] for e in entries]
 
-        fig, (ax1, ax2) = plt.subplots(
+        fig, (ax1, ax2) = new_subplots(
             nrows=2, ncols=1, figsize=(12, 8), sharex=True, constrained_layout=True
         )
 
@@ -292,7 +273,6 @@ class FileSetPlots(BasePlots):
         ax2.set_xticklabels(labels, rotation=45, ha='right')
 
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_plot_conv_factor_intercept_method_comparison(self):
         # Comparison of the two methods to obtain the conversion factor intercept 
@@ -301,7 +281,7 @@ class FileSetPlots(BasePlots):
 
         fig_id = "ConvFactorIntercepts_Comparison"
 
-        fig, (ax1, ax2, ax3) = plt.subplots(
+        fig, (ax1, ax2, ax3) = new_subplots(
             nrows=3, ncols=1, figsize=(10, 9), sharex=True, constrained_layout=True
         )
 
@@ -373,25 +353,24 @@ class FileSetPlots(BasePlots):
         fig.suptitle(f'Conv Factor Intercept Comparison for {self.level_label}', y=1.02)
 
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_plot_slopes_vs_temperature(self):
         # Plot dels slopes per la pm en funció de la temperatura mitja de cada fitxer, no cal fer regressió lineal perque
         # totes han de tenir el mateix valor.
         fig_id = 'pmVsRefPD_fitSlope_vs_Temperature'
-        fig = plt.figure(figsize=(10, 6))
-        plt.grid()
-        plt.errorbar(self._anal.mean_temp, self._anal.slopes,yerr=self._anal.slopes_std,
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        ax.grid()
+        ax.errorbar(self._anal.mean_temp, self._anal.slopes,yerr=self._anal.slopes_std,
                      fmt='.', markersize=10, linewidth=1, color=self.colors['linreg'], ecolor=self.colors['linreg'])
-        plt.axhline(y=self._anal.lr_slopes_mean.mean, color=self.colors['compare_mean'], linestyle='-',
+        ax.axhline(y=self._anal.lr_slopes_mean.mean, color=self.colors['compare_mean'], linestyle='-',
                     label=f'mean slope value={self._anal.lr_slopes_mean.mean:.3e}')
-        plt.legend()
-        plt.ylabel('ref PD vs pm slopes')
-        plt.xlabel('Mean temperature (Cº)')
-        plt.title(f'{self.level_label} - {self.power_units}/V fit slopes')
-        plt.tight_layout(rect=(0, 0, 1, 0.98))
+        ax.legend()
+        ax.set_ylabel('ref PD vs pm slopes')
+        ax.set_xlabel('Mean temperature (Cº)')
+        ax.set_title(f'{self.level_label} - {self.power_units}/V fit slopes')
+        fig.tight_layout(rect=(0, 0, 1, 0.98))
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_plot_slopes_intercepts_vs_index(self, vertical=False):
         # Plot dels slopes i intercepts per la pm en funció de l'índex del fitxer, no cal fer regressió lineal perque
@@ -399,9 +378,9 @@ class FileSetPlots(BasePlots):
 
         fig_id = 'pmVsRefPD_fitSlopes_and_Intercepts_vs_Run' + ('_vert' if vertical else '')
         if vertical:
-            fig, (ax1, ax2) = plt.subplots(nrows=2, ncols=1, figsize=(8, 10), sharex=True)
+            fig, (ax1, ax2) = new_subplots(nrows=2, ncols=1, figsize=(8, 10), sharex=True)
         else:
-            fig, (ax1, ax2) = plt.subplots(nrows=1, ncols=2, figsize=(14, 6), sharex=True)
+            fig, (ax1, ax2) = new_subplots(nrows=1, ncols=2, figsize=(14, 6), sharex=True)
         
 
         # Slopes
@@ -463,9 +442,8 @@ class FileSetPlots(BasePlots):
         ax2.set_xlim([-1, len(self._anal.intercepts)])
 
         fig.suptitle(f'{self.level_label} - {self.power_units}/V fit slopes and intercepts')
-        plt.tight_layout(rect=(0, 0, 1, 0.98))
+        fig.tight_layout(rect=(0, 0, 1, 0.98))
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_plot_pmvsRefPD_all_calfiles(self):
 
@@ -473,7 +451,7 @@ class FileSetPlots(BasePlots):
 
         n_files = len(self._data_holder.files)
 
-        fig = plt.figure(
+        fig = new_figure(
             figsize=(12, 7),
             constrained_layout=True
         )
@@ -569,7 +547,6 @@ class FileSetPlots(BasePlots):
         # )
 
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_plot_pmvsRefPD(self):
 
@@ -577,7 +554,7 @@ class FileSetPlots(BasePlots):
 
         n_files = len(self._data_holder.files)
 
-        fig = plt.figure(
+        fig = new_figure(
             figsize=(12, 7),
             constrained_layout=True
         )
@@ -676,43 +653,42 @@ class FileSetPlots(BasePlots):
         # )
 
         self.savefig(fig, fig_id)
-        plt.close(fig)
     
     def _gen_plots_vs_laser_setting(self):
         """Generate plots vs laser setting for the set of calibration files"""
         fig_id = "pm_vs_LaserSetting"
-        fig = plt.figure(figsize=(10, 6))
-        plt.grid()
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        ax.grid()
         for calfile in self._data_holder.files:
-            plt.errorbar(calfile.df['laser_setpoint'], calfile.df[calfile.pm_col], yerr=calfile.df[calfile.pm_std_col],
+            ax.errorbar(calfile.df['laser_setpoint'], calfile.df[calfile.pm_col], yerr=calfile.df[calfile.pm_std_col],
                          fmt='.', markersize=10, linewidth=1, label=calfile.file_label, color=self.colors['pm'], ecolor=self.colors['pm'])
-        plt.ylabel(f'Power meter ({self.power_units})')
-        plt.xlabel(self.laser_label)
-        plt.title(f'{self.level_label} - pm vs Laser setting')
-        plt.legend()
-        plt.tight_layout(rect=[0, 0, 1, 0.98])
+        ax.set_ylabel(f'Power meter ({self.power_units})')
+        ax.set_xlabel(self.laser_label)
+        ax.set_title(f'{self.level_label} - pm vs Laser setting')
+        ax.legend()
+        fig.tight_layout(rect=[0, 0, 1, 0.98])
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
         fig_id = "RefPD_vs_LaserSetting"
-        fig = plt.figure(figsize=(10, 6))
-        plt.grid()
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        ax.grid()
         for calfile in self._data_holder.files:
-            plt.errorbar(calfile.df['laser_setpoint'], calfile.df[calfile.refpd_col], yerr=calfile.df[calfile.refpd_std_col],
+            ax.errorbar(calfile.df['laser_setpoint'], calfile.df[calfile.refpd_col], yerr=calfile.df[calfile.refpd_std_col],
                          fmt='.', markersize=10, linewidth=1, label=calfile.file_label, color=self.colors['refpd'], ecolor=self.colors['refpd'])
-        plt.ylabel('ref PD (V)')
-        plt.xlabel(self.laser_label)
-        plt.title(f'{self.level_label} - RefPD vs Laser setting')
-        plt.legend()
-        plt.tight_layout(rect=(0, 0, 1, 0.98))
+        ax.set_ylabel('ref PD (V)')
+        ax.set_xlabel(self.laser_label)
+        ax.set_title(f'{self.level_label} - RefPD vs Laser setting')
+        ax.legend()
+        fig.tight_layout(rect=(0, 0, 1, 0.98))
         self.savefig(fig, fig_id)
-        plt.close(fig)
     
     def _gen_pedestals_hist_plot(self):
         """Generate histogram plot of pedestal values for the set of calibration files"""
         fig_id = "Pedestals_Histogram"
 
-        fig, (ax1, ax2) = plt.subplots(
+        fig, (ax1, ax2) = new_subplots(
             nrows=1, ncols=2, figsize=(12, 6), sharey=True
         )
 
@@ -756,15 +732,14 @@ class FileSetPlots(BasePlots):
 
         # ─────────────────────────────
         fig.suptitle(f'{self.level_label} - Histogram of pedestal values', fontsize=14)
-        plt.tight_layout(rect=(0, 0, 1, 0.98))
+        fig.tight_layout(rect=(0, 0, 1, 0.98))
         self.savefig(fig, fig_id)
-        plt.close(fig)
     
     def _gen_pedestal_points_with_mean_plot(self):
         """Generate pedestal plot for the set of calibration files"""
         fig_id = "pedestals_points_with_mean"
 
-        fig, (ax1, ax2) = plt.subplots(
+        fig, (ax1, ax2) = new_subplots(
             nrows=2, ncols=1,
             figsize=(10, 6),
             sharex=True,
@@ -843,13 +818,12 @@ class FileSetPlots(BasePlots):
         ax2.legend()
 
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_pedestal_vs_run_plot(self):
         """Generate a pedestal-per-run plot and compare with fileset pedestal mean/std."""
         fig_id = "pedestals_vs_run"
 
-        fig, (ax1, ax2) = plt.subplots(
+        fig, (ax1, ax2) = new_subplots(
             nrows=2, ncols=1,
             figsize=(10, 6),
             sharex=True,
@@ -945,4 +919,3 @@ class FileSetPlots(BasePlots):
         ax2.legend()
 
         self.savefig(fig, fig_id)
-        plt.close(fig)
@@ -2,18 +2,26 @@ from abc import ABC, abstractmethod
 import os
 
 import pandas as pd
-from matplotlib import pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.colors import to_rgba
 from matplotlib.ticker import ScalarFormatter
 
 from calibration.config import config
 
+from calibration.helpers import plot_cache
+from calibration.helpers.downsample import downsample_rows
 from calibration.helpers.file_manage import get_base_output_path
+from .figures import VECTOR_FORMATS, add_grid_subplot, new_figure, new_subplots, rasterize_dense_layers
+from .plot_registry import PlotProducer, select_producers
 
 class BasePlots(ABC):
     """Abstract base class for analysis components."""
 
+    # level of the plots in a plot selection (see plot_registry)
+    plot_level = ''
+    # producers of the figures of the data holder, in rendering order
+    PLOT_PRODUCERS: tuple[PlotProducer, ...] = ()
+
     def __init__(self, *args, **kwargs) -> None:
         self.plots = {}
         self._data_holder = None
@@ -136,6 +144,20 @@ class BasePlots(ABC):
         """Generate plots for the analysis."""
         pass
 
+    def schedule_plots(self, scheduler):
+        """Add the jobs rendering the plots of the data holder (and of its children) to a PlotScheduler."""
+        if self.selected_producers():
+            scheduler.add(self)
+
+    def selected_producers(self, producers=None) -> list[PlotProducer]:
+        """Return the producers (by default all of PLOT_PRODUCERS) of the figures selected at the plot level."""
+        return select_producers(self.PLOT_PRODUCERS if producers is None else producers, self.plot_level)
+
+    def render_plots(self, producers=None):
+        """Render the selected figures of the given producers (by default all of PLOT_PRODUCERS)."""
+        for plot_producer in self.selected_producers(producers):
+            plot_producer.render(self)
+
 
     @property
     def power_units(self) -> str:
@@ -155,7 +177,7 @@ class BasePlots(ABC):
         self.plots[fig_id] = fig_path
     
     def savefig(self, fig, fig_id: str, fig_filename: str|None = None):
-        """Save current plt matplotlib figure to the output path and register it.
+        """Save the matplotlib figure to the output path and register it.
         Save format is set globally in file_manage module.
         Args:
             fig_id (str): Identifier for the figure.
@@ -165,36 +187,39 @@ class BasePlots(ABC):
         fig.text(0.99, 0.01, f'{self._data_holder.long_label}', 
                  ha='right', va='bottom', fontsize=8, color=self.colors['text_muted'])
         fig_path = os.path.join(self.output_path, f"{fig_filename or fig_id}.{plot_format}")
-        plt.savefig(fig_path)
+        savefig_kw = {}
+        if plot_format in VECTOR_FORMATS and rasterize_dense_layers(fig, config.rasterize_min_points):
+            savefig_kw['dpi'] = config.rasterize_dpi
+        plot_cache.save_figure(fig, fig_path, plot_format, **savefig_kw)
         self.add_plot_path(fig_id, fig_path)
 
     def _gen_temp_humidity_hists_plot(self):
         """Generate temperature and humidity plot for the calibration file data."""
         fig_id = "temperature_hist"
-        fig = plt.figure(figsize=(10, 6))
-        plt.hist(self.df['temperature'], color=self.colors['temperature'], alpha=0.7)
-        plt.xlabel('Temperature (°C)')
-        plt.ylabel('Frequency')
-        plt.grid()
-        plt.title(f'{self.level_label} - Temperatures histogram')
-        plt.tight_layout()
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        ax.hist(self.df['temperature'], color=self.colors['temperature'], alpha=0.7)
+        ax.set_xlabel('Temperature (°C)')
+        ax.set_ylabel('Frequency')
+        ax.grid()
+        ax.set_title(f'{self.level_label} - Temperatures histogram')
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
         fig_id = "humidity_hist"
-        fig = plt.figure(figsize=(10, 6))
-        plt.hist(self.df['RH'], color=self.colors['humidity'], alpha=0.7)
-        plt.xlabel('Humidity (%)')
-        plt.ylabel('Frequency')
-        plt.grid()
-        plt.title(f'{self.level_label} - Humidity histogram')
-        plt.tight_layout()
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        ax.hist(self.df['RH'], color=self.colors['humidity'], alpha=0.7)
+        ax.set_xlabel('Humidity (%)')
+        ax.set_ylabel('Frequency')
+        ax.grid()
+        ax.set_title(f'{self.level_label} - Humidity histogram')
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_samples_plot(self, df: pd.DataFrame, fig_id: str):
         """Generate samples timeseries and histogram plot using provided DataFrame."""
-        fig, (ax1, ax2) = plt.subplots(
+        fig, (ax1, ax2) = new_subplots(
             nrows=2, ncols=1,
             figsize=(10, 8),
             constrained_layout=True
@@ -220,7 +245,6 @@ class BasePlots(ABC):
         ax2.grid(True, alpha=0.3)
 
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _format_datetime_axis(self, ax):
         """Format datetime x-axis to show only hour:minute labels."""
@@ -237,17 +261,23 @@ class BasePlots(ABC):
         fig_id = "pm_samples_pedestals"
         self._gen_samples_plot(self.df_pedestals, fig_id)
 
+    def _timeseries_rows(self, df: pd.DataFrame, column: str, std_column: str | None = None) -> pd.DataFrame:
+        """Rows of df drawn for the series df[column], downsampled to config.timeseries_max_points."""
+        return downsample_rows(df, column, std_column, config.timeseries_max_points)
+
     def _gen_timeseries_plot(self):
         """Generate timeseries plot with dual axes for calibration file data."""
         fig_id = "timeseries"
-        fig = plt.figure(figsize=(12, 10))
+        fig = new_figure(figsize=(12, 10))
+        df_full = self.df_full
 
         # Top plot: ref_pd_mean and pm_mean vs time (2/3 height)
-        ax1 = plt.subplot2grid((5, 1), (0, 0), rowspan=2)
+        ax1 = add_grid_subplot(fig, (5, 1), (0, 0), rowspan=2)
         ax1_twin = ax1.twinx()
         # ax1.plot(self.df['datetime'], self.df['ref_pd_mean'], 'b-', label='Mean Ref PD', linewidth=2)
+        rows = self._timeseries_rows(df_full, self.refpd_col, self.refpd_std_col)
         ax1.errorbar(
-            self.df_full['datetime'], self.df_full[self.refpd_col], yerr=self.df_full[self.refpd_std_col],
+            rows['datetime'], rows[self.refpd_col], yerr=rows[self.refpd_std_col],
             c=self.colors['refpd'], ecolor=self.colors['refpd'],
             fmt='o', markersize=4, markerfacecolor='none', markeredgewidth=1.0,
             linewidth=1, label='Mean Ref PD'
@@ -255,8 +285,9 @@ class BasePlots(ABC):
         ax1.set_ylabel('Ref PD (V)', color=self.colors['refpd'])
         ax1.tick_params(axis='y', labelcolor=self.colors['refpd'])
 
+        rows = self._timeseries_rows(df_full, self.pm_col, self.pm_std_col)
         ax1_twin.errorbar(
-            self.df_full['datetime'], self.df_full[self.pm_col], yerr=self.df_full[self.pm_std_col],
+            rows['datetime'], rows[self.pm_col], yerr=rows[self.pm_std_col],
             c=self.colors['pm'], ecolor=self.colors['pm'],
             fmt='x', markersize=4, markeredgewidth=1.0,
             linewidth=1, label='Mean pm'
@@ -276,21 +307,23 @@ class BasePlots(ABC):
 
 
         # Middle plot: laser setpoints vs time
-        ax2 = plt.subplot2grid((5, 1), (2, 0), rowspan=2)
-        has_1064 = 'laser_sp_1064' in self.df_full.columns and self.df_full['laser_sp_1064'].notna().any()
-        has_532 = 'laser_sp_532' in self.df_full.columns and self.df_full['laser_sp_532'].notna().any()
+        ax2 = add_grid_subplot(fig, (5, 1), (2, 0), rowspan=2)
+        has_1064 = 'laser_sp_1064' in df_full.columns and df_full['laser_sp_1064'].notna().any()
+        has_532 = 'laser_sp_532' in df_full.columns and df_full['laser_sp_532'].notna().any()
 
         if has_1064 and has_532:
+            rows = self._timeseries_rows(df_full, 'laser_sp_1064')
             ax2.scatter(
-                self.df_full['datetime'], self.df_full['laser_sp_1064'],
+                rows['datetime'], rows['laser_sp_1064'],
                 c=self.colors['laser_1064'], label='1064nm laser setpoint (mW)', marker='.', s=10
             )
             ax2.set_ylabel('1064nm laser setpoint (mW)', color=self.colors['laser_1064'])
             ax2.tick_params(axis='y', labelcolor=self.colors['laser_1064'])
 
             ax2_twin = ax2.twinx()
+            rows = self._timeseries_rows(df_full, 'laser_sp_532')
             ax2_twin.scatter(
-                self.df_full['datetime'], self.df_full['laser_sp_532'],
+                rows['datetime'], rows['laser_sp_532'],
                 c=self.colors['laser_532'], label='532nm laser setpoint (mV)', marker='.', s=10
             )
             ax2_twin.set_ylabel('532nm laser setpoint (mV)', color=self.colors['laser_532'])
@@ -301,15 +334,17 @@ class BasePlots(ABC):
             ax2.legend(h1 + h2, l1 + l2, loc='lower right')
         elif has_1064 or has_532:
             if has_1064:
+                rows = self._timeseries_rows(df_full, 'laser_sp_1064')
                 ax2.scatter(
-                    self.df_full['datetime'], self.df_full['laser_sp_1064'],
+                    rows['datetime'], rows['laser_sp_1064'],
                     c=self.colors['laser_1064'], label='1064nm laser setpoint (mW)', marker='.', s=10
                 )
                 ax2.set_ylabel('1064nm laser setpoint (mW)', color=self.colors['laser_1064'])
                 ax2.tick_params(axis='y', labelcolor=self.colors['laser_1064'])
             else:
+                rows = self._timeseries_rows(df_full, 'laser_sp_532')
                 ax2.scatter(
-                    self.df_full['datetime'], self.df_full['laser_sp_532'],
+                    rows['datetime'], rows['laser_sp_532'],
                     c=self.colors['laser_532'], label='532nm laser setpoint (mV)', marker='.', s=10
                 )
                 ax2.set_ylabel('532nm laser setpoint (mV)', color=self.colors['laser_532'])
@@ -321,13 +356,15 @@ class BasePlots(ABC):
         self._format_datetime_axis(ax2)
         
         # Bottom plot: Temperature and RH vs time (1/6 height)
-        ax3 = plt.subplot2grid((5, 1), (4, 0), rowspan=1)
+        ax3 = add_grid_subplot(fig, (5, 1), (4, 0), rowspan=1)
         ax3_twin = ax3.twinx()
         
-        ax3.plot(self.df_full['datetime'], self.df_full['temperature'], c=self.colors['temperature'], label='Temperature', markersize=5, linewidth=1)
+        rows = self._timeseries_rows(df_full, 'temperature')
+        ax3.plot(rows['datetime'], rows['temperature'], c=self.colors['temperature'], label='Temperature', markersize=5, linewidth=1)
         ax3.set_ylabel('Temperature (°C)', color=self.colors['temperature'])
         ax3.tick_params(axis='y', labelcolor=self.colors['temperature'])
-        ax3_twin.plot(self.df_full['datetime'], self.df_full['RH'], c=self.colors['humidity'], label='Humidity', markersize=5, linewidth=1)
+        rows = self._timeseries_rows(df_full, 'RH')
+        ax3_twin.plot(rows['datetime'], rows['RH'], c=self.colors['humidity'], label='Humidity', markersize=5, linewidth=1)
         ax3_twin.set_ylabel('Humidity (%)', color=self.colors['humidity'])
         ax3_twin.tick_params(axis='y', labelcolor=self.colors['humidity'])
         ax3.set_xlabel('Time')
@@ -338,15 +375,14 @@ class BasePlots(ABC):
 
         ax3.grid(True, alpha=0.3)
         self._format_datetime_axis(ax3)
-        plt.tight_layout()
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_pedestals_timeseries_plot(self):
         """Generate pedestal plot for the set of calibration files"""
         fig_id = "pedestals_timeseries"
 
-        fig, (ax1, ax2) = plt.subplots(
+        fig, (ax1, ax2) = new_subplots(
             nrows=2, ncols=1,
             figsize=(10, 6),
             sharex=True,
@@ -360,9 +396,9 @@ class BasePlots(ABC):
         # ─────────────────────────────
         # Top plot: pm pedestals
         # ─────────────────────────────
+        rows = self._timeseries_rows(self._data_holder.df_pedestals, self.ped_pm_col, self.ped_pm_std_col)
         ax1.errorbar(
-            self._data_holder.df_pedestals['datetime'], self._data_holder.df_pedestals[self.ped_pm_col],
-            yerr=self._data_holder.df_pedestals[self.ped_pm_std_col],
+            rows['datetime'], rows[self.ped_pm_col], yerr=rows[self.ped_pm_std_col],
             fmt='.', markersize=10, linewidth=1,
             label='pm Pedestals',
             color=self.colors['ped_pm'],
@@ -400,9 +436,9 @@ class BasePlots(ABC):
         # ─────────────────────────────
         # Bottom plot: RefPD pedestals
         # ─────────────────────────────
+        rows = self._timeseries_rows(self._data_holder.df_pedestals, self.ped_refpd_col, self.ped_refpd_std_col)
         ax2.errorbar(
-            self._data_holder.df_pedestals['datetime'], self._data_holder.df_pedestals[self.ped_refpd_col],
-            yerr=self._data_holder.df_pedestals[self.ped_refpd_std_col],
+            rows['datetime'], rows[self.ped_refpd_col], yerr=rows[self.ped_refpd_std_col],
             fmt='.', markersize=10, linewidth=1,
             label='RefPD Pedestals',
             color=self.colors['ped_refpd'],
@@ -439,5 +475,4 @@ class BasePlots(ABC):
         self._format_datetime_axis(ax2)
 
         self.savefig(fig, fig_id)
-        plt.close(fig)
     
@@ -0,0 +1,58 @@
+"""Registry of the plot producers and selection of the figures to render.
+
+Every plotter class lists its producers in PLOT_PRODUCERS, in rendering
+order. A producer is a plotter method (called with fixed keyword arguments)
+and the ids of the figures it registers, given as regular expressions when
+the ids are built from the data (e.g. one figure per wavelength).
+
+A plot selection (config.plot_selection) maps a plot level (see
+BasePlots.plot_level) to the ids of the figures wanted at that level: only
+the producers of a wanted figure are run, and the plotters of a level with
+no wanted figure are not scheduled at all. Without a selection (None) every
+figure is rendered. The report publishes the selection of the figures it
+embeds, see calib_report.main.report_plots.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from calibration.config import config
+
+
+@dataclass(frozen=True)
+class PlotProducer:
+    """A plotter method and the ids (regular expressions) of the figures it registers"""
+    method: str
+    fig_ids: tuple[str, ...]
+    kwargs: dict = field(default_factory=dict)
+
+    def produces(self, fig_id: str) -> bool:
+        """Whether the producer registers the figure fig_id"""
+        return any(re.fullmatch(pattern, fig_id) for pattern in self.fig_ids)
+
+    def render(self, plotter):
+        """Render the figures of the producer with plotter"""
+        getattr(plotter, self.method)(**self.kwargs)
+
+
+def producer(method: str, *fig_ids: str, **kwargs) -> PlotProducer:
+    """Return the producer calling method(**kwargs), which registers the figures fig_ids"""
+    return PlotProducer(method, fig_ids, kwargs)
+
+
+def wanted_fig_ids(level: str) -> list[str] | None:
+    """Return the ids of the figures selected at a plot level, None if all of them are"""
+    selection = config.plot_selection
+    if selection is None:
+        return None
+    return list(selection.get(level, ()))
+
+
+def select_producers(producers: Iterable[PlotProducer], level: str) -> list[PlotProducer]:
+    """Return the producers of the figures selected at a plot level, in their order"""
+    wanted = wanted_fig_ids(level)
+    if wanted is None:
+        return list(producers)
+    return [p for p in producers if any(p.produces(fig_id) for fig_id in wanted)]
@@ -0,0 +1,99 @@
+"""File level sanity checks evaluated on all the calibration files at once"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from ..helpers import SanityCheckResult
+from .sanity_base import SanityBase
+
+if TYPE_CHECKING:
+    from ..calib_file import CalibFile
+
+DATA_COLUMNS = ['temperature', 'RH', 'datetime', 'pm_std', 'ref_pd_std']
+PEDESTAL_COLUMNS = ['pm_mean', 'ref_pd_mean', 'pm_std', 'ref_pd_std']
+
+
+class FileBatchSanityChecker:
+    """Evaluates the file checks of many calibration files in one pass.
+
+    The columns used by the checks are stacked once per frame (data and
+    pedestals) with the index of their file, and every statistic is a grouped
+    reduction of the stacked frame. Each san_check_* method returns the results
+    of all the files, in order, built as FileSanityChecker would build them.
+    """
+    level_name = 'file'
+
+    def __init__(self, calibfiles: list[CalibFile]):
+        self.elements = list(calibfiles)
+        self._stats: dict[str, pd.DataFrame] = {}
+
+    def _stack(self, kind: str, columns: list[str]) -> tuple[pd.DataFrame, np.ndarray]:
+        """Return the columns of the `kind` frame of every file in one frame, and the file index of its rows"""
+        frames = [calfile.project(columns, kind) for calfile in self.elements]
+        keys = np.repeat(np.arange(len(frames)), [len(frame) for frame in frames])
+        return pd.concat(frames, ignore_index=True), keys
+
+    def _count(self, keys: np.ndarray, mask=None) -> np.ndarray:
+        weights = None if mask is None else np.asarray(mask, dtype=np.float64)
+        return np.bincount(keys, weights=weights, minlength=len(self.elements)).astype(np.int64)
+
+    @property
+    def data_stats(self) -> pd.DataFrame:
+        """Statistics of the data frame of every file (one row per file)"""
+        if 'df' not in self._stats:
+            stacked, keys = self._stack('df', DATA_COLUMNS)
+            stats = stacked.groupby(keys).agg(
+                temperature_min=('temperature', 'min'),
+                temperature_max=('temperature', 'max'),
+                temperature_mean=('temperature', 'mean'),
+                rh_max=('RH', 'max'),
+                datetime_min=('datetime', 'min'),
+                datetime_max=('datetime', 'max'),
+            ).reindex(range(len(self.elements)))
+            stats['num_points'] = self._count(keys)
+            stats['no_std_points'] = self._count(keys, (stacked['pm_std'] == 0) | (stacked['ref_pd_std'] == 0))
+            self._stats['df'] = stats
+        return self._stats['df']
+
+    @property
+    def pedestal_stats(self) -> pd.DataFrame:
+        """Statistics of the pedestal frame of every file (one row per file)"""
+        if 'df_pedestals' not in self._stats:
+            stacked, keys = self._stack('df_pedestals', PEDESTAL_COLUMNS)
+            self._stats['df_pedestals'] = pd.DataFrame({
+                'no_std_pedestals': self._count(keys, (stacked['pm_std'] == 0) | (stacked['ref_pd_std'] == 0)),
+                'zero_pedestals': self._count(keys, (stacked['pm_mean'] == 0) | (stacked['ref_pd_mean'] == 0)),
+            })
+        return self._stats['df_pedestals']
+
+    def san_check_max_temperature_swing(self, max_swing, severity) -> list[SanityCheckResult]:
+        swings = self.data_stats['temperature_max'] - self.data_stats['temperature_min']
+        return [SanityBase.max_temperature_swing_result(swing, max_swing, severity) for swing in swings]
+
+    def san_check_avg_temperature_range(self, min_avg, max_avg, severity) -> list[SanityCheckResult]:
+        return [
+            SanityBase.avg_temperature_range_result(avg, min_avg, max_avg, severity)
+            for avg in self.data_stats['temperature_mean']
+        ]
+
+    def san_check_max_rh(self, max_rh, severity) -> list[SanityCheckResult]:
+        return [SanityBase.max_rh_result(value, max_rh, severity) for value in self.data_stats['rh_max']]
+
+    def san_check_max_acq_time_span_hours(self, max_hours, severity) -> list[SanityCheckResult]:
+        spans = (self.data_stats['datetime_max'] - self.data_stats['datetime_min']).dt.total_seconds() / 3600.0
+        return [SanityBase.max_acq_time_span_hours_result(span, max_hours, severity) for span in spans]
+
+    def san_check_min_data_points(self, min_points, severity) -> list[SanityCheckResult]:
+        return [SanityBase.min_data_points_result(int(n), min_points, severity) for n in self.data_stats['num_points']]
+
+    def san_check_no_std_points(self, _, severity) -> list[SanityCheckResult]:
+        return [SanityBase.no_std_points_result(int(n), severity) for n in self.data_stats['no_std_points']]
+
+    def san_check_no_std_pedestals(self, _, severity) -> list[SanityCheckResult]:
+        return [SanityBase.no_std_pedestals_result(int(n), severity) for n in self.pedestal_stats['no_std_pedestals']]
+
+    def san_check_zero_pedestals(self, _, severity) -> list[SanityCheckResult]:
+        return [SanityBase.zero_pedestals_result(int(n), severity) for n in self.pedestal_stats['zero_pedestals']]
@@ -1,4 +1,5 @@
 
+from functools import cached_property
 
 from ..base_element import BaseElement, DataHolderLevel
 
@@ -11,10 +12,20 @@ class SanityBase:
 
     def __init__(self, data_holder: BaseElement, level: DataHolderLevel):
         self.data_holder = data_holder
-        self.df = data_holder.df
-        self.df_pedestals = data_holder.df_pedestals
-        self.df_full = data_holder.df_full
         self.level = level
+
+    # frames are fetched on first use: checks evaluated in batch do not need them
+    @cached_property
+    def df(self):
+        return self.data_holder.df
+
+    @cached_property
+    def df_pedestals(self):
+        return self.data_holder.df_pedestals
+
+    @cached_property
+    def df_full(self):
+        return self.data_holder.df_full
     
     @property
     def level_header(self) -> str:
@@ -25,7 +36,11 @@ class SanityBase:
     def san_check_max_temperature_swing(self, max_swing, severity) -> SanityCheckResult:
         """Check that the maximum temperature swing is within the specified range."""
         temp_series = self.df['temperature']
-        temp_swing = temp_series.max() - temp_series.min()
+        return self.max_temperature_swing_result(temp_series.max() - temp_series.min(), max_swing, severity)
+
+    @staticmethod
+    def max_temperature_swing_result(temp_swing, max_swing, severity) -> SanityCheckResult:
+        """Result of the maximum temperature swing check for a computed swing"""
         passed = temp_swing <= max_swing
         info = f"Temperature swing: {temp_swing:.2f} °C, Allowed range: {max_swing} °C"
         return SanityCheckResult(
@@ -49,7 +64,11 @@ class SanityBase:
     def san_check_avg_temperature_range(self, min_avg, max_avg, severity) -> SanityCheckResult:
         """Check that the average temperature is within the specified range."""
         temp_series = self.df['temperature']
-        avg_temp = temp_series.mean()
+        return self.avg_temperature_range_result(temp_series.mean(), min_avg, max_avg, severity)
+
+    @staticmethod
+    def avg_temperature_range_result(avg_temp, min_avg, max_avg, severity) -> SanityCheckResult:
+        """Result of the average temperature range check for a computed average"""
         passed = min_avg <= avg_temp <= max_avg
         info = f"Average temperature: {avg_temp:.2f} °C, Allowed range: [{min_avg}, {max_avg}] °C"
         return SanityCheckResult(
@@ -73,7 +92,11 @@ class SanityBase:
     def san_check_max_rh(self, max_rh, severity) -> SanityCheckResult:
         """Check that the maximum relative humidity is within the specified limit."""
         rh_series = self.df['RH']
-        max_rh_value = rh_series.max()
+        return self.max_rh_result(rh_series.max(), max_rh, severity)
+
+    @staticmethod
+    def max_rh_result(max_rh_value, max_rh, severity) -> SanityCheckResult:
+        """Result of the maximum relative humidity check for a computed maximum"""
         passed = max_rh_value <= max_rh
         info = f"Maximum relative humidity: {max_rh_value:.2f} %, Allowed maximum: {max_rh} %"
         return SanityCheckResult(
@@ -98,6 +121,11 @@ class SanityBase:
         """Check that the total acquisition time span is within the specified limit in hours."""
         time_series = self.df['datetime']
         time_span = (time_series.max() - time_series.min()).total_seconds() / 3600.0
+        return self.max_acq_time_span_hours_result(time_span, max_hours, severity)
+
+    @staticmethod
+    def max_acq_time_span_hours_result(time_span, max_hours, severity) -> SanityCheckResult:
+        """Result of the acquisition time span check for a computed span in hours"""
         passed = time_span <= max_hours
         info = f"Acquisition time span: {time_span:.2f} hours, Allowed maximum: {max_hours} hours"
         return SanityCheckResult(
@@ -120,7 +148,11 @@ class SanityBase:
     
     def san_check_min_data_points(self, min_points, severity) -> SanityCheckResult:
         """Check that the number of data points is above the specified minimum."""
-        num_points = len(self.df)
+        return self.min_data_points_result(len(self.df), min_points, severity)
+
+    @staticmethod
+    def min_data_points_result(num_points, min_points, severity) -> SanityCheckResult:
+        """Result of the minimum data points check for a number of points"""
         passed = num_points >= min_points
         info = f"Number of data points: {num_points}, Required minimum: {min_points}"
         return SanityCheckResult(
@@ -144,7 +176,11 @@ class SanityBase:
     def san_check_no_std_points(self, _, severity) -> SanityCheckResult:
         """Check that there are no points with standard deviation equal to zero in the data."""
         no_std_points = self.df[(self.df['pm_std']==0) | (self.df['ref_pd_std']==0)]
-        num_std_points = len(no_std_points)
+        return self.no_std_points_result(len(no_std_points), severity)
+
+    @staticmethod
+    def no_std_points_result(num_std_points, severity) -> SanityCheckResult:
+        """Result of the no std points check for a number of points with std = 0"""
         info = f"There are {num_std_points} points with std = 0"
         passed = not num_std_points > 0
         return SanityCheckResult(
@@ -168,7 +204,11 @@ class SanityBase:
     def san_check_no_std_pedestals(self, _, severity) -> SanityCheckResult:
         """Check that there are no pedestal points with standard deviation equal to zero in the data."""
         no_std_points = self.df_pedestals[(self.df_pedestals['pm_std']==0) | (self.df_pedestals['ref_pd_std']==0)]
-        num_std_points = len(no_std_points)
+        return self.no_std_pedestals_result(len(no_std_points), severity)
+
+    @staticmethod
+    def no_std_pedestals_result(num_std_points, severity) -> SanityCheckResult:
+        """Result of the no std pedestals check for a number of pedestals with std = 0"""
         info = f"There are {num_std_points} points with std = 0"
         passed = not num_std_points > 0
         return SanityCheckResult(
@@ -192,7 +232,11 @@ class SanityBase:
     def san_check_zero_pedestals(self, _, severity) -> SanityCheckResult:
         """Check that there are no pedestal points with zero value in the data."""
         zero_pedestals = self.df_pedestals[(self.df_pedestals['pm_mean']==0) | (self.df_pedestals['ref_pd_mean']==0)]
-        num_zero_pedestals = len(zero_pedestals)
+        return self.zero_pedestals_result(len(zero_pedestals), severity)
+
+    @staticmethod
+    def zero_pedestals_result(num_zero_pedestals, severity) -> SanityCheckResult:
+        """Result of the zero pedestals check for a number of pedestals with zero value"""
         info = f"There are {num_zero_pedestals} pedestal points with zero value"
         passed = not num_zero_pedestals > 0
         return SanityCheckResult(
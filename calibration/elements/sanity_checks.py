@@ -5,12 +5,15 @@ from typing import TYPE_CHECKING
 
 import yaml
 
-from calibration.helpers import get_logger
+from calibration.config import config
+from calibration.helpers import get_logger, sanity_cache
+from calibration.helpers.batch_manifest import tool_version
 from .helpers import SanityCheckResult
 
 from .sanity.calibration_sanity import CalibrationSanityChecker
 from .sanity.fileset_sanity import FileSetSanityChecker
 from .sanity.file_sanity import FileSanityChecker
+from .sanity.file_batch import FileBatchSanityChecker
 
 if TYPE_CHECKING:
     from .calibration import Calibration
@@ -19,6 +22,9 @@ logger = get_logger()
 
 file_path = os.path.dirname(os.path.abspath(__file__))
 config_file = os.path.abspath(os.path.join(file_path,'..','sanity_checks_config.yaml'))
+# configuration settings that do not change the checked data (left out of the data fingerprints)
+OUTPUT_SETTINGS = ('plot_output_format', 'generate_plots', 'plot_selection', 'timeseries_max_points',
+                   'rasterize_min_points', 'rasterize_dpi')
 
 class Counter:
     """Simple counter class to keep track of passed and failed checks"""
@@ -53,11 +59,19 @@ class SanityChecks:
         self.config = {}
         self.results = {}
         self._c = Counter()
+        self._cache: sanity_cache.SanityResultCache | None = None
+        self._fingerprints: dict[int, str] = {}
+        self._cached: dict[str, dict] = {}
+        self._new_results: dict[str, dict] = {}
         self.initialize()
     
     def initialize(self):
         """Initialize sanity checks by loading configuration"""
         self._load_config()
+        if config.use_sanity_cache:
+            self._cache = sanity_cache.open_cache(
+                os.path.join(self.calibration.root_output_path, sanity_cache.CACHE_FILE_NAME)
+            )
     
     def _load_config(self):
         """Load sanity checks configuration from YAML file"""
@@ -84,9 +98,102 @@ class SanityChecks:
         """Return the file checks configuration"""
         return self.config.get('fileset', {})
     
-    def _run_check_methods(self, severity, checks, checker) -> SanityCheckResult:
+    def _compute_fingerprints(self) -> dict[int, str]:
+        """Data fingerprint of the calibration, filesets and files (by object id), empty if a file has none"""
+        calfiles = [calfile for fs in self.calibration.filesets.values() for calfile in fs.files]
+        if any(calfile.data_fingerprint is None for calfile in calfiles):
+            return {}
+        settings = {k: v for k, v in config.to_dict().items() if k not in OUTPUT_SETTINGS}
+        # sources only: the thresholds of sanity_checks_config.yaml are part of the check keys
+        salt = sanity_cache.fingerprint(settings, tool_version('calibration', suffixes=('.py',)))
+        fingerprints = {}
+        for fs in self.calibration.filesets.values():
+            for calfile in fs.files:
+                fingerprints[id(calfile)] = sanity_cache.fingerprint(salt, calfile.level_header, calfile.data_fingerprint)
+            fingerprints[id(fs)] = sanity_cache.fingerprint(fs.level_header, [fingerprints[id(calfile)] for calfile in fs.files])
+        fingerprints[id(self.calibration)] = sanity_cache.fingerprint(
+            self.calibration.level_header, [fingerprints[id(fs)] for fs in self.calibration.filesets.values()]
+        )
+        return fingerprints
+
+    def _cache_keys(self, level: str, element, checks_config: dict) -> dict[tuple[str, str], str]:
+        """Cache keys of the configured checks of an element by (severity, check name), empty if not cached"""
+        data_fingerprint = self._fingerprints.get(id(element))
+        if data_fingerprint is None:
+            return {}
+        return {
+            (severity, check_name): sanity_cache.check_key(data_fingerprint, level, severity, check_name, check_params)
+            for severity, checks in checks_config.items()
+            for check_name, check_params in checks.items()
+        }
+
+    def _load_cached_results(self):
+        """Fetch from the cache the results of every configured check of every element"""
+        self._fingerprints = self._compute_fingerprints() if self._cache is not None else {}
+        self._new_results = {}
+        if not self._fingerprints:
+            self._cached = {}
+            return
+        keys = list(self._cache_keys('calibration', self.calibration, self.calibration_checks_config).values())
+        for fs in self.calibration.filesets.values():
+            keys.extend(self._cache_keys('fileset', fs, self.fileset_checks_config).values())
+            for calfile in fs.files:
+                keys.extend(self._cache_keys('file', calfile, self.file_checks_config).values())
+        self._cached = self._cache.get_many(keys)
+        logger.info("Sanity checks: %d of %d results served from the cache", len(self._cached), len(keys))
+
+    @staticmethod
+    def _call_check(method, check_params, severity):
+        if isinstance(check_params, dict):
+            return method(**check_params, severity=severity)
+        if isinstance(check_params, list):
+            return method(*check_params, severity=severity)
+        return method(check_params, severity=severity)
+
+    def _run_batch_check_methods(self, checks_config, batch_checker, level: str) -> list[dict[str, dict[str, SanityCheckResult]]]:
+        """Evaluate the configured checks implemented by the batch checker on all its elements at once.
+
+        Return, for every element, the results by severity and check name. Checks
+        not implemented by the batch checker or failing in it are left out, they
+        are run by the checker of every element. Checks cached for every element
+        are not evaluated.
+        """
+        precomputed = [{} for _ in batch_checker.elements]
+        cache_keys = [self._cache_keys(level, element, checks_config) for element in batch_checker.elements]
+        for severity, checks in checks_config.items():
+            for check_name, check_params in checks.items():
+                if cache_keys and all(keys.get((severity, check_name)) in self._cached for keys in cache_keys):
+                    continue
+                check_method = getattr(batch_checker, f"san_check_{check_name}", None)
+                if check_method is None:
+                    continue
+                try:
+                    results = self._call_check(check_method, check_params, severity)
+                except Exception as e:
+                    logger.debug("Batch %s check %s failed, running it on every element: %s", batch_checker.level_name, check_name, str(e))
+                    continue
+                for element_results, result in zip(precomputed, results):
+                    if result is not None:
+                        element_results.setdefault(severity, {})[check_name] = result
+        return precomputed
+
+    def _run_check_methods(self, severity, checks, checker, precomputed: dict | None = None, cache_keys: dict | None = None) -> SanityCheckResult:
         results = {}
+        precomputed = precomputed or {}
+        cache_keys = cache_keys or {}
         for check_name, check_params in checks.items():
+            key = cache_keys.get((severity, check_name))
+            if key in self._cached:
+                results[f"{severity}.{check_name}"] = self._cached[key]
+                self._c.check(severity, self._cached[key]['passed'])
+                continue
+            if check_name in precomputed:
+                result = precomputed[check_name]
+                results[f"{severity}.{check_name}"] = result.to_dict()
+                self._c.check(severity, result.passed)
+                if key is not None:
+                    self._new_results[key] = results[f"{severity}.{check_name}"]
+                continue
             method_name = f"san_check_{check_name}"
             check_method = getattr(checker, method_name, None)
             if check_method is None:
@@ -103,14 +210,11 @@ class SanityChecks:
                 self._c.check(severity, False)
                 continue
             try:
-                if isinstance(check_params, dict):
-                    result:SanityCheckResult = check_method(**check_params, severity=severity)
-                elif isinstance(check_params, list):
-                    result:SanityCheckResult = check_method(*check_params, severity=severity)
-                else:
-                    result:SanityCheckResult = check_method(check_params, severity=severity)
+                result:SanityCheckResult = self._call_check(check_method, check_params, severity)
                 results[f"{severity}.{check_name}"] = result.to_dict()
                 self._c.check(severity, result.passed)
+                if key is not None and not result.exec_error:
+                    self._new_results[key] = results[f"{severity}.{check_name}"]
             except Exception as e:
                 result = SanityCheckResult(
                         severity=severity,
@@ -141,12 +245,7 @@ class SanityChecks:
                 }
                 continue
             try:
-                if isinstance(check_params, dict):
-                    info = info_method(**check_params, severity=severity)
-                elif isinstance(check_params, list):
-                    info = info_method(*check_params, severity=severity)
-                else:
-                    info = info_method(check_params, severity=severity)
+                info = self._call_check(info_method, check_params, severity)
                 results[f"{severity}.{check_name}"] = info
             except Exception as e:
                 results[f"{severity}.{check_name}"] = {
@@ -164,14 +263,14 @@ class SanityChecks:
         logger.info("Running sanity checks...")
         self.results = {}
         defined_checks = {}
-        
-
+        self._load_cached_results()
 
         checker = CalibrationSanityChecker(self.calibration)
         self.results[checker.level_header] = {'checks': {}}
         defined_checks['calibration_checks'] = {}
+        cache_keys = self._cache_keys('calibration', self.calibration, self.calibration_checks_config)
         for severity, checks in self.calibration_checks_config.items():
-            results = self._run_check_methods(severity, checks, checker)
+            results = self._run_check_methods(severity, checks, checker, cache_keys=cache_keys)
             self.results[checker.level_header]['checks'].update(results)
             info_results = self._run_info_methods(severity, checks, checker)
             defined_checks['calibration_checks'].update(info_results)
@@ -180,11 +279,15 @@ class SanityChecks:
         filesets_defined = defined_checks.setdefault('fileset_checks', {})
         first_fs = True
         first_calfile = True
+        # the file checks of all the files are evaluated in one pass over their stacked data
+        calfiles = [calfile for fs in self.calibration.filesets.values() for calfile in fs.files]
+        file_precomputed = iter(self._run_batch_check_methods(self.file_checks_config, FileBatchSanityChecker(calfiles), 'file'))
         for _, fs in self.calibration.filesets.items():
             checker = FileSetSanityChecker(fs)
             fs_res = filesets_results.setdefault(fs.level_header, {'checks': {}})
+            cache_keys = self._cache_keys('fileset', fs, self.fileset_checks_config)
             for severity, checks in self.fileset_checks_config.items():
-                results = self._run_check_methods(severity, checks, checker)
+                results = self._run_check_methods(severity, checks, checker, cache_keys=cache_keys)
                 fs_res['checks'].update(results)
                 info_results = self._run_info_methods(severity, checks, checker)
                 if first_fs:
@@ -195,14 +298,18 @@ class SanityChecks:
             for calfile in fs.files:
                 checker = FileSanityChecker(calfile)
                 file_results.setdefault(calfile.level_header, {})
+                precomputed = next(file_precomputed)
+                cache_keys = self._cache_keys('file', calfile, self.file_checks_config)
                 for severity, checks in self.file_checks_config.items():
-                    results = self._run_check_methods(severity, checks, checker)
+                    results = self._run_check_methods(severity, checks, checker, precomputed.get(severity), cache_keys)
                     file_results[calfile.level_header].update(results)
                     info_results = self._run_info_methods(severity, checks, checker)
                     if first_calfile:
                         file_defined.update(info_results)
                 first_calfile = False
         
+        if self._cache is not None:
+            self._cache.put_many(self._new_results)
         c_d = self._c.to_dict()
         self.results['summary'] = c_d
         self.results['defined_checks'] = defined_checks
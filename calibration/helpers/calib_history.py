@@ -0,0 +1,198 @@
+"""Persistent index of the fileset results of past calibrations.
+
+The fileset regressions and pedestals of every exported calibration are kept
+in a SQLite file at the output root, so the calibration evolution plots query
+one table instead of loading every past reduced summary on each run.
+
+Reduced summaries already in the output root (``calibration_DDMMYYYY.json``,
+e.g. published by the batch runner or moved there by ``--zip-it``) are
+imported incrementally: a file is only parsed again when its size or
+modification time changes. Every calibration is recorded with the path of
+its summary relative to the output root (``source_file``), and is dropped
+once that file is removed.
+
+The evolution plot of a calibration only shows the calibrations dated before
+it, whatever the order (or concurrency) in which they were processed.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+from calibration.helpers import get_logger
+from calibration.helpers.dated_files import extract_date_from_name
+
+logger = get_logger()
+
+HISTORY_FILE_NAME = 'calibration_history.sqlite'
+SUMMARY_FILE_PATTERN = re.compile(r"^calibration_\d{8}\.json$")
+
+_FIELDS = (
+    'slope', 'slope_err', 'intercept', 'intercept_err',
+    'pm_ped', 'pm_ped_err', 'refpd_ped', 'refpd_ped_err',
+)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS calibrations (
+    calib_id TEXT PRIMARY KEY,
+    min_ts REAL,
+    source_file TEXT,
+    source_size INTEGER,
+    source_mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS fileset_results (
+    calib_id TEXT NOT NULL REFERENCES calibrations(calib_id) ON DELETE CASCADE,
+    fileset TEXT NOT NULL,
+    {', '.join(f'{field} REAL' for field in _FIELDS)},
+    PRIMARY KEY (calib_id, fileset)
+);
+CREATE INDEX IF NOT EXISTS fileset_results_by_fileset ON fileset_results (fileset);
+"""
+
+
+def pedestal_value_err(ped_data: dict, key: str) -> tuple[float | None, float | None]:
+    """Return the (weighted if available) pedestal value and its error from pedestal statistics"""
+    p = ped_data.get(key, {}) if isinstance(ped_data, dict) else {}
+    if not isinstance(p, dict):
+        return None, None
+    weighted = bool(p.get("weighted", False))
+    value = p.get("w_mean") if weighted else p.get("mean")
+    err = p.get("w_stderr") if weighted else p.get("std")
+    return value, err
+
+
+def fileset_rows(summary: dict) -> dict[str, dict]:
+    """Extract the history fields of every fileset of a reduced calibration summary"""
+    rows = {}
+    for fileset, fs_entry in summary.get("filesets", {}).items():
+        linreg = fs_entry.get("full_dataset_linreg")
+        if not isinstance(linreg, dict) or "slope" not in linreg or "intercept" not in linreg:
+            continue
+        pm_ped, pm_ped_err = pedestal_value_err(fs_entry.get("pedestals", {}), "pm")
+        refpd_ped, refpd_ped_err = pedestal_value_err(fs_entry.get("pedestals", {}), "refpd")
+        rows[fileset] = {
+            'slope': linreg.get("slope"),
+            'slope_err': linreg.get("stderr"),
+            'intercept': linreg.get("intercept"),
+            'intercept_err': linreg.get("intercept_stderr"),
+            'pm_ped': pm_ped,
+            'pm_ped_err': pm_ped_err,
+            'refpd_ped': refpd_ped,
+            'refpd_ped_err': refpd_ped_err,
+        }
+    return rows
+
+
+def _dated_before(calib_id: str, until: datetime) -> bool:
+    date = extract_date_from_name(calib_id)
+    return date is not None and date < until
+
+
+class CalibrationHistory:
+    """SQLite backed history of the fileset results of past calibrations"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as con:
+            con.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Connection committed on success (rolled back on error) and closed on exit"""
+        # several batch workers may share the output root, wait for their writes
+        con = sqlite3.connect(self.path, timeout=30)
+        try:
+            con.execute("PRAGMA foreign_keys = ON")
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def record(self, calib_id: str, summary: dict, source: os.stat_result | None = None, source_file: str | None = None):
+        """Insert (or replace) the fileset results of a reduced calibration summary.
+
+        source_file is the path of the summary relative to the synced directory (see sync_directory).
+        """
+        min_ts = summary.get("acquisition_time", {}).get("min_ts")
+        if not isinstance(min_ts, (int, float)):
+            min_ts = None
+        rows = fileset_rows(summary)
+        with self._connect() as con:
+            con.execute("DELETE FROM calibrations WHERE calib_id = ?", (calib_id,))
+            con.execute(
+                "INSERT INTO calibrations VALUES (?, ?, ?, ?, ?)",
+                (
+                    calib_id, min_ts, source_file,
+                    source.st_size if source else None,
+                    source.st_mtime_ns if source else None,
+                ),
+            )
+            con.executemany(
+                f"INSERT INTO fileset_results VALUES (?, ?, {', '.join('?' for _ in _FIELDS)})",
+                [(calib_id, fileset, *(row[field] for field in _FIELDS)) for fileset, row in rows.items()],
+            )
+
+    def sync_directory(self, directory: str):
+        """Import the new or modified reduced summaries of a directory, drop the calibrations whose summary was removed"""
+        try:
+            names = sorted(name for name in os.listdir(directory) if SUMMARY_FILE_PATTERN.match(name))
+        except OSError as e:
+            logger.warning("Failed to scan output root for past calibrations at %s: %s", directory, str(e))
+            return
+        with self._connect() as con:
+            indexed = {
+                source_file: (size, mtime_ns)
+                for source_file, size, mtime_ns in con.execute(
+                    "SELECT source_file, source_size, source_mtime_ns FROM calibrations WHERE source_file IS NOT NULL"
+                )
+            }
+            removed = [
+                (source_file,) for source_file in indexed
+                if not os.path.isfile(os.path.join(directory, source_file))
+            ]
+            con.executemany("DELETE FROM calibrations WHERE source_file = ?", removed)
+            # recorded without a summary (older versions): they could never be dropped
+            con.execute("DELETE FROM calibrations WHERE source_file IS NULL")
+        for name in names:
+            fpath = os.path.join(directory, name)
+            try:
+                stat = os.stat(fpath)
+            except OSError:
+                continue
+            if indexed.get(name) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            try:
+                with open(fpath, "r", encoding="utf-8") as f:
+                    summary = json.load(f)
+            except Exception as e:
+                logger.warning("Skipping past calibration file %s: %s", fpath, str(e))
+                continue
+            self.record(os.path.splitext(name)[0], summary, stat, name)
+
+    def fileset_history(self, fileset: str, before: str | None = None) -> list[dict]:
+        """Return the results of a fileset in every recorded calibration.
+
+        With before (a calibration id), only the calibrations dated (DDMMYYYY in their id) before it are
+        returned, so the history of a calibration does not depend on the ones recorded after it.
+        """
+        until = extract_date_from_name(before) if before is not None else None
+        with self._connect() as con:
+            cursor = con.execute(
+                f"SELECT c.calib_id, c.min_ts, {', '.join(f'r.{field}' for field in _FIELDS)} "
+                "FROM fileset_results r JOIN calibrations c USING (calib_id) "
+                "WHERE r.fileset = ? ORDER BY c.calib_id",
+                (fileset,),
+            )
+            return [
+                {
+                    'label': calib_id,
+                    'sort_ts': min_ts if min_ts is not None else float("inf"),
+                    **dict(zip(_FIELDS, values)),
+                }
+                for calib_id, min_ts, *values in cursor
+                if until is None or _dated_before(calib_id, until)
+            ]
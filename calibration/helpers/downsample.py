@@ -0,0 +1,52 @@
+"""Visual-preserving downsampling of time series.
+
+The rows of a series are split in consecutive buckets and, in every bucket,
+only the rows holding the lowest and the highest value are kept (min/max
+bucketing), with the first and last rows of the series. Drawn at the width
+of a plot the kept rows cover the same envelope as the full series, while
+the number of drawn markers (and the size of vector outputs) is bounded.
+
+For series drawn with error bars the envelope is the one of the bars: the
+lowest value - std and the highest value + std of every bucket are kept.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def envelope_indices(lower, upper=None, max_points: int | None = None) -> np.ndarray:
+    """Return the sorted positions of the rows to draw.
+
+    Args:
+        lower: values whose minimum is kept in every bucket.
+        upper: values whose maximum is kept in every bucket (lower if None).
+        max_points (int | None): bound on the number of kept rows, all rows are kept if None or 0.
+    """
+    lower = np.asarray(lower, dtype=np.float64)
+    upper = lower if upper is None else np.asarray(upper, dtype=np.float64)
+    n = len(lower)
+    if not max_points or n <= max_points:
+        return np.arange(n)
+
+    n_buckets = max(1, (max_points - 2) // 2)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.intp)
+    buckets = np.repeat(np.arange(n_buckets), np.diff(edges))
+    # rows sorted by bucket then value (NaN last): each bucket starts at its edge
+    lowest = np.lexsort((lower, buckets))[edges[:-1]]
+    highest = np.lexsort((-upper, buckets))[edges[:-1]]
+    return np.unique(np.concatenate(([0, n - 1], lowest, highest)))
+
+
+def downsample_rows(df: pd.DataFrame, column: str, std_column: str | None = None,
+                    max_points: int | None = None) -> pd.DataFrame:
+    """Return the rows of df to draw the series df[column] (with error bars df[std_column] if given)."""
+    if not max_points or len(df) <= max_points:
+        return df
+    values = df[column].to_numpy(dtype=np.float64)
+    if std_column is None:
+        indices = envelope_indices(values, max_points=max_points)
+    else:
+        stds = np.nan_to_num(df[std_column].to_numpy(dtype=np.float64))
+        indices = envelope_indices(values - stds, values + stds, max_points)
+    return df.iloc[indices]
@@ -2,13 +2,18 @@
 import os
 import sys
 import shutil
-import tempfile
 import zipfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from calibration.helpers import get_logger
 logger = get_logger()
 
 
-singleton_output_path = None
+# output path of the current run (see setup_paths), per context so concurrent runs do not share it
+_base_output_path: ContextVar[str | None] = ContextVar("calibration_output_path", default=None)
+# zip archives kept open while loading (see open_archives), by zip path
+_open_archives: ContextVar[dict[str, zipfile.ZipFile] | None] = ContextVar("calibration_open_archives", default=None)
 MAX_ZIP_MEMBERS = 5000
 MAX_ZIP_TOTAL_UNCOMPRESSED_BYTES = 500 * 1024 * 1024  # 500 MiB
 MAX_ZIP_SINGLE_FILE_BYTES = 100 * 1024 * 1024  # 100 MiB
@@ -27,7 +32,72 @@ def _safe_flatten_name(member_name: str) -> str:
     return base
 
 
-def _extract_zip_safely_flattened(zip_path: str, output_dir: str):
+@dataclass(frozen=True)
+class InputFile:
+    """Input run file, either a regular file or a member of a zip archive.
+
+    Zip members are read directly from the archive into memory, so zip inputs
+    never need to be extracted to disk. Instances are plain data so they can be
+    sent to worker processes.
+    """
+    name: str  # flattened file name
+    path: str  # path used for logging / metadata
+    size: int  # uncompressed size in bytes
+    zip_path: str | None = None
+    member: str | None = None
+
+    @classmethod
+    def from_path(cls, file_path: str) -> 'InputFile':
+        """Create an input file from a regular file path"""
+        return cls(name=os.path.basename(file_path), path=file_path, size=os.path.getsize(file_path))
+
+    def read_bytes(self) -> bytes:
+        """Return the (decompressed) content of the file"""
+        if self.zip_path is None:
+            with open(self.path, 'rb') as f:
+                return f.read()
+        archives = _open_archives.get()
+        if archives is None:
+            with zipfile.ZipFile(self.zip_path, 'r') as zip_ref:
+                return self._read_member(zip_ref)
+        zip_ref = archives.get(self.zip_path)
+        if zip_ref is None:
+            zip_ref = archives[self.zip_path] = zipfile.ZipFile(self.zip_path, 'r')
+        return self._read_member(zip_ref)
+
+    def _read_member(self, zip_ref: zipfile.ZipFile) -> bytes:
+        info = zip_ref.getinfo(self.member)
+        if info.file_size > MAX_ZIP_SINGLE_FILE_BYTES:
+            raise ValueError(
+                f"zip entry '{info.filename}' exceeds allowed size "
+                f"({MAX_ZIP_SINGLE_FILE_BYTES} bytes)"
+            )
+        return zip_ref.read(info)
+
+
+@contextmanager
+def open_archives():
+    """Read the zip members of input files through one open ZipFile per archive within the block.
+
+    Without it every read reopens the archive and parses its central directory
+    again, which is quadratic in the number of members.
+    """
+    archives: dict[str, zipfile.ZipFile] = {}
+    token = _open_archives.set(archives)
+    try:
+        yield
+    finally:
+        _open_archives.reset(token)
+        for zip_ref in archives.values():
+            zip_ref.close()
+
+
+def keep_archives_open():
+    """Keep the zip archives read by the current context open until it ends (e.g. in a worker process)"""
+    _open_archives.set({})
+
+
+def _list_zip_members_safely_flattened(zip_path: str) -> list[InputFile]:
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
         infos = zip_ref.infolist()
         if len(infos) > MAX_ZIP_MEMBERS:
@@ -37,6 +107,7 @@ def _extract_zip_safely_flattened(zip_path: str, output_dir: str):
 
         total_uncompressed = 0
         seen_names: set[str] = set()
+        members: list[InputFile] = []
 
         for info in infos:
             if info.is_dir():
@@ -60,29 +131,51 @@ def _extract_zip_safely_flattened(zip_path: str, output_dir: str):
                     f"zip contains colliding flattened filenames: '{flat_name}'"
                 )
             seen_names.add(flat_name)
+            members.append(InputFile(
+                name=flat_name,
+                path=os.path.join(zip_path, info.filename),
+                size=info.file_size,
+                zip_path=zip_path,
+                member=info.filename,
+            ))
+    return members
 
-            dest = os.path.abspath(os.path.join(output_dir, flat_name))
-            output_root = os.path.abspath(output_dir)
-            if not dest.startswith(output_root + os.sep):
-                raise ValueError(f"unsafe destination path for zip entry '{info.filename}'")
 
-            with zip_ref.open(info, 'r') as src, open(dest, 'wb') as dst:
-                shutil.copyfileobj(src, dst)
+def list_input_files(files_path: str) -> list[InputFile]:
+    """
+    List the input files of a calibration folder or zip file, sorted by file name.
+
+    Zip members are validated (number of entries, size caps, path traversal and
+    flattened name collisions) but not extracted.
+    """
+    if os.path.isdir(files_path):
+        return [
+            InputFile.from_path(os.path.join(files_path, file_name))
+            for file_name in sorted(os.listdir(files_path))
+            if os.path.isfile(os.path.join(files_path, file_name))
+        ]
+    return sorted(_list_zip_members_safely_flattened(files_path), key=lambda item: item.name)
+
+
+def set_base_output_path(output_path: str | None):
+    """Set the base output path of the current run (worker processes replicate the one of their parent)."""
+    _base_output_path.set(output_path)
 
 
 def get_base_output_path():
     """Get the base output path for storing analysis results."""
-    global singleton_output_path
-    if singleton_output_path is None:
+    output_path = _base_output_path.get()
+    if output_path is None:
         logger.error("Output path has not been set up yet. Call setup_paths first.")
         sys.exit(1)
-    return singleton_output_path
+    return output_path
 
 def setup_paths(calib_files_path, output_path=None, overwrite=False):
     """
     Setup file paths for calibration input data files and output directory.
 
-    Implements sanity checks and handles zip file extraction if necessary.
+    Implements sanity checks. Zip files are validated but not extracted, their
+    members are read in memory (see list_input_files).
 
     Args:
         calib_files_path: Path to calibration files
@@ -104,12 +197,12 @@ def setup_paths(calib_files_path, output_path=None, overwrite=False):
         if not calib_files_path.lower().endswith('.zip'):
             logger.error("Calibration files path '%s' is not a directory or a zip file.", calib_files_path)
             sys.exit(1)
-        files_path = tempfile.mkdtemp()
+        files_path = calib_files_path
         base_name = os.path.splitext(os.path.basename(calib_files_path))[0]
         try:
-            _extract_zip_safely_flattened(calib_files_path, files_path)
+            _list_zip_members_safely_flattened(calib_files_path)
         except (zipfile.BadZipFile, ValueError, OSError) as e:
-            logger.error("Failed to extract zip '%s': %s", calib_files_path, str(e))
+            logger.error("Failed to read zip '%s': %s", calib_files_path, str(e))
             sys.exit(1)
 
     if output_path is None:
@@ -127,8 +220,7 @@ def setup_paths(calib_files_path, output_path=None, overwrite=False):
             sys.exit(1)
         # Remove existing directory
         shutil.rmtree(output_path)
-    global singleton_output_path
-    singleton_output_path = output_path
+    _base_output_path.set(output_path)
     os.makedirs(output_path, exist_ok=True)
 
     logger.info("Calibration files path: %s", files_path)
@@ -0,0 +1,78 @@
+"""Grouped (weighted) mean statistics.
+
+One vectorized pass over an array of values (one column per quantity) and
+their standard deviations computes, for every group of rows and every
+column, the mean and sample standard deviation and the weighted mean
+(weights 1/std**2) with its standard error and chi2. NaN values are skipped
+(as pandas does); rows with a non positive or NaN std are left out of the
+weighted statistics.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class GroupedMeans:
+    """Mean statistics with shape (n_groups, n_columns)"""
+    mean: np.ndarray
+    std: np.ndarray  # sample standard deviation (ddof=1)
+    samples: np.ndarray  # rows of the group (NaN values included)
+    w_mean: np.ndarray
+    w_stderr: np.ndarray
+    chi2: np.ndarray  # sum((value - w_mean)**2 / std**2)
+    ndof: np.ndarray  # weighted points - 1
+    zero_std: np.ndarray  # rows with std == 0 (left out of the weighted statistics)
+
+
+def grouped_means(values, stds, groups=None, n_groups: int = 1) -> GroupedMeans:
+    """Compute the mean statistics of every group and column.
+
+    Args:
+        values: array of shape (n,) or (n, n_columns).
+        stds: standard deviations of the values, same shape as values.
+        groups: group index in [0, n_groups) of every row (all rows in group 0 if None).
+        n_groups (int): number of groups.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    stds = np.asarray(stds, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+        stds = stds[:, None]
+    if values.shape != stds.shape:
+        raise ValueError("values and stds must have the same shape")
+    n_rows, n_cols = values.shape
+    groups = np.zeros(n_rows, dtype=np.intp) if groups is None else np.asarray(groups, dtype=np.intp)
+    # one bincount per quantity over the flattened (group, column) cells
+    cells = (groups[:, None] * n_cols + np.arange(n_cols)).ravel()
+
+    def _sum(x) -> np.ndarray:
+        return np.bincount(cells, weights=np.ravel(x), minlength=n_groups * n_cols).reshape(n_groups, n_cols)
+
+    valid = ~np.isnan(values)
+    weighted = valid & (stds > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        count = _sum(valid)
+        mean = _sum(np.where(valid, values, 0.0)) / count
+        dev = np.where(valid, values - mean[groups], 0.0)
+        std = np.sqrt(_sum(dev * dev) / (count - 1))
+        w = np.where(weighted, 1.0 / stds**2, 0.0)
+        sum_w = _sum(w)
+        w_mean = _sum(np.where(weighted, w * values, 0.0)) / sum_w
+        w_dev = np.where(weighted, values - w_mean[groups], 0.0)
+        chi2 = _sum(w * w_dev * w_dev)
+        w_stderr = np.sqrt(1.0 / sum_w)
+    std = np.where(count > 1, std, np.nan)
+    samples = np.bincount(groups, minlength=n_groups)
+    return GroupedMeans(
+        mean=mean,
+        std=std,
+        samples=np.repeat(samples[:, None], n_cols, axis=1),
+        w_mean=w_mean,
+        w_stderr=w_stderr,
+        chi2=chi2,
+        ndof=_sum(weighted).astype(np.int64) - 1,
+        zero_std=_sum(stds == 0).astype(np.int64),
+    )
@@ -0,0 +1,173 @@
+"""On-disk cache of parsed and prepared run files.
+
+Every entry is a ``.npz`` file holding the prepared DataFrames of one run file
+(one array per column, no pickling) plus a JSON metadata blob. Entries are
+keyed by the sha256 of the raw file content, the file name (it encodes the
+wavelength/filter wheel) and the configuration flags that change the data
+preparation, so a rerun with only plotting or sanity options changed skips
+parsing entirely.
+
+The cache is bounded in size: on every hit the entry modification time is
+refreshed and, after each store, the least recently used entries are removed
+until the total size is below ``max_bytes``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from contextvars import ContextVar
+
+import numpy as np
+import pandas as pd
+
+from calibration.helpers import get_logger
+
+logger = get_logger()
+
+CACHE_FORMAT_VERSION = 2
+CACHE_DIR_NAME = '.parsed_cache'
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MiB
+_META_KEY = '__meta__'
+
+
+def _encode_frame(name: str, df: pd.DataFrame, arrays: dict[str, np.ndarray]) -> list[list[str]]:
+    """Store the columns of df in arrays and return the column schema"""
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        raise TypeError(f"frame '{name}' does not have a default RangeIndex")
+    schema = []
+    for i, col in enumerate(df.columns):
+        series = df[col]
+        key = f"{name}/{i}"
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            arrays[key] = series.dt.tz_convert('UTC').astype('datetime64[ns, UTC]').astype('int64').to_numpy()
+            schema.append([col, 'datetime_utc', 'datetime64[ns, UTC]'])
+        elif isinstance(series.array, (pd.arrays.FloatingArray, pd.arrays.IntegerArray, pd.arrays.BooleanArray)):
+            mask = series.isna().to_numpy()
+            arrays[key] = series.array.to_numpy(dtype=series.dtype.numpy_dtype, na_value=series.dtype.numpy_dtype.type(0))
+            arrays[f"{key}/mask"] = mask
+            schema.append([col, 'masked', str(series.dtype)])
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'fiub':
+            arrays[key] = series.to_numpy()
+            schema.append([col, 'numpy', str(series.dtype)])
+        else:
+            raise TypeError(f"column '{col}' of frame '{name}' has unsupported dtype {series.dtype}")
+    return schema
+
+
+def _decode_frame(name: str, schema: list[list[str]], npz) -> pd.DataFrame:
+    data = {}
+    for i, (col, kind, dtype) in enumerate(schema):
+        key = f"{name}/{i}"
+        if kind == 'datetime_utc':
+            data[col] = pd.DatetimeIndex(npz[key].view('datetime64[ns]')).tz_localize('UTC')
+        elif kind == 'masked':
+            array_type = pd.api.types.pandas_dtype(dtype).construct_array_type()
+            data[col] = array_type(npz[key], npz[f"{key}/mask"])
+        else:
+            data[col] = npz[key]
+    return pd.DataFrame(data)
+
+
+class ParsedDataCache:
+    """Content-addressed cache of prepared run file DataFrames"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(raw: bytes, file_name: str, flags: dict) -> str:
+        """Return the cache key of a run file content for the given preparation flags"""
+        digest = hashlib.sha256()
+        digest.update(raw)
+        digest.update(json.dumps(
+            {'version': CACHE_FORMAT_VERSION, 'file_name': file_name, 'flags': flags},
+            sort_keys=True
+        ).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npz")
+
+    def load(self, key: str) -> tuple[dict[str, pd.DataFrame], dict] | None:
+        """Return the cached (frames, meta) for key, or None if not cached"""
+        path = self._entry_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                meta = json.loads(str(npz[_META_KEY]))
+                frames = {
+                    name: _decode_frame(name, schema, npz)
+                    for name, schema in meta['schemas'].items()
+                }
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Discarding unreadable parsed-data cache entry %s: %s", path, str(e))
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return frames, meta['meta']
+
+    def store(self, key: str, frames: dict[str, pd.DataFrame], meta: dict):
+        """Store the frames and JSON serializable meta under key (failures are only logged)"""
+        arrays: dict[str, np.ndarray] = {}
+        try:
+            schemas = {name: _encode_frame(name, df, arrays) for name, df in frames.items()}
+            arrays[_META_KEY] = np.array(json.dumps({'schemas': schemas, 'meta': meta}))
+        except (TypeError, ValueError) as e:
+            logger.warning("Parsed data not cached: %s", str(e))
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError as e:
+            logger.warning("Failed to write parsed-data cache entry in %s: %s", self.cache_dir, str(e))
+            return
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith('.npz'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# per context, so concurrent runs (see config.run_config) can use different caches
+_cache: ContextVar[ParsedDataCache | None] = ContextVar("calibration_parsed_cache", default=None)
+
+
+def set_cache(cache: ParsedDataCache | None):
+    """Set (or disable with None) the cache used by the loaders"""
+    _cache.set(cache)
+
+
+def get_cache() -> ParsedDataCache | None:
+    """Return the cache used by the loaders, None if caching is disabled"""
+    return _cache.get()
@@ -0,0 +1,153 @@
+"""Columnar parser for calibration run files.
+
+Calibration run files are tab separated text files with a fixed 9 column
+layout and no header:
+
+    datetime  laser_setpoint  pm_mean  pm_std  ref_pd_mean  ref_pd_std  temperature  RH  samples
+
+with datetimes written as ``%Y-%m-%d-%H:%M:%S``. Instead of going through
+``pd.read_csv`` + ``pd.to_datetime`` the whole file is tokenized once and
+every column is converted in a single vectorized numpy pass.
+"""
+from __future__ import annotations
+
+import warnings
+
+import numpy as np
+
+CALIB_RUN_COLUMNS = [
+    'datetime', 'laser_setpoint', 'pm_mean', 'pm_std', 'ref_pd_mean',
+    'ref_pd_std', 'temperature', 'RH', 'samples'
+]
+CALIB_RUN_FLOAT_COLUMNS = CALIB_RUN_COLUMNS[1:-1]
+CALIB_RUN_INT_COLUMNS = CALIB_RUN_COLUMNS[-1:]
+
+# Fixed width layout of '%Y-%m-%d-%H:%M:%S'
+_DT_WIDTH = 19
+_DT_SEPARATORS = {4: b'-', 7: b'-', 10: b'-', 13: b':', 16: b':'}
+_DT_FIELDS = {
+    'year': (0, 4),
+    'month': (5, 7),
+    'day': (8, 10),
+    'hour': (11, 13),
+    'minute': (14, 16),
+    'second': (17, 19),
+}
+
+
+def _digits_to_int(digits: np.ndarray, start: int, stop: int) -> np.ndarray:
+    out = np.zeros(digits.shape[0], dtype=np.int64)
+    for pos in range(start, stop):
+        out = out * 10 + digits[:, pos]
+    return out
+
+
+def _days_from_civil(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    """Days since 1970-01-01 of a proleptic gregorian date (vectorized)."""
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    yoe = year - era * 400
+    mp = (month + 9) % 12
+    doy = (153 * mp + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+def decode_timestamps(raw: np.ndarray) -> np.ndarray:
+    """Decode an array of ``%Y-%m-%d-%H:%M:%S`` byte strings into UTC epoch seconds.
+
+    Args:
+        raw (np.ndarray): 1D array of byte strings (dtype ``S``).
+
+    Raises:
+        ValueError: if any value does not match the expected format.
+    """
+    raw = np.asarray(raw)
+    if raw.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    if raw.dtype.kind != 'S' or raw.dtype.itemsize != _DT_WIDTH or (np.char.str_len(raw) != _DT_WIDTH).any():
+        raise ValueError("datetime values do not match format '%Y-%m-%d-%H:%M:%S'")
+    chars = raw.view(np.uint8).reshape(-1, _DT_WIDTH)
+    for pos, sep in _DT_SEPARATORS.items():
+        if (chars[:, pos] != ord(sep)).any():
+            raise ValueError("datetime values do not match format '%Y-%m-%d-%H:%M:%S'")
+    digit_pos = [p for p in range(_DT_WIDTH) if p not in _DT_SEPARATORS]
+    digits = chars.astype(np.int64) - ord('0')
+    if ((digits[:, digit_pos] < 0) | (digits[:, digit_pos] > 9)).any():
+        raise ValueError("datetime values do not match format '%Y-%m-%d-%H:%M:%S'")
+
+    fields = {name: _digits_to_int(digits, start, stop) for name, (start, stop) in _DT_FIELDS.items()}
+    month, day = fields['month'], fields['day']
+    leap = (fields['year'] % 4 == 0) & ((fields['year'] % 100 != 0) | (fields['year'] % 400 == 0))
+    month_days = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+    if ((month < 1) | (month > 12)).any():
+        raise ValueError("datetime values contain an invalid month")
+    max_day = month_days[month - 1] + ((month == 2) & leap)
+    if ((day < 1) | (day > max_day)).any():
+        raise ValueError("datetime values contain an invalid day")
+    if (fields['hour'] > 23).any() or (fields['minute'] > 59).any() or (fields['second'] > 59).any():
+        raise ValueError("datetime values contain an invalid time")
+
+    days = _days_from_civil(fields['year'], month, day)
+    return days * 86400 + fields['hour'] * 3600 + fields['minute'] * 60 + fields['second']
+
+
+def parse_calibration_run(data: bytes) -> dict[str, np.ndarray]:
+    """Parse the raw content of a calibration run file into contiguous numpy columns.
+
+    Returns a dictionary with one array per column of ``CALIB_RUN_COLUMNS``
+    (``datetime`` as ``datetime64[ns]`` in UTC, float64 for measurements and
+    int64 for ``samples``) plus ``timestamp`` (int64 epoch seconds).
+
+    Raises:
+        ValueError: if the content does not follow the 9 column layout.
+    """
+    ncols = len(CALIB_RUN_COLUMNS)
+    buf = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == ord('\n'))
+    starts = np.concatenate(([0], newlines + 1))
+    starts = starts[starts < buf.size]
+    # skip blank lines the same way read_csv does
+    starts = starts[~np.isin(buf[starts], (ord('\n'), ord('\r')))]
+    nrows = starts.size
+    if nrows == 0:
+        raise ValueError("calibration run file is empty")
+    if starts[-1] + _DT_WIDTH >= buf.size or np.count_nonzero(buf == ord('\t')) != nrows * (ncols - 1):
+        raise ValueError(f"calibration run file does not have {ncols} tab separated columns per row")
+
+    stamp_idx = starts[:, None] + np.arange(_DT_WIDTH)
+    if (buf[starts + _DT_WIDTH] != ord('\t')).any():
+        raise ValueError("datetime values do not match format '%Y-%m-%d-%H:%M:%S'")
+    seconds = decode_timestamps(np.ascontiguousarray(buf[stamp_idx]).view(f'S{_DT_WIDTH}').ravel())
+
+    # Blank the datetime field so the remaining numeric table can be parsed in one C pass
+    numeric = buf.copy()
+    numeric[stamp_idx] = ord(' ')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            values = np.fromstring(numeric.tobytes(), dtype=np.float64, sep=' ')
+        except (ValueError, DeprecationWarning) as e:
+            raise ValueError(f"calibration run file contains non numeric values: {e}") from e
+    if values.size != nrows * (ncols - 1):
+        raise ValueError(f"calibration run file does not have {ncols} columns per row")
+    values = values.reshape(nrows, ncols - 1)
+
+    columns: dict[str, np.ndarray] = {
+        'datetime': (seconds * 1_000_000_000).astype('datetime64[ns]'),
+    }
+    for i, col in enumerate(CALIB_RUN_FLOAT_COLUMNS):
+        columns[col] = np.ascontiguousarray(values[:, i])
+    for i, col in enumerate(CALIB_RUN_INT_COLUMNS, start=len(CALIB_RUN_FLOAT_COLUMNS)):
+        as_int = values[:, i].astype(np.int64)
+        if (as_int != values[:, i]).any():
+            raise ValueError(f"calibration run file column '{col}' is not integer")
+        columns[col] = as_int
+    columns['timestamp'] = seconds
+    return columns
+
+
+def read_calibration_run(file_path: str) -> dict[str, np.ndarray]:
+    """Read and parse a calibration run file (see ``parse_calibration_run``)."""
+    with open(file_path, 'rb') as f:
+        return parse_calibration_run(f.read())
@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 now = datetime.now(timezone.utc)
 
 from .helpers import get_logger
+from .helpers.in_process import run_main
 from .elements.calibration import Calibration
 from .elements.sanity_checks import SanityChecks
 from .config import config
@@ -14,7 +15,9 @@ now_libs = datetime.now(timezone.utc)
 logger = get_logger()
 
 
-def main():
+def main(argv: list[str] | None = None):
+    # the module level `now` is the interpreter start, several runs may share it (see run)
+    started = datetime.now(timezone.utc)
     logger.info("Virgo Instrumented Baffles Calibration script")
 
     parser = argparse.ArgumentParser(description="Virgo Instrumented Baffles Calibration script")
@@ -25,12 +28,18 @@ def main():
     parser.add_argument("--overwrite", "-w", action="store_true", help="Overwrite output directory if it exists")
     parser.add_argument("--no-plots", "-n", action="store_true", help="Do not generate plots")
     parser.add_argument("--no-gen-report", action="store_true", help="Do not generate calibration report")
+    parser.add_argument("--report-plots-only", action="store_true", help="Render only the plots embedded in the calibration report")
+    parser.add_argument("--timeseries-max-points", type=int, default=None, help="Downsample timeseries plots to about this many points per series, preserving their min/max envelope (default: draw every point)")
+    parser.add_argument("--rasterize-min-points", type=int, default=None, help="Rasterize the markers and error bars of pdf/svg plot axes drawing more than this many points, e.g. 10000 to keep dense plots small (default: 0, every layer stays vector)")
     parser.add_argument("--zip-it", "-z", action="store_true", help="Zip calibration output, move key files to root, and remove output folder")
     parser.add_argument("--do-not-sub-pedestals", "-d", action="store_true", help="Do not subtract pedestals from data")
     parser.add_argument("--do-not-replace-zero-pm-stds", "-s", action="store_true", help="Do not replace zero PM stds from data")
     parser.add_argument("--use-first-ped-in-linreag", "-p", action="store_true", help="Use first pedestal measurement in linear regression")
     parser.add_argument("--use-W-as-power-units", "-u", action="store_true", help="Use W as power units instead of uW")
-    args = parser.parse_args()
+    parser.add_argument("--no-cache", action="store_true", help="Do not use (nor update) the parsed run files, sanity check results and rendered plots caches at the output root")
+    parser.add_argument("--fit-mode", choices=["ols", "wls"], default="ols", help="Linear fit mode: ordinary or weighted (with the recorded stds) least squares (default: ols)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of worker processes used to load calibration files and render plots (default: 1)")
+    args = parser.parse_args(argv)
 
     if args.plot_format:
         config.plot_output_format = args.plot_format
@@ -38,22 +47,40 @@ def main():
         config.subtract_pedestals = False
     if args.no_plots:
         config.generate_plots = False
+    if args.report_plots_only:
+        from calib_report.main import report_plots
+        config.plot_selection = report_plots()
+    if args.timeseries_max_points:
+        config.timeseries_max_points = args.timeseries_max_points
+    if args.rasterize_min_points is not None:
+        config.rasterize_min_points = args.rasterize_min_points or None
     if args.do_not_replace_zero_pm_stds:
         config.replace_zero_pm_stds = False
     if args.use_first_ped_in_linreag:
         config.use_first_pedestal_in_linreg = True
     if args.use_W_as_power_units:
         config.use_uW_as_power_units = False
+    if args.no_cache:
+        config.use_parsed_cache = False
+        config.use_sanity_cache = False
+        config.use_plot_cache = False
+    config.fit_mode = args.fit_mode
+    if args.jobs < 1:
+        parser.error("--jobs must be a positive integer")
+    if args.timeseries_max_points is not None and args.timeseries_max_points < 4:
+        parser.error("--timeseries-max-points must be at least 4")
+    if args.rasterize_min_points is not None and args.rasterize_min_points < 0:
+        parser.error("--rasterize-min-points must be zero or positive")
     
     calibration = Calibration(args)
     if args.log_file:
-        log_file_path = os.path.join(calibration.plots_path, f"{now.strftime('%Y%m%d_%H%M%S')}_calibration.log")
+        log_file_path = os.path.join(calibration.plots_path, f"{started.strftime('%Y%m%d_%H%M%S')}_calibration.log")
         logger.info("Logging to file: %s", log_file_path)
         from .helpers import add_file_handler
         add_file_handler(log_file_path)
     logger.info("Calibration files path: %s", args.calib_files_path)
     logger.info("Output path: %s", calibration.plots_path)
-    logger.info("Starting calibration analysis at %s", now.isoformat())
+    logger.info("Starting calibration analysis at %s", started.isoformat())
 
     calibration.load_calibration_files()
     if not calibration.filesets:
@@ -101,9 +128,14 @@ def main():
 
     now_end = datetime.now(timezone.utc)
     logger.info("Finished calibration analysis at %s", now_end.isoformat())
-    logger.info("Total duration: %s", str(now_end - now))
+    logger.info("Total duration: %s", str(now_end - started))
     logger.info("Total duration loading libraries: %s", str(now_libs - now))
 
 
+def run(argv: list[str], output_path: str | None = None) -> int:
+    """Run the calibration script in this interpreter and return its exit code (see run_main)"""
+    return run_main(main, argv, output_path)
+
+
 if __name__ == "__main__":
     main()
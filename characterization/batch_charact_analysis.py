@@ -1,59 +1,36 @@
 import argparse
-import re
 import subprocess
 import sys
-from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+from characterization.helpers.batch_manifest import MANIFEST_FILE_NAME, BatchManifest, tool_version
+from characterization.helpers.dated_files import (
+    DatedFile,
+    collect_dated_files,
+    extract_board_id,
+    find_previous_calibration,
+)
+
+
+def _build_characterization_command(char_file: DatedFile, calib_file: DatedFile, run_output: Path) -> list[str]:
+    return [
+        sys.executable,
+        "-m",
+        "characterization.main",
+        str(char_file.path),
+        str(calib_file.path),
+        "-wze",
+        "-o",
+        str(run_output),
+    ]
 
-DATE_RE = re.compile(r"(?P<day>\d{2})(?P<month>\d{2})(?P<year>\d{4})")
-
-
-@dataclass(frozen=True)
-class DatedFile:
-    path: Path
-    date: datetime
-
-
-def _extract_date_from_name(path: Path) -> datetime | None:
-    match = DATE_RE.search(path.name)
-    if not match:
-        return None
-    day = int(match.group("day"))
-    month = int(match.group("month"))
-    year = int(match.group("year"))
-    try:
-        return datetime(year, month, day)
-    except ValueError:
-        return None
-
-
-def _extract_board_id(path: Path) -> str:
-    stem = path.stem
-    if "_" in stem:
-        return stem.split("_", 1)[1]
-    return stem
-
-
-def _collect_dated_files(folder: Path, pattern: str) -> list[DatedFile]:
-    out: list[DatedFile] = []
-    for p in sorted(folder.glob(pattern)):
-        if not p.is_file():
-            continue
-        file_date = _extract_date_from_name(p)
-        if file_date is None:
-            print(f"[skip] no DDMMYYYY date found in filename: {p.name}")
-            continue
-        out.append(DatedFile(path=p, date=file_date))
-    return out
 
+def _run_in_process(cmd: list[str]) -> int:
+    """Run a characterization command in this interpreter instead of a new Python process"""
+    from characterization.main import run
 
-def _find_previous_calibration(char_date: datetime, calibrations: list[DatedFile]) -> DatedFile | None:
-    candidates = [c for c in calibrations if c.date <= char_date]
-    if not candidates:
-        return None
-    return max(candidates, key=lambda c: c.date)
+    return run(cmd[cmd.index("characterization.main") + 1:])
 
 
 def main():
@@ -71,6 +48,22 @@ def main():
         default="charact-reports",
         help="Root output folder for characterization reports (default: charact-reports)",
     )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help=(
+            "Run every characterization in this interpreter, loading the analysis libraries once, "
+            "instead of starting a new Python process for each one"
+        ),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=(
+            "Process every characterization, even those up to date "
+            f"(same zip, calibration and options) in the {MANIFEST_FILE_NAME} of the output folder"
+        ),
+    )
     args = parser.parse_args()
     execution_dt = datetime.now()
 
@@ -84,8 +77,8 @@ def main():
     if not calib_folder.is_dir():
         parser.error(f"Calibration folder does not exist or is not a directory: {calib_folder}")
 
-    characterization_files = _collect_dated_files(char_folder, "*.zip")
-    calibration_files = _collect_dated_files(calib_folder, "*.json")
+    characterization_files = collect_dated_files(char_folder, "*.zip")
+    calibration_files = collect_dated_files(calib_folder, "*.json")
 
     if not characterization_files:
         parser.error(f"No characterization .zip files with parsable DDMMYYYY date found in {char_folder}")
@@ -96,11 +89,11 @@ def main():
     skipped: list[DatedFile] = []
 
     for char_file in characterization_files:
-        calib = _find_previous_calibration(char_file.date, calibration_files)
+        calib = find_previous_calibration(char_file.date, calibration_files)
         if calib is None:
             skipped.append(char_file)
             continue
-        board_id = _extract_board_id(char_file.path)
+        board_id = extract_board_id(char_file.path)
         relations.append((char_file, calib, board_id))
 
     print("Characterization -> Calibration relations:")
@@ -145,28 +138,39 @@ def main():
 
         f.write("\n## Execution Results\n\n")
 
+    # skip the characterizations processed before with the same zip and calibration content, tool version and options
+    manifest = BatchManifest(output_root, tool_version("characterization", "characterization_report", "base_report"))
     for char_file, calib_file, board_id in relations:
         run_output = output_root / board_id
+        cmd = _build_characterization_command(char_file, calib_file, run_output)
+        key = char_file.path.name
+        fingerprint = manifest.fingerprint(key, [char_file.path, calib_file.path], cmd[1:])
+        if not args.force and manifest.is_up_to_date(key, fingerprint):
+            print(f"\n[skip] {key} is up to date (use --force to rerun)")
+            with log_path.open("a", encoding="utf-8") as f:
+                f.write(
+                    f"- `{key}` with `{calib_file.path.name}`: "
+                    f"up to date in `{MANIFEST_FILE_NAME}`, skipped\n"
+                )
+            continue
         run_output.mkdir(parents=True, exist_ok=True)
-        cmd = [
-            sys.executable,
-            "-m",
-            "characterization.main",
-            str(char_file.path),
-            str(calib_file.path),
-            "-wze",
-            "-o",
-            str(run_output),
-        ]
         print("\nRunning:", " ".join(cmd))
-        result = subprocess.run(cmd, check=False)
+        if args.in_process:
+            returncode = _run_in_process(cmd)
+        else:
+            returncode = subprocess.run(cmd, check=False).returncode
         with log_path.open("a", encoding="utf-8") as f:
             f.write(
                 f"- `{char_file.path.name}` with `{calib_file.path.name}`: "
-                f"exit code `{result.returncode}`\n"
+                f"exit code `{returncode}`\n"
             )
-        if result.returncode != 0:
-            print(f"[error] characterization failed for {char_file.path.name} (exit={result.returncode})")
+        outputs = [path for path in (run_output / f"{char_file.path.stem}.zip",) if path.exists()]
+        if returncode == 0 and outputs:
+            manifest.record(key, fingerprint, outputs)
+        else:
+            manifest.forget(key)
+        if returncode != 0:
+            print(f"[error] characterization failed for {char_file.path.name} (exit={returncode})")
 
     print(f"\nSaved batch log: {log_path}")
 
@@ -1,3 +1,7 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import cast
+
 
 DEFAULT_SENSOR_CONFIG = {
     '0.0': {'gain': 'G1', 'resistor': '26KOhm', 'valid_setups': ['1064_FW5', '532_FW4']},
@@ -72,7 +76,17 @@ class Configuration:
     generate_file_plots = True
     subtract_pedestals = True
     saturation_derivative_threshold = 10.0
+    fit_mode = "ols"  # "ols" (ordinary least squares) or "wls" (weighted with the recorded standard deviations)
     summary_file_name = "characterization_summary.json"
+    use_parsed_cache = True  # whether to cache parsed sweep files in <output root>/.parsed_cache
+    parsed_cache_max_bytes = 512 * 1024 * 1024  # size bound of the parsed sweep files cache (LRU eviction)
+    use_sanity_cache = True  # whether to cache sanity check results in <output root>/sanity_cache.sqlite
+    use_plot_cache = True  # whether to reuse unchanged rendered plots from <output root>/.plot_cache
+    plot_cache_max_bytes = 1024 * 1024 * 1024  # size bound of the rendered plots cache (LRU eviction)
+    plot_selection = None  # ids of the figures to render per plot level (see elements.plots.plot_registry), None for all
+    timeseries_max_points = None  # bound on the points drawn per timeseries (min/max bucketing, see helpers.downsample), None for all
+    rasterize_min_points = None  # markers and error bars of an axes above which they are rasterized in pdf/svg plots, None to keep vectors
+    rasterize_dpi = 200  # resolution of the rasterized layers
     sensor_config = DEFAULT_SENSOR_CONFIG
 
     def to_dict(self):
@@ -82,8 +96,65 @@ class Configuration:
             'generate_file_plots': self.generate_file_plots,
             'subtract_pedestals': self.subtract_pedestals,
             'saturation_derivative_threshold': self.saturation_derivative_threshold,
+            'fit_mode': self.fit_mode,
             'summary_file_name': self.summary_file_name,
             'sensor_config': dict(self.sensor_config)
         }
 
-config = Configuration()
+    def plot_settings(self):
+        """Settings only shaping the rendered plots, not exported with the results"""
+        return {
+            'plot_selection': self.plot_selection,
+            'timeseries_max_points': self.timeseries_max_points,
+            'rasterize_min_points': self.rasterize_min_points,
+            'rasterize_dpi': self.rasterize_dpi,
+        }
+
+    def update_from_dict(self, values: dict):
+        """Apply settings exported with to_dict or plot_settings (e.g. to replicate the configuration in a worker process)"""
+        for key in {**self.to_dict(), **self.plot_settings()}:
+            if key in values:
+                setattr(self, key, values[key])
+
+class _RunConfig:
+    """The configuration of the current run.
+
+    Attribute reads and writes are forwarded to the Configuration of the
+    current context (see run_config), by default a process wide one.
+    """
+
+    def __getattr__(self, name):
+        return getattr(current_config(), name)
+
+    def __setattr__(self, name, value):
+        setattr(current_config(), name, value)
+
+    def __delattr__(self, name):
+        delattr(current_config(), name)
+
+
+_default_config = Configuration()
+_run_config: ContextVar[Configuration] = ContextVar("characterization_config")
+
+
+def current_config() -> Configuration:
+    """Return the configuration of the current run"""
+    return _run_config.get(_default_config)
+
+
+@contextmanager
+def run_config(configuration: Configuration | None = None):
+    """Use a separate configuration (a new default one if None) in the current context.
+
+    Threads and asyncio tasks entering their own run_config can run characterizations
+    concurrently without sharing settings. New threads start with the default
+    configuration, run them in contextvars.copy_context() to use the caller's one.
+    """
+    token = _run_config.set(configuration if configuration is not None else Configuration())
+    try:
+        yield current_config()
+    finally:
+        _run_config.reset(token)
+
+
+config = cast(Configuration, _RunConfig())
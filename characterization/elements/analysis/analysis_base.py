@@ -3,11 +3,100 @@ import numpy as np
 import pandas as pd
 
 from characterization.helpers import get_logger
+from characterization.helpers.grouped_stats import GroupedMeans, grouped_means
+from characterization.helpers.regression import RegressionStats, fit_stats
 from characterization.config import config
 from ..helpers import CharLinReg
 
 logger = get_logger()
 
+# (value, std) columns of the pedestal statistics, always the raw (not zeroed) measurements
+PEDESTAL_COLUMNS = (("mean_adc", "std_adc"), ("ref_pd_mean", "ref_pd_std"))
+
+
+def _column(frame: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in frame.columns:
+        return np.full(len(frame), np.nan)
+    return frame[col].to_numpy(dtype=float, na_value=np.nan)
+
+
+def pedestal_stats_of(analyses: list['BaseAnal'], columns=PEDESTAL_COLUMNS) -> list[dict]:
+    """Pedestal statistics of several analyses (sweeps, filesets, photodiodes) with a single grouped_means call.
+
+    Returns one dict per analysis mapping the value columns to their
+    statistics. Value columns missing from the pedestals are left out.
+    """
+    frames = [[f for f in anal._pedestal_frames() if f is not None and not f.empty] for anal in analyses]
+    values = [np.empty((0, len(columns)))]
+    stds = [np.empty((0, len(columns)))]
+    groups = [np.empty(0, dtype=np.intp)]
+    for i, group_frames in enumerate(frames):
+        for f in group_frames:
+            values.append(np.column_stack([_column(f, value_col) for value_col, _ in columns]))
+            stds.append(np.column_stack([_column(f, std_col) for _, std_col in columns]))
+            groups.append(np.full(len(f), i, dtype=np.intp))
+    means = grouped_means(np.concatenate(values), np.concatenate(stds), np.concatenate(groups), len(analyses))
+    out = []
+    for i, (anal, group_frames) in enumerate(zip(analyses, frames)):
+        stats = {}
+        for c, (value_col, std_col) in enumerate(columns):
+            if group_frames and all(value_col in f.columns for f in group_frames):
+                has_std = all(std_col in f.columns for f in group_frames)
+                stats[value_col] = anal._pedestal_stat(means, i, c, has_std)
+        out.append(stats)
+    return out
+
+
+def calc_pedestal_stats_batch(analyses: list['BaseAnal']):
+    """Calculate the pedestal statistics of several analyses at once, their analyses reuse them"""
+    for anal, stats in zip(analyses, pedestal_stats_of(analyses)):
+        anal._pedestal_stats = stats
+        anal._pedestal_stats_done = True
+
+
+def fit_refpd_vs_adc_batch(analyses: list['BaseAnal']):
+    """Fit the ref PD vs ADC regressions of several analyses (sweeps, filesets) in a single batch.
+
+    Sweeps are reduced to regression statistics from their data, filesets merge
+    the statistics of their sweeps instead of scanning their merged frame.
+    """
+    pending = [anal for anal in analyses if anal._refpd_vs_adc_status is None]
+    leaves = []
+    fits = []
+    for anal in pending:
+        if anal._refpd_vs_adc_children() is not None:
+            continue
+        data = anal._refpd_vs_adc_data()
+        if data is not None:
+            leaves.append(anal)
+            fits.append(data)
+    if fits:
+        stats = fit_stats(fits, weighted=config.fit_mode == 'wls')
+        for i, anal in enumerate(leaves):
+            anal.refpd_vs_adc_stats = stats.take([i])
+    for anal in pending:
+        children = anal._refpd_vs_adc_children()
+        if children is not None:
+            fit_refpd_vs_adc_batch(children)
+            anal._merge_refpd_vs_adc_stats(children)
+
+    to_fit = []
+    for anal in pending:
+        if anal.refpd_vs_adc_stats is None:
+            continue
+        if anal.refpd_vs_adc_stats.n[0] < 2:
+            logger.warning("Not enough points for linreg in %s", anal._fit_context())
+            anal._refpd_vs_adc_status = 'too_few_points'
+            continue
+        to_fit.append(anal)
+    if not to_fit:
+        return
+    linregs = RegressionStats.concat([anal.refpd_vs_adc_stats for anal in to_fit]).fit()
+    for anal, linreg in zip(to_fit, linregs):
+        anal.lr_refpd_vs_adc.linreg = linreg
+        anal._refpd_vs_adc_status = 'fitted'
+
+
 class BaseAnal(ABC):
     def __init__(self) -> None:
         self._data_holder = None
@@ -17,7 +106,12 @@ class BaseAnal(ABC):
         else:
             self.lr_refpd_vs_adc = CharLinReg('mean_adc', 'ref_pd_mean', None)
         self._pedestal_stats = {}
+        self._pedestal_stats_done = False
         self._saturation_stats = {}
+        # None until the ref PD vs ADC fit is attempted, then 'fitted', 'empty', 'missing_columns' or 'too_few_points'
+        self._refpd_vs_adc_status: str | None = None
+        # sufficient statistics of the ref PD vs ADC fit (None if the data does not allow it)
+        self.refpd_vs_adc_stats: RegressionStats | None = None
 
     @property
     def df(self) -> pd.DataFrame:
@@ -43,16 +137,66 @@ class BaseAnal(ABC):
     def to_dict(self) -> dict:
         pass
 
-    def _calc_single_pedestal_stat(self, value_col: str, std_col: str) -> dict | None:
-        if self.df_pedestals is None or self.df_pedestals.empty:
+    def _fit_context(self) -> str:
+        """Element description used in the regression log messages"""
+        return str(getattr(self._data_holder, 'level_header', ''))
+
+    def _set_refpd_vs_adc_vars(self) -> tuple[str, str]:
+        """Set and return the (x, y) columns of the ref PD vs ADC fit"""
+        x_col = self._data_holder.adc_col
+        y_col = self._data_holder.ref_pd_col
+        self.lr_refpd_vs_adc.x_var = x_col
+        self.lr_refpd_vs_adc.y_var = y_col
+        return x_col, y_col
+
+    def _refpd_vs_adc_children(self) -> list['BaseAnal'] | None:
+        """Analyses whose statistics are merged for the ref PD vs ADC fit (None if fitted from own data)"""
+        return None
+
+    def _merge_refpd_vs_adc_stats(self, children: list['BaseAnal']):
+        """Set the ref PD vs ADC statistics by merging those of the (already reduced) children"""
+        x_col, y_col = self._set_refpd_vs_adc_vars()
+        if any(child._refpd_vs_adc_status == 'missing_columns' for child in children):
+            logger.error("Missing required regression columns (%s, %s) in %s", x_col, y_col, self._fit_context())
+            self._refpd_vs_adc_status = 'missing_columns'
+            return
+        stats = [child.refpd_vs_adc_stats for child in children if child.refpd_vs_adc_stats is not None]
+        if not stats:
+            self._refpd_vs_adc_status = 'empty'
+            return
+        self.refpd_vs_adc_stats = RegressionStats.merge(stats)
+
+    def _refpd_vs_adc_data(self) -> tuple | None:
+        """Set the regression variables and return the (x, y, sigma_x, sigma_y) data of the ref PD vs ADC fit.
+
+        Returns None (and records the reason in _refpd_vs_adc_status) when the fit is not possible.
+        """
+        if self.df is None or self.df.empty:
+            self._refpd_vs_adc_status = 'empty'
             return None
-        if value_col not in self.df_pedestals.columns:
+        x_col, y_col = self._set_refpd_vs_adc_vars()
+        if x_col not in self.df.columns or y_col not in self.df.columns:
+            logger.error("Missing required regression columns (%s, %s) in %s", x_col, y_col, self._fit_context())
+            self._refpd_vs_adc_status = 'missing_columns'
             return None
-        vals = self.df_pedestals[value_col].astype(float)
+        return self.df[x_col], self.df[y_col], self.df['std_adc'], self.df['ref_pd_std']
+
+    def _fit_refpd_vs_adc(self) -> bool:
+        """Fit the ref PD vs ADC regression unless already done in a batch, False if the regression columns are missing"""
+        if self._refpd_vs_adc_status is None:
+            fit_refpd_vs_adc_batch([self])
+        return self._refpd_vs_adc_status != 'missing_columns'
+
+    def _pedestal_frames(self) -> list[pd.DataFrame]:
+        """Frames holding the pedestal rows of the element (aggregates return those of their sweeps)"""
+        return [self.df_pedestals]
+
+    def _pedestal_stat(self, means: GroupedMeans, group: int, column: int, has_std: bool) -> dict:
+        """Pedestal statistics of one group and column of grouped_means results"""
         out = {
-            "mean": float(vals.mean()),
-            "std": float(vals.std()),
-            "samples": int(vals.shape[0]),
+            "mean": float(means.mean[group, column]),
+            "std": float(means.std[group, column]),
+            "samples": int(means.samples[group, column]),
             "weighted": False,
             "w_mean": 0.0,
             "w_stderr": 0.0,
@@ -61,39 +205,29 @@ class BaseAnal(ABC):
             "chi2_reduced": 0.0,
             "exec_error": False,
         }
-        if std_col not in self.df_pedestals.columns:
+        if not has_std:
             return out
-        std = self.df_pedestals[std_col].astype(float)
-        mask = std > 0
-        vals = vals[mask]
-        std = std[mask]
-        ndof = int(vals.shape[0] - 1)
+        ndof = int(means.ndof[group, column])
         out["ndof"] = ndof
         if ndof <= 0:
             out["exec_error"] = True
             return out
-        w = 1.0 / (std ** 2)
-        w_mean = float((w * vals).sum() / w.sum())
-        w_stderr = float(np.sqrt(1.0 / w.sum()))
-        chi2 = float(np.sum(((vals - w_mean) ** 2) / (std ** 2)))
+        chi2 = float(means.chi2[group, column])
         out["weighted"] = True
-        out["w_mean"] = w_mean
-        out["w_stderr"] = w_stderr
+        out["w_mean"] = float(means.w_mean[group, column])
+        out["w_stderr"] = float(means.w_stderr[group, column])
         out["chi2"] = chi2
         out["chi2_reduced"] = float(chi2 / ndof)
         return out
 
+    def _calc_single_pedestal_stat(self, value_col: str, std_col: str) -> dict | None:
+        return pedestal_stats_of([self], [(value_col, std_col)])[0].get(value_col)
+
     def _calc_pedestal_stats(self) -> dict:
         ## We have to use the raw values for the pedestals as the zeroed values are all zero
         # and would not give us any information. (We need the pedestals stats to calculate the zeroed columns)
-        out = {}
-        adc_stats = self._calc_single_pedestal_stat("mean_adc", "std_adc")
-        refpd_stats = self._calc_single_pedestal_stat("ref_pd_mean", "ref_pd_std")
-        if adc_stats is not None:
-            out["mean_adc"] = adc_stats
-        if refpd_stats is not None:
-            out["ref_pd_mean"] = refpd_stats
-        self._pedestal_stats = out
+        if not self._pedestal_stats_done:
+            calc_pedestal_stats_batch([self])
         return self._pedestal_stats
 
     def _calc_saturation_stats(self, threshold: int = 4095) -> dict:
@@ -4,7 +4,7 @@ from typing import TYPE_CHECKING
 import numpy as np
 from characterization.helpers import get_logger
 from characterization.config import config
-from .analysis_base import BaseAnal
+from .analysis_base import BaseAnal, calc_pedestal_stats_batch, fit_refpd_vs_adc_batch
 
 if TYPE_CHECKING:
     from ..characterization import Characterization
@@ -20,6 +20,23 @@ class CharacterizationAnalysis(BaseAnal):
         self.results = {}
 
     def analyze(self):
+        # fit the regressions of every sweep and fileset at once, their analyses reuse them
+        fit_refpd_vs_adc_batch([
+            anal
+            for pdh in self.photodiodes.values()
+            for fs in pdh.filesets.values()
+            for anal in [*(cf.anal for cf in fs.files), fs.anal]
+        ])
+        # pedestal statistics of every sweep, fileset and photodiode in one pass over the sweep pedestals
+        calc_pedestal_stats_batch([
+            anal
+            for pdh in self.photodiodes.values()
+            for anal in [
+                *(cf.anal for fs in pdh.filesets.values() for cf in fs.files),
+                *(fs.anal for fs in pdh.filesets.values()),
+                pdh.anal,
+            ]
+        ])
         for pdh in self.photodiodes.values():
             pdh.analyze()
         self._calc_refpd_pedestal_stats()
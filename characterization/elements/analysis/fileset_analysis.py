@@ -1,6 +1,7 @@
 """Fileset-level analysis"""
 from typing import TYPE_CHECKING
-from scipy.stats import linregress
+
+import pandas as pd
 
 from characterization.helpers import get_logger
 from ..helpers import CharLinReg
@@ -59,30 +60,26 @@ class FilesetAnalysis(BaseAnal):
         self.adc_to_power = conv
 
     def analyze(self):
-        if self.df is None or self.df.empty:
+        # check the sweeps instead of building the merged frame (the fit merges their statistics)
+        if not any(cf.df is not None and not cf.df.empty for cf in self._data_holder.files):
             logger.error("Dataframe is not loaded for fileset: %s", self._data_holder.label)
             return
         self._calc_pedestal_stats()
         self._calc_saturation_stats(threshold=4095)
         
-        x_col = self._data_holder.adc_col
-        y_col = self._data_holder.ref_pd_col
-        self.lr_refpd_vs_adc.x_var = x_col
-        self.lr_refpd_vs_adc.y_var = y_col
-        if x_col not in self.df.columns or y_col not in self.df.columns:
-            logger.error(
-                "Missing required regression columns (%s, %s) in fileset: %s",
-                x_col,
-                y_col,
-                self._data_holder.label,
-            )
+        if not self._fit_refpd_vs_adc():
             return
-        if len(self.df) >= 2:
-            self.lr_refpd_vs_adc.linreg = linregress(self.df[x_col], self.df[y_col])
-        else:
-            logger.warning("Not enough points for linreg in fileset: %s", self._data_holder.label)
         self._analyzed = True
 
+    def _fit_context(self) -> str:
+        return f"fileset: {self._data_holder.label}"
+
+    def _pedestal_frames(self) -> list[pd.DataFrame]:
+        return [cf.df_pedestals for cf in self._data_holder.files]
+
+    def _refpd_vs_adc_children(self) -> list[BaseAnal]:
+        return [cf.anal for cf in self._data_holder.files]
+
     def to_dict(self) -> dict:
         if not self._analyzed:
             logger.warning("Analysis has not been performed yet for fileset: %s", self._data_holder.label)
@@ -1,6 +1,9 @@
 """Photodiode-level analysis"""
 
 from typing import TYPE_CHECKING
+
+import pandas as pd
+
 from characterization.helpers import get_logger
 from .analysis_base import BaseAnal
 
@@ -23,6 +26,9 @@ class PhotodiodeAnalysis(BaseAnal):
         self.results['pedestal_stats'] = self._pedestal_stats
         self._analyzed = True
 
+    def _pedestal_frames(self) -> list[pd.DataFrame]:
+        return [cf.df_pedestals for cf in self._data_holder.files]
+
     def to_dict(self) -> dict:
         if not self._analyzed:
             logger.warning("Analysis has not been performed yet for photodiode: %s", self._data_holder.sensor_id)
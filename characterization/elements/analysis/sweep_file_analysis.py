@@ -2,7 +2,6 @@
 
 from typing import TYPE_CHECKING
 import numpy as np
-from scipy.stats import linregress
 
 from characterization.helpers import get_logger
 from characterization.config import config
@@ -25,31 +24,20 @@ class SweepFileAnalysis(BaseAnal):
     def analyze(self):
         if self.df is None or self.df.empty:
             logger.error("Dataframe is not loaded for file: %s", self._data_holder.file_info['filename'])
-            print(self._data_holder._df)
+            print(self._data_holder.df)
             return
         self._calc_pedestal_stats()
         self._calc_saturation_stats()
         # Saturation derivative method disabled for now
         # df_filtered, sat_adc = self._find_saturation_from_derivative(self.df)
         # self.saturation_adc = sat_adc
-        x_col = self._data_holder.adc_col
-        y_col = self._data_holder.ref_pd_col
-        self.lr_refpd_vs_adc.x_var = x_col
-        self.lr_refpd_vs_adc.y_var = y_col
-        if x_col not in self.df.columns or y_col not in self.df.columns:
-            logger.error(
-                "Missing required regression columns (%s, %s) in file: %s",
-                x_col,
-                y_col,
-                self._data_holder.file_info['filename'],
-            )
+        if not self._fit_refpd_vs_adc():
             return
-        if len(self.df) >= 2:
-            self.lr_refpd_vs_adc.linreg = linregress(self.df[x_col], self.df[y_col])
-        else:
-            logger.warning("Not enough points for linreg in file: %s", self._data_holder.file_info['filename'])
         self._analyzed = True
 
+    def _fit_context(self) -> str:
+        return f"file: {self._data_holder.file_info['filename']}"
+
     # def _find_saturation_from_derivative(self, df):
     #     x = df['ref_pd_mean'].values
     #     y = df['mean_adc'].values
@@ -47,6 +47,22 @@ class BaseElement(ABC):
     def df_full(self) -> pd.DataFrame:
         """DataFrame containing the full data."""
 
+    def project(self, columns: list[str], kind: str = 'df') -> pd.DataFrame:
+        """Return only the given columns of the df, df_full, df_pedestals or df_sat frame.
+
+        Aggregate elements that have not built the whole frame yet merge only
+        these columns from their children.
+        """
+        if getattr(self, f"_{kind}", None) is None:
+            merged = self._merge_children(kind, columns)
+            if merged is not None:
+                return merged
+        return getattr(self, kind)[columns]
+
+    def _merge_children(self, kind: str, columns: list[str] | None = None) -> pd.DataFrame | None:
+        """Time ordered merge of the `kind` frames of the children (None for elements without children)"""
+        return None
+
     @abstractmethod
     def analyze(self):
         """Perform the analysis."""
@@ -1,11 +1,14 @@
 """Characterization top-level element"""
+import hashlib
 import os
 import json
 from datetime import datetime, timezone
+import numpy as np
 import pandas as pd
 import math
 
-from characterization.helpers import file_manage, get_logger, system_info
+from characterization.helpers import file_manage, get_logger, parsed_cache, plot_cache, system_info
+from characterization.helpers.frame_merge import merge_sorted_frames
 from characterization.helpers.output_contract import (
     format_contract_violations,
     validate_characterization_extended_contract,
@@ -14,6 +17,7 @@ from characterization.helpers.output_contract import (
 from .sweep_file import SweepFile
 from .analysis.characterization_analysis import CharacterizationAnalysis
 from .plots.characterization_plots import CharacterizationPlots
+from .plots.plot_scheduler import PlotScheduler
 from .base_element import BaseElement, DataHolderLevel
 from .photodiode import Photodiode
 from characterization.config import config
@@ -33,8 +37,10 @@ class Characterization(BaseElement):
         self.reports_path = char_folder_path
         self.output_path = os.path.join(char_folder_path, 'plots')
         self.strict_contract = bool(getattr(call_args, "strict_contract", False))
+        self.jobs = max(1, int(getattr(call_args, "jobs", 1) or 1))
         self.photodiodes: dict[str, Photodiode] = {}
         self.calibration_info: dict = {}
+        self.calibration_digest: str | None = None  # sha256 of the applied calibration file
         self.conversion_factors: dict = {}
         self.meta = {
             'calling_arguments': vars(call_args),
@@ -57,6 +63,24 @@ class Characterization(BaseElement):
     def initialize(self):
         os.makedirs(self.output_path, exist_ok=True)
         self.plot_label = self.level_header
+        self._setup_parsed_cache()
+        self._setup_plot_cache()
+
+    def _setup_parsed_cache(self):
+        """Enable the parsed sweep files cache in the output root (unless disabled by configuration)"""
+        if not config.use_parsed_cache:
+            parsed_cache.set_cache(None)
+            return
+        cache_dir = os.path.join(self.meta['root_output_path'], parsed_cache.CACHE_DIR_NAME)
+        parsed_cache.set_cache(parsed_cache.ParsedDataCache(cache_dir, config.parsed_cache_max_bytes))
+
+    def _setup_plot_cache(self):
+        """Enable the rendered plots cache in the output root (unless disabled by configuration)"""
+        if not config.use_plot_cache:
+            plot_cache.set_cache(None)
+            return
+        cache_dir = os.path.join(self.meta['root_output_path'], plot_cache.CACHE_DIR_NAME)
+        plot_cache.set_cache(plot_cache.PlotRenderCache(cache_dir, config.plot_cache_max_bytes))
 
     # We need to remove values of adc at characterization level because
     # the adc columns are related to a single photodiode. So when we mix
@@ -71,69 +95,51 @@ class Characterization(BaseElement):
     @property
     def df(self):
         if self._df is None:
-            if not self.photodiodes:
-                return pd.DataFrame()
-            self._df = pd.concat(
-                [cf.df for pdh in self.photodiodes.values()
-                 for cf in pdh.files if cf.df is not None],
-                ignore_index=True
-            )
-            self._df = self._df.sort_values(
-                by='timestamp').reset_index(drop=True)
-            self._df = self._na_adc_columns(self._df)
+            self._df = self._merge_children('df')
         return self._df
 
     @property
     def df_pedestals(self):
         if self._df_pedestals is None:
-            if not self.photodiodes:
-                return pd.DataFrame()
-            self._df_pedestals = pd.concat(
-                [cf.df_pedestals for pdh in self.photodiodes.values()
-                 for cf in pdh.files if cf.df_pedestals is not None],
-                ignore_index=True
-            )
-            self._df_pedestals = self._df_pedestals.sort_values(
-                by='timestamp').reset_index(drop=True)
-            self._df_pedestals = self._na_adc_columns(self._df_pedestals)
+            self._df_pedestals = self._merge_children('df_pedestals')
         return self._df_pedestals
 
     @property
     def df_full(self):
         if self._df_full is None:
-            if not self.photodiodes:
-                return pd.DataFrame()
-            self._df_full = pd.concat(
-                [cf.df_full for pdh in self.photodiodes.values()
-                 for cf in pdh.files if cf.df_full is not None],
-                ignore_index=True
-            )
-            self._df_full = self._df_full.sort_values(
-                by='timestamp').reset_index(drop=True)
-            self._df_full = self._na_adc_columns(self._df_full)
+            self._df_full = self._merge_children('df_full')
         return self._df_full
 
-    @staticmethod
-    def _na_adc_columns(df: pd.DataFrame) -> pd.DataFrame:
-        adc_cols = ['total_sum', 'total_square_sum',
-                    'total_counts', 'mean_adc', 'std_adc']
-        existing = [col for col in adc_cols if col in df.columns]
-        if existing:
-            df = df.copy()
-            df[existing] = pd.NA
+    ADC_COLUMNS = ['total_sum', 'total_square_sum', 'total_counts', 'mean_adc', 'std_adc']
+
+    def _merge_children(self, kind: str, columns: list[str] | None = None) -> pd.DataFrame | None:
+        """Merge the sweep file frames of all photodiodes, with the ADC columns set to NA.
+
+        The ADC columns are not merged at all (they are added back filled with
+        NA), which avoids copying the whole board frame just to blank them.
+        """
+        if not self.photodiodes:
+            return pd.DataFrame()
+        frames = [getattr(cf, kind) for pdh in self.photodiodes.values() for cf in pdh.files]
+        if columns is None:
+            columns = list(dict.fromkeys(col for frame in frames for col in frame.columns))
+        merged_cols = [col for col in columns if col not in self.ADC_COLUMNS]
+        df = merge_sorted_frames(frames, columns=merged_cols)
+        for pos, col in enumerate(columns):
+            if col in self.ADC_COLUMNS:
+                df.insert(pos, col, np.full(len(df), pd.NA, dtype=object))
         return df
 
     def load_characterization_files(self):
-        for file_name in sorted(os.listdir(self.char_files_path)):
-            file_path = os.path.join(self.char_files_path, file_name)
-            if os.path.isfile(file_path):
-                sweepfile = SweepFile(file_path)
+        with file_manage.open_archives():
+            for input_file in file_manage.list_input_files(self.char_files_path):
+                sweepfile = SweepFile(input_file)
                 if sweepfile.valid:
                     self.photodiodes.setdefault(sweepfile.sensor_id, Photodiode(
                         sweepfile.sensor_id, characterization=self)).add_file(sweepfile)
                 else:
                     logger.warning(
-                        "Skipping invalid characterization file: %s", file_name)
+                        "Skipping invalid characterization file: %s", input_file.name)
                     continue
 
     @staticmethod
@@ -165,12 +171,15 @@ class Characterization(BaseElement):
 
     def generate_plots(self):
         os.makedirs(self.output_path, exist_ok=True)
+        # the figures of every sweep, fileset, photodiode and of the characterization are rendered by up to `jobs` processes
+        scheduler = PlotScheduler(self.jobs)
         pd_plots = self.plotter.plots.setdefault('photodiodes', {})
         for _, pdh in sorted(self.photodiodes.items(), key=lambda item: self._sensor_sort_key(item[0])):
-            pdh.generate_plots()
+            pdh.plotter.schedule_plots(scheduler)
             pd_plots[pdh.level_header] = pdh.plotter.plots
-            logger.debug("Generated plots for photodiode %s", pdh.sensor_id)
-        self.plotter.generate_plots()
+        self.plotter.schedule_plots(scheduler)
+        scheduler.run()
+        logger.debug("Generated plots for photodiodes %s", ", ".join(pd_plots))
 
     def to_dict(self):
         out = {
@@ -284,8 +293,10 @@ class Characterization(BaseElement):
             "Reduced characterization summary saved to %s", results_path)
 
     def apply_calibration(self, calibration_json_path: str):
-        with open(calibration_json_path, 'r', encoding='utf-8') as f:
-            cal_data = json.load(f)
+        with open(calibration_json_path, 'rb') as f:
+            raw = f.read()
+        self.calibration_digest = hashlib.sha256(raw).hexdigest()
+        cal_data = json.loads(raw.decode('utf-8'))
 
         cal_filesets = self._extract_calibration_filesets(cal_data)
         used_configs = sorted({
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 import pandas as pd
 
 from characterization.helpers import get_logger
+from characterization.helpers.frame_merge import merge_sorted_frames
 from .analysis.fileset_analysis import FilesetAnalysis
 from .plots.fileset_plots import FilesetPlots
 from .base_element import BaseElement, DataHolderLevel
@@ -43,8 +44,7 @@ class Fileset(BaseElement):
         if self._df is None:
             if not self.files:
                 return pd.DataFrame()
-            self._df = pd.concat([cf.df for cf in self.files if cf.df is not None], ignore_index=True)
-            self._df = self._df.sort_values(by='timestamp').reset_index(drop=True)
+            self._df = self._merge_children('df')
         return self._df
 
     @property
@@ -52,8 +52,7 @@ class Fileset(BaseElement):
         if self._df_pedestals is None:
             if not self.files:
                 return pd.DataFrame()
-            self._df_pedestals = pd.concat([cf.df_pedestals for cf in self.files if cf.df_pedestals is not None], ignore_index=True)
-            self._df_pedestals = self._df_pedestals.sort_values(by='timestamp').reset_index(drop=True)
+            self._df_pedestals = self._merge_children('df_pedestals')
         return self._df_pedestals
 
     @property
@@ -61,8 +60,7 @@ class Fileset(BaseElement):
         if self._df_full is None:
             if not self.files:
                 return pd.DataFrame()
-            self._df_full = pd.concat([cf.df_full for cf in self.files if cf.df_full is not None], ignore_index=True)
-            self._df_full = self._df_full.sort_values(by='timestamp').reset_index(drop=True)
+            self._df_full = self._merge_children('df_full')
         return self._df_full
 
     @property
@@ -70,11 +68,15 @@ class Fileset(BaseElement):
         if self._df_sat is None:
             if not self.files:
                 return pd.DataFrame()
-            self._df_sat = pd.concat([cf.df_sat for cf in self.files if cf.df_sat is not None], ignore_index=True)
-            self._df_sat = self._df_sat.sort_values(by='timestamp').reset_index(drop=True)
+            self._df_sat = self._merge_children('df_sat')
         return self._df_sat
 
 
+    def _merge_children(self, kind: str, columns: list[str] | None = None) -> pd.DataFrame | None:
+        if not self.files:
+            return pd.DataFrame()
+        return merge_sorted_frames([getattr(cf, kind) for cf in self.files], columns=columns)
+
     def add_file(self, sweep_file: 'SweepFile'):
         if sweep_file.wavelength != self.wavelength or sweep_file.filter_wheel != self.filter_wheel:
             logger.error("Sweep file configuration does not match fileset %s", self.label)
@@ -43,9 +43,13 @@ class CharLinReg:
             return self.linreg.intercept_stderr
         raise AttributeError("No linear regression result available")
 
+    @property
+    def weighted(self) -> bool:
+        return hasattr(self.linreg, 'chi2')
+
     def to_dict(self):
         if self.linreg:
-            return {
+            out = {
                 'x_var': self.x_var,
                 'y_var': self.y_var,
                 'slope': float(self.slope),
@@ -55,6 +59,20 @@ class CharLinReg:
                 'stderr': float(self.stderr),
                 'intercept_stderr': float(self.intercept_stderr),
             }
+            if self.weighted:
+                # same keys as the calibration fit results, slope and intercept share the fit chi2
+                chi2 = float(self.linreg.chi2)
+                ndof = int(self.linreg.ndof)
+                chi2_reduced = chi2 / ndof if ndof > 0 else 0.0
+                out.update({
+                    'weighted': True,
+                    'slope_chi2': chi2,
+                    'intercept_chi2': chi2,
+                    'slope_chi2_reduced': chi2_reduced,
+                    'intercept_chi2_reduced': chi2_reduced,
+                    'ndof': ndof,
+                })
+            return out
         raise AttributeError("No linear regression result available")
 
 @dataclass
@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING
 import pandas as pd
 
 from characterization.helpers import get_logger
+from characterization.helpers.frame_merge import merge_sorted_frames
 from characterization.config import config
 from .analysis.photodiode_analysis import PhotodiodeAnalysis
 from .plots.photodiode_plots import PhotodiodePlots
@@ -41,8 +42,7 @@ class Photodiode(BaseElement):
         if self._df is None:
             if not self.files:
                 return pd.DataFrame()
-            self._df = pd.concat([cf.df for cf in self.files if cf.df is not None], ignore_index=True)
-            self._df = self._df.sort_values(by='timestamp').reset_index(drop=True)
+            self._df = self._merge_children('df')
         return self._df
 
     @property
@@ -50,8 +50,7 @@ class Photodiode(BaseElement):
         if self._df_pedestals is None:
             if not self.files:
                 return pd.DataFrame()
-            self._df_pedestals = pd.concat([cf.df_pedestals for cf in self.files if cf.df_pedestals is not None], ignore_index=True)
-            self._df_pedestals = self._df_pedestals.sort_values(by='timestamp').reset_index(drop=True)
+            self._df_pedestals = self._merge_children('df_pedestals')
         return self._df_pedestals
 
     @property
@@ -59,10 +58,14 @@ class Photodiode(BaseElement):
         if self._df_full is None:
             if not self.files:
                 return pd.DataFrame()
-            self._df_full = pd.concat([cf.df_full for cf in self.files if cf.df_full is not None], ignore_index=True)
-            self._df_full = self._df_full.sort_values(by='timestamp').reset_index(drop=True)
+            self._df_full = self._merge_children('df_full')
         return self._df_full
 
+    def _merge_children(self, kind: str, columns: list[str] | None = None) -> pd.DataFrame | None:
+        if not self.files:
+            return pd.DataFrame()
+        return merge_sorted_frames([getattr(cf, kind) for cf in self.files], columns=columns)
+
     def add_file(self, sweep_file: 'SweepFile'):
         if sweep_file.sensor_id != self.sensor_id:
             logger.error("File sensor id does not match photodiode id: %s", sweep_file.file_info['filename'])
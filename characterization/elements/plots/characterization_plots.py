@@ -2,13 +2,15 @@
 
 from typing import TYPE_CHECKING
 import numpy as np
+from matplotlib.artist import setp
 from matplotlib.patches import Rectangle
 
 from characterization.helpers import get_logger
 from characterization.helpers.fileset_selector import select_fileset_for_wavelength
 from characterization.config import config, simulation_values
+from .figures import new_subplots
 from .plot_base import BasePlots
-from matplotlib import pyplot as plt
+from .plot_registry import producer
 
 if TYPE_CHECKING:
     from ..characterization import Characterization
@@ -16,6 +18,21 @@ if TYPE_CHECKING:
 logger = get_logger()
 
 class CharacterizationPlots(BasePlots):
+    plot_level = 'characterization'
+    PLOT_PRODUCERS = (
+        producer('_gen_saturation_points_by_filter', 'saturation_points_by_filter'),
+        producer('_gen_refpd_vs_adc_linregs', r'refpd_vs_adc_linregs_\d+', include_rp=True),
+        producer('_gen_refpd_vs_adc_linregs', r'refpd_vs_adc_linregs_\d+_simp', include_rp=False),
+        producer('_gen_relative_slope_deviation_by_gain_and_wavelength', r'relative_slope_deviation_by_gain_\w+'),
+        producer('_gen_voltage_slope_vs_intercept_by_wavelength', r'linreg_voltage_slope_vs_intercept_\w+'),
+        producer('_gen_power_slope_vs_intercept_by_wavelength', r'linreg_power_slope_vs_intercept_\w+'),
+        producer('_gen_power_range_rectangles_by_wavelength', r'power_range_by_sensor_\d+'),
+        producer('_gen_power_vs_adc_linregs', r'power_vs_adc_linregs_\d+_simp', include_extra=False),
+        producer('_gen_refpd_pedestals_timeseries', 'refpd_pedestals_timeseries', include_temp=False),
+        producer('_gen_refpd_pedestals_timeseries', 'refpd_pedestals_timeseries_temp', include_temp=True),
+        producer('_gen_refpd_pedestals_histogram', 'refpd_pedestals_histogram'),
+    )
+
     def __init__(self, characterization: 'Characterization'):
         super().__init__()
         self._data_holder: Characterization = characterization
@@ -28,17 +45,7 @@ class CharacterizationPlots(BasePlots):
     def generate_plots(self):
         if not config.generate_plots:
             return
-        self._gen_saturation_points_by_filter()
-        self._gen_refpd_vs_adc_linregs(include_rp=True)
-        self._gen_refpd_vs_adc_linregs(include_rp=False)
-        self._gen_relative_slope_deviation_by_gain_and_wavelength()
-        self._gen_voltage_slope_vs_intercept_by_wavelength()
-        self._gen_power_slope_vs_intercept_by_wavelength()
-        self._gen_power_range_rectangles_by_wavelength()
-        self._gen_power_vs_adc_linregs(include_extra=False)
-        self._gen_refpd_pedestals_timeseries(include_temp=False)
-        self._gen_refpd_pedestals_timeseries(include_temp=True)
-        self._gen_refpd_pedestals_histogram()
+        self.render_plots()
 
     def _gen_saturation_points_by_filter(self):
         valid_setups = sorted({
@@ -66,7 +73,7 @@ class CharacterizationPlots(BasePlots):
                 run_labels
             )
 
-        fig, axes = plt.subplots(nrows=len(run_labels), ncols=1, figsize=(12, 4 * len(run_labels)), sharex=True)
+        fig, axes = new_subplots(nrows=len(run_labels), ncols=1, figsize=(12, 4 * len(run_labels)), sharex=True)
         if len(run_labels) == 1:
             axes = [axes]
 
@@ -97,11 +104,10 @@ class CharacterizationPlots(BasePlots):
             ax.legend(loc='upper right')
 
         axes[-1].set_xlabel("Sensor")
-        plt.setp(axes[-1].get_xticklabels(), rotation=45, ha='right')
+        setp(axes[-1].get_xticklabels(), rotation=45, ha='right')
         fig.suptitle(f"{self._plot_label()} - Saturation points by wavelength/filter", y=1.02)
-        plt.tight_layout()
+        fig.tight_layout()
         self.savefig(fig, "saturation_points_by_filter")
-        plt.close(fig)
 
     def _gen_refpd_vs_adc_linregs(self, include_rp: bool = True):
         run_labels = sorted({
@@ -163,7 +169,7 @@ class CharacterizationPlots(BasePlots):
             sensors, sensor_labels, slopes, slope_errs, intercepts, intercept_errs, r_values, p_values = map(list, zip(*rows))
 
             nrows = 3 if include_rp else 2
-            fig, axes = plt.subplots(nrows=nrows, ncols=1, figsize=(12, 4 * nrows), sharex=True)
+            fig, axes = new_subplots(nrows=nrows, ncols=1, figsize=(12, 4 * nrows), sharex=True)
             x = list(range(len(sensor_labels)))
 
             axes[0].errorbar(x, slopes, yerr=slope_errs, fmt=self._m("linreg_slope"), color=self._c("linreg_slope"), label='Slope')
@@ -198,11 +204,10 @@ class CharacterizationPlots(BasePlots):
             axes[-1].set_xlabel("Sensor")
             axes[-1].set_xticks(x)
             axes[-1].set_xticklabels(sensor_labels)
-            plt.setp(axes[-1].get_xticklabels(), rotation=45, ha='right')
-            plt.tight_layout(rect=[0, 0, 1, 0.95])
+            setp(axes[-1].get_xticklabels(), rotation=45, ha='right')
+            fig.tight_layout(rect=[0, 0, 1, 0.95])
             suffix = "" if include_rp else "_simp"
             self.savefig(fig, f"refpd_vs_adc_linregs_{wavelength_label}{suffix}")
-            plt.close(fig)
 
     def _gen_power_vs_adc_linregs(self, include_extra: bool = True):
         run_labels = sorted({
@@ -261,7 +266,7 @@ class CharacterizationPlots(BasePlots):
             sensors, sensor_labels, slopes, slope_errs, intercepts, intercept_errs = map(list, zip(*rows))
 
             nrows = 3 if include_extra else 2
-            fig, axes = plt.subplots(nrows=nrows, ncols=1, figsize=(12, 4 * nrows), sharex=True)
+            fig, axes = new_subplots(nrows=nrows, ncols=1, figsize=(12, 4 * nrows), sharex=True)
             x = list(range(len(sensor_labels)))
 
             axes[0].errorbar(x, slopes, yerr=slope_errs, fmt=self._m("power_slope"), color=self._c("power_slope"), label='Slope')
@@ -296,11 +301,10 @@ class CharacterizationPlots(BasePlots):
             axes[-1].set_xlabel("Sensor")
             axes[-1].set_xticks(x)
             axes[-1].set_xticklabels(sensor_labels)
-            plt.setp(axes[-1].get_xticklabels(), rotation=45, ha='right')
-            plt.tight_layout(rect=[0, 0, 1, 0.95])
+            setp(axes[-1].get_xticklabels(), rotation=45, ha='right')
+            fig.tight_layout(rect=[0, 0, 1, 0.95])
             suffix = "" if include_extra else "_simp"
             self.savefig(fig, f"power_vs_adc_linregs_{wavelength_label}{suffix}")
-            plt.close(fig)
 
     def _select_fileset_for_wavelength(self, sensor_id: str, filesets: dict, wavelength: str):
         selection = select_fileset_for_wavelength(
@@ -328,18 +332,15 @@ class CharacterizationPlots(BasePlots):
             return
 
         fig_id = "refpd_pedestals_timeseries" + ("_temp" if include_temp else "")
-        fig, ax = plt.subplots(figsize=(12, 6))
-
-        if 'datetime' in df.columns:
-            x = df['datetime']
-        else:
-            x = range(len(df))
+        fig, ax = new_subplots(figsize=(12, 6))
 
         y = df['ref_pd_mean']
         mean = float(y.mean())
         std = float(y.std())
+        rows = self._timeseries_rows(df.reset_index(drop=True), 'ref_pd_mean', 'ref_pd_std')
+        x = rows['datetime'] if 'datetime' in df.columns else rows.index
         self._draw_confidence_band(ax, mean, std, metric="ref_pd_mean", orientation="h")
-        ax.errorbar(x, y, yerr=df['ref_pd_std'], color=self._c("ref_pd_mean"), fmt=self._m("ref_pd_mean"), markersize=5, linewidth=1, label='RefPD pedestals', zorder=20)
+        ax.errorbar(x, rows['ref_pd_mean'], yerr=rows['ref_pd_std'], color=self._c("ref_pd_mean"), fmt=self._m("ref_pd_mean"), markersize=5, linewidth=1, label='RefPD pedestals', zorder=20)
 
         ax.set_title("characterization ref PD pedestals")
         ax.set_ylabel("RefPD (V)", color=self._c("ref_pd_mean"))
@@ -349,7 +350,9 @@ class CharacterizationPlots(BasePlots):
 
         if include_temp and 'temperature' in df.columns:
             ax_temp = ax.twinx()
-            ax_temp.plot(x, df['temperature'], color=self._c("temperature"), marker=self._m("temperature"), linestyle=self._ls("temperature"), linewidth=1.2, label='Temperature')
+            rows = self._timeseries_rows(df.reset_index(drop=True), 'temperature')
+            x = rows['datetime'] if 'datetime' in df.columns else rows.index
+            ax_temp.plot(x, rows['temperature'], color=self._c("temperature"), marker=self._m("temperature"), linestyle=self._ls("temperature"), linewidth=1.2, label='Temperature')
             ax_temp.set_ylabel("Temperature (°C)", color=self._c("temperature"))
             ax_temp.tick_params(axis='y', labelcolor=self._c("temperature"))
             h1, l1 = ax.get_legend_handles_labels()
@@ -358,9 +361,8 @@ class CharacterizationPlots(BasePlots):
         else:
             ax.legend(loc='best')
 
-        plt.tight_layout()
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_refpd_pedestals_histogram(self):
         df = self._data_holder.df_pedestals
@@ -369,7 +371,7 @@ class CharacterizationPlots(BasePlots):
             return
 
         fig_id = "refpd_pedestals_histogram"
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = new_subplots(figsize=(10, 6))
 
         y = df['ref_pd_mean']
         mean = float(y.mean())
@@ -384,9 +386,8 @@ class CharacterizationPlots(BasePlots):
         ax.grid(True)
         ax.legend(loc='best')
 
-        plt.tight_layout()
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _collect_linreg_rows_by_group(self) -> dict[str, list[dict]]:
         grouped: dict[str, list[dict]] = {}
@@ -435,7 +436,7 @@ class CharacterizationPlots(BasePlots):
 
         for wavelength, gain_rows in sorted(by_wavelength_gain.items()):
             gain_keys = sorted(gain_rows.keys())
-            fig, axes = plt.subplots(nrows=len(gain_keys), ncols=1, figsize=(12, 4 * len(gain_keys)), sharex=False)
+            fig, axes = new_subplots(nrows=len(gain_keys), ncols=1, figsize=(12, 4 * len(gain_keys)), sharex=False)
             if len(gain_keys) == 1:
                 axes = [axes]
 
@@ -459,12 +460,11 @@ class CharacterizationPlots(BasePlots):
                 ax.set_xticklabels(x_labels)
                 ax.grid(True, axis='y')
                 ax.legend(loc='upper right')
-                plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+                setp(ax.get_xticklabels(), rotation=45, ha='right')
 
             axes[-1].set_xlabel("Sensor")
-            plt.tight_layout()
+            fig.tight_layout()
             self.savefig(fig, f"relative_slope_deviation_by_gain_{wavelength}")
-            plt.close(fig)
 
     def _collect_linreg_scatter_points(self) -> dict[str, dict[str, list[dict]]]:
         grouped = self._collect_linreg_rows_by_group()
@@ -500,7 +500,7 @@ class CharacterizationPlots(BasePlots):
             return
 
         for wavelength, filter_rows in sorted(by_wavelength_filter.items()):
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = new_subplots(figsize=(10, 6))
             plotted_any = False
             for idx, (filter_group, rows) in enumerate(sorted(filter_rows.items())):
                 if not rows:
@@ -513,7 +513,6 @@ class CharacterizationPlots(BasePlots):
                 plotted_any = True
 
             if not plotted_any:
-                plt.close(fig)
                 continue
 
             ax.set_title(f"Slope vs intercept (voltage) - {wavelength}")
@@ -524,9 +523,8 @@ class CharacterizationPlots(BasePlots):
             ax.grid(True)
             ax.legend(loc='best', title="Filter group")
 
-            plt.tight_layout()
+            fig.tight_layout()
             self.savefig(fig, f"linreg_voltage_slope_vs_intercept_{wavelength}")
-            plt.close(fig)
 
     def _gen_power_slope_vs_intercept_by_wavelength(self):
         by_wavelength_filter = self._collect_linreg_scatter_points()
@@ -536,7 +534,7 @@ class CharacterizationPlots(BasePlots):
         power_unit = self._data_holder.calibration_info.get("power_unit") or "power"
 
         for wavelength, filter_rows in sorted(by_wavelength_filter.items()):
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = new_subplots(figsize=(10, 6))
             plotted_any = False
             for idx, (filter_group, rows) in enumerate(sorted(filter_rows.items())):
                 rows_with_power = [
@@ -553,7 +551,6 @@ class CharacterizationPlots(BasePlots):
                 plotted_any = True
 
             if not plotted_any:
-                plt.close(fig)
                 continue
 
             ax.set_title(f"Slope vs intercept (power) - {wavelength}")
@@ -564,9 +561,8 @@ class CharacterizationPlots(BasePlots):
             ax.grid(True)
             ax.legend(loc='best', title="Filter group")
 
-            plt.tight_layout()
+            fig.tight_layout()
             self.savefig(fig, f"linreg_power_slope_vs_intercept_{wavelength}")
-            plt.close(fig)
 
     @staticmethod
     def _compute_power_range_from_conversion(conv: dict | None, adc_min: int = 0, adc_max: int = 4095) -> dict | None:
@@ -698,7 +694,7 @@ class CharacterizationPlots(BasePlots):
             )
             x = np.arange(len(rows), dtype=float)
             rect_width = 0.68
-            fig, ax = plt.subplots(figsize=(12, 6))
+            fig, ax = new_subplots(figsize=(12, 6))
 
             y_min = min(r["power_low"] for r in rows)
             y_max = max(r["power_high"] for r in rows)
@@ -816,13 +812,12 @@ class CharacterizationPlots(BasePlots):
             ax.set_ylim(y_min - y_pad, y_max + y_pad)
             ax.set_xticks(x)
             ax.set_xticklabels([r["label"] for r in rows])
-            plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+            setp(ax.get_xticklabels(), rotation=45, ha='right')
             ax.set_ylabel(f"Power ({power_unit})")
             ax.set_xlabel("Sensor")
             ax.set_title(f"ADC-to-power range by sensor - {wavelength_label}")
             ax.grid(True, axis='y', alpha=0.3)
             ax.legend(loc="best")
 
-            plt.tight_layout()
+            fig.tight_layout()
             self.savefig(fig, f"power_range_by_sensor_{wavelength_label}")
-            plt.close(fig)
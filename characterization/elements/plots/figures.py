@@ -0,0 +1,82 @@
+"""Figures rendered without pyplot.
+
+The figures are plain matplotlib Figure objects attached to their own Agg
+canvas: they are not registered in pyplot (no "current" figure, nothing to
+close, they are released with their last reference), so they can be built
+and saved concurrently from several threads. Saving in a vector format (pdf,
+svg) uses the matching backend of the canvas.
+
+In vector formats every marker and error bar is a path of its own: the
+marker and error bar layers of the axes drawing many of them can be
+rasterized (see rasterize_dense_layers) to keep the files small and fast to
+render, axes, text, legends and plain lines (e.g. fits) staying vectors.
+"""
+from __future__ import annotations
+
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.figure import Figure
+from matplotlib.gridspec import GridSpec
+from matplotlib.lines import Line2D
+
+VECTOR_FORMATS = ('pdf', 'svg')
+
+
+def new_figure(**fig_kw) -> Figure:
+    """Return a new figure with its own canvas (fig_kw as for matplotlib Figure, e.g. figsize, constrained_layout)"""
+    fig = Figure(**fig_kw)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def new_subplots(nrows: int = 1, ncols: int = 1, *, sharex=False, sharey=False, squeeze: bool = True,
+                 width_ratios=None, height_ratios=None, subplot_kw=None, gridspec_kw=None, **fig_kw):
+    """Equivalent of pyplot.subplots for a figure with its own canvas: return the figure and its axes"""
+    fig = new_figure(**fig_kw)
+    axes = fig.subplots(nrows, ncols, sharex=sharex, sharey=sharey, squeeze=squeeze, width_ratios=width_ratios,
+                        height_ratios=height_ratios, subplot_kw=subplot_kw, gridspec_kw=gridspec_kw)
+    return fig, axes
+
+
+def add_grid_subplot(fig: Figure, shape: tuple[int, int], loc: tuple[int, int], rowspan: int = 1, colspan: int = 1) -> Axes:
+    """Equivalent of pyplot.subplot2grid on the given figure (the axes of a shape share their grid)"""
+    for ax in fig.get_axes():
+        spec = ax.get_subplotspec()
+        if spec is not None and spec.get_gridspec().get_geometry() == tuple(shape):
+            gs = spec.get_gridspec()
+            break
+    else:
+        gs = GridSpec(shape[0], shape[1], figure=fig)
+    return fig.add_subplot(gs.new_subplotspec(loc, rowspan=rowspan, colspan=colspan))
+
+
+def _drawn_points(artist: Artist) -> int:
+    """Number of markers (or error bars) drawn by a data layer, 0 for other artists"""
+    if isinstance(artist, Line2D):
+        return len(artist.get_xydata()) if artist.get_marker() not in ('None', 'none', '', ' ', None) else 0
+    if isinstance(artist, PathCollection):
+        return len(artist.get_offsets())
+    if isinstance(artist, LineCollection):
+        return len(artist.get_segments())
+    return 0
+
+
+def rasterize_dense_layers(fig: Figure, min_points: int | None) -> bool:
+    """Rasterize the marker and error bar layers of the axes drawing at least min_points markers and error bars.
+
+    Return whether a layer was rasterized (nothing is if min_points is None or 0).
+    """
+    if not min_points:
+        return False
+    rasterized = False
+    for ax in fig.get_axes():
+        layers = [(artist, _drawn_points(artist)) for artist in (*ax.lines, *ax.collections)]
+        if sum(points for _, points in layers) < min_points:
+            continue
+        for artist, points in layers:
+            if points:
+                artist.set_rasterized(True)
+        rasterized = True
+    return rasterized
@@ -1,11 +1,12 @@
 """Characterization file plots"""
 
 from typing import TYPE_CHECKING
-import matplotlib.pyplot as plt
 import numpy as np
 
 from characterization.helpers import get_logger
+from .figures import new_figure
 from .plot_base import BasePlots
+from .plot_registry import producer
 
 if TYPE_CHECKING:
     from ..sweep_file import SweepFile
@@ -13,6 +14,14 @@ if TYPE_CHECKING:
 logger = get_logger()
 
 class FilePlots(BasePlots):
+    plot_level = 'file'
+    PLOT_PRODUCERS = (
+        producer('_gen_timeseries_plot', 'timeseries'),
+        producer('_gen_dut_vs_laser_setpoint', 'dut_vs_laser_setpoint'),
+        producer('_gen_refpd_vs_laser_setpoint', 'refpd_vs_laser_setpoint'),
+        producer('_gen_refpd_vs_dut', 'refpd_vs_dut'),
+    )
+
     def __init__(self, char_file: 'SweepFile'):
         super().__init__()
         self._data_holder = char_file
@@ -34,76 +43,78 @@ class FilePlots(BasePlots):
         if self.cf.df is None or self.cf.df.empty:
             logger.error("No analysis dataframe for file: %s", self.cf.file_info['filename'])
             return
+        self.render_plots()
 
-        df = self.cf.df
-        self._gen_timeseries_plot()
-
+    def _gen_dut_vs_laser_setpoint(self):
         fig_id = "dut_vs_laser_setpoint"
-        fig = plt.figure(figsize=(10, 6))
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
         df_full = self.cf.df_full
         run_label = f"{self._pd_label()} run{self.cf.run}"
-        plt.errorbar(df_full['laser_setpoint'], df_full['mean_adc'], yerr=df_full['std_adc'],
+        ax.errorbar(df_full['laser_setpoint'], df_full['mean_adc'], yerr=df_full['std_adc'],
                      fmt=self._m("mean_adc"), color=self._c("mean_adc"), markersize=8, linewidth=1, label=run_label)
-        plt.ylabel(f'{self._pd_label()} (ADC counts)', color=self._c("mean_adc"))
-        plt.xlabel(self.laser_label)
+        ax.set_ylabel(f'{self._pd_label()} (ADC counts)', color=self._c("mean_adc"))
+        ax.set_xlabel(self.laser_label)
         if self.cf.wavelength == '1064':
-            plt.gca().xaxis.label.set_color(self._c("laser_sp_1064"))
-            plt.gca().tick_params(axis='x', labelcolor=self._c("laser_sp_1064"))
+            ax.xaxis.label.set_color(self._c("laser_sp_1064"))
+            ax.tick_params(axis='x', labelcolor=self._c("laser_sp_1064"))
         elif self.cf.wavelength == '532':
-            plt.gca().xaxis.label.set_color(self._c("laser_sp_532"))
-            plt.gca().tick_params(axis='x', labelcolor=self._c("laser_sp_532"))
-        plt.gca().tick_params(axis='y', labelcolor=self._c("mean_adc"))
-        plt.grid()
-        plt.title(f'{self.level_label} - DUT vs {self.laser_label}')
-        plt.legend(loc='best')
-        plt.tight_layout()
+            ax.xaxis.label.set_color(self._c("laser_sp_532"))
+            ax.tick_params(axis='x', labelcolor=self._c("laser_sp_532"))
+        ax.tick_params(axis='y', labelcolor=self._c("mean_adc"))
+        ax.grid()
+        ax.set_title(f'{self.level_label} - DUT vs {self.laser_label}')
+        ax.legend(loc='best')
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
+    def _gen_refpd_vs_laser_setpoint(self):
         fig_id = "refpd_vs_laser_setpoint"
-        fig = plt.figure(figsize=(10, 6))
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
+        df_full = self.cf.df_full
         run_label = f"{self._pd_label()} run{self.cf.run}"
-        plt.errorbar(df_full['laser_setpoint'], df_full['ref_pd_mean'], yerr=df_full['ref_pd_std'],
+        ax.errorbar(df_full['laser_setpoint'], df_full['ref_pd_mean'], yerr=df_full['ref_pd_std'],
                      fmt=self._m("ref_pd_mean"), color=self._c("ref_pd_mean"), markersize=8, linewidth=1, label=run_label)
-        plt.ylabel('RefPD (V)', color=self._c("ref_pd_mean"))
-        plt.xlabel(self.laser_label)
+        ax.set_ylabel('RefPD (V)', color=self._c("ref_pd_mean"))
+        ax.set_xlabel(self.laser_label)
         if self.cf.wavelength == '1064':
-            plt.gca().xaxis.label.set_color(self._c("laser_sp_1064"))
-            plt.gca().tick_params(axis='x', labelcolor=self._c("laser_sp_1064"))
+            ax.xaxis.label.set_color(self._c("laser_sp_1064"))
+            ax.tick_params(axis='x', labelcolor=self._c("laser_sp_1064"))
         elif self.cf.wavelength == '532':
-            plt.gca().xaxis.label.set_color(self._c("laser_sp_532"))
-            plt.gca().tick_params(axis='x', labelcolor=self._c("laser_sp_532"))
-        plt.gca().tick_params(axis='y', labelcolor=self._c("ref_pd_mean"))
-        plt.grid()
-        plt.title(f'{self.level_label} - RefPD vs {self.laser_label}')
-        plt.legend(loc='best')
-        plt.tight_layout()
+            ax.xaxis.label.set_color(self._c("laser_sp_532"))
+            ax.tick_params(axis='x', labelcolor=self._c("laser_sp_532"))
+        ax.tick_params(axis='y', labelcolor=self._c("ref_pd_mean"))
+        ax.grid()
+        ax.set_title(f'{self.level_label} - RefPD vs {self.laser_label}')
+        ax.legend(loc='best')
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
+    def _gen_refpd_vs_dut(self):
         fig_id = "refpd_vs_dut"
-        fig = plt.figure(figsize=(10, 6))
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
         df_full = self.cf.df_full
-        plt.errorbar(df_full['mean_adc'], df_full['ref_pd_mean'], yerr=df_full['ref_pd_std'],
+        ax.errorbar(df_full['mean_adc'], df_full['ref_pd_mean'], yerr=df_full['ref_pd_std'],
                      fmt=self._m("ref_pd_mean"), color=self._c("ref_pd_mean"), markersize=8, linewidth=1, label='data')
-        # plt.axvline(4095, color=self._c("linreg_region"), linestyle=self._ls("linreg_region"), linewidth=1.2, label='linear/saturation boundary')
-        # plt.axvline(4300, color=self._c("saturation_region"), linestyle=self._ls("saturation_region"), linewidth=1.2, label='saturation max')
-        plt.axvspan(0, 4095, color=self._c("linreg_region"), alpha=0.3, label='linear region')
-        plt.axvspan(4095, 4300, color=self._c("saturation_region"), alpha=0.3, label='saturation')        
+        # ax.axvline(4095, color=self._c("linreg_region"), linestyle=self._ls("linreg_region"), linewidth=1.2, label='linear/saturation boundary')
+        # ax.axvline(4300, color=self._c("saturation_region"), linestyle=self._ls("saturation_region"), linewidth=1.2, label='saturation max')
+        ax.axvspan(0, 4095, color=self._c("linreg_region"), alpha=0.3, label='linear region')
+        ax.axvspan(4095, 4300, color=self._c("saturation_region"), alpha=0.3, label='saturation')        
         if self.cf.anal.lr_refpd_vs_adc.linreg is not None:
             intercept = self.cf.anal.lr_refpd_vs_adc.intercept
             slope = self.cf.anal.lr_refpd_vs_adc.slope
             xline = np.linspace(0, 4095, 200)
             fit_label = f"fit: y={slope:.2e}x+{intercept:.2e}"
-            plt.plot(xline, intercept + slope * xline, color=self._c("fit_line"), linestyle=self._ls("fit_line"), linewidth=2, label=fit_label)
-        plt.ylabel('RefPD (V)', color=self._c("ref_pd_mean"))
-        plt.xlabel(f'{self._pd_label()} (ADC counts)', color=self._c("mean_adc"))
-        plt.gca().tick_params(axis='x', labelcolor=self._c("mean_adc"))
-        plt.gca().tick_params(axis='y', labelcolor=self._c("ref_pd_mean"))
-        plt.grid()
-        plt.xlim(-50, 4200)
-        plt.title(f'{self.level_label} - Ref PD vs DUT')
-        plt.legend(loc='best')
-        plt.tight_layout()
+            ax.plot(xline, intercept + slope * xline, color=self._c("fit_line"), linestyle=self._ls("fit_line"), linewidth=2, label=fit_label)
+        ax.set_ylabel('RefPD (V)', color=self._c("ref_pd_mean"))
+        ax.set_xlabel(f'{self._pd_label()} (ADC counts)', color=self._c("mean_adc"))
+        ax.tick_params(axis='x', labelcolor=self._c("mean_adc"))
+        ax.tick_params(axis='y', labelcolor=self._c("ref_pd_mean"))
+        ax.grid()
+        ax.set_xlim(-50, 4200)
+        ax.set_title(f'{self.level_label} - Ref PD vs DUT')
+        ax.legend(loc='best')
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
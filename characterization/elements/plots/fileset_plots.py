@@ -2,10 +2,11 @@
 
 from typing import TYPE_CHECKING
 import numpy as np
-import matplotlib.pyplot as plt
 
 from characterization.helpers import get_logger
+from .figures import new_figure, new_subplots
 from .plot_base import BasePlots
+from .plot_registry import producer
 
 if TYPE_CHECKING:
     from ..fileset import Fileset
@@ -14,6 +15,16 @@ logger = get_logger()
 
 
 class FilesetPlots(BasePlots):
+    plot_level = 'fileset'
+    PLOT_PRODUCERS = (
+        producer('_gen_timeseries_plot', 'timeseries'),
+        producer('_gen_fit_slopes_intercepts_vs_run', 'fit_slopes_intercepts_vs_run_vert', 'fit_slopes_intercepts_vs_run_horiz'),
+        producer('_gen_saturation_points_vs_run', 'saturation_points_vs_run'),
+        producer('_gen_refpd_vs_laser_setpoint', 'refpd_vs_laser_setpoint'),
+        producer('_gen_refpd_vs_dut', 'refpd_vs_dut'),
+        producer('_gen_dut_vs_laser_setpoint', 'dut_vs_laser_setpoint'),
+    )
+
     def __init__(self, fileset: 'Fileset'):
         super().__init__()
         self._data_holder: Fileset = fileset
@@ -36,38 +47,34 @@ class FilesetPlots(BasePlots):
         if df is None:
             logger.error("No analysis dataframe for fileset: %s", self.fs.label)
             return
-        self._gen_timeseries_plot()
+        self.render_plots(self.PLOT_PRODUCERS[:1])
         try:
-            self._gen_fit_slopes_intercepts_vs_run()
-            self._gen_saturation_points_vs_run()
-            self._gen_refpd_vs_laser_setpoint()
-            self._gen_refpd_vs_dut()
-            self._gen_dut_vs_laser_setpoint()
+            self.render_plots(self.PLOT_PRODUCERS[1:])
         except Exception as e:
             logger.error("Error generating plots for fileset %s: %s", self.fs.label, str(e))
     def _gen_dut_vs_laser_setpoint(self):
         fig_id = "dut_vs_laser_setpoint"
-        fig = plt.figure(figsize=(10, 6))
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
         for idx, sweep in enumerate(self.fs.files):
             df_full = sweep.df_full
             label = f"run{sweep.run}"
-            plt.errorbar(df_full['laser_setpoint'], df_full['mean_adc'], yerr=df_full['std_adc'],
+            ax.errorbar(df_full['laser_setpoint'], df_full['mean_adc'], yerr=df_full['std_adc'],
                          fmt=self._series_marker(idx, base_marker=self._m("mean_adc")), markersize=6, linewidth=1, color=self._c("mean_adc"), label=label)
-        plt.ylabel(f'{self._pd_label()} (ADC counts)', color=self._c("mean_adc"))
-        plt.xlabel(self.laser_label)
+        ax.set_ylabel(f'{self._pd_label()} (ADC counts)', color=self._c("mean_adc"))
+        ax.set_xlabel(self.laser_label)
         if self.fs.wavelength == '1064':
-            plt.gca().xaxis.label.set_color(self._c("laser_sp_1064"))
-            plt.gca().tick_params(axis='x', labelcolor=self._c("laser_sp_1064"))
+            ax.xaxis.label.set_color(self._c("laser_sp_1064"))
+            ax.tick_params(axis='x', labelcolor=self._c("laser_sp_1064"))
         elif self.fs.wavelength == '532':
-            plt.gca().xaxis.label.set_color(self._c("laser_sp_532"))
-            plt.gca().tick_params(axis='x', labelcolor=self._c("laser_sp_532"))
-        plt.gca().tick_params(axis='y', labelcolor=self._c("mean_adc"))
-        plt.grid()
-        plt.title(f'{self.level_label} - DUT vs {self.laser_label}')
-        plt.legend(loc='best', ncol=2, fontsize=8)
-        plt.tight_layout()
+            ax.xaxis.label.set_color(self._c("laser_sp_532"))
+            ax.tick_params(axis='x', labelcolor=self._c("laser_sp_532"))
+        ax.tick_params(axis='y', labelcolor=self._c("mean_adc"))
+        ax.grid()
+        ax.set_title(f'{self.level_label} - DUT vs {self.laser_label}')
+        ax.legend(loc='best', ncol=2, fontsize=8)
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_saturation_points_vs_run(self):
         fig_id = "saturation_points_vs_run"
@@ -86,73 +93,73 @@ class FilesetPlots(BasePlots):
         runs = [runs[i] for i in order]
         sat_counts = [sat_counts[i] for i in order]
 
-        fig = plt.figure(figsize=(8, 4))
-        plt.bar(runs, sat_counts, color=self._c("saturation_points"), label='saturated points')
-        plt.xlabel('Run number in set')
-        plt.ylabel('Saturated points', color=self._c("saturation_points"))
-        plt.gca().tick_params(axis='y', labelcolor=self._c("saturation_points"))
-        plt.xticks(runs)
-        plt.xlim([0.5, max(runs) + 0.5])
-        plt.grid(True)
-        plt.legend(loc='best')
-        plt.tight_layout()
+        fig = new_figure(figsize=(8, 4))
+        ax = fig.add_subplot()
+        ax.bar(runs, sat_counts, color=self._c("saturation_points"), label='saturated points')
+        ax.set_xlabel('Run number in set')
+        ax.set_ylabel('Saturated points', color=self._c("saturation_points"))
+        ax.tick_params(axis='y', labelcolor=self._c("saturation_points"))
+        ax.set_xticks(runs)
+        ax.set_xlim([0.5, max(runs) + 0.5])
+        ax.grid(True)
+        ax.legend(loc='best')
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_refpd_vs_laser_setpoint(self):
         fig_id = "refpd_vs_laser_setpoint"
-        fig = plt.figure(figsize=(10, 6))
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
         for idx, sweep in enumerate(self.fs.files):
             df_full = sweep.df_full
             label = f"run{sweep.run}"
-            plt.errorbar(df_full['laser_setpoint'], df_full['ref_pd_mean'], yerr=df_full['ref_pd_std'],
+            ax.errorbar(df_full['laser_setpoint'], df_full['ref_pd_mean'], yerr=df_full['ref_pd_std'],
                          fmt=self._series_marker(idx, base_marker=self._m("ref_pd_mean")), markersize=6, linewidth=1, color=self._c("ref_pd_mean"), label=label)
-        plt.ylabel('RefPD (V)', color=self._c("ref_pd_mean"))
-        plt.xlabel(self.laser_label)
+        ax.set_ylabel('RefPD (V)', color=self._c("ref_pd_mean"))
+        ax.set_xlabel(self.laser_label)
         if self.fs.wavelength == '1064':
-            plt.gca().xaxis.label.set_color(self._c("laser_sp_1064"))
-            plt.gca().tick_params(axis='x', labelcolor=self._c("laser_sp_1064"))
+            ax.xaxis.label.set_color(self._c("laser_sp_1064"))
+            ax.tick_params(axis='x', labelcolor=self._c("laser_sp_1064"))
         elif self.fs.wavelength == '532':
-            plt.gca().xaxis.label.set_color(self._c("laser_sp_532"))
-            plt.gca().tick_params(axis='x', labelcolor=self._c("laser_sp_532"))
-        plt.gca().tick_params(axis='y', labelcolor=self._c("ref_pd_mean"))
-        plt.grid()
-        plt.title(f'{self.level_label} - RefPD vs {self.laser_label}')
-        plt.legend(loc='best', ncol=2, fontsize=8)
-        plt.tight_layout()
+            ax.xaxis.label.set_color(self._c("laser_sp_532"))
+            ax.tick_params(axis='x', labelcolor=self._c("laser_sp_532"))
+        ax.tick_params(axis='y', labelcolor=self._c("ref_pd_mean"))
+        ax.grid()
+        ax.set_title(f'{self.level_label} - RefPD vs {self.laser_label}')
+        ax.legend(loc='best', ncol=2, fontsize=8)
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_refpd_vs_dut(self):
         fig_id = "refpd_vs_dut"
-        fig = plt.figure(figsize=(10, 6))
+        fig = new_figure(figsize=(10, 6))
+        ax = fig.add_subplot()
         for idx, sweep in enumerate(self.fs.files):
             df_full = sweep.df_full
             label = f"run{sweep.run}"
-            plt.errorbar(df_full['mean_adc'], df_full['ref_pd_mean'], yerr=df_full['ref_pd_std'],
+            ax.errorbar(df_full['mean_adc'], df_full['ref_pd_mean'], yerr=df_full['ref_pd_std'],
                          fmt=self._series_marker(idx, base_marker=self._m("ref_pd_mean")), markersize=6, linewidth=1, color=self._c("ref_pd_mean"), label=label)
 
-        # plt.axvline(4095, color=self._c("linreg_region"), linestyle=self._ls("linreg_region"), linewidth=1.2, label='linear/saturation boundary')
-        # plt.axvline(4300, color=self._c("saturation_region"), linestyle=self._ls("saturation_region"), linewidth=1.2, label='saturation max')
-        plt.axvspan(0, 4095, color=self._c("linreg_region"), label='linear region')
-        plt.axvspan(4095, 4300, color=self._c("saturation_region"), label='saturation')
+        # ax.axvline(4095, color=self._c("linreg_region"), linestyle=self._ls("linreg_region"), linewidth=1.2, label='linear/saturation boundary')
+        # ax.axvline(4300, color=self._c("saturation_region"), linestyle=self._ls("saturation_region"), linewidth=1.2, label='saturation max')
+        ax.axvspan(0, 4095, color=self._c("linreg_region"), label='linear region')
+        ax.axvspan(4095, 4300, color=self._c("saturation_region"), label='saturation')
         if self.fs.anal.lr_refpd_vs_adc.linreg is not None:
             intercept = self.fs.anal.lr_refpd_vs_adc.intercept
             slope = self.fs.anal.lr_refpd_vs_adc.slope
             xline = np.linspace(0, 4095, 200)
             fit_label = f"fit: y={slope:.2e}x+{intercept:.2e}"
-            plt.plot(xline, intercept + slope * xline, color=self._c("fit_line"), linestyle=self._ls("fit_line"), linewidth=2, label=fit_label)
-        plt.ylabel('RefPD (V)', color=self._c("ref_pd_mean"))
-        plt.xlabel(f'{self._pd_label()} (ADC counts)', color=self._c("mean_adc"))
-        plt.gca().tick_params(axis='x', labelcolor=self._c("mean_adc"))
-        plt.gca().tick_params(axis='y', labelcolor=self._c("ref_pd_mean"))
-        plt.grid()
-        plt.xlim(-50, 4200)
-        plt.title(f'{self.level_label} - Ref PD vs DUT')
-        plt.legend(loc='best', ncol=2, fontsize=8)
-        plt.tight_layout()
+            ax.plot(xline, intercept + slope * xline, color=self._c("fit_line"), linestyle=self._ls("fit_line"), linewidth=2, label=fit_label)
+        ax.set_ylabel('RefPD (V)', color=self._c("ref_pd_mean"))
+        ax.set_xlabel(f'{self._pd_label()} (ADC counts)', color=self._c("mean_adc"))
+        ax.tick_params(axis='x', labelcolor=self._c("mean_adc"))
+        ax.tick_params(axis='y', labelcolor=self._c("ref_pd_mean"))
+        ax.grid()
+        ax.set_xlim(-50, 4200)
+        ax.set_title(f'{self.level_label} - Ref PD vs DUT')
+        ax.legend(loc='best', ncol=2, fontsize=8)
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_fit_slopes_intercepts_vs_run(self):
         self._gen_fit_slopes_intercepts_vs_run_plot(orientation='vertical')
@@ -189,9 +196,9 @@ class FilesetPlots(BasePlots):
         intercepts_stderr = [intercepts_stderr[i] for i in order]
 
         if orientation == 'vertical':
-            fig, (ax1, ax2) = plt.subplots(nrows=2, ncols=1, figsize=(8, 10), sharex=True)
+            fig, (ax1, ax2) = new_subplots(nrows=2, ncols=1, figsize=(8, 10), sharex=True)
         else:
-            fig, (ax1, ax2) = plt.subplots(nrows=1, ncols=2, figsize=(14, 6), sharex=True)
+            fig, (ax1, ax2) = new_subplots(nrows=1, ncols=2, figsize=(14, 6), sharex=True)
 
         # Slopes
         ax1.errorbar(
@@ -245,4 +252,3 @@ class FilesetPlots(BasePlots):
 
         fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
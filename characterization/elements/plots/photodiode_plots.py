@@ -1,11 +1,13 @@
 """Photodiode plots"""
 
 from typing import TYPE_CHECKING
-from matplotlib import pyplot as plt
 
 from characterization.helpers import get_logger
 from characterization.config import config
+from .figures import new_subplots
 from .plot_base import BasePlots
+from .plot_registry import producer
+from .plot_scheduler import PlotScheduler
 
 if TYPE_CHECKING:
     from ..photodiode import Photodiode
@@ -13,6 +15,14 @@ if TYPE_CHECKING:
 logger = get_logger()
 
 class PhotodiodePlots(BasePlots):
+    plot_level = 'photodiode'
+    PLOT_PRODUCERS = (
+        producer('_gen_timeseries_plot', 'timeseries'),
+        producer('_gen_refpd_pedestals_timeseries', 'refpd_pedestals_timeseries', include_temp=False),
+        producer('_gen_refpd_pedestals_timeseries', 'refpd_pedestals_timeseries_temp', include_temp=True),
+        producer('_gen_refpd_pedestals_histogram', 'refpd_pedestals_histogram'),
+    )
+
     def __init__(self, photodiode: 'Photodiode'):
         super().__init__()
         self._data_holder: Photodiode = photodiode
@@ -22,19 +32,32 @@ class PhotodiodePlots(BasePlots):
         return self._data_holder.output_path if self._data_holder.output_path else '.'
 
     def generate_plots(self):
-        self._gen_timeseries_plot()
-        self._gen_refpd_pedestals_timeseries(include_temp=False)
-        self._gen_refpd_pedestals_timeseries(include_temp=True)
-        self._gen_refpd_pedestals_histogram()
+        scheduler = PlotScheduler()
+        self.schedule_plots(scheduler)
+        scheduler.run()
+
+    def schedule_plots(self, scheduler: PlotScheduler):
+        if self.selected_producers():
+            scheduler.add(self, '_gen_photodiode_plots')
+        if config.generate_file_plots:
+            for cf in self._data_holder.files:
+                cf.plotter.schedule_plots(scheduler)
+        for fs in self._data_holder.filesets.values():
+            fs.plotter.schedule_plots(scheduler)
+        # the children plots follow those of the photodiode
+        scheduler.call(self._collect_children_plots)
+
+    def _gen_photodiode_plots(self):
+        self.render_plots()
+
+    def _collect_children_plots(self):
         if config.generate_file_plots:
             fileplots = self.plots.setdefault('files', {})
             for cf in self._data_holder.files:
-                cf.plotter.generate_plots()
                 fileplots[cf.level_header] = cf.plotter.plots
 
         fileset_plots = self.plots.setdefault('filesets', {})
         for key, fs in self._data_holder.filesets.items():
-            fs.generate_plots()
             fileset_plots[key] = fs.plotter.plots
 
     def _gen_refpd_pedestals_timeseries(self, include_temp: bool = False):
@@ -44,19 +67,16 @@ class PhotodiodePlots(BasePlots):
             return
 
         fig_id = "refpd_pedestals_timeseries" + ("_temp" if include_temp else "")
-        fig, ax = plt.subplots(figsize=(12, 6))
-
-        if 'datetime' in df.columns:
-            x = df['datetime']
-        else:
-            x = range(len(df))
+        fig, ax = new_subplots(figsize=(12, 6))
 
         y = df['ref_pd_mean']
         mean = float(y.mean())
         std = float(y.std())
+        rows = self._timeseries_rows(df.reset_index(drop=True), 'ref_pd_mean', 'ref_pd_std')
+        x = rows['datetime'] if 'datetime' in df.columns else rows.index
 
         self._draw_confidence_band(ax, mean, std, metric="ref_pd_mean", orientation="h")
-        ax.errorbar(x, y, yerr=df['ref_pd_std'], color=self._c("ref_pd_mean"), fmt=self._m("ref_pd_mean"), markersize=5, linewidth=1, label='RefPD pedestals', zorder=20)
+        ax.errorbar(x, rows['ref_pd_mean'], yerr=rows['ref_pd_std'], color=self._c("ref_pd_mean"), fmt=self._m("ref_pd_mean"), markersize=5, linewidth=1, label='RefPD pedestals', zorder=20)
 
         ax.set_title("photodiode ref PD pedestals")
         ax.set_ylabel("RefPD (V)", color=self._c("ref_pd_mean"))
@@ -66,7 +86,9 @@ class PhotodiodePlots(BasePlots):
 
         if include_temp and 'temperature' in df.columns:
             ax_temp = ax.twinx()
-            ax_temp.plot(x, df['temperature'], color=self._c("temperature"), marker=self._m("temperature"), linestyle=self._ls("temperature"), linewidth=1.2, label='Temperature')
+            rows = self._timeseries_rows(df.reset_index(drop=True), 'temperature')
+            x = rows['datetime'] if 'datetime' in df.columns else rows.index
+            ax_temp.plot(x, rows['temperature'], color=self._c("temperature"), marker=self._m("temperature"), linestyle=self._ls("temperature"), linewidth=1.2, label='Temperature')
             ax_temp.set_ylabel("Temperature (°C)", color=self._c("temperature"))
             ax_temp.tick_params(axis='y', labelcolor=self._c("temperature"))
             h1, l1 = ax.get_legend_handles_labels()
@@ -75,9 +97,8 @@ class PhotodiodePlots(BasePlots):
         else:
             ax.legend(loc='best')
 
-        plt.tight_layout()
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
 
     def _gen_refpd_pedestals_histogram(self):
         df = self._data_holder.df_pedestals
@@ -86,7 +107,7 @@ class PhotodiodePlots(BasePlots):
             return
 
         fig_id = "refpd_pedestals_histogram"
-        fig, ax = plt.subplots(figsize=(10, 6))
+        fig, ax = new_subplots(figsize=(10, 6))
 
         y = df['ref_pd_mean']
         mean = float(y.mean())
@@ -101,6 +122,5 @@ class PhotodiodePlots(BasePlots):
         ax.grid(True)
         ax.legend(loc='best')
 
-        plt.tight_layout()
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
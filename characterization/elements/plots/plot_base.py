@@ -2,13 +2,21 @@ from abc import ABC, abstractmethod
 import os
 
 import pandas as pd
-from matplotlib import pyplot as plt
 
 from characterization.config import config
+from characterization.helpers import plot_cache
+from characterization.helpers.downsample import downsample_rows
 from characterization.helpers.file_manage import get_base_output_path
+from .figures import VECTOR_FORMATS, add_grid_subplot, new_figure, rasterize_dense_layers
+from .plot_registry import PlotProducer, select_producers
 from .style_spec import BAND_ALPHA, MEAN_LINESTYLE, metric_style
 
 class BasePlots(ABC):
+    # level of the plots in a plot selection (see plot_registry)
+    plot_level = ''
+    # producers of the figures of the data holder, in rendering order
+    PLOT_PRODUCERS: tuple[PlotProducer, ...] = ()
+
     def __init__(self) -> None:
         self.plots = {}
         self._data_holder = None
@@ -42,6 +50,20 @@ class BasePlots(ABC):
     def generate_plots(self):
         pass
 
+    def schedule_plots(self, scheduler):
+        """Add the jobs rendering the plots of the data holder (and of its children) to a PlotScheduler"""
+        if self.selected_producers():
+            scheduler.add(self)
+
+    def selected_producers(self, producers=None) -> list[PlotProducer]:
+        """Return the producers (by default all of PLOT_PRODUCERS) of the figures selected at the plot level"""
+        return select_producers(self.PLOT_PRODUCERS if producers is None else producers, self.plot_level)
+
+    def render_plots(self, producers=None):
+        """Render the selected figures of the given producers (by default all of PLOT_PRODUCERS)"""
+        for plot_producer in self.selected_producers(producers):
+            plot_producer.render(self)
+
     def add_plot_path(self, fig_id: str, fig_path: str):
         base_output_path = get_base_output_path()
         fig_path = os.path.relpath(fig_path, start=base_output_path)
@@ -52,7 +74,10 @@ class BasePlots(ABC):
         fig.text(0.99, 0.01, self._plot_label(),
                  ha='right', va='bottom', fontsize=8, color='gray')
         fig_path = os.path.join(self.output_path, f"{fig_filename or fig_id}.{plot_format}")
-        plt.savefig(fig_path)
+        savefig_kw = {}
+        if plot_format in VECTOR_FORMATS and rasterize_dense_layers(fig, config.rasterize_min_points):
+            savefig_kw['dpi'] = config.rasterize_dpi
+        plot_cache.save_figure(fig, fig_path, plot_format, **savefig_kw)
         self.add_plot_path(fig_id, fig_path)
 
     def _plot_label(self) -> str:
@@ -104,12 +129,22 @@ class BasePlots(ABC):
         ax.axhspan(mean - std, mean + std, color=color, alpha=BAND_ALPHA, label="mean ± std", zorder=0)
         ax.axhline(mean, color=color, linestyle=MEAN_LINESTYLE, linewidth=1.5, label="mean", zorder=1)
 
+    TIMESERIES_COLUMNS = [
+        'datetime', 'ref_pd_mean', 'ref_pd_std', 'mean_adc', 'std_adc',
+        'laser_sp_1064', 'laser_sp_532', 'temperature', 'RH',
+    ]
+
+    def _timeseries_rows(self, df: pd.DataFrame, column: str, std_column: str | None = None) -> pd.DataFrame:
+        """Rows of df drawn for the series df[column], downsampled to config.timeseries_max_points."""
+        return downsample_rows(df, column, std_column, config.timeseries_max_points)
+
     def _gen_timeseries_plot(self):
         """Generate timeseries plot with dual axes for characterization data."""
-        if self.df_full is None or self.df_full.empty:
+        df_full = self.dh.project(self.TIMESERIES_COLUMNS, 'df_full')
+        if df_full.empty:
             return
-        dt_min = self.df_full['datetime'].min()
-        dt_max = self.df_full['datetime'].max()
+        dt_min = df_full['datetime'].min()
+        dt_max = df_full['datetime'].max()
         if pd.isna(dt_min) or pd.isna(dt_max):
             return
         dt_span = dt_max - dt_min
@@ -119,17 +154,19 @@ class BasePlots(ABC):
         right_pad = dt_span * 0.2
         x_limits = (dt_min - left_pad, dt_max + right_pad)
         fig_id = "timeseries"
-        fig = plt.figure(figsize=(12, 10))
+        fig = new_figure(figsize=(12, 10))
 
         # Top plot: ref_pd_mean and mean_adc vs time
-        ax1 = plt.subplot2grid((5, 1), (0, 0), rowspan=2)
+        ax1 = add_grid_subplot(fig, (5, 1), (0, 0), rowspan=2)
         ax1_twin = ax1.twinx()
-        ax1.errorbar(self.df_full['datetime'], self.df_full['ref_pd_mean'], yerr=self.df_full['ref_pd_std'],
+        rows = self._timeseries_rows(df_full, 'ref_pd_mean', 'ref_pd_std')
+        ax1.errorbar(rows['datetime'], rows['ref_pd_mean'], yerr=rows['ref_pd_std'],
                      c=self._c("ref_pd_mean"), fmt=self._m("ref_pd_mean"), markersize=5, linewidth=1, label='Ref PD')
         ax1.set_ylabel('Ref PD (V)', color=self._c("ref_pd_mean"))
         self._apply_axis_metric_color(ax1, "ref_pd_mean", axis="y")
 
-        ax1_twin.errorbar(self.df_full['datetime'], self.df_full['mean_adc'], yerr=self.df_full['std_adc'],
+        rows = self._timeseries_rows(df_full, 'mean_adc', 'std_adc')
+        ax1_twin.errorbar(rows['datetime'], rows['mean_adc'], yerr=rows['std_adc'],
                           c=self._c("mean_adc"), fmt=self._m("mean_adc"), markersize=5, linewidth=1, label=f'{self._pd_label()} (ADC)')
         ax1_twin.set_ylabel(f'{self._pd_label()} (ADC counts)', color=self._c("mean_adc"))
         self._apply_axis_metric_color(ax1_twin, "mean_adc", axis="y")
@@ -142,21 +179,24 @@ class BasePlots(ABC):
         ax1.grid(True)
 
         # Middle plot: laser setpoints vs time
-        ax2 = plt.subplot2grid((5, 1), (2, 0), rowspan=2)
-        has_1064 = 'laser_sp_1064' in self.df_full.columns and self.df_full['laser_sp_1064'].notna().any()
-        has_532 = 'laser_sp_532' in self.df_full.columns and self.df_full['laser_sp_532'].notna().any()
+        ax2 = add_grid_subplot(fig, (5, 1), (2, 0), rowspan=2)
+        has_1064 = 'laser_sp_1064' in df_full.columns and df_full['laser_sp_1064'].notna().any()
+        has_532 = 'laser_sp_532' in df_full.columns and df_full['laser_sp_532'].notna().any()
 
         if has_1064 and has_532:
             ax2_twin = ax2.twinx()
+            rows = self._timeseries_rows(df_full, 'laser_sp_1064')
             ax2_twin.scatter(
-                self.df_full['datetime'], self.df_full['laser_sp_1064'],
+                rows['datetime'], rows['laser_sp_1064'],
                 c=self._c("laser_sp_1064"), label='1064nm laser setpoint (mW)', marker=self._m("laser_sp_1064"), s=10
             )
             ax2_twin.set_ylabel('1064nm laser setpoint (mW)', color=self._c("laser_sp_1064"))
             self._apply_axis_metric_color(ax2_twin, "laser_sp_1064", axis="y")
 
+            rows = self._timeseries_rows(df_full, 'laser_sp_532')
+
             ax2.scatter(
-                self.df_full['datetime'], self.df_full['laser_sp_532'],
+                rows['datetime'], rows['laser_sp_532'],
                 c=self._c("laser_sp_532"), label='532nm laser setpoint (mA)', marker=self._m("laser_sp_532"), s=10
             )
             ax2.set_ylabel('532nm laser setpoint (mA)', color=self._c("laser_sp_532"))
@@ -167,15 +207,17 @@ class BasePlots(ABC):
             ax2.legend(h1 + h2, l1 + l2, loc='upper right')
         elif has_1064 or has_532:
             if has_1064:
+                rows = self._timeseries_rows(df_full, 'laser_sp_1064')
                 ax2.scatter(
-                    self.df_full['datetime'], self.df_full['laser_sp_1064'],
+                    rows['datetime'], rows['laser_sp_1064'],
                     c=self._c("laser_sp_1064"), label='1064nm laser setpoint (mW)', marker=self._m("laser_sp_1064"), s=10
                 )
                 ax2.set_ylabel('1064nm laser setpoint (mW)', color=self._c("laser_sp_1064"))
                 self._apply_axis_metric_color(ax2, "laser_sp_1064", axis="y")
             else:
+                rows = self._timeseries_rows(df_full, 'laser_sp_532')
                 ax2.scatter(
-                    self.df_full['datetime'], self.df_full['laser_sp_532'],
+                    rows['datetime'], rows['laser_sp_532'],
                     c=self._c("laser_sp_532"), label='532nm laser setpoint (mA)', marker=self._m("laser_sp_532"), s=10
                 )
                 ax2.set_ylabel('532nm laser setpoint (mA)', color=self._c("laser_sp_532"))
@@ -186,11 +228,12 @@ class BasePlots(ABC):
         ax2.grid(True)
 
         # Bottom plot: Temperature and RH vs time
-        ax3 = plt.subplot2grid((5, 1), (4, 0), rowspan=1)
+        ax3 = add_grid_subplot(fig, (5, 1), (4, 0), rowspan=1)
         ax3_twin = ax3.twinx()
+        rows = self._timeseries_rows(df_full, 'temperature')
         ax3.plot(
-            self.df_full['datetime'],
-            self.df_full['temperature'],
+            rows['datetime'],
+            rows['temperature'],
             c=self._c("temperature"),
             marker=self._m("temperature"),
             linestyle=self._ls("temperature"),
@@ -200,9 +243,10 @@ class BasePlots(ABC):
         )
         ax3.set_ylabel('Temperature (°C)', color=self._c("temperature"))
         self._apply_axis_metric_color(ax3, "temperature", axis="y")
+        rows = self._timeseries_rows(df_full, 'RH')
         ax3_twin.plot(
-            self.df_full['datetime'],
-            self.df_full['RH'],
+            rows['datetime'],
+            rows['RH'],
             c=self._c("RH"),
             marker=self._m("RH"),
             linestyle=self._ls("RH"),
@@ -220,6 +264,5 @@ class BasePlots(ABC):
         ax3.set_xlim(x_limits)
         ax3.grid(True)
 
-        plt.tight_layout()
+        fig.tight_layout()
         self.savefig(fig, fig_id)
-        plt.close(fig)
@@ -0,0 +1,91 @@
+"""Rendering of plot jobs in a process pool.
+
+A plot job is a plotter and the name of its method rendering the figures of one
+element (not those of its children). With more than one worker the jobs are
+rendered in forked processes, which inherit the analyzed elements without
+pickling them, and every worker returns the `plots` entries registered by its
+job. Those entries are merged into the plotters of the parent process in the
+order the jobs were added, together with the steps run in the parent (see
+PlotScheduler.call), so the `plots` dictionaries are the same as with a serial
+rendering. Platforms without fork render the jobs serially.
+"""
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Callable
+
+import matplotlib
+
+from characterization.config import config
+from characterization.helpers import file_manage, get_logger, plot_cache
+
+if TYPE_CHECKING:
+    from .plot_base import BasePlots
+
+logger = get_logger()
+
+# jobs of the running pool, inherited by its forked workers
+_pending: list[tuple[BasePlots, str]] = []
+
+
+def _init_plot_worker(config_values: dict, base_output_path: str, cache: plot_cache.PlotRenderCache | None):
+    """Process pool initializer: replicate the parent configuration, output path and plot cache, render off screen"""
+    matplotlib.use('Agg')
+    config.update_from_dict(config_values)
+    file_manage.set_base_output_path(base_output_path)
+    plot_cache.set_cache(cache)
+
+
+def _render_job(index: int) -> dict:
+    """Render a pending job in a worker and return the plots it registered"""
+    plotter, method = _pending[index]
+    plotter.plots = {}
+    getattr(plotter, method)()
+    return plotter.plots
+
+
+class PlotScheduler:
+    """Collects plot jobs and renders them with up to `jobs` worker processes"""
+
+    def __init__(self, jobs: int = 1):
+        self.jobs = max(1, int(jobs))
+        self._entries: list[tuple[BasePlots | None, str | Callable[[], None]]] = []
+
+    def add(self, plotter: BasePlots, method: str = 'generate_plots'):
+        """Add a job rendering the figures of `plotter` with its `method`"""
+        self._entries.append((plotter, method))
+
+    def call(self, step: Callable[[], None]):
+        """Add a step run in this process once the jobs added before it are rendered"""
+        self._entries.append((None, step))
+
+    def run(self):
+        """Render the jobs added so far (in the order they were added when serial)"""
+        entries, self._entries = self._entries, []
+        jobs = [(plotter, method) for plotter, method in entries if plotter is not None]
+        workers = min(self.jobs, len(jobs))
+        if workers <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+            for plotter, method in entries:
+                if plotter is None:
+                    method()
+                else:
+                    getattr(plotter, method)()
+            return
+
+        global _pending
+        logger.info("Rendering %d plot jobs using %d worker processes", len(jobs), workers)
+        _pending = jobs
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('fork'),
+                                     initializer=_init_plot_worker,
+                                     initargs=({**config.to_dict(), **config.plot_settings()}, file_manage.get_base_output_path(),
+                                               plot_cache.get_cache())) as pool:
+                rendered = pool.map(_render_job, range(len(jobs)))
+                for plotter, method in entries:
+                    if plotter is None:
+                        method()
+                    else:
+                        plotter.plots.update(next(rendered))
+        finally:
+            _pending = []
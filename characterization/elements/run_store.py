@@ -0,0 +1,85 @@
+"""Compact storage of the prepared data of a single run file"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+class RunStore:
+    """One backing DataFrame with every row of a run file plus named row selections.
+
+    Selections are kept as slices or positional row indices and projected on
+    first access, so the filtered, pedestal (and saturated) frames of a file do
+    not hold their own copies of the data. Slices (contiguous index selections
+    included) are projected as views of the backing frame, other index
+    selections with a single ``take``. Projections are kept until the selection
+    or the backing frame (see set_column) changes; they share memory with the
+    backing frame and must be treated as read-only.
+    """
+    ROWS_PREFIX = 'rows/'
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self._rows: dict[str, slice | np.ndarray] = {}
+        self._views: dict[str, pd.DataFrame] = {}
+
+    def __getstate__(self):
+        # projections are rebuilt on access: do not copy them (e.g. from the loading worker processes)
+        return {**self.__dict__, '_views': {}}
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def select(self, name: str, rows: slice | np.ndarray | pd.Series):
+        """Register a row selection given as a slice, a boolean mask or positional indices"""
+        if not isinstance(rows, slice):
+            rows = np.asarray(rows)
+            if rows.dtype == bool:
+                rows = np.flatnonzero(rows)
+            rows = rows.astype(np.intp, copy=False)
+            if len(rows) and rows[0] >= 0 and np.all(np.diff(rows) == 1):
+                rows = slice(int(rows[0]), int(rows[-1]) + 1)
+        self._rows[name] = rows
+        self._views.pop(name, None)
+
+    def set_column(self, column: str, values):
+        """Add (or replace) a column of the backing frame, the selections are projected again on their next access"""
+        self.frame[column] = values
+        self._views.clear()
+
+    def rows(self, name: str) -> np.ndarray:
+        """Return the positional row indices of a selection"""
+        rows = self._rows[name]
+        if isinstance(rows, slice):
+            return np.arange(len(self.frame))[rows]
+        return rows
+
+    def count(self, name: str) -> int:
+        """Return the number of rows of a selection"""
+        return len(self.rows(name))
+
+    def view(self, name: str) -> pd.DataFrame:
+        """Return the rows of a selection as a DataFrame with a default RangeIndex"""
+        out = self._views.get(name)
+        if out is None:
+            rows = self._rows[name]
+            out = self.frame.iloc[rows] if isinstance(rows, slice) else self.frame.take(rows)
+            out.index = pd.RangeIndex(len(out))
+            self._views[name] = out
+        return out
+
+    def to_frames(self) -> dict[str, pd.DataFrame]:
+        """Return the backing frame and the selections as frames (for the parsed-data cache)"""
+        frames = {'full': self.frame}
+        for name in self._rows:
+            frames[f"{self.ROWS_PREFIX}{name}"] = pd.DataFrame({'row': self.rows(name).astype(np.int64)})
+        return frames
+
+    @classmethod
+    def from_frames(cls, frames: dict[str, pd.DataFrame]) -> RunStore:
+        """Rebuild a store from the output of to_frames"""
+        store = cls(frames['full'])
+        for key, rows in frames.items():
+            if key.startswith(cls.ROWS_PREFIX):
+                store.select(key[len(cls.ROWS_PREFIX):], rows['row'].to_numpy())
+        return store
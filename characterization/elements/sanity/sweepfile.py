@@ -14,6 +14,10 @@ class SweepFileSanityChecker:
     def san_check_minimum_linreg_points(self, minimum_linreg_points: int, severity='warning') -> SanityCheckResult:
         df = self.sw.df
         n = 0 if df is None else int(df.shape[0])
+        return self.minimum_linreg_points_result(n, minimum_linreg_points, severity)
+
+    @staticmethod
+    def minimum_linreg_points_result(n: int, minimum_linreg_points: int, severity='warning') -> SanityCheckResult:
         passed = n >= minimum_linreg_points
         return SanityCheckResult(
             severity=severity,
@@ -35,9 +39,15 @@ class SweepFileSanityChecker:
     def san_check_low_total_counts(self, min_total_counts: int = 250, severity='warning') -> SanityCheckResult:
         df = self.sw.df_full
         if df is None or df.empty:
-            return SanityCheckResult(severity, 'low_total_counts', min_total_counts, False, info='No data', exec_error=True)
+            return self.low_total_counts_result(None, min_total_counts, severity)
         low = df['total_counts'] < min_total_counts
-        count = int(low.sum())
+        return self.low_total_counts_result(int(low.sum()), min_total_counts, severity)
+
+    @staticmethod
+    def low_total_counts_result(count: int | None, min_total_counts: int = 250, severity='warning') -> SanityCheckResult:
+        """Result for the number of total_counts values below the threshold (None without data)"""
+        if count is None:
+            return SanityCheckResult(severity, 'low_total_counts', min_total_counts, False, info='No data', exec_error=True)
         passed = count == 0
         return SanityCheckResult(
             severity=severity,
@@ -58,9 +68,13 @@ class SweepFileSanityChecker:
 
     def san_check_minimum_saturated_points(self, minimum_saturated_points: int = 3, severity='error') -> SanityCheckResult:
         df = self.sw.df_sat
-        if df is None or df.empty:
+        count = 0 if df is None else int(df.shape[0])
+        return self.minimum_saturated_points_result(count, minimum_saturated_points, severity)
+
+    @staticmethod
+    def minimum_saturated_points_result(count: int, minimum_saturated_points: int = 3, severity='error') -> SanityCheckResult:
+        if count == 0:
             return SanityCheckResult(severity, 'minimum_saturated_points', minimum_saturated_points, False, info='No data', exec_error=True)
-        count = int(df.shape[0])
         passed = count >= minimum_saturated_points
         return SanityCheckResult(
             severity=severity,
@@ -0,0 +1,63 @@
+"""Sweepfile-level sanity checks evaluated on all the sweep files at once"""
+from __future__ import annotations
+
+import numpy as np
+
+from ..helpers import SanityCheckResult
+from .sweepfile import SweepFileSanityChecker
+
+
+class SweepFileBatchSanityChecker:
+    """Evaluates the sweepfile checks of many sweep files in one pass.
+
+    Row counts come from the run stores of the sweeps without projecting their
+    frames, and the columns scanned by the checks are stacked once for all the
+    sweeps and reduced per sweep. Each san_check_* method returns the results of
+    all the sweeps, in order, built as SweepFileSanityChecker would build them;
+    None is returned for sweeps that are not valid, they are checked one by one.
+    """
+    level_name = 'sweepfile'
+
+    def __init__(self, sweep_files: list):
+        self.elements = list(sweep_files)
+        self._valid = np.array([bool(sw.valid) for sw in self.elements], dtype=bool)
+        self._total_counts: tuple[np.ndarray, np.ndarray] | None = None
+
+    def _row_counts(self, kind: str) -> list[int | None]:
+        return [sw.row_count(kind) if valid else None for sw, valid in zip(self.elements, self._valid)]
+
+    def _stacked_total_counts(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the total_counts of the full frames of the valid sweeps and the sweep index of every value"""
+        if self._total_counts is None:
+            columns = [
+                self.elements[i].df_full['total_counts'].to_numpy(dtype=np.float64, na_value=np.nan)
+                for i in np.flatnonzero(self._valid)
+            ]
+            keys = np.repeat(np.flatnonzero(self._valid), [len(values) for values in columns])
+            values = np.concatenate(columns) if columns else np.empty(0)
+            self._total_counts = (values, keys)
+        return self._total_counts
+
+    def san_check_minimum_linreg_points(self, minimum_linreg_points: int, severity='warning') -> list[SanityCheckResult | None]:
+        return [
+            None if n is None else SweepFileSanityChecker.minimum_linreg_points_result(n, minimum_linreg_points, severity)
+            for n in self._row_counts('df')
+        ]
+
+    def san_check_minimum_saturated_points(self, minimum_saturated_points: int = 3, severity='error') -> list[SanityCheckResult | None]:
+        return [
+            None if n is None else SweepFileSanityChecker.minimum_saturated_points_result(n, minimum_saturated_points, severity)
+            for n in self._row_counts('df_sat')
+        ]
+
+    def san_check_low_total_counts(self, min_total_counts: int = 250, severity='warning') -> list[SanityCheckResult | None]:
+        values, keys = self._stacked_total_counts()
+        n_elements = len(self.elements)
+        rows = np.bincount(keys, minlength=n_elements)
+        low = np.bincount(keys, weights=values < min_total_counts, minlength=n_elements).astype(np.int64)
+        return [
+            None if not valid else SweepFileSanityChecker.low_total_counts_result(
+                int(count) if n_rows else None, min_total_counts, severity
+            )
+            for valid, n_rows, count in zip(self._valid, rows, low)
+        ]
@@ -5,12 +5,15 @@ from typing import TYPE_CHECKING
 
 import yaml
 
-from characterization.helpers import get_logger
+from characterization.config import config
+from characterization.helpers import get_logger, sanity_cache
+from characterization.helpers.batch_manifest import tool_version
 from .helpers import SanityCheckResult
 
 from .sanity.characterization import CharacterizationSanityChecker
 from .sanity.fileset import FilesetSanityChecker
 from .sanity.sweepfile import SweepFileSanityChecker
+from .sanity.sweepfile_batch import SweepFileBatchSanityChecker
 
 if TYPE_CHECKING:
     from .characterization import Characterization
@@ -19,6 +22,9 @@ logger = get_logger()
 
 file_path = os.path.dirname(os.path.abspath(__file__))
 config_file = os.path.abspath(os.path.join(file_path, '..', 'sanity_checks_config.yaml'))
+# configuration settings that do not change the checked data (left out of the data fingerprints)
+OUTPUT_SETTINGS = ('plot_output_format', 'generate_plots', 'generate_file_plots', 'summary_file_name',
+                   'plot_selection', 'timeseries_max_points', 'rasterize_min_points', 'rasterize_dpi')
 
 
 class Counter:
@@ -50,7 +56,15 @@ class SanityChecks:
         self.config = {}
         self.results = {}
         self._c = Counter()
+        self._cache: sanity_cache.SanityResultCache | None = None
+        self._fingerprints: dict[int, str] = {}
+        self._cached: dict[str, dict] = {}
+        self._new_results: dict[str, dict] = {}
         self._load_config()
+        if config.use_sanity_cache:
+            self._cache = sanity_cache.open_cache(
+                os.path.join(self.char.meta['root_output_path'], sanity_cache.CACHE_FILE_NAME)
+            )
 
     def _load_config(self):
         try:
@@ -73,9 +87,108 @@ class SanityChecks:
     def sweepfile_checks_config(self) -> dict:
         return self.config.get('sweepfile', {})
 
-    def _run_check_methods(self, severity, checks, checker):
+    def _compute_fingerprints(self) -> dict[int, str]:
+        """Data fingerprint of the characterization, filesets and sweeps (by object id), empty if a sweep has none"""
+        sweeps = [sw for pdh in self.char.photodiodes.values() for fs in pdh.filesets.values() for sw in fs.files]
+        if any(sw.data_fingerprint is None for sw in sweeps):
+            return {}
+        settings = {k: v for k, v in config.to_dict().items() if k not in OUTPUT_SETTINGS}
+        # sources only: the thresholds of sanity_checks_config.yaml are part of the check keys
+        salt = sanity_cache.fingerprint(settings, tool_version('characterization', suffixes=('.py',)))
+        fingerprints = {}
+        photodiodes = {}
+        for pdh in self.char.photodiodes.values():
+            for fs in pdh.filesets.values():
+                for sw in fs.files:
+                    fingerprints[id(sw)] = sanity_cache.fingerprint(salt, sw.level_header, sw.data_fingerprint)
+                fingerprints[id(fs)] = sanity_cache.fingerprint(fs.level_header, [fingerprints[id(sw)] for sw in fs.files])
+            photodiodes[pdh.level_header] = [fingerprints[id(fs)] for fs in pdh.filesets.values()]
+        fingerprints[id(self.char)] = sanity_cache.fingerprint(
+            self.char.level_header, photodiodes, self.char.calibration_digest
+        )
+        return fingerprints
+
+    def _cache_keys(self, level: str, element, checks_config: dict) -> dict[tuple[str, str], str]:
+        """Cache keys of the configured checks of an element by (severity, check name), empty if not cached"""
+        data_fingerprint = self._fingerprints.get(id(element))
+        if data_fingerprint is None:
+            return {}
+        return {
+            (severity, check_name): sanity_cache.check_key(data_fingerprint, level, severity, check_name, check_params)
+            for severity, checks in checks_config.items()
+            for check_name, check_params in checks.items()
+        }
+
+    def _load_cached_results(self):
+        """Fetch from the cache the results of every configured check of every element"""
+        self._fingerprints = self._compute_fingerprints() if self._cache is not None else {}
+        self._new_results = {}
+        if not self._fingerprints:
+            self._cached = {}
+            return
+        keys = list(self._cache_keys('characterization', self.char, self.characterization_checks_config).values())
+        for pdh in self.char.photodiodes.values():
+            for fs in pdh.filesets.values():
+                keys.extend(self._cache_keys('fileset', fs, self.fileset_checks_config).values())
+                for sw in fs.files:
+                    keys.extend(self._cache_keys('sweepfile', sw, self.sweepfile_checks_config).values())
+        self._cached = self._cache.get_many(keys)
+        logger.info("Sanity checks: %d of %d results served from the cache", len(self._cached), len(keys))
+
+    @staticmethod
+    def _call_check(method, check_params, severity):
+        if check_params is None:
+            return method(severity=severity)
+        if isinstance(check_params, dict):
+            return method(**check_params, severity=severity)
+        if isinstance(check_params, list):
+            return method(*check_params, severity=severity)
+        return method(check_params, severity=severity)
+
+    def _run_batch_check_methods(self, checks_config, batch_checker, level: str) -> list[dict[str, dict[str, SanityCheckResult]]]:
+        """Evaluate the configured checks implemented by the batch checker on all its elements at once.
+
+        Return, for every element, the results by severity and check name. Checks
+        not implemented by the batch checker or failing in it (and elements it
+        returns None for) are left out, they are run by the checker of every element.
+        Checks cached for every element are not evaluated.
+        """
+        precomputed = [{} for _ in batch_checker.elements]
+        cache_keys = [self._cache_keys(level, element, checks_config) for element in batch_checker.elements]
+        for severity, checks in checks_config.items():
+            for check_name, check_params in checks.items():
+                if cache_keys and all(keys.get((severity, check_name)) in self._cached for keys in cache_keys):
+                    continue
+                check_method = getattr(batch_checker, f"san_check_{check_name}", None)
+                if check_method is None:
+                    continue
+                try:
+                    results = self._call_check(check_method, check_params, severity)
+                except Exception as e:
+                    logger.debug("Batch %s check %s failed, running it on every element: %s", batch_checker.level_name, check_name, str(e))
+                    continue
+                for element_results, result in zip(precomputed, results):
+                    if result is not None:
+                        element_results.setdefault(severity, {})[check_name] = result
+        return precomputed
+
+    def _run_check_methods(self, severity, checks, checker, precomputed: dict | None = None, cache_keys: dict | None = None):
         results = {}
+        precomputed = precomputed or {}
+        cache_keys = cache_keys or {}
         for check_name, check_params in checks.items():
+            key = cache_keys.get((severity, check_name))
+            if key in self._cached:
+                results[f"{severity}.{check_name}"] = self._cached[key]
+                self._c.check(severity, self._cached[key]['passed'])
+                continue
+            if check_name in precomputed:
+                result = precomputed[check_name]
+                results[f"{severity}.{check_name}"] = result.to_dict()
+                self._c.check(severity, result.passed)
+                if key is not None:
+                    self._new_results[key] = results[f"{severity}.{check_name}"]
+                continue
             method_name = f"san_check_{check_name}"
             check_method = getattr(checker, method_name, None)
             if check_method is None:
@@ -92,16 +205,11 @@ class SanityChecks:
                 self._c.check(severity, False)
                 continue
             try:
-                if check_params is None:
-                    result = check_method(severity=severity)
-                elif isinstance(check_params, dict):
-                    result = check_method(**check_params, severity=severity)
-                elif isinstance(check_params, list):
-                    result = check_method(*check_params, severity=severity)
-                else:
-                    result = check_method(check_params, severity=severity)
+                result = self._call_check(check_method, check_params, severity)
                 results[f"{severity}.{check_name}"] = result.to_dict()
                 self._c.check(severity, result.passed)
+                if key is not None and not result.exec_error:
+                    self._new_results[key] = results[f"{severity}.{check_name}"]
             except Exception as e:
                 result = SanityCheckResult(
                     severity=severity,
@@ -132,14 +240,7 @@ class SanityChecks:
                 }
                 continue
             try:
-                if check_params is None:
-                    info = info_method(severity=severity)
-                elif isinstance(check_params, dict):
-                    info = info_method(**check_params, severity=severity)
-                elif isinstance(check_params, list):
-                    info = info_method(*check_params, severity=severity)
-                else:
-                    info = info_method(check_params, severity=severity)
+                info = self._call_check(info_method, check_params, severity)
                 results[f"{severity}.{check_name}"] = info
             except Exception as e:
                 results[f"{severity}.{check_name}"] = {
@@ -211,12 +312,14 @@ class SanityChecks:
         logger.info("Running sanity checks...")
         self.results = {}
         defined_checks = {}
+        self._load_cached_results()
 
         checker = CharacterizationSanityChecker(self.char)
         self.results[checker.level_header] = {'checks': {}, 'photodiodes': {}}
         defined_checks['characterization_checks'] = {}
+        cache_keys = self._cache_keys('characterization', self.char, self.characterization_checks_config)
         for severity, checks in self.characterization_checks_config.items():
-            results = self._run_check_methods(severity, checks, checker)
+            results = self._run_check_methods(severity, checks, checker, cache_keys=cache_keys)
             self.results[checker.level_header]['checks'].update(results)
             info_results = self._run_info_methods(severity, checks, checker)
             defined_checks['characterization_checks'].update(info_results)
@@ -225,14 +328,18 @@ class SanityChecks:
         filesets_defined = defined_checks.setdefault('fileset_checks', {})
         first_fs = True
         first_sw = True
+        # the sweepfile checks of all the sweeps are evaluated in one pass over their stacked data
+        sweeps = [sw for pdh in self.char.photodiodes.values() for fs in pdh.filesets.values() for sw in fs.files]
+        sweep_precomputed = iter(self._run_batch_check_methods(self.sweepfile_checks_config, SweepFileBatchSanityChecker(sweeps), 'sweepfile'))
         for pdh in self.char.photodiodes.values():
             pd_res = photodiodes_results.setdefault(pdh.level_header, {'checks': {}, 'filesets': {}})
             filesets_results = pd_res['filesets']
             for fs in pdh.filesets.values():
                 checker = FilesetSanityChecker(fs)
                 fs_res = filesets_results.setdefault(fs.level_header, {'checks': {}})
+                cache_keys = self._cache_keys('fileset', fs, self.fileset_checks_config)
                 for severity, checks in self.fileset_checks_config.items():
-                    results = self._run_check_methods(severity, checks, checker)
+                    results = self._run_check_methods(severity, checks, checker, cache_keys=cache_keys)
                     fs_res['checks'].update(results)
                     info_results = self._run_info_methods(severity, checks, checker)
                     if first_fs:
@@ -243,14 +350,18 @@ class SanityChecks:
                 for sw in fs.files:
                     checker = SweepFileSanityChecker(sw)
                     sweep_results.setdefault(sw.level_header, {})
+                    precomputed = next(sweep_precomputed)
+                    cache_keys = self._cache_keys('sweepfile', sw, self.sweepfile_checks_config)
                     for severity, checks in self.sweepfile_checks_config.items():
-                        results = self._run_check_methods(severity, checks, checker)
+                        results = self._run_check_methods(severity, checks, checker, precomputed.get(severity), cache_keys)
                         sweep_results[sw.level_header].update(results)
                         info_results = self._run_info_methods(severity, checks, checker)
                         if first_sw:
                             sweep_defined.update(info_results)
                     first_sw = False
 
+        if self._cache is not None:
+            self._cache.put_many(self._new_results)
         self.results['summary'] = self._c.to_dict()
         self.results['defined_checks'] = defined_checks
         self._add_summary_issues(self.results['summary'])
@@ -1,5 +1,6 @@
 """Sweep file representation and data handling"""
 
+import io
 import os
 import re
 from typing import TYPE_CHECKING
@@ -7,12 +8,14 @@ from typing import TYPE_CHECKING
 import numpy as np
 import pandas as pd
 
-from characterization.helpers import get_logger
+from characterization.helpers import get_logger, parsed_cache
+from characterization.helpers.file_manage import InputFile
 from characterization.config import config
 
 from .analysis.sweep_file_analysis import SweepFileAnalysis
 from .plots.file_plots import FilePlots
 from .base_element import BaseElement, DataHolderLevel
+from .run_store import RunStore
 
 logger = get_logger()
 
@@ -29,9 +32,10 @@ file_name_pattern = re.compile(
 )
 
 class SweepFile(BaseElement):
-    def __init__(self, file_path: str, photodiode: 'Photodiode|None' = None):
+    def __init__(self, source: 'InputFile|str', photodiode: 'Photodiode|None' = None):
         super().__init__(DataHolderLevel.RUN)
-        self.file_path = file_path
+        self.source = source if isinstance(source, InputFile) else InputFile.from_path(source)
+        self.file_path = self.source.path
         self.dh_parent = photodiode
         self.fileset = None
         self.output_path = self._calc_output_path()
@@ -39,9 +43,10 @@ class SweepFile(BaseElement):
         self.anal = SweepFileAnalysis(self)
         self.plotter = FilePlots(self)
         self.file_info = {
-            'filename': os.path.basename(file_path),
+            'filename': self.source.name,
         }
-        self._df_sat = None
+        self._store: RunStore | None = None
+        self.data_fingerprint: str | None = None  # digest of the raw content and preparation flags
         self.initialize()
         if self.valid:
             self.level_header = self.file_label
@@ -50,32 +55,37 @@ class SweepFile(BaseElement):
 
     @property
     def base_filename(self) -> str:
-        return '.'.join(os.path.basename(self.file_path).split('.')[:-1])
+        return '.'.join(self.source.name.split('.')[:-1])
 
     @property
     def df(self) -> pd.DataFrame:
-        if self._df is not None:
-            return self._df
+        if self._store is not None:
+            return self._store.view('df')
         raise ValueError("DataFrame not loaded yet.")
 
     @property
     def df_pedestals(self) -> pd.DataFrame:
-        if self._df_pedestals is not None:
-            return self._df_pedestals
+        if self._store is not None:
+            return self._store.view('pedestals')
         raise ValueError("Pedestal DataFrame not loaded yet.")
 
     @property
     def df_full(self) -> pd.DataFrame:
-        if self._df_full is not None:
-            return self._df_full
+        if self._store is not None:
+            return self._store.frame
         raise ValueError("Full DataFrame not loaded yet.")
 
     @property
     def df_sat(self) -> pd.DataFrame:
-        if self._df_sat is not None:
-            return self._df_sat
+        if self._store is not None:
+            return self._store.view('sat')
         raise ValueError("Saturated DataFrame not loaded yet.")
 
+    def row_count(self, kind: str = 'df') -> int:
+        """Number of rows of the df, df_pedestals or df_sat frame, without projecting it"""
+        if self._store is None:
+            raise ValueError("DataFrame not loaded yet.")
+        return self._store.count({'df': 'df', 'df_pedestals': 'pedestals', 'df_sat': 'sat'}[kind])
 
     def _calc_output_path(self):
         if self.fileset:
@@ -119,7 +129,38 @@ class SweepFile(BaseElement):
         self.load_data()
 
     def load_data(self):
-        self._df = pd.read_csv(self.file_path, delimiter='\t', header=None)
+        raw = self.source.read_bytes()
+        cache = parsed_cache.get_cache()
+        # the parsed-data cache key also identifies the data in the sanity check results cache
+        cache_key = parsed_cache.ParsedDataCache.make_key(raw, self.source.name, self._cache_flags())
+        self.data_fingerprint = cache_key
+        cached = cache.load(cache_key) if cache else None
+        if cached is not None:
+            frames, meta = cached
+            self._store = RunStore.from_frames(frames)
+            self.data_prep_info = meta['data_prep_info']
+            self.issues.extend(meta['issues'])
+            self.valid = meta['valid']
+            logger.debug("Using cached parsed data for sweep file: %s", self.file_info['filename'])
+        else:
+            issues_before = len(self.issues)
+            self._prepare_data(raw)
+            if cache:
+                cache.store(
+                    cache_key,
+                    self._store.to_frames(),
+                    {'data_prep_info': self.data_prep_info, 'issues': self.issues[issues_before:], 'valid': self.valid}
+                )
+        logger.info("Loaded data for sweep file: %s \t shape: %s", self.file_info['filename'], (self._store.count('df'), self._store.frame.shape[1]))
+
+    @staticmethod
+    def _cache_flags() -> dict:
+        """Configuration flags that change the prepared data (part of the parsed-data cache key)"""
+        return {'subtract_pedestals': config.subtract_pedestals}
+
+    def _prepare_data(self, raw: bytes):
+        """Parse the raw file content and prepare the run store (data, pedestal and saturated selections)"""
+        self._df = pd.read_csv(io.BytesIO(raw), delimiter='\t', header=None)
         # logger.debug("Loaded raw data for file %s with shape %s", self.file_info['filename'], self._df.shape)
 
         self._df.columns = [
@@ -169,24 +210,27 @@ class SweepFile(BaseElement):
         self.data_prep_info['original_num_rows'] = len(self._df)
 
         is_pedestal = np.isclose(self._df['laser_setpoint'], 0.0)
-        is_saturated = self._df['mean_adc'] >= 4095
-        self._df_pedestals = self._df[is_pedestal].copy().reset_index(drop=True)
-        self._df_full = self._df.copy()
-        self._df_sat = self._df[is_saturated].copy().reset_index(drop=True)
-        self._df = self._df[~is_pedestal & ~is_saturated].reset_index(drop=True)
-        
+        saturated = self._df['mean_adc'] >= 4095
+        is_saturated = saturated.to_numpy(dtype=bool, na_value=False)
+        # rows with a missing mean_adc are neither saturated nor valid data points
+        is_data = (~is_pedestal & ~saturated).to_numpy(dtype=bool, na_value=False)
+        self._store = RunStore(self._df)
+        self._df = None
+        self._store.select('pedestals', is_pedestal)
+        self._store.select('sat', is_saturated)
+        self._store.select('df', is_data)
+
+        full = self._store.frame
         ped_mean_adc = 0.0
         ped_ref_pd = 0.0
-        if self._df_pedestals is not None and not self._df_pedestals.empty:
-            ped_mean_adc = float(self._df_pedestals['mean_adc'].mean())
-            ped_ref_pd = float(self._df_pedestals['ref_pd_mean'].mean())
-        for df_obj in (self._df, self._df_full, self._df_sat, self._df_pedestals):
-            if df_obj is None:
-                continue
-            df_obj['mean_adc_zeroed'] = df_obj['mean_adc'] - ped_mean_adc
-            df_obj['ref_pd_zeroed'] = df_obj['ref_pd_mean'] - ped_ref_pd
-        if self._df.empty:
-            total_points = int(self._df_full.shape[0]) if self._df_full is not None else 0
+        if self._store.count('pedestals'):
+            pedestals = self._store.view('pedestals')
+            ped_mean_adc = float(pedestals['mean_adc'].mean())
+            ped_ref_pd = float(pedestals['ref_pd_mean'].mean())
+        self._store.set_column('mean_adc_zeroed', full['mean_adc'] - ped_mean_adc)
+        self._store.set_column('ref_pd_zeroed', full['ref_pd_mean'] - ped_ref_pd)
+        if self._store.count('df') == 0:
+            total_points = len(self._store)
             num_pedestals = int(is_pedestal.sum())
             num_saturated = int(is_saturated.sum())
             if total_points == 0:
@@ -227,7 +271,6 @@ class SweepFile(BaseElement):
         self.data_prep_info['original_num_pedestals'] = int(is_pedestal.sum())
         self.data_prep_info['original_num_saturated'] = int(is_saturated.sum())
         self.data_prep_info['subtract_pedestals'] = bool(config.subtract_pedestals)
-        logger.info("Loaded data for sweep file: %s \t shape: %s", self.file_info['filename'], self._df.shape)
 
     def analyze(self):
         if self.output_path:
@@ -237,8 +280,8 @@ class SweepFile(BaseElement):
         self.set_time_info()
 
     def set_file_info(self):
-        self.file_info['num_points'] = len(self._df)
-        self.file_info['file_size_bytes'] = os.path.getsize(self.file_path)
+        self.file_info['num_points'] = self._store.count('df')
+        self.file_info['file_size_bytes'] = self.source.size
 
     @property
     def sensor_id(self) -> str:
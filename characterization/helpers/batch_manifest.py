@@ -0,0 +1,140 @@
+"""Manifest of the items processed by the batch runner.
+
+The manifest (``batch_manifest.json`` in the batch output root) records, for
+every successfully processed input, the sha256 of its content, the tool
+version, the effective options of the run, the content of the other items it
+depends on and the output artefacts it produced. A rerun skips the items
+whose record still matches (same content, tool version, options and
+dependencies) and whose outputs still exist.
+
+The tool version is the package version plus a digest of the analysis sources
+(and configuration files), so editing the code also invalidates the records.
+Input hashes are reused while the file size and modification time do not
+change, so checking an up to date batch does not read the inputs again.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import tempfile
+from importlib import metadata
+from pathlib import Path
+
+MANIFEST_FILE_NAME = 'batch_manifest.json'
+MANIFEST_FORMAT_VERSION = 1
+DISTRIBUTION_NAME = 'sensors-analysis'
+_SOURCE_SUFFIXES = ('.py', '.yaml')
+
+
+def file_sha256(path: Path) -> str:
+    """Return the sha256 hex digest of a file content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tool_version(*packages: str, suffixes: tuple[str, ...] = _SOURCE_SUFFIXES) -> str:
+    """Return the package version plus a digest of the sources (files with the given suffixes) of the given (top level) packages"""
+    try:
+        version = metadata.version(DISTRIBUTION_NAME)
+    except metadata.PackageNotFoundError:
+        version = 'unknown'
+    digest = hashlib.sha256()
+    for package in packages:
+        spec = importlib.util.find_spec(package)
+        if spec is None or not spec.submodule_search_locations:
+            continue
+        for location in spec.submodule_search_locations:
+            root = Path(location)
+            for path in sorted(p for p in root.rglob('*') if p.suffix in suffixes and '__pycache__' not in p.parts):
+                digest.update(f"{package}/{path.relative_to(root).as_posix()}\0".encode())
+                digest.update(path.read_bytes())
+    return f"{version}+{digest.hexdigest()[:16]}"
+
+
+class BatchManifest:
+    """Records of the processed batch items, stored as JSON in the output root"""
+
+    def __init__(self, output_root: Path, version: str):
+        self.path = Path(output_root) / MANIFEST_FILE_NAME
+        self.output_root = Path(output_root)
+        self.version = version
+        self.items: dict[str, dict] = self._load()
+
+    def _load(self) -> dict[str, dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('format_version') != MANIFEST_FORMAT_VERSION:
+            return {}
+        items = data.get('items')
+        return items if isinstance(items, dict) else {}
+
+    def save(self):
+        """Write the manifest atomically (a crash never leaves a truncated file)"""
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_root, prefix=f".{MANIFEST_FILE_NAME}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'format_version': MANIFEST_FORMAT_VERSION, 'items': self.items}, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _input_record(self, path: Path, previous: dict | None) -> dict:
+        stat = os.stat(path)
+        if previous and (previous.get('size'), previous.get('mtime_ns')) == (stat.st_size, stat.st_mtime_ns):
+            sha256 = previous.get('sha256')
+        else:
+            sha256 = file_sha256(path)
+        return {'path': str(path), 'sha256': sha256, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def fingerprint(self, key: str, inputs: list[Path], options: list[str]) -> dict:
+        """Return the record fields identifying a run of the item: its inputs content, tool version and options.
+
+        The caller fills 'depends_on' with the content sha256 (by key) of the other items whose outputs the run reads.
+        """
+        previous = self.items.get(key, {}).get('inputs', [])
+        previous_by_path = {record.get('path'): record for record in previous if isinstance(record, dict)}
+        return {
+            'inputs': [self._input_record(path, previous_by_path.get(str(path))) for path in inputs],
+            'tool_version': self.version,
+            'options': list(options),
+            'depends_on': {},
+        }
+
+    def is_up_to_date(self, key: str, fingerprint: dict) -> bool:
+        """Whether the item was processed with the same inputs content, tool version, options and dependencies and its outputs exist"""
+        record = self.items.get(key)
+        if not record or record.get('tool_version') != fingerprint['tool_version']:
+            return False
+        if record.get('options') != fingerprint['options'] or record.get('depends_on', {}) != fingerprint['depends_on']:
+            return False
+        recorded_hashes = [item.get('sha256') for item in record.get('inputs', []) if isinstance(item, dict)]
+        if recorded_hashes != [item['sha256'] for item in fingerprint['inputs']]:
+            return False
+        outputs = record.get('outputs') or []
+        return bool(outputs) and all((self.output_root / output).exists() for output in outputs)
+
+    def record(self, key: str, fingerprint: dict, outputs: list[Path]):
+        """Record a successful run of the item (outputs relative to the output root, or absolute) and save"""
+        self.items[key] = {
+            **fingerprint,
+            'outputs': [os.path.relpath(output, self.output_root) for output in outputs],
+        }
+        self.save()
+
+    def forget(self, key: str):
+        """Drop the record of an item (e.g. after a failed run) and save"""
+        if self.items.pop(key, None) is not None:
+            self.save()
@@ -0,0 +1,64 @@
+"""Input files dated by the DDMMYYYY date in their name.
+
+The batch runners and the pipeline process the calibrations (and the
+characterizations) in the order of these dates, and pair every
+characterization with the nearest previous calibration.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+DATE_RE = re.compile(r"(?P<day>\d{2})(?P<month>\d{2})(?P<year>\d{4})")
+
+
+@dataclass(frozen=True)
+class DatedFile:
+    path: Path
+    date: datetime
+
+
+def extract_date_from_name(name: str) -> datetime | None:
+    """Return the DDMMYYYY date in a file name (or calibration id), None if there is no valid one"""
+    match = DATE_RE.search(name)
+    if not match:
+        return None
+    day = int(match.group("day"))
+    month = int(match.group("month"))
+    year = int(match.group("year"))
+    try:
+        return datetime(year, month, day)
+    except ValueError:
+        return None
+
+
+def collect_dated_files(folder: Path, pattern: str) -> list[DatedFile]:
+    """Return the files of folder matching pattern with a date in their name, sorted by date (then name)"""
+    out: list[DatedFile] = []
+    for path in sorted(folder.glob(pattern)):
+        if not path.is_file():
+            continue
+        file_date = extract_date_from_name(path.name)
+        if file_date is None:
+            print(f"[skip] no DDMMYYYY date found in filename: {path.name}")
+            continue
+        out.append(DatedFile(path=path, date=file_date))
+    return sorted(out, key=lambda item: (item.date, item.path.name))
+
+
+def extract_board_id(path: Path) -> str:
+    """Return the board id of a characterization file (the part of its name after the date)"""
+    stem = path.stem
+    if "_" in stem:
+        return stem.split("_", 1)[1]
+    return stem
+
+
+def find_previous_calibration(char_date: datetime, calibrations: list[DatedFile]) -> DatedFile | None:
+    """Return the latest calibration dated on or before char_date, None if there is none"""
+    candidates = [c for c in calibrations if c.date <= char_date]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: c.date)
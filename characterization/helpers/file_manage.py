@@ -1,19 +1,172 @@
 """Module for setting up file paths for characterization data."""
 import os
 import sys
-import tempfile
 import zipfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from characterization.helpers import get_logger
 logger = get_logger()
 
-singleton_output_path = None
+# output path of the current run (see setup_paths), per context so concurrent runs do not share it
+_base_output_path: ContextVar[str | None] = ContextVar("characterization_output_path", default=None)
+# zip archives kept open while loading (see open_archives), by zip path
+_open_archives: ContextVar[dict[str, zipfile.ZipFile] | None] = ContextVar("characterization_open_archives", default=None)
+MAX_ZIP_MEMBERS = 5000
+MAX_ZIP_TOTAL_UNCOMPRESSED_BYTES = 500 * 1024 * 1024  # 500 MiB
+MAX_ZIP_SINGLE_FILE_BYTES = 100 * 1024 * 1024  # 100 MiB
+
+
+def _safe_flatten_name(member_name: str) -> str:
+    norm = os.path.normpath(member_name)
+    if os.path.isabs(norm):
+        raise ValueError(f"absolute paths are not allowed: '{member_name}'")
+    parts = norm.split(os.sep)
+    if any(part == ".." for part in parts):
+        raise ValueError(f"path traversal detected: '{member_name}'")
+    base = os.path.basename(norm)
+    if not base:
+        raise ValueError(f"invalid zip entry name: '{member_name}'")
+    return base
+
+
+@dataclass(frozen=True)
+class InputFile:
+    """Input run file, either a regular file or a member of a zip archive.
+
+    Zip members are read directly from the archive into memory, so zip inputs
+    never need to be extracted to disk. Instances are plain data so they can be
+    sent to worker processes.
+    """
+    name: str  # flattened file name
+    path: str  # path used for logging / metadata
+    size: int  # uncompressed size in bytes
+    zip_path: str | None = None
+    member: str | None = None
+
+    @classmethod
+    def from_path(cls, file_path: str) -> 'InputFile':
+        """Create an input file from a regular file path"""
+        return cls(name=os.path.basename(file_path), path=file_path, size=os.path.getsize(file_path))
+
+    def read_bytes(self) -> bytes:
+        """Return the (decompressed) content of the file"""
+        if self.zip_path is None:
+            with open(self.path, 'rb') as f:
+                return f.read()
+        archives = _open_archives.get()
+        if archives is None:
+            with zipfile.ZipFile(self.zip_path, 'r') as zip_ref:
+                return self._read_member(zip_ref)
+        zip_ref = archives.get(self.zip_path)
+        if zip_ref is None:
+            zip_ref = archives[self.zip_path] = zipfile.ZipFile(self.zip_path, 'r')
+        return self._read_member(zip_ref)
+
+    def _read_member(self, zip_ref: zipfile.ZipFile) -> bytes:
+        info = zip_ref.getinfo(self.member)
+        if info.file_size > MAX_ZIP_SINGLE_FILE_BYTES:
+            raise ValueError(
+                f"zip entry '{info.filename}' exceeds allowed size "
+                f"({MAX_ZIP_SINGLE_FILE_BYTES} bytes)"
+            )
+        return zip_ref.read(info)
+
+
+@contextmanager
+def open_archives():
+    """Read the zip members of input files through one open ZipFile per archive within the block.
+
+    Without it every read reopens the archive and parses its central directory
+    again, which is quadratic in the number of members.
+    """
+    archives: dict[str, zipfile.ZipFile] = {}
+    token = _open_archives.set(archives)
+    try:
+        yield
+    finally:
+        _open_archives.reset(token)
+        for zip_ref in archives.values():
+            zip_ref.close()
+
+
+def keep_archives_open():
+    """Keep the zip archives read by the current context open until it ends (e.g. in a worker process)"""
+    _open_archives.set({})
+
+
+def _list_zip_members_safely_flattened(zip_path: str) -> list[InputFile]:
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        infos = zip_ref.infolist()
+        if len(infos) > MAX_ZIP_MEMBERS:
+            raise ValueError(
+                f"zip file has too many entries ({len(infos)} > {MAX_ZIP_MEMBERS})"
+            )
+
+        total_uncompressed = 0
+        seen_names: set[str] = set()
+        members: list[InputFile] = []
+
+        for info in infos:
+            if info.is_dir():
+                continue
+
+            total_uncompressed += info.file_size
+            if total_uncompressed > MAX_ZIP_TOTAL_UNCOMPRESSED_BYTES:
+                raise ValueError(
+                    "zip file uncompressed content exceeds allowed limit "
+                    f"({MAX_ZIP_TOTAL_UNCOMPRESSED_BYTES} bytes)"
+                )
+            if info.file_size > MAX_ZIP_SINGLE_FILE_BYTES:
+                raise ValueError(
+                    f"zip entry '{info.filename}' exceeds allowed size "
+                    f"({MAX_ZIP_SINGLE_FILE_BYTES} bytes)"
+                )
+
+            flat_name = _safe_flatten_name(info.filename)
+            if flat_name in seen_names:
+                raise ValueError(
+                    f"zip contains colliding flattened filenames: '{flat_name}'"
+                )
+            seen_names.add(flat_name)
+            members.append(InputFile(
+                name=flat_name,
+                path=os.path.join(zip_path, info.filename),
+                size=info.file_size,
+                zip_path=zip_path,
+                member=info.filename,
+            ))
+    return members
+
+
+def list_input_files(files_path: str) -> list[InputFile]:
+    """
+    List the input files of a characterization folder or zip file, sorted by file name.
+
+    Zip members are validated (number of entries, size caps, path traversal and
+    flattened name collisions) but not extracted.
+    """
+    if os.path.isdir(files_path):
+        return [
+            InputFile.from_path(os.path.join(files_path, file_name))
+            for file_name in sorted(os.listdir(files_path))
+            if os.path.isfile(os.path.join(files_path, file_name))
+        ]
+    return sorted(_list_zip_members_safely_flattened(files_path), key=lambda item: item.name)
+
+
+
+def set_base_output_path(output_path: str | None):
+    """Set the base output path of the current run (worker processes replicate the one of their parent)."""
+    _base_output_path.set(output_path)
+
 
 def get_base_output_path():
-    global singleton_output_path
-    if singleton_output_path is None:
+    output_path = _base_output_path.get()
+    if output_path is None:
         logger.error("Output path has not been set up yet. Call setup_paths first.")
         sys.exit(1)
-    return singleton_output_path
+    return output_path
 
 def setup_paths(char_files_path, output_path=None, overwrite=False):
     if not os.path.exists(char_files_path):
@@ -32,16 +185,14 @@ def setup_paths(char_files_path, output_path=None, overwrite=False):
         if not char_files_path.lower().endswith('.zip'):
             logger.error("Characterization files path '%s' is not a directory or a zip file.", char_files_path)
             sys.exit(1)
-        files_path = tempfile.mkdtemp()
+        # Zip members are read in memory by the loaders (see list_input_files), no extraction needed
+        files_path = char_files_path
         base_name = os.path.splitext(os.path.basename(char_files_path))[0]
-        with zipfile.ZipFile(char_files_path, 'r') as zip_ref:
-            for member in zip_ref.namelist():
-                zip_ref.extract(member, files_path)
-                source = os.path.join(files_path, member)
-                if os.path.isfile(source):
-                    dest = os.path.join(files_path, os.path.basename(member))
-                    if source != dest:
-                        os.rename(source, dest)
+        try:
+            _list_zip_members_safely_flattened(char_files_path)
+        except (zipfile.BadZipFile, ValueError, OSError) as e:
+            logger.error("Failed to read zip '%s': %s", char_files_path, str(e))
+            sys.exit(1)
 
     if output_path is None:
         output_root = './output'
@@ -59,8 +210,7 @@ def setup_paths(char_files_path, output_path=None, overwrite=False):
         import shutil
         shutil.rmtree(output_path)
 
-    global singleton_output_path
-    singleton_output_path = output_path
+    _base_output_path.set(output_path)
     os.makedirs(output_path, exist_ok=True)
 
     logger.info("Characterization files path: %s", files_path)
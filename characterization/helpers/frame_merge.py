@@ -0,0 +1,80 @@
+"""Merge of time ordered DataFrames.
+
+Aggregate elements (filesets, photodiodes, calibrations, characterizations)
+build their frames from the frames of their children, which are already
+ordered by time. Instead of concatenating and sorting the result again,
+the children are merged pairwise with ``np.searchsorted`` (O(n log k) for k
+children) and, in the common case of children that do not overlap in time,
+the concatenation is already ordered and no reordering is done at all.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def _merge_two(a_keys: np.ndarray, a_idx: np.ndarray, b_keys: np.ndarray, b_idx: np.ndarray):
+    """Stable merge of two sorted runs (rows of a come first on equal keys)"""
+    pos_b = np.searchsorted(a_keys, b_keys, side='right') + np.arange(len(b_keys))
+    from_b = np.zeros(len(a_keys) + len(b_keys), dtype=bool)
+    from_b[pos_b] = True
+    keys = np.empty(from_b.size, dtype=np.result_type(a_keys, b_keys))
+    idx = np.empty(from_b.size, dtype=np.intp)
+    keys[from_b] = b_keys
+    keys[~from_b] = a_keys
+    idx[from_b] = b_idx
+    idx[~from_b] = a_idx
+    return keys, idx
+
+
+def merged_order(keys: list[np.ndarray]) -> np.ndarray | None:
+    """Return the positions that stably sort the concatenation of the key arrays.
+
+    Every key array is expected to be sorted (arrays that are not are sorted
+    first). Returns None when the concatenation is already sorted.
+    """
+    keys = [np.asarray(k) for k in keys]
+    concat = np.concatenate(keys) if keys else np.empty(0)
+    if len(concat) < 2 or not (concat[1:] < concat[:-1]).any():
+        return None
+    runs = []
+    offset = 0
+    for k in keys:
+        idx = np.arange(offset, offset + len(k), dtype=np.intp)
+        if len(k) > 1 and (k[1:] < k[:-1]).any():
+            order = np.argsort(k, kind='stable')
+            k, idx = k[order], idx[order]
+        runs.append((k, idx))
+        offset += len(k)
+    while len(runs) > 1:
+        merged = [_merge_two(*runs[i], *runs[i + 1]) for i in range(0, len(runs) - 1, 2)]
+        if len(runs) % 2:
+            merged.append(runs[-1])
+        runs = merged
+    return runs[0][1]
+
+
+def merge_sorted_frames(
+    frames: list[pd.DataFrame],
+    by: str = 'timestamp',
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """Merge frames individually ordered by ``by`` into one ordered frame.
+
+    Args:
+        frames (list[pd.DataFrame]): frames to merge, each sorted by ``by``.
+        by (str): column the frames are ordered by.
+        columns (list[str] | None): only keep these columns (all if None).
+
+    Rows with equal keys keep the order of the input frames. The result has
+    a default RangeIndex.
+    """
+    keys = [f[by].to_numpy() for f in frames]
+    if columns is not None:
+        frames = [f[columns] for f in frames]
+    out = pd.concat(frames, ignore_index=True)
+    order = merged_order(keys)
+    if order is not None:
+        out = out.take(order)
+        out.index = pd.RangeIndex(len(out))
+    return out
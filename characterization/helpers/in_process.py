@@ -0,0 +1,46 @@
+"""Run a script entry point in the current interpreter.
+
+Batch runs use it to process many characterizations without paying the interpreter
+and libraries startup for each one. Every run has its own default
+configuration (see config.run_config) and runs in a copy of the current
+context, so the settings it makes (output path, parsed cache) are dropped
+afterwards. The log handlers (e.g. log files) and figures left open by a run
+are closed too, so runs do not leak into each other.
+"""
+from __future__ import annotations
+
+from contextlib import ExitStack, redirect_stderr, redirect_stdout
+from contextvars import copy_context
+from typing import Callable
+
+from characterization.config import run_config
+from characterization.helpers.logger import get_logger, scoped_handlers
+
+logger = get_logger()
+
+
+def run_main(main: Callable[[list[str]], None], argv: list[str], output_path: str | None = None) -> int:
+    """Call main(argv) as the script would run and return its exit code.
+
+    The console output (prints and log messages) goes to output_path if given.
+    """
+    import matplotlib.pyplot as plt
+
+    with ExitStack() as stack:
+        stack.enter_context(run_config())
+        out = None
+        if output_path:
+            out = stack.enter_context(open(output_path, "w", encoding="utf-8"))
+            stack.enter_context(redirect_stdout(out))
+            stack.enter_context(redirect_stderr(out))
+        stack.enter_context(scoped_handlers(out))
+        try:
+            copy_context().run(main, argv)
+            return 0
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception:
+            logger.exception("Run failed for arguments %s", argv)
+            return 1
+        finally:
+            plt.close("all")
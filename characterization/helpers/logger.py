@@ -1,4 +1,6 @@
 import logging
+from contextlib import contextmanager
+
 import colorlog
 
 logger = None
@@ -41,3 +43,28 @@ def add_file_handler(log_file_path: str):
     )
     logger = get_logger()
     logger.addHandler(file_handler)
+
+
+@contextmanager
+def scoped_handlers(stream=None):
+    """Restore the logger handlers on exit, closing the ones added meanwhile (e.g. log files).
+
+    If stream is given, the console handlers write to it meanwhile.
+    """
+    logger = get_logger()
+    handlers = list(logger.handlers)
+    console_streams = {}
+    if stream is not None:
+        for handler in handlers:
+            if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+                console_streams[handler] = handler.stream
+                handler.setStream(stream)
+    try:
+        yield logger
+    finally:
+        for handler in logger.handlers:
+            if handler not in handlers:
+                handler.close()
+        logger.handlers[:] = handlers
+        for handler, console_stream in console_streams.items():
+            handler.setStream(console_stream)
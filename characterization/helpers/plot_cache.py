@@ -0,0 +1,180 @@
+"""On-disk cache of rendered plot files.
+
+Every entry is a plot file (pdf, svg or png) named after the fingerprint of
+the figure it was rendered from: the sha256 of the pickled figure (its data,
+labels, styles and layout), the output format and savefig options, the
+matplotlib version and the rcParams used when saving. Saving a figure identical to a cached one
+hard-links (or copies) the cached file instead of rendering it again, so a
+rerun with only sanity options changed renders only the figures
+whose content changed. The plot paths registered by the plotters are the
+same with or without the cache.
+
+The cache is bounded in size: on every hit the entry modification time is
+refreshed and, after each store, the least recently used entries are removed
+until the total size is below ``max_bytes``.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import pickle
+import shutil
+import tempfile
+from contextvars import ContextVar
+
+import matplotlib
+from matplotlib import cbook
+from matplotlib.figure import Figure
+from matplotlib.transforms import TransformNode
+
+from characterization.helpers import get_logger
+
+logger = get_logger()
+
+CACHE_FORMAT_VERSION = 1
+CACHE_DIR_NAME = '.plot_cache'
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB
+# rcParams read by the backends when saving (the figure content is fingerprinted by pickling)
+_SAVE_RCPARAMS_PREFIXES = ('savefig.', 'pdf.', 'svg.', 'ps.', 'agg.', 'path.', 'text.', 'font.', 'mathtext.')
+
+
+def _identity_free_state(obj):
+    """Reconstructor placeholder of the fingerprint pickles (they are never loaded)"""
+    raise TypeError("plot fingerprints cannot be unpickled")
+
+
+class _FingerprintPickler(pickle.Pickler):
+    """Pickler leaving out the parts of a figure that depend on object identities.
+
+    Transforms keep a map of their parents keyed by id() and shared axes are
+    grouped in sets of axes, both ordered differently in every process; they
+    only link objects already pickled through the artists.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, TransformNode):
+            state = {key: value for key, value in vars(obj).items() if key != '_parents'}
+            return _identity_free_state, (type(obj).__qualname__,), state
+        if isinstance(obj, cbook.Grouper):
+            return _identity_free_state, (type(obj).__qualname__,)
+        return NotImplemented
+
+
+def _figure_digest(fig: Figure) -> str:
+    buffer = io.BytesIO()
+    _FingerprintPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(fig)
+    return hashlib.sha256(buffer.getbuffer()).hexdigest()
+
+
+class PlotRenderCache:
+    """Content-addressed cache of rendered plot files"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(fig: Figure, plot_format: str, savefig_kw: dict | None = None) -> str | None:
+        """Return the cache key of the figure rendered in plot_format (with savefig_kw), None if it cannot be fingerprinted"""
+        try:
+            figure_digest = _figure_digest(fig)
+        except (pickle.PicklingError, TypeError, AttributeError, ValueError) as e:
+            logger.debug("Figure not cacheable: %s", str(e))
+            return None
+        rc_params = sorted(
+            (key, repr(value)) for key, value in matplotlib.rcParams.items()
+            if key.startswith(_SAVE_RCPARAMS_PREFIXES)
+        )
+        digest = hashlib.sha256(figure_digest.encode('ascii'))
+        digest.update(repr((CACHE_FORMAT_VERSION, matplotlib.__version__, plot_format, sorted((savefig_kw or {}).items()), rc_params)).encode('utf-8'))
+        return f"{digest.hexdigest()}.{plot_format}"
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def fetch(self, key: str, dest_path: str) -> bool:
+        """Place the cached file of key at dest_path (hard link, else copy), False if not cached"""
+        path = self._entry_path(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return False
+        try:
+            if os.path.lexists(dest_path):
+                os.remove(dest_path)
+            try:
+                os.link(path, dest_path)
+            except OSError:
+                shutil.copyfile(path, dest_path)
+        except OSError as e:
+            logger.warning("Failed to reuse cached plot %s for %s: %s", path, dest_path, str(e))
+            return False
+        return True
+
+    def store(self, key: str, src_path: str):
+        """Store the rendered file src_path under key (failures are only logged)"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            os.close(fd)
+            try:
+                os.remove(tmp_path)
+                os.link(src_path, tmp_path)
+            except OSError:
+                shutil.copyfile(src_path, tmp_path)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError as e:
+            logger.warning("Failed to write plot cache entry in %s: %s", self.cache_dir, str(e))
+            return
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits in max_bytes"""
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.endswith('.tmp'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def save_figure(fig: Figure, fig_path: str, plot_format: str, **savefig_kw):
+    """Save the figure to fig_path, reusing the cached file of an identical figure when the cache is enabled"""
+    cache = get_cache()
+    key = cache.make_key(fig, plot_format, savefig_kw) if cache is not None else None
+    if key is not None and cache.fetch(key, fig_path):
+        return
+    fig.savefig(fig_path, **savefig_kw)
+    if key is not None:
+        cache.store(key, fig_path)
+
+
+# per context, so concurrent runs (see config.run_config) can use different caches
+_cache: ContextVar[PlotRenderCache | None] = ContextVar("characterization_plot_cache", default=None)
+
+
+def set_cache(cache: PlotRenderCache | None):
+    """Set (or disable with None) the cache used when saving plots"""
+    _cache.set(cache)
+
+
+def get_cache() -> PlotRenderCache | None:
+    """Return the cache used when saving plots, None if caching is disabled"""
+    return _cache.get()
@@ -0,0 +1,391 @@
+"""Batched ordinary least squares regressions.
+
+Instead of one ``scipy.stats.linregress`` call per fit, all the (x, y)
+groups are reduced to per-group sufficient statistics (counts, means and
+centered sums of squares/products, computed in one vectorized pass with
+``np.bincount``) and slope, intercept, r, p-value and standard errors of
+every group are derived from them at once. Results follow the
+``linregress`` conventions and match it to floating point tolerance.
+
+The statistics are mergeable: the statistics of a union of groups (e.g. all
+the files of a fileset) are obtained from those of the groups alone, so
+higher level fits never need the concatenated samples.
+
+When the samples are reduced with weights, weighted least squares fits (with
+chi2 diagnostics) are solved in closed form from the weighted moments. The
+chi2 is accumulated from the residuals of every group and merged with the
+parallel axis decomposition, never as the difference wsyy - slope * wsxy of
+two large nearly equal sums (small sigmas, e.g. powers in W).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+from scipy import special
+
+_TINY = 1.0e-20
+
+
+class LinRegResult(NamedTuple):
+    """Result of a linear regression (same fields as the scipy ``linregress`` result)"""
+    slope: float
+    intercept: float
+    rvalue: float
+    pvalue: float
+    stderr: float
+    intercept_stderr: float
+
+
+class WLSResult(NamedTuple):
+    """Result of a weighted least squares fit (LinRegResult fields plus the fit chi2)"""
+    slope: float
+    intercept: float
+    rvalue: float
+    pvalue: float
+    stderr: float
+    intercept_stderr: float
+    chi2: float
+    ndof: int
+
+
+def _correlation_pvalue(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Two-sided p-value of the t-test on the correlation coefficient (as in linregress)"""
+    df = n - 2
+    t = r * np.sqrt(df / ((1.0 - r + _TINY) * (1.0 + r + _TINY)))
+    return 2 * special.stdtr(df, -np.abs(t))
+
+
+def _combine_moments(labels, n_groups, w, mean_x, mean_y, sxx, syy, sxy):
+    """Merge centered moments of groups with equal labels (parallel algorithm of Chan et al.)"""
+    filled = w > 0
+    w_out = np.bincount(labels, weights=w, minlength=n_groups)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mx = np.bincount(labels, weights=np.where(filled, w * mean_x, 0.0), minlength=n_groups) / w_out
+        my = np.bincount(labels, weights=np.where(filled, w * mean_y, 0.0), minlength=n_groups) / w_out
+    dx = np.where(filled, mean_x - mx[labels], 0.0)
+    dy = np.where(filled, mean_y - my[labels], 0.0)
+    return (
+        w_out,
+        mx,
+        my,
+        np.bincount(labels, weights=sxx + w * dx * dx, minlength=n_groups),
+        np.bincount(labels, weights=syy + w * dy * dy, minlength=n_groups),
+        np.bincount(labels, weights=sxy + w * dx * dy, minlength=n_groups),
+    )
+
+
+def _wls_slope(wsxx, wsxy):
+    """Weighted slope of every group, 0 for groups without x spread"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(wsxx > 0, wsxy / wsxx, 0.0)
+
+
+@dataclass
+class RegressionStats:
+    """Per-group sufficient statistics of (x, y) samples (one array element per group)"""
+    n: np.ndarray
+    mean_x: np.ndarray
+    mean_y: np.ndarray
+    sxx: np.ndarray  # sum((x - mean_x)**2)
+    syy: np.ndarray  # sum((y - mean_y)**2)
+    sxy: np.ndarray  # sum((x - mean_x) * (y - mean_y))
+    x_min: np.ndarray
+    x_max: np.ndarray
+    y_first: np.ndarray  # needed for the two points p-value convention of linregress
+    y_last: np.ndarray
+    # weighted moments, only present when the samples were reduced with weights
+    sum_w: np.ndarray | None = None
+    wmean_x: np.ndarray | None = None
+    wmean_y: np.ndarray | None = None
+    wsxx: np.ndarray | None = None  # sum(w * (x - wmean_x)**2)
+    wsyy: np.ndarray | None = None
+    wsxy: np.ndarray | None = None
+    wchi2: np.ndarray | None = None  # sum(w * residual**2) about the weighted fit of the group
+
+    WEIGHTED_FIELDS = ('sum_w', 'wmean_x', 'wmean_y', 'wsxx', 'wsyy', 'wsxy', 'wchi2')
+
+    def __len__(self) -> int:
+        return len(self.n)
+
+    @property
+    def weighted(self) -> bool:
+        """Whether the weighted moments are available"""
+        return self.sum_w is not None
+
+    @classmethod
+    def from_groups(cls, x, y, groups, n_groups: int, weights=None) -> RegressionStats:
+        """Reduce samples labelled with group indices in [0, n_groups) to per-group statistics"""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        groups = np.asarray(groups, dtype=np.intp)
+        n = np.bincount(groups, minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_x = np.bincount(groups, weights=x, minlength=n_groups) / n
+            mean_y = np.bincount(groups, weights=y, minlength=n_groups) / n
+        dx = x - mean_x[groups]
+        dy = y - mean_y[groups]
+        x_min = np.full(n_groups, np.inf)
+        x_max = np.full(n_groups, -np.inf)
+        np.minimum.at(x_min, groups, x)
+        np.maximum.at(x_max, groups, x)
+        y_first = np.full(n_groups, np.nan)
+        y_last = np.full(n_groups, np.nan)
+        y_first[groups[::-1]] = y[::-1]
+        y_last[groups] = y
+        weighted = {}
+        if weights is not None:
+            w = np.asarray(weights, dtype=np.float64)
+            sum_w = np.bincount(groups, weights=w, minlength=n_groups)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                wmean_x = np.bincount(groups, weights=w * x, minlength=n_groups) / sum_w
+                wmean_y = np.bincount(groups, weights=w * y, minlength=n_groups) / sum_w
+            wdx = x - wmean_x[groups]
+            wdy = y - wmean_y[groups]
+            wsxx = np.bincount(groups, weights=w * wdx * wdx, minlength=n_groups)
+            wsxy = np.bincount(groups, weights=w * wdx * wdy, minlength=n_groups)
+            residuals = wdy - _wls_slope(wsxx, wsxy)[groups] * wdx
+            weighted = dict(
+                sum_w=sum_w,
+                wmean_x=wmean_x,
+                wmean_y=wmean_y,
+                wsxx=wsxx,
+                wsyy=np.bincount(groups, weights=w * wdy * wdy, minlength=n_groups),
+                wsxy=wsxy,
+                wchi2=np.bincount(groups, weights=w * residuals * residuals, minlength=n_groups),
+            )
+        return cls(
+            n=n,
+            mean_x=mean_x,
+            mean_y=mean_y,
+            sxx=np.bincount(groups, weights=dx * dx, minlength=n_groups),
+            syy=np.bincount(groups, weights=dy * dy, minlength=n_groups),
+            sxy=np.bincount(groups, weights=dx * dy, minlength=n_groups),
+            x_min=x_min,
+            x_max=x_max,
+            y_first=y_first,
+            y_last=y_last,
+            **weighted,
+        )
+
+    @classmethod
+    def from_pairs(cls, pairs: list[tuple], weights: list | None = None) -> RegressionStats:
+        """Statistics of a list of (x, y) pairs, one group per pair (optionally with per-sample weights)"""
+        xs = [np.asarray(x, dtype=np.float64) for x, _ in pairs]
+        ys = [np.asarray(y, dtype=np.float64) for _, y in pairs]
+        for x, y in zip(xs, ys):
+            if len(x) != len(y):
+                raise ValueError("x and y of a regression must have the same length")
+        if weights is not None:
+            weights = [np.asarray(w, dtype=np.float64) for w in weights]
+            if len(weights) != len(xs) or any(len(w) != len(x) for w, x in zip(weights, xs)):
+                raise ValueError("weights of a regression must have the same length as x and y")
+        groups = np.repeat(np.arange(len(pairs)), [len(x) for x in xs])
+        return cls.from_groups(
+            np.concatenate(xs) if xs else np.empty(0),
+            np.concatenate(ys) if ys else np.empty(0),
+            groups,
+            len(pairs),
+            weights=None if weights is None else (np.concatenate(weights) if weights else np.empty(0)),
+        )
+
+    def _arrays(self) -> dict[str, np.ndarray]:
+        return {
+            name: value for name, value in vars(self).items()
+            if value is not None
+        }
+
+    def take(self, indices) -> RegressionStats:
+        """Return the statistics of a subset of the groups"""
+        indices = np.asarray(indices, dtype=np.intp)
+        return type(self)(**{name: value[indices] for name, value in self._arrays().items()})
+
+    @classmethod
+    def concat(cls, stats: list[RegressionStats]) -> RegressionStats:
+        """Stack the groups of several statistics (weighted moments are kept only if all have them)"""
+        weighted = all(s.weighted for s in stats)
+        fields = [f for f in cls.__dataclass_fields__ if weighted or f not in cls.WEIGHTED_FIELDS]
+        return cls(**{f: np.concatenate([getattr(s, f) for s in stats]) for f in fields})
+
+    def combine(self, labels, n_groups: int) -> RegressionStats:
+        """Merge the groups with equal labels in [0, n_groups).
+
+        The result is the statistics of the union of the samples of the
+        merged groups, taken in group order.
+        """
+        labels = np.asarray(labels, dtype=np.intp)
+        n, mean_x, mean_y, sxx, syy, sxy = _combine_moments(
+            labels, n_groups, self.n.astype(np.float64),
+            self.mean_x, self.mean_y, self.sxx, self.syy, self.sxy,
+        )
+        x_min = np.full(n_groups, np.inf)
+        x_max = np.full(n_groups, -np.inf)
+        np.minimum.at(x_min, labels, self.x_min)
+        np.maximum.at(x_max, labels, self.x_max)
+        filled = self.n > 0
+        filled_labels = labels[filled]
+        y_first = np.full(n_groups, np.nan)
+        y_last = np.full(n_groups, np.nan)
+        y_first[filled_labels[::-1]] = self.y_first[filled][::-1]
+        y_last[filled_labels] = self.y_last[filled]
+        weighted = {}
+        if self.weighted:
+            weighted = dict(zip(self.WEIGHTED_FIELDS, _combine_moments(
+                labels, n_groups, self.sum_w,
+                self.wmean_x, self.wmean_y, self.wsxx, self.wsyy, self.wsxy,
+            )))
+            # residuals about the merged fit: those about the group fit plus the
+            # (orthogonal) distance between the two fits over the group samples
+            slope = _wls_slope(self.wsxx, self.wsxy)
+            merged_slope = _wls_slope(weighted['wsxx'], weighted['wsxy'])[labels]
+            offset = np.where(
+                self.sum_w > 0,
+                self.wmean_y - weighted['wmean_y'][labels] - merged_slope * (self.wmean_x - weighted['wmean_x'][labels]),
+                0.0,
+            )
+            weighted['wchi2'] = np.bincount(
+                labels,
+                weights=self.wchi2 + self.sum_w * offset * offset + (slope - merged_slope)**2 * self.wsxx,
+                minlength=n_groups,
+            )
+        return type(self)(
+            n=n.astype(self.n.dtype),
+            mean_x=mean_x,
+            mean_y=mean_y,
+            sxx=sxx,
+            syy=syy,
+            sxy=sxy,
+            x_min=x_min,
+            x_max=x_max,
+            y_first=y_first,
+            y_last=y_last,
+            **weighted,
+        )
+
+    @classmethod
+    def merge(cls, stats: list[RegressionStats]) -> RegressionStats:
+        """Merge all the groups of several statistics into a single group"""
+        stacked = cls.concat(stats)
+        return stacked.combine(np.zeros(len(stacked), dtype=np.intp), 1)
+
+    def _check_fit_inputs(self):
+        if (self.n == 0).any():
+            raise ValueError("Inputs must not be empty.")
+        if ((self.x_max == self.x_min) & (self.n > 1)).any():
+            raise ValueError("Cannot calculate a linear regression if all x values are identical")
+
+    def fit(self) -> list[LinRegResult] | list[WLSResult]:
+        """Return the weighted fit of every group if the statistics are weighted, the regression otherwise"""
+        return self.wls() if self.weighted else self.linregress()
+
+    def wls(self) -> list[WLSResult]:
+        """Return the weighted least squares fit of every group.
+
+        The weights are taken as 1/sigma**2, so the standard errors are the
+        absolute ones (not scaled by the reduced chi2).
+
+        Raises:
+            ValueError: if the statistics are not weighted, or on the linregress input conditions.
+        """
+        if not self.weighted:
+            raise ValueError("Weighted least squares fit needs statistics reduced with weights")
+        self._check_fit_inputs()
+        n = self.n.astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            slope = self.wsxy / self.wsxx
+            intercept = self.wmean_y - slope * self.wmean_x
+            r = np.clip(self.wsxy / np.sqrt(self.wsxx * self.wsyy), -1.0, 1.0)
+            prob = _correlation_pvalue(r, n)
+            chi2 = self.wchi2
+            slope_stderr = np.sqrt(1.0 / self.wsxx)
+            intercept_stderr = np.sqrt(1.0 / self.sum_w + self.wmean_x**2 / self.wsxx)
+        two_points = self.n == 2
+        prob = np.where(two_points, np.where(self.y_first == self.y_last, 1.0, 0.0), prob)
+        chi2 = np.where(two_points, 0.0, chi2)
+        ndof = np.maximum(self.n - 2, 0)
+        return [
+            WLSResult(*values[:-1], int(values[-1]))
+            for values in zip(slope, intercept, r, prob, slope_stderr, intercept_stderr, chi2, ndof)
+        ]
+
+    def linregress(self) -> list[LinRegResult]:
+        """Return the regression of every group.
+
+        Raises:
+            ValueError: if a group is empty or has more than one point and all x values identical
+                (same conditions as ``linregress``).
+        """
+        self._check_fit_inputs()
+        n = self.n.astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ssxm = self.sxx / n
+            ssym = self.syy / n
+            ssxym = self.sxy / n
+            degenerate = (ssxm == 0.0) | (ssym == 0.0)
+            r = np.where(degenerate, np.where(ssxym == 0, np.nan, 0.0), ssxym / np.sqrt(ssxm * ssym))
+            r = np.where(degenerate, r, np.clip(r, -1.0, 1.0))
+            slope = ssxym / ssxm
+            intercept = self.mean_y - slope * self.mean_x
+
+            df = n - 2
+            prob = _correlation_pvalue(r, n)
+            slope_stderr = np.sqrt((1 - r**2) * ssym / ssxm / df)
+            intercept_stderr = slope_stderr * np.sqrt(ssxm + self.mean_x**2)
+
+        two_points = self.n == 2
+        prob = np.where(two_points, np.where(self.y_first == self.y_last, 1.0, 0.0), prob)
+        slope_stderr = np.where(two_points, 0.0, slope_stderr)
+        intercept_stderr = np.where(two_points, 0.0, intercept_stderr)
+        return [
+            LinRegResult(*values)
+            for values in zip(slope, intercept, r, prob, slope_stderr, intercept_stderr)
+        ]
+
+
+def linregress_groups(x, y, groups, n_groups: int) -> list[LinRegResult]:
+    """Linear regressions of y on x for every group of samples (see RegressionStats.from_groups)"""
+    return RegressionStats.from_groups(x, y, groups, n_groups).linregress()
+
+
+def linregress_many(pairs: list[tuple[np.ndarray, np.ndarray]]) -> list[LinRegResult]:
+    """Linear regressions of y on x for a list of (x, y) pairs, computed in one batch"""
+    if not pairs:
+        return []
+    return RegressionStats.from_pairs(pairs).linregress()
+
+
+def effective_weights(slope: float, sigma_x, sigma_y) -> np.ndarray:
+    """Weights 1 / (sigma_y**2 + slope**2 * sigma_x**2) of the effective variance method.
+
+    A missing sigma_x (None, e.g. for set points) counts as zero. Samples
+    without a finite positive variance get a zero weight.
+    """
+    var = np.asarray(sigma_y, dtype=np.float64) ** 2
+    if sigma_x is not None:
+        var = var + (slope * np.asarray(sigma_x, dtype=np.float64)) ** 2
+    with np.errstate(divide='ignore'):
+        w = 1.0 / var
+    return np.where(np.isfinite(w) & (var > 0), w, 0.0)
+
+
+def fit_stats(fits: list[tuple], weighted: bool = False) -> RegressionStats:
+    """Regression statistics of a list of (x, y, sigma_x, sigma_y) fits, one group per fit.
+
+    With weighted=True the samples are weighted with the effective variance
+    of the recorded standard deviations, using the unweighted slope of the
+    fit to propagate sigma_x (one closed form step instead of an iterative
+    solution). Samples with a zero weight are left out of the fit.
+    """
+    pairs = [(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)) for x, y, *_ in fits]
+    stats = RegressionStats.from_pairs(pairs)
+    if not weighted:
+        return stats
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slopes = np.nan_to_num(stats.sxy / stats.sxx)
+    weights = [effective_weights(b, sx, sy) for b, (*_, sx, sy) in zip(slopes, fits)]
+    kept = [w > 0 for w in weights]
+    return RegressionStats.from_pairs(
+        [(x[k], y[k]) for (x, y), k in zip(pairs, kept)],
+        weights=[w[k] for w, k in zip(weights, kept)],
+    )
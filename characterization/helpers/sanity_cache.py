@@ -0,0 +1,124 @@
+"""Cache of sanity check results.
+
+Results are kept in a SQLite file at the output root, keyed by the data
+fingerprint of the checked element plus the normalized check parameters
+(level, severity, check name and the arguments from sanity_checks_config.yaml).
+The data fingerprint of a sweep file is its parsed-data cache key (raw content,
+file name and preparation flags) combined with the analysis settings and the
+code version; the fingerprint of a fileset or characterization combines those
+of its children (and the applied calibration). A rerun with only plotting or
+report options changed serves every check from the cache, and tuning a
+threshold only re-evaluates the checks whose parameters changed. Checks that
+failed to execute are never cached.
+
+The cache is bounded: entries not used by the most recent runs are removed
+once it holds more than ``max_entries`` results.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+
+from characterization.helpers import get_logger
+
+logger = get_logger()
+
+CACHE_FILE_NAME = 'sanity_cache.sqlite'
+CACHE_FORMAT_VERSION = 1
+DEFAULT_MAX_ENTRIES = 200_000
+_CHUNK = 500  # keys per query, below the SQLite variables limit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_use ON results (used);
+"""
+
+
+def fingerprint(*parts) -> str:
+    """Return the sha256 hex digest of the canonical JSON serialization of the parts"""
+    return hashlib.sha256(
+        json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str).encode('utf-8')
+    ).hexdigest()
+
+
+def check_key(data_fingerprint: str, level: str, severity: str, check_name: str, check_params) -> str:
+    """Return the cache key of a check of an element (parameters are compared in canonical JSON form)"""
+    return fingerprint(CACHE_FORMAT_VERSION, data_fingerprint, level, severity, check_name, check_params)
+
+
+class SanityResultCache:
+    """SQLite backed cache of sanity check result dictionaries"""
+
+    def __init__(self, path: str, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        with self._connect() as con:
+            con.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Connection committed on success (rolled back on error) and closed on exit"""
+        # several batch workers may share the output root, wait for their writes
+        con = sqlite3.connect(self.path, timeout=30)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def get_many(self, keys) -> dict[str, dict]:
+        """Return the cached results of the given keys (missing keys are left out) and mark them used"""
+        keys = list(dict.fromkeys(keys))
+        found: dict[str, dict] = {}
+        try:
+            with self._connect() as con:
+                for start in range(0, len(keys), _CHUNK):
+                    chunk = keys[start:start + _CHUNK]
+                    placeholders = ', '.join('?' for _ in chunk)
+                    for key, result in con.execute(f"SELECT key, result FROM results WHERE key IN ({placeholders})", chunk):
+                        try:
+                            found[key] = json.loads(result)
+                        except ValueError:
+                            continue
+                now = time.time()
+                con.executemany("UPDATE results SET used = ? WHERE key = ?", [(now, key) for key in found])
+        except sqlite3.Error as e:
+            logger.warning("Failed to read the sanity check results cache %s: %s", self.path, str(e))
+            return {}
+        return found
+
+    def put_many(self, results: dict[str, dict]):
+        """Store the results by key (failures are only logged), evicting the least recently used entries above max_entries"""
+        if not results:
+            return
+        now = time.time()
+        try:
+            with self._connect() as con:
+                con.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                    [(key, json.dumps(result), now) for key, result in results.items()],
+                )
+                (count,) = con.execute("SELECT COUNT(*) FROM results").fetchone()
+                if count > self.max_entries:
+                    con.execute(
+                        "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY used LIMIT ?)",
+                        (count - self.max_entries,),
+                    )
+        except sqlite3.Error as e:
+            logger.warning("Failed to write the sanity check results cache %s: %s", self.path, str(e))
+
+
+def open_cache(path: str, max_entries: int = DEFAULT_MAX_ENTRIES) -> SanityResultCache | None:
+    """Open the cache at path, None (results are not cached) if the database is not usable"""
+    try:
+        return SanityResultCache(path, max_entries)
+    except sqlite3.Error as e:
+        logger.warning("Sanity check results cache not available at %s: %s", path, str(e))
+        return None
@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 now = datetime.now(timezone.utc)
 
 from .helpers import get_logger
+from .helpers.in_process import run_main
 from .elements.characterization import Characterization
 from .elements.sanity_checks import SanityChecks
 from .json_2_csv import convert_json_to_csv
@@ -16,7 +17,9 @@ now_libs = datetime.now(timezone.utc)
 logger = get_logger()
 
 
-def main():
+def main(argv: list[str] | None = None):
+    # the module level `now` is the interpreter start, several runs may share it (see run)
+    started = datetime.now(timezone.utc)
     logger.info("Virgo Instrumented Baffles Characterization script")
 
     parser = argparse.ArgumentParser(description="Virgo Instrumented Baffles Characterization script")
@@ -30,17 +33,48 @@ def main():
     parser.add_argument("--no-plots", "-n", action="store_true", help="Do not generate plots")
     parser.add_argument("--no-sweepfile-plots", "-e", action="store_true", help="Do not generate sweepfile-level plots")
     parser.add_argument("--no-gen-report", action="store_true", help="Do not generate characterization report")
+    parser.add_argument("--report-plots-only", action="store_true", help="Render only the plots embedded in the characterization report")
+    parser.add_argument(
+        "--timeseries-max-points",
+        type=int,
+        default=None,
+        help="Downsample timeseries plots to about this many points per series, preserving their min/max envelope (default: draw every point)",
+    )
+    parser.add_argument(
+        "--rasterize-min-points",
+        type=int,
+        default=None,
+        help="Rasterize the markers and error bars of pdf/svg plot axes drawing more than this many points, e.g. 10000 to keep dense plots small (default: 0, every layer stays vector)",
+    )
     parser.add_argument("--no-json-to-csv", action="store_true", help="Do not generate CSV from reduced characterization JSON")
     parser.add_argument(
         "--do-not-sub-pedestals",
         action="store_true",
         help="Do not subtract pedestals in characterization regressions",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not use (nor update) the parsed sweep files, sanity check results and rendered plots caches at the output root",
+    )
+    parser.add_argument(
+        "--fit-mode",
+        choices=["ols", "wls"],
+        default="ols",
+        help="Linear fit mode: ordinary or weighted (with the recorded stds) least squares (default: ols)",
+    )
     parser.add_argument(
         "--strict-contract",
         action="store_true",
         help="Fail when exported characterization summaries violate output contract checks",
     )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes used to render plots (default: 1)",
+    )
     parser.add_argument(
         "--profile",
         "--profile-report",
@@ -48,7 +82,13 @@ def main():
         action="store_true",
         help="Profile full execution using cProfile (except argument parsing)"
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be a positive integer")
+    if args.timeseries_max_points is not None and args.timeseries_max_points < 4:
+        parser.error("--timeseries-max-points must be at least 4")
+    if args.rasterize_min_points is not None and args.rasterize_min_points < 0:
+        parser.error("--rasterize-min-points must be zero or positive")
     if not os.path.isfile(args.calibration_json_path):
         parser.error(f"Calibration JSON file does not exist: {args.calibration_json_path}")
 
@@ -63,21 +103,33 @@ def main():
         config.generate_plots = False
     if args.no_sweepfile_plots:
         config.generate_file_plots = False
+    if args.report_plots_only:
+        from characterization_report.main import report_plots
+        config.plot_selection = report_plots()
+    if args.timeseries_max_points:
+        config.timeseries_max_points = args.timeseries_max_points
+    if args.rasterize_min_points is not None:
+        config.rasterize_min_points = args.rasterize_min_points or None
     if args.do_not_sub_pedestals:
         config.subtract_pedestals = False
+    if args.no_cache:
+        config.use_parsed_cache = False
+        config.use_sanity_cache = False
+        config.use_plot_cache = False
+    config.fit_mode = args.fit_mode
 
     characterization = None
     output_base_name = None
     try:
         characterization = Characterization(args)
         if args.log_file:
-            log_file_path = os.path.join(characterization.output_path, f"{now.strftime('%Y%m%d_%H%M%S')}_characterization.log")
+            log_file_path = os.path.join(characterization.output_path, f"{started.strftime('%Y%m%d_%H%M%S')}_characterization.log")
             logger.info("Logging to file: %s", log_file_path)
             from .helpers import add_file_handler
             add_file_handler(log_file_path)
         logger.info("Characterization files path: %s", args.char_files_path)
         logger.info("Output path: %s", characterization.output_path)
-        logger.info("Starting characterization analysis at %s", now.isoformat())
+        logger.info("Starting characterization analysis at %s", started.isoformat())
 
         characterization.load_characterization_files()
         output_base_name = characterization.get_output_base_name()
@@ -152,7 +204,7 @@ def main():
 
         now_end = datetime.now(timezone.utc)
         logger.info("Finished characterization analysis at %s", now_end.isoformat())
-        logger.info("Total duration: %s", str(now_end - now))
+        logger.info("Total duration: %s", str(now_end - started))
         logger.info("Total duration loading libraries: %s", str(now_libs - now))
     finally:
         if profile is not None:
@@ -176,5 +228,10 @@ def main():
             logger.info("Saved profiling stats to %s and %s", profile_path, profile_txt_path)
 
 
+def run(argv: list[str], output_path: str | None = None) -> int:
+    """Run the characterization script in this interpreter and return its exit code (see run_main)"""
+    return run_main(main, argv, output_path)
+
+
 if __name__ == "__main__":
     main()
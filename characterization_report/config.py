@@ -1,4 +1,7 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
+from typing import cast
 
 from .helpers.paths import ReportPaths
 
@@ -16,4 +19,45 @@ class CharacterizationReportConfig:
     )
 
 
-config = CharacterizationReportConfig()
+class _RunConfig:
+    """The configuration of the current run.
+
+    Attribute reads and writes are forwarded to the CharacterizationReportConfig of the
+    current context (see run_config), by default a process wide one.
+    """
+
+    def __getattr__(self, name):
+        return getattr(current_config(), name)
+
+    def __setattr__(self, name, value):
+        setattr(current_config(), name, value)
+
+    def __delattr__(self, name):
+        delattr(current_config(), name)
+
+
+_default_config = CharacterizationReportConfig()
+_run_config: ContextVar[CharacterizationReportConfig] = ContextVar("characterization_report_config")
+
+
+def current_config() -> CharacterizationReportConfig:
+    """Return the configuration of the current run"""
+    return _run_config.get(_default_config)
+
+
+@contextmanager
+def run_config(configuration: CharacterizationReportConfig):
+    """Use a separate configuration in the current context.
+
+    Threads and asyncio tasks entering their own run_config can build reports
+    concurrently without sharing paths.
+    """
+    token = _run_config.set(configuration)
+    try:
+        yield configuration
+    finally:
+        _run_config.reset(token)
+
+
+config = cast(CharacterizationReportConfig, _RunConfig())
+
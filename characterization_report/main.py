@@ -2,20 +2,27 @@ from __future__ import annotations
 
 import argparse
 
-from .config import config
+from .config import CharacterizationReportConfig, run_config
 from .helpers import ReportPaths, add_file_handler, calc_paths, get_logger
 from .slides_sections.full_report import FullReport
 
 logger = get_logger()
 
+REPORT_DEPTH = 0  # full depth
+
+
+def report_plots(depth: int = REPORT_DEPTH) -> dict[str, list[str]]:
+    """Return the ids of the figures embedded in the report, per plot level (see characterization config.plot_selection)"""
+    return FullReport.required_plots(depth)
+
 
 def build_report(input_path: str, output_path: str | None = None, strict_plots: bool = False) -> None:
     add_file_handler("characterization_report.log")
     report_paths: ReportPaths = calc_paths(input_path, output_path, strict_plots=strict_plots)
-    config.paths = report_paths
 
-    report = FullReport(report_paths=report_paths)
-    report.build(depth=0)
+    with run_config(CharacterizationReportConfig(paths=report_paths)):
+        report = FullReport(report_paths=report_paths)
+        report.build(depth=REPORT_DEPTH)
 
 
 def main() -> None:
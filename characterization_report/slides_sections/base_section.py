@@ -7,10 +7,13 @@ from ..helpers.data_holders import ReportData
 
 
 class BaseSection(ABC):
+    section_depth = 3
+    # ids of the figures embedded by the section per plot level ('characterization', 'photodiode', 'fileset', 'file')
+    report_plots: dict[str, tuple[str, ...]] = {}
+
     def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
         self.report_data = report_data
         self.report = report
-        self.section_depth = 3
         self.init_x = 10
         self.end_x = 950
         self.init_y = 480
@@ -22,8 +25,12 @@ class BaseSection(ABC):
             raise ValueError("No frame available yet.")
         return self.report.last_frame
 
+    @classmethod
+    def is_built(cls, depth: int) -> bool:
+        return depth == 0 or cls.section_depth <= depth
+
     def build(self, depth: int = 0) -> None:
-        if depth == 0 or self.section_depth <= depth:
+        if self.is_built(depth):
             self._build(depth)
 
     @abstractmethod
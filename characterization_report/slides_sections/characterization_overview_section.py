@@ -9,9 +9,15 @@ from .base_section import BaseSection
 
 
 class CharacterizationOverviewSection(BaseSection):
-    def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
-        super().__init__(report_data, report)
-        self.section_depth = 1
+    section_depth = 1
+    report_plots = {
+        'characterization': (
+            'power_vs_adc_linregs_1064_simp', 'power_vs_adc_linregs_532_simp', 'refpd_vs_adc_linregs_532',
+            'linreg_power_slope_vs_intercept_1064', 'linreg_power_slope_vs_intercept_532',
+            'relative_slope_deviation_by_gain_1064', 'relative_slope_deviation_by_gain_532',
+            'power_range_by_sensor_1064', 'power_range_by_sensor_532',
+        ),
+    }
 
     def _build(self, depth: int) -> None:
         power_unit = "W"
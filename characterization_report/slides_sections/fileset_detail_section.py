@@ -8,9 +8,7 @@ from .base_section import BaseSection
 
 
 class FilesetDetailSection(BaseSection):
-    def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
-        super().__init__(report_data, report)
-        self.section_depth = 3
+    section_depth = 3
 
     def _build(self, depth: int) -> None:
         photodiodes = self.report_data.analysis.photodiodes
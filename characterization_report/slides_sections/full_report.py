@@ -16,6 +16,15 @@ from .toc_section import ToCSection
 
 
 class FullReport:
+    SECTIONS = (
+        CharacterizationOverviewSection,
+        ToCSection,
+        PhotodiodeOverviewSection,
+        SanityChecksSection,
+        IssuesSection,
+        MiscelaniaSection,
+    )
+
     def __init__(self, report_paths: ReportPaths) -> None:
         self.report_paths = report_paths
         self._data: ReportData | None = None
@@ -48,13 +57,20 @@ class FullReport:
         # Canonical root for all relative plot paths across the report modules.
         self._data.meta.characterization_folder_path = self.report_paths.root_path
 
+    @classmethod
+    def required_plots(cls, depth: int = 0) -> dict[str, list[str]]:
+        """Return the ids of the figures embedded in a report built with depth, per plot level"""
+        plots: dict[str, list[str]] = {}
+        for section in cls.SECTIONS:
+            if section.is_built(depth):
+                for level, fig_ids in section.report_plots.items():
+                    level_plots = plots.setdefault(level, [])
+                    level_plots.extend(fig_id for fig_id in fig_ids if fig_id not in level_plots)
+        return plots
+
     def load_sections(self) -> None:
-        self.sections.append(CharacterizationOverviewSection(self.data, self.report))
-        self.sections.append(ToCSection(self.data, self.report))
-        self.sections.append(PhotodiodeOverviewSection(self.data, self.report))
-        self.sections.append(SanityChecksSection(self.data, self.report))
-        self.sections.append(IssuesSection(self.data, self.report))
-        self.sections.append(MiscelaniaSection(self.data, self.report))
+        for section in self.SECTIONS:
+            self.sections.append(section(self.data, self.report))
 
     def build(self, depth: int = 0) -> None:
         self.load_sections()
@@ -65,9 +65,10 @@ def _flatten_issues(issues: Dict[str, list[IssueEntry]]) -> List[IssueItem]:
 
 
 class IssuesSection(BaseSection):
+    section_depth = 2
+
     def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
         super().__init__(report_data, report)
-        self.section_depth = 2
         margin = 10
         self.col_width = (self.end_x - self.init_x - margin) / 2
         self.col_height = self.init_y - self.end_y
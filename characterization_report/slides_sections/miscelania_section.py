@@ -9,9 +9,7 @@ from .base_section import BaseSection
 
 
 class MiscelaniaSection(BaseSection):
-    def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
-        super().__init__(report_data, report)
-        self.section_depth = 2
+    section_depth = 2
 
     def _build(self, depth: int) -> None:
         self.report.add_slide("Miscelania")
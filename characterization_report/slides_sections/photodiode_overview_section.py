@@ -9,9 +9,10 @@ from .base_section import BaseSection
 
 
 class PhotodiodeOverviewSection(BaseSection):
-    def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
-        super().__init__(report_data, report)
-        self.section_depth = 2
+    section_depth = 2
+    report_plots = {
+        'fileset': ('refpd_vs_dut', 'fit_slopes_intercepts_vs_run_horiz', 'timeseries'),
+    }
 
     def _build(self, depth: int) -> None:
         photodiodes = self.report_data.analysis.photodiodes
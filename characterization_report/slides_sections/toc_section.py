@@ -7,9 +7,7 @@ from .base_section import BaseSection
 
 
 class ToCSection(BaseSection):
-    def __init__(self, report_data: ReportData, report: BaseReportSlides) -> None:
-        super().__init__(report_data, report)
-        self.section_depth = 2
+    section_depth = 2
 
     def _build(self, depth: int) -> None:
         self.report.create_table_of_contents_slide(
@@ -1,3 +1,8 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import cast
+
+
 class Configuration:
     """Holds global configuration settings for crossboard analysis."""
 
@@ -5,6 +10,9 @@ class Configuration:
     generate_plots = True
     summary_file_name = "crossboard_summary.json"
     final_calification_exclusion_pct_threshold = 10.0
+    heatmap_cell_labels_max_cells = 400  # cells of the z-score heatmap above which their values are not written
+    rasterize_min_points = None  # markers and error bars of an axes above which they are rasterized in pdf/svg plots, None to keep vectors
+    rasterize_dpi = 200  # resolution of the rasterized layers
 
     def to_dict(self):
         return {
@@ -12,7 +20,56 @@ class Configuration:
             "generate_plots": self.generate_plots,
             "summary_file_name": self.summary_file_name,
             "final_calification_exclusion_pct_threshold": self.final_calification_exclusion_pct_threshold,
+            "heatmap_cell_labels_max_cells": self.heatmap_cell_labels_max_cells,
+        }
+
+    def plot_settings(self):
+        """Settings only shaping the rendered plots, not exported with the results"""
+        return {
+            "rasterize_min_points": self.rasterize_min_points,
+            "rasterize_dpi": self.rasterize_dpi,
         }
 
 
-config = Configuration()
+class _RunConfig:
+    """The configuration of the current run.
+
+    Attribute reads and writes are forwarded to the Configuration of the
+    current context (see run_config), by default a process wide one.
+    """
+
+    def __getattr__(self, name):
+        return getattr(current_config(), name)
+
+    def __setattr__(self, name, value):
+        setattr(current_config(), name, value)
+
+    def __delattr__(self, name):
+        delattr(current_config(), name)
+
+
+_default_config = Configuration()
+_run_config: ContextVar[Configuration] = ContextVar("crossboard_config")
+
+
+def current_config() -> Configuration:
+    """Return the configuration of the current run"""
+    return _run_config.get(_default_config)
+
+
+@contextmanager
+def run_config(configuration: Configuration | None = None):
+    """Use a separate configuration (a new default one if None) in the current context.
+
+    Threads and asyncio tasks entering their own run_config can run crossboard analyses
+    concurrently without sharing settings. New threads start with the default
+    configuration, run them in contextvars.copy_context() to use the caller's one.
+    """
+    token = _run_config.set(configuration if configuration is not None else Configuration())
+    try:
+        yield current_config()
+    finally:
+        _run_config.reset(token)
+
+
+config = cast(Configuration, _RunConfig())
@@ -70,9 +70,19 @@ def main():
         action="store_true",
         help="Skip crossboard report generation",
     )
+    parser.add_argument(
+        "--rasterize-min-points",
+        type=int,
+        default=None,
+        help="Rasterize the markers and error bars of pdf/svg plot axes drawing more than this many points, e.g. 10000 to keep dense plots small (default: 0, every layer stays vector)",
+    )
     args = parser.parse_args()
+    if args.rasterize_min_points is not None and args.rasterize_min_points < 0:
+        parser.error("--rasterize-min-points must be zero or positive")
 
     config.plot_output_format = args.plot_format
+    if args.rasterize_min_points is not None:
+        config.rasterize_min_points = args.rasterize_min_points or None
 
     output_path = args.output_path
     if os.path.exists(output_path):
@@ -7,10 +7,12 @@ from typing import Any
 
 import numpy as np
 import pandas as pd
-from matplotlib import pyplot as plt
+from matplotlib import colormaps
+from matplotlib.colors import Normalize
 
 from .config import config
 from .dataframe import CrossboardDataFrame
+from .figures import VECTOR_FORMATS, new_subplots, rasterize_dense_layers
 from .helpers import get_logger
 from .style_spec import PLOT_STYLE
 
@@ -31,6 +33,13 @@ class CrossboardPlotter:
     def df(self):
         return self.crossboard_dataframe.dataframe
 
+    @staticmethod
+    def _savefig(fig, fig_path: str) -> None:
+        savefig_kw = {}
+        if config.plot_output_format in VECTOR_FORMATS and rasterize_dense_layers(fig, config.rasterize_min_points):
+            savefig_kw["dpi"] = config.rasterize_dpi
+        fig.savefig(fig_path, **savefig_kw)
+
     def generate_intercept_vs_slope_by_wavelength(self, metric: str = "a2p") -> dict[str, str]:
         slope_col = f"{metric}_slope"
         intercept_col = f"{metric}_intercept"
@@ -50,7 +59,7 @@ class CrossboardPlotter:
 
         wavelengths = sorted(clean_df["wavelength"].astype(str).unique(), key=self._sort_wavelength)
         board_ids = sorted(clean_df["board_id"].astype(str).unique())
-        cmap = plt.get_cmap(PLOT_STYLE["board_cmap"], max(len(board_ids), 1))
+        cmap = colormaps[PLOT_STYLE["board_cmap"]].resampled(max(len(board_ids), 1))
         board_color_map: dict[str, Any] = {board_id: cmap(idx) for idx, board_id in enumerate(board_ids)}
 
         for wavelength in wavelengths:
@@ -58,7 +67,7 @@ class CrossboardPlotter:
             if subset.empty:
                 continue
 
-            fig, ax = plt.subplots(figsize=(10, 7))
+            fig, ax = new_subplots(figsize=(10, 7))
             for board_id in board_ids:
                 points = subset[subset["board_id"].astype(str) == board_id]
                 if points.empty:
@@ -89,8 +98,7 @@ class CrossboardPlotter:
             fig.tight_layout()
             fig_id = f"{metric}_slope_vs_intercept_{wavelength}"
             fig_path = os.path.join(self.output_path, f"{fig_id}.{config.plot_output_format}")
-            fig.savefig(fig_path)
-            plt.close(fig)
+            self._savefig(fig, fig_path)
             self.plots[fig_id] = fig_path
             logger.info("Saved plot: %s", fig_path)
 
@@ -131,7 +139,7 @@ class CrossboardPlotter:
             if subset.empty:
                 continue
 
-            fig, axes = plt.subplots(nrows=2, ncols=1, figsize=(9, 8), sharex=False)
+            fig, axes = new_subplots(nrows=2, ncols=1, figsize=(9, 8), sharex=False)
 
             axes[0].hist(
                 subset[slope_col],
@@ -158,8 +166,7 @@ class CrossboardPlotter:
             fig.tight_layout()
             fig_id = f"{metric}_histograms_{wavelength}_{gain}"
             fig_path = os.path.join(self.output_path, f"{fig_id}.{config.plot_output_format}")
-            fig.savefig(fig_path)
-            plt.close(fig)
+            self._savefig(fig, fig_path)
             self.plots[fig_id] = fig_path
             logger.info("Saved plot: %s", fig_path)
 
@@ -191,7 +198,7 @@ class CrossboardPlotter:
             .sort_values(by=["wavelength_s", "gain_s"], key=lambda s: s.map(self._sort_wavelength) if s.name == "wavelength_s" else s)
         )
         board_ids = sorted(clean_df["board_id"].astype(str).unique())
-        cmap = plt.get_cmap(PLOT_STYLE["board_cmap"], max(len(board_ids), 1))
+        cmap = colormaps[PLOT_STYLE["board_cmap"]].resampled(max(len(board_ids), 1))
         board_color_map: dict[str, Any] = {board_id: cmap(idx) for idx, board_id in enumerate(board_ids)}
 
         for _, combo in combos.iterrows():
@@ -204,7 +211,7 @@ class CrossboardPlotter:
             if subset.empty:
                 continue
 
-            fig, ax = plt.subplots(figsize=(10, 7))
+            fig, ax = new_subplots(figsize=(10, 7))
             for board_id in board_ids:
                 points = subset[subset["board_id"].astype(str) == board_id]
                 if points.empty:
@@ -235,8 +242,7 @@ class CrossboardPlotter:
             fig.tight_layout()
             fig_id = f"{metric}_slope_vs_intercept_{wavelength}_{gain}"
             fig_path = os.path.join(self.output_path, f"{fig_id}.{config.plot_output_format}")
-            fig.savefig(fig_path)
-            plt.close(fig)
+            self._savefig(fig, fig_path)
             self.plots[fig_id] = fig_path
             logger.info("Saved plot: %s", fig_path)
 
@@ -298,7 +304,7 @@ class CrossboardPlotter:
 
             ncols = len(column_order)
             nrows = max(max(len(boards_by_col[key]) for key in column_order), 1)
-            fig, axes = plt.subplots(nrows=nrows, ncols=ncols, figsize=(4.0 * ncols, 4.5 * nrows), sharey=False)
+            fig, axes = new_subplots(nrows=nrows, ncols=ncols, figsize=(4.0 * ncols, 4.5 * nrows), sharey=False)
             axes_arr = np.array(axes).reshape(-1)
             used_axes: set[int] = set()
 
@@ -355,8 +361,7 @@ class CrossboardPlotter:
             fig.tight_layout()
             fig_id = f"a2p_slope_median_std_by_board_{wavelength}_{gain}"
             fig_path = os.path.join(self.output_path, f"{fig_id}.{config.plot_output_format}")
-            fig.savefig(fig_path)
-            plt.close(fig)
+            self._savefig(fig, fig_path)
             self.plots[fig_id] = fig_path
             logger.info("Saved plot: %s", fig_path)
         return self.plots
@@ -426,7 +431,7 @@ class CrossboardPlotter:
 
             ncols = len(column_order)
             nrows = max(max(len(boards_by_col[key]) for key in column_order), 1)
-            fig, axes = plt.subplots(nrows=nrows, ncols=ncols, figsize=(4.0 * ncols, 4.5 * nrows), sharey=False)
+            fig, axes = new_subplots(nrows=nrows, ncols=ncols, figsize=(4.0 * ncols, 4.5 * nrows), sharey=False)
             axes_arr = np.array(axes).reshape(-1)
             used_axes: set[int] = set()
 
@@ -518,8 +523,7 @@ class CrossboardPlotter:
             fig.tight_layout()
             fig_id = f"a2p_slope_pct_diff_median_std_by_board_{wavelength}_{gain}"
             fig_path = os.path.join(self.output_path, f"{fig_id}.{config.plot_output_format}")
-            fig.savefig(fig_path)
-            plt.close(fig)
+            self._savefig(fig, fig_path)
             self.plots[fig_id] = fig_path
             logger.info("Saved plot: %s", fig_path)
         return self.plots
@@ -567,42 +571,40 @@ class CrossboardPlotter:
 
         fig_width = max(10.0, len(boards) * 0.55)
         fig_height = max(4.5, len(combos) * 1.1)
-        fig, ax = plt.subplots(figsize=(fig_width, fig_height))
+        fig, ax = new_subplots(figsize=(fig_width, fig_height))
         fig.patch.set_facecolor("white")
         ax.set_facecolor("white")
         arr = zmat.to_numpy(dtype=float)
         color_limit = 10.0
+        # combos as rows, boards as columns; cells without data are drawn as 0
         arr_plot = np.clip(np.where(np.isnan(arr), 0.0, arr), -color_limit, color_limit).T
         label_values = arr.T
-        cmap = plt.get_cmap(PLOT_STYLE["heatmap_cmap"])
-        norm = plt.Normalize(vmin=-color_limit, vmax=color_limit)
+        cmap = colormaps[PLOT_STYLE["heatmap_cmap"]]
+        norm = Normalize(vmin=-color_limit, vmax=color_limit)
 
+        # a single mesh artist for all the cells, whatever the number of boards
         nrows, ncols = arr_plot.shape
-        for row_idx in range(nrows):
-            for col_idx in range(ncols):
+        mesh = ax.pcolormesh(
+            np.arange(ncols + 1) - 0.5,
+            np.arange(nrows + 1) - 0.5,
+            arr_plot,
+            cmap=cmap,
+            norm=norm,
+            edgecolors="white",
+            linewidth=0.8,
+        )
+        if arr_plot.size <= config.heatmap_cell_labels_max_cells:
+            for row_idx, col_idx in zip(*np.nonzero(np.isfinite(label_values))):
                 value = arr_plot[row_idx, col_idx]
-                label_value = label_values[row_idx, col_idx]
-                facecolor = cmap(norm(value))
-                rect = plt.Rectangle(
-                    (col_idx - 0.5, row_idx - 0.5),
-                    1.0,
-                    1.0,
-                    facecolor=facecolor,
-                    edgecolor="white",
-                    linewidth=0.8,
+                ax.text(
+                    col_idx,
+                    row_idx,
+                    f"{label_values[row_idx, col_idx]:.2f}",
+                    ha="center",
+                    va="center",
+                    fontsize=7,
+                    color="white" if abs(value) >= 0.55 * color_limit else "black",
                 )
-                ax.add_patch(rect)
-                if np.isfinite(label_value):
-                    text_color = "white" if abs(value) >= 0.55 * color_limit else "black"
-                    ax.text(
-                        col_idx,
-                        row_idx,
-                        f"{label_value:.2f}",
-                        ha="center",
-                        va="center",
-                        fontsize=7,
-                        color=text_color,
-                    )
 
         ax.set_xlim(-0.5, ncols - 0.5)
         ax.set_ylim(nrows - 0.5, -0.5)
@@ -613,57 +615,16 @@ class CrossboardPlotter:
         ax.set_xticklabels(boards, rotation=65, ha="right", fontsize=8)
         ax.set_yticks(np.arange(len(combos)))
         ax.set_yticklabels(combos, fontsize=9)
-        legend_steps = np.linspace(-color_limit, color_limit, 9)
-        legend_x = ncols + 0.6
-        legend_width = 0.45
-        for idx in range(len(legend_steps) - 1):
-            y0 = idx * (nrows / (len(legend_steps) - 1)) - 0.5
-            y1 = (idx + 1) * (nrows / (len(legend_steps) - 1)) - 0.5
-            mid = 0.5 * (legend_steps[idx] + legend_steps[idx + 1])
-            rect = plt.Rectangle(
-                (legend_x, y0),
-                legend_width,
-                y1 - y0,
-                facecolor=cmap(norm(mid)),
-                edgecolor="white",
-                linewidth=0.4,
-            )
-            ax.add_patch(rect)
-
-        tick_values = np.linspace(-color_limit, color_limit, 5)
-        for tick in tick_values:
-            y = (tick_values[-1] - tick) / (tick_values[-1] - tick_values[0]) * (nrows - 1)
-            ax.plot(
-                [legend_x + legend_width, legend_x + legend_width + 0.12],
-                [y, y],
-                color="black",
-                linewidth=0.8,
-                clip_on=False,
-            )
-            ax.text(
-                legend_x + legend_width + 0.18,
-                y,
-                f"{tick:.1f}",
-                va="center",
-                ha="left",
-                fontsize=8,
-            )
-        ax.text(
-            legend_x,
-            -1.05,
-            "Robust z-score",
-            ha="left",
-            va="bottom",
-            fontsize=9,
-            fontweight="bold",
+        colorbar = fig.colorbar(
+            mesh, ax=ax, extend="both", ticks=np.linspace(-color_limit, color_limit, 5), fraction=0.04, pad=0.02
         )
-        ax.set_xlim(-0.5, legend_x + legend_width + 1.0)
+        colorbar.set_label("Robust z-score", fontsize=9, fontweight="bold")
+        colorbar.ax.tick_params(labelsize=8)
         fig.tight_layout()
 
         fig_id = "a2p_robust_zscore_heatmap"
         fig_path = os.path.join(self.output_path, f"{fig_id}.{config.plot_output_format}")
-        fig.savefig(fig_path)
-        plt.close(fig)
+        self._savefig(fig, fig_path)
         self.plots[fig_id] = fig_path
         logger.info("Saved plot: %s", fig_path)
         return self.plots
@@ -1,4 +1,7 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
+from typing import cast
 
 from .helpers.paths import ReportPaths
 
@@ -14,4 +17,45 @@ class CrossboardReportConfig:
     )
 
 
-config = CrossboardReportConfig()
+class _RunConfig:
+    """The configuration of the current run.
+
+    Attribute reads and writes are forwarded to the CrossboardReportConfig of the
+    current context (see run_config), by default a process wide one.
+    """
+
+    def __getattr__(self, name):
+        return getattr(current_config(), name)
+
+    def __setattr__(self, name, value):
+        setattr(current_config(), name, value)
+
+    def __delattr__(self, name):
+        delattr(current_config(), name)
+
+
+_default_config = CrossboardReportConfig()
+_run_config: ContextVar[CrossboardReportConfig] = ContextVar("crossboard_report_config")
+
+
+def current_config() -> CrossboardReportConfig:
+    """Return the configuration of the current run"""
+    return _run_config.get(_default_config)
+
+
+@contextmanager
+def run_config(configuration: CrossboardReportConfig):
+    """Use a separate configuration in the current context.
+
+    Threads and asyncio tasks entering their own run_config can build reports
+    concurrently without sharing paths.
+    """
+    token = _run_config.set(configuration)
+    try:
+        yield configuration
+    finally:
+        _run_config.reset(token)
+
+
+config = cast(CrossboardReportConfig, _RunConfig())
+
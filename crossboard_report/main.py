@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import argparse
 
-from .config import config
+from .config import CrossboardReportConfig, run_config
 from .helpers import ReportPaths, add_file_handler, calc_paths, get_logger
 from .slides_sections.full_report import FullReport
 
@@ -12,14 +12,14 @@ logger = get_logger()
 def build_report(input_path: str, output_path: str | None = None) -> None:
     add_file_handler("crossboard_report.log")
     report_paths: ReportPaths = calc_paths(input_path, output_path)
-    config.paths = report_paths
 
     logger.info("Crossboard report loaded")
     logger.info("Input summary: %s", report_paths.input_file)
     logger.info("Output path: %s", report_paths.output_path)
 
-    report = FullReport(report_paths=report_paths)
-    report.build(depth=0)
+    with run_config(CrossboardReportConfig(paths=report_paths)):
+        report = FullReport(report_paths=report_paths)
+        report.build(depth=0)
     logger.info("Generated crossboard report: %s", report_paths.report_path)
 
 
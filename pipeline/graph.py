@@ -0,0 +1,128 @@
+"""Dependency graph of the analysis pipeline and its parallel executor.
+
+Every node runs one command (an analysis script) and declares the files its
+outputs depend on: its own input files and the outputs of the nodes it
+depends on. A node whose fingerprint (see state.NodeCache) did not change since
+its last successful run is not run again, so a changed input only re-runs the
+nodes downstream of it.
+"""
+from __future__ import annotations
+
+import shutil
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from .state import NodeCache
+
+DONE = "done"
+UP_TO_DATE = "up to date"
+FAILED = "failed"
+BLOCKED = "blocked"
+
+
+@dataclass
+class Node:
+    """A pipeline step: a command, the files it reads and the files it produces"""
+    node_id: str
+    command: list[str]
+    inputs: list[Path] = field(default_factory=list)  # files whose content the outputs depend on
+    outputs: list[Path] = field(default_factory=list)
+    deps: list[str] = field(default_factory=list)
+    packages: tuple[str, ...] = ()  # packages whose sources the outputs depend on
+    publish: list[tuple[Path, Path]] = field(default_factory=list)  # (source, destination) copies after a run
+
+
+class PipelineGraph:
+    """Nodes in insertion order; the dependencies of a node must be added before it (so there are no cycles)"""
+
+    def __init__(self):
+        self.nodes: dict[str, Node] = {}
+
+    def add(self, node: Node) -> Node:
+        if node.node_id in self.nodes:
+            raise ValueError(f"Duplicated pipeline node: {node.node_id}")
+        unknown = [dep for dep in node.deps if dep not in self.nodes]
+        if unknown:
+            raise ValueError(f"Pipeline node {node.node_id} depends on unknown nodes: {unknown}")
+        self.nodes[node.node_id] = node
+        return node
+
+
+def _run_command(cmd: list[str], output_path: Path) -> int:
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", encoding="utf-8") as f:
+        return subprocess.run(cmd, stdout=f, stderr=subprocess.STDOUT, check=False).returncode
+
+
+def run_graph(
+    graph: PipelineGraph,
+    cache: NodeCache,
+    jobs: int,
+    log_dir: Path,
+    force: bool = False,
+    run_command: Callable[[list[str], Path], int] = _run_command,
+) -> dict[str, str]:
+    """Run the out of date nodes, up to `jobs` at a time, and return the status of every node.
+
+    A node runs once all its dependencies are done (or up to date). It is
+    skipped when up to date in the cache (unless force), and blocked when a
+    dependency failed. The output of every command goes to `<log_dir>/<node_id>.log`.
+    """
+    status: dict[str, str] = {}
+    running: dict[Future, tuple[Node, str]] = {}
+    start = time.monotonic()
+
+    def _report(node: Node, state: str, detail: str = ""):
+        status[node.node_id] = state
+        print(f"[{len(status)}/{len(graph.nodes)}] {node.node_id}: {state}{detail} ({time.monotonic() - start:.1f} s)")
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while len(status) < len(graph.nodes):
+            scheduled = True
+            while scheduled:
+                # schedule until nothing changes: skipping a node can make its dependents ready
+                scheduled = False
+                running_ids = {node.node_id for node, _ in running.values()}
+                for node in graph.nodes.values():
+                    if node.node_id in status or node.node_id in running_ids:
+                        continue
+                    if any(status.get(dep) in (FAILED, BLOCKED) for dep in node.deps):
+                        _report(node, BLOCKED)
+                        scheduled = True
+                        continue
+                    if any(status.get(dep) not in (DONE, UP_TO_DATE) for dep in node.deps):
+                        continue
+                    if len(running) >= jobs:
+                        continue
+                    fingerprint = cache.fingerprint(node)
+                    if not force and cache.is_up_to_date(node, fingerprint):
+                        _report(node, UP_TO_DATE)
+                        scheduled = True
+                        continue
+                    print("Running:", " ".join(node.command))
+                    running[pool.submit(run_command, node.command, log_dir / f"{node.node_id}.log")] = (node, fingerprint)
+                    running_ids.add(node.node_id)
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                node, fingerprint = running.pop(future)
+                returncode = future.result()
+                detail = f" (exit code {returncode})"
+                if returncode == 0:
+                    try:
+                        for source, destination in node.publish:
+                            shutil.copy2(source, destination)
+                    except OSError as exc:
+                        returncode, detail = 1, f" (cannot publish output: {exc})"
+                if returncode == 0:
+                    cache.record(node, fingerprint)
+                    _report(node, DONE)
+                else:
+                    cache.forget(node.node_id)
+                    _report(node, FAILED, detail)
+    return status
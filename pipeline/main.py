@@ -0,0 +1,212 @@
+"""Run the whole analysis chain (calibration -> characterization -> crossboard) as a dependency graph.
+
+Every calibration zip and every characterization zip is a node, the
+characterizations depending on the nearest previous calibration (by the
+DDMMYYYY date of the file names), and the crossboard analysis depends on every
+characterization. With plots, the calibration nodes only analyse and publish
+their summary, and a plot node per calibration, depending on the summaries of
+the earlier calibrations (shown in its evolution plots), makes the full run. The
+reports are built by the analysis scripts themselves. Independent nodes run
+in parallel (--jobs) and a rerun only processes the nodes whose inputs,
+options or code changed, plus those downstream of them.
+
+Output layout under the output folder:
+    calibrations/<calib_id>/...     calibration outputs (and <calib_id>.json, the published summary)
+    characterizations/<board_id>/   characterization outputs of every board
+    crossboard/                     crossboard outputs
+    pipeline_logs/<node>.log        output of every node command
+    pipeline_state.json             fingerprints of the last successful runs
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from characterization.helpers.dated_files import (
+    DatedFile,
+    collect_dated_files,
+    extract_board_id,
+    find_previous_calibration,
+)
+
+from .graph import BLOCKED, FAILED, Node, PipelineGraph, run_graph
+from .state import STATE_FILE_NAME, NodeCache
+
+
+def build_graph(
+    calibration_files: list[DatedFile],
+    characterization_files: list[DatedFile],
+    output_root: Path,
+    args: argparse.Namespace,
+) -> tuple[PipelineGraph, list[DatedFile]]:
+    """Build the pipeline graph, return it with the characterizations without previous calibration"""
+    graph = PipelineGraph()
+    calibrations_root = output_root / "calibrations"
+    characterizations_root = output_root / "characterizations"
+    plot_options = ["-f", args.plot_format]
+    if args.no_plots:
+        plot_options.append("-n")
+    if args.no_gen_report:
+        plot_options.append("--no-gen-report")
+    raster_options = []
+    if args.rasterize_min_points is not None:
+        raster_options = ["--rasterize-min-points", str(args.rasterize_min_points)]
+
+    # with plots, the evolution plots of a calibration read the summaries published by the earlier calibrations:
+    # the analysis nodes (no plots nor report) publish every summary, then the plot nodes run on the earlier ones
+    analysis_options = ["-n", "--no-gen-report"] if not args.no_plots else plot_options
+    calibration_nodes: dict[Path, Node] = {}
+    for calibration_file in calibration_files:
+        calib_id = calibration_file.path.stem
+        summary = calibrations_root / calib_id / f"{calib_id}.json"
+        published = calibrations_root / f"{calib_id}.json"
+        calibration_nodes[calibration_file.path] = graph.add(Node(
+            node_id=calib_id,
+            command=[
+                sys.executable, "-m", "calibration.main", str(calibration_file.path),
+                "-o", str(calibrations_root), "-w", "--fit-mode", args.fit_mode, *analysis_options,
+            ],
+            inputs=[calibration_file.path],
+            outputs=[summary, published],
+            packages=("calibration", "calib_report", "base_report"),
+            publish=[(summary, published)],
+        ))
+    if not args.no_plots:
+        for calibration_file in calibration_files:
+            calibration_node = calibration_nodes[calibration_file.path]
+            earlier_nodes = [calibration_nodes[earlier.path] for earlier in calibration_files if earlier.date < calibration_file.date]
+            graph.add(Node(
+                node_id=f"{calibration_node.node_id}_plots",
+                command=[
+                    sys.executable, "-m", "calibration.main", str(calibration_file.path),
+                    "-o", str(calibrations_root), "-w", "--fit-mode", args.fit_mode, *plot_options, *raster_options,
+                ],
+                inputs=[calibration_file.path, *(node.publish[0][1] for node in earlier_nodes)],
+                outputs=[calibration_node.outputs[0]],
+                deps=[*(node.node_id for node in earlier_nodes), calibration_node.node_id],
+                packages=("calibration", "calib_report", "base_report"),
+            ))
+
+    skipped: list[DatedFile] = []
+    characterization_nodes: list[Node] = []
+    last_of_board: dict[str, Node] = {}
+    for char_file in characterization_files:
+        calibration_file = find_previous_calibration(char_file.date, calibration_files)
+        if calibration_file is None:
+            skipped.append(char_file)
+            continue
+        board_id = extract_board_id(char_file.path)
+        run_output = characterizations_root / board_id
+        calibration_node = calibration_nodes[calibration_file.path]
+        calibration_json = calibration_node.publish[0][1]
+        inputs = [char_file.path, calibration_json]
+        deps = [calibration_node.node_id]
+        previous = last_of_board.get(board_id)
+        if previous is not None:
+            # the characterizations of a board share their output folder (the latest one provides the
+            # board summary): run them in date order and again whenever an earlier one is re-run
+            inputs.extend(previous.outputs)
+            deps.append(previous.node_id)
+        node = graph.add(Node(
+            node_id=f"characterization_{char_file.path.stem}",
+            command=[
+                sys.executable, "-m", "characterization.main", str(char_file.path),
+                str(calibration_json), "-wze", "-o", str(run_output),
+                "--fit-mode", args.fit_mode, *plot_options, *raster_options,
+            ],
+            inputs=inputs,
+            outputs=[run_output / f"{char_file.path.stem}.zip"],
+            deps=deps,
+            packages=("characterization", "characterization_report", "base_report"),
+        ))
+        last_of_board[board_id] = node
+        characterization_nodes.append(node)
+
+    if characterization_nodes:
+        crossboard_command = [
+            sys.executable, "-m", "crossboard.main", str(characterizations_root),
+            "-o", str(output_root / "crossboard"), "-w", "-f", args.plot_format, *raster_options,
+        ]
+        if args.no_gen_report:
+            crossboard_command.append("--no-report")
+        graph.add(Node(
+            node_id="crossboard",
+            command=crossboard_command,
+            inputs=[output for node in characterization_nodes for output in node.outputs],
+            outputs=[output_root / "crossboard" / "crossboard_summary.json"],
+            deps=[node.node_id for node in characterization_nodes],
+            packages=("crossboard", "crossboard_report", "characterization", "base_report"),
+        ))
+    return graph, skipped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run calibrations, characterizations (each with the nearest previous calibration by the "
+            "DDMMYYYY date in the file names) and the crossboard analysis, only re-running what changed."
+        )
+    )
+    parser.add_argument("calibration_zip_folder", help="Folder containing calibration zip files")
+    parser.add_argument("characterization_zip_folder", help="Folder containing characterization zip files")
+    parser.add_argument(
+        "--output-folder",
+        "-o",
+        type=Path,
+        default=Path("pipeline-output"),
+        help="Root output folder (default: pipeline-output)",
+    )
+    parser.add_argument("--plot-format", "-f", choices=["pdf", "svg", "png"], default="pdf", help="Plot file format")
+    parser.add_argument("--no-plots", "-n", action="store_true", help="Do not generate plots")
+    parser.add_argument("--no-gen-report", action="store_true", help="Do not generate reports")
+    parser.add_argument(
+        "--rasterize-min-points",
+        type=int,
+        default=None,
+        help="Rasterize the markers and error bars of pdf/svg plot axes drawing more than this many points, "
+        "e.g. 10000 to keep dense plots small (default: 0, every layer stays vector)",
+    )
+    parser.add_argument("--fit-mode", choices=["ols", "wls"], default="ols", help="Linear fit mode (default: ols)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Number of nodes run concurrently (default: 1)")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"Run every node, even those up to date in the {STATE_FILE_NAME} of the output folder",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be a positive integer")
+    if args.rasterize_min_points is not None and args.rasterize_min_points < 0:
+        parser.error("--rasterize-min-points must be zero or positive")
+
+    calibration_folder = Path(args.calibration_zip_folder)
+    characterization_folder = Path(args.characterization_zip_folder)
+    for folder in (calibration_folder, characterization_folder):
+        if not folder.is_dir():
+            parser.error(f"Folder does not exist or is not a directory: {folder}")
+    calibration_files = collect_dated_files(calibration_folder, "*.zip")
+    if not calibration_files:
+        parser.error(f"No calibration .zip files with parsable DDMMYYYY date found in {calibration_folder}")
+    characterization_files = collect_dated_files(characterization_folder, "*.zip")
+
+    output_root = args.output_folder.resolve()
+    (output_root / "calibrations").mkdir(parents=True, exist_ok=True)
+    graph, skipped = build_graph(calibration_files, characterization_files, output_root, args)
+    for char_file in skipped:
+        print(f"[skip] {char_file.path.name}: no previous calibration found")
+    print(f"Pipeline nodes: {len(graph.nodes)}")
+    for node in graph.nodes.values():
+        deps = f" <- {', '.join(node.deps)}" if node.deps else ""
+        print(f"  {node.node_id}{deps}")
+
+    status = run_graph(graph, NodeCache(output_root), args.jobs, output_root / "pipeline_logs", force=args.force)
+    failed = [node_id for node_id, state in status.items() if state in (FAILED, BLOCKED)]
+    if failed:
+        print(f"\n[error] {len(failed)} pipeline nodes failed or blocked: {', '.join(failed)}")
+        sys.exit(1)
+    print("\nPipeline completed")
+
+
+if __name__ == "__main__":
+    main()
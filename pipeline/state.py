@@ -0,0 +1,109 @@
+"""Cache of the pipeline node runs (``pipeline_state.json`` in the output root).
+
+The fingerprint of a node digests its command options, the version of the
+packages producing its outputs (package version plus a digest of their
+sources) and the content of its input files, which include the outputs of the
+nodes it depends on. A node whose fingerprint matches its last successful run
+and whose outputs exist is up to date. File hashes are reused while the file
+size and modification time do not change.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from calibration.helpers.batch_manifest import file_sha256, tool_version
+
+if TYPE_CHECKING:
+    from .graph import Node
+
+STATE_FILE_NAME = 'pipeline_state.json'
+STATE_FORMAT_VERSION = 1
+
+
+class NodeCache:
+    """Fingerprints and outputs of the last successful run of every node"""
+
+    def __init__(self, output_root: Path):
+        self.output_root = Path(output_root)
+        self.path = self.output_root / STATE_FILE_NAME
+        self.nodes, self.files = self._load()
+        self._versions: dict[tuple[str, ...], str] = {}
+
+    def _load(self) -> tuple[dict[str, dict], dict[str, dict]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}
+        if not isinstance(data, dict) or data.get('format_version') != STATE_FORMAT_VERSION:
+            return {}, {}
+        return data.get('nodes', {}), data.get('files', {})
+
+    def save(self):
+        """Write the state atomically (a crash never leaves a truncated file)"""
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_root, prefix=f".{STATE_FILE_NAME}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'format_version': STATE_FORMAT_VERSION, 'nodes': self.nodes, 'files': self.files},
+                    f, indent=2, sort_keys=True,
+                )
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _file_hash(self, path: Path) -> str | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = str(Path(path).resolve())
+        known = self.files.get(key)
+        if known and (known.get('size'), known.get('mtime_ns')) == (stat.st_size, stat.st_mtime_ns):
+            return known['sha256']
+        sha256 = file_sha256(path)
+        self.files[key] = {'sha256': sha256, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        return sha256
+
+    def _version(self, packages: tuple[str, ...]) -> str:
+        if packages not in self._versions:
+            self._versions[packages] = tool_version(*packages)
+        return self._versions[packages]
+
+    def fingerprint(self, node: Node) -> str:
+        """Digest of the node options, tool version and input files content (missing inputs included)"""
+        payload = {
+            'options': node.command[1:],
+            'tool_version': self._version(node.packages),
+            'inputs': [[str(path), self._file_hash(path)] for path in node.inputs],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def is_up_to_date(self, node: Node, fingerprint: str) -> bool:
+        record = self.nodes.get(node.node_id)
+        if not record or record.get('fingerprint') != fingerprint:
+            return False
+        return all(Path(output).exists() for output in node.outputs)
+
+    def record(self, node: Node, fingerprint: str):
+        """Record a successful run of the node and save"""
+        self.nodes[node.node_id] = {
+            'fingerprint': fingerprint,
+            'outputs': [os.path.relpath(output, self.output_root) for output in node.outputs],
+        }
+        self.save()
+
+    def forget(self, node_id: str):
+        """Drop the record of a node (e.g. after a failed run) and save"""
+        if self.nodes.pop(node_id, None) is not None:
+            self.save()
@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import json
+import sys
 import tempfile
+import time
+import types
 import unittest
+from datetime import datetime
 from pathlib import Path
+from unittest import mock
 
-from calibration.batch_calib_analysis import _build_calibration_command, _collect_dated_files, _publish_reduced_summary
+from calibration.batch_calib_analysis import (
+    _build_analysis_command,
+    _build_calibration_command,
+    _publish_reduced_summary,
+    _run_calibrations,
+    _run_in_process,
+    main,
+)
+from calibration.helpers.calib_history import HISTORY_FILE_NAME, CalibrationHistory
+from calibration.helpers.dated_files import DatedFile, collect_dated_files
 
 
 class _Args:
@@ -21,6 +36,23 @@ class _Args:
         self.use_W_as_power_units = True
 
 
+
+def _fake_calibration(cmd: list[str], output_path) -> int:
+    """Stand-in for calibration.main: export a summary and, with plots, the calibrations in its evolution plot"""
+    calib_id = Path(cmd[3]).stem
+    output_root = Path(cmd[cmd.index("-o") + 1])
+    history = CalibrationHistory(str(output_root / HISTORY_FILE_NAME))
+    history.sync_directory(str(output_root))
+    run_output = output_root / calib_id
+    run_output.mkdir(parents=True, exist_ok=True)
+    summary = {"filesets": {"1064_FW5": {"full_dataset_linreg": {"slope": float(calib_id[-8:-6]), "intercept": 0.0}}}}
+    (run_output / f"{calib_id}.json").write_text(json.dumps(summary), encoding="utf-8")
+    if "-n" not in cmd:
+        evolution = [entry["label"] for entry in history.fileset_history("1064_FW5", before=calib_id)]
+        (run_output / "calibrations_evolution.json").write_text(json.dumps(evolution), encoding="utf-8")
+    return 0
+
+
 class TestBatchCalibrationAnalysis(unittest.TestCase):
     def test_collect_dated_files_sorts_by_date_and_skips_invalid_names(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -29,7 +61,7 @@ class TestBatchCalibrationAnalysis(unittest.TestCase):
             (root / "calibration_01012026.zip").write_text("", encoding="utf-8")
             (root / "invalid_name.zip").write_text("", encoding="utf-8")
 
-            collected = _collect_dated_files(root, "*.zip")
+            collected = collect_dated_files(root, "*.zip")
 
         self.assertEqual(
             [item.path.name for item in collected],
@@ -55,6 +87,97 @@ class TestBatchCalibrationAnalysis(unittest.TestCase):
         self.assertIn("-p", command)
         self.assertIn("-u", command)
 
+    def test_build_analysis_command_disables_plots_report_and_zip(self) -> None:
+        args = _Args()
+        args.no_plots = False
+        args.no_gen_report = False
+
+        command = _build_analysis_command(args, Path("calibration_21012026.zip"))
+
+        self.assertNotIn("-z", command)
+        self.assertEqual(command.count("-n"), 1)
+        self.assertEqual(command.count("--no-gen-report"), 1)
+        self.assertIn("-s", command)
+
+    def test_run_calibrations_reports_results_in_chronological_order(self) -> None:
+        files = [DatedFile(Path(f"calibration_0{day}012026.zip"), datetime(2026, 1, day)) for day in (1, 2, 3)]
+        # the earliest calibration finishes last
+        delays = {"calibration_01012026.zip": 0.2, "calibration_02012026.zip": 0.0, "calibration_03012026.zip": 0.1}
+
+        def _fake_run(cmd, output_path):
+            time.sleep(delays[Path(cmd[0]).name])
+            return 0
+
+        results = []
+        with mock.patch("calibration.batch_calib_analysis._run_command", side_effect=_fake_run), \
+                mock.patch("builtins.print"):
+            _run_calibrations(files, lambda path: [str(path)], 3, None, lambda f, rc: results.append((f.path.name, rc)))
+
+        self.assertEqual(results, [(f.path.name, 0) for f in files])
+
+    def test_evolution_plots_do_not_depend_on_jobs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            (root / "calibs").mkdir()
+            for day in ("03", "01", "02"):
+                (root / "calibs" / f"calibration_{day}012026.zip").write_bytes(day.encode())
+            evolutions = {}
+            for jobs in ("1", "2"):
+                output_root = root / f"out_{jobs}"
+                argv = ["batch_calib_analysis", str(root / "calibs"), "-o", str(output_root), "-j", jobs]
+                with mock.patch.object(sys, "argv", argv), \
+                        mock.patch("calibration.batch_calib_analysis._run_command", side_effect=_fake_calibration), \
+                        mock.patch("builtins.print"):
+                    main()
+                evolutions[jobs] = {
+                    path.parent.name: json.loads(path.read_text(encoding="utf-8"))
+                    for path in output_root.glob("*/calibrations_evolution.json")
+                }
+
+        self.assertEqual(evolutions["1"], evolutions["2"])
+        self.assertEqual(evolutions["1"]["calibration_03012026"], ["calibration_01012026", "calibration_02012026"])
+        self.assertEqual(evolutions["1"]["calibration_01012026"], [])
+
+    def test_new_calibration_only_runs_itself(self) -> None:
+        runs = []
+
+        def _run(cmd, output_path):
+            runs.append(Path(cmd[3]).name)
+            return _fake_calibration(cmd, output_path)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            (root / "calibs").mkdir()
+            for day in ("01", "02"):
+                (root / "calibs" / f"calibration_{day}012026.zip").write_bytes(day.encode())
+            argv = ["batch_calib_analysis", str(root / "calibs"), "-o", str(root / "out"), "-j", "2"]
+            with mock.patch.object(sys, "argv", argv), \
+                    mock.patch("calibration.batch_calib_analysis._run_command", side_effect=_run), \
+                    mock.patch("builtins.print"):
+                main()
+                runs.clear()
+                main()
+                self.assertEqual(runs, [])
+
+                (root / "calibs" / "calibration_03012026.zip").write_bytes(b"03")
+                main()
+                self.assertEqual(runs, ["calibration_03012026.zip", "calibration_03012026.zip"])  # analysis, then plots
+
+                runs.clear()
+                (root / "calibs" / "calibration_02012026.zip").write_bytes(b"new content")
+                main()
+                self.assertEqual(sorted(set(runs)), ["calibration_02012026.zip", "calibration_03012026.zip"])
+
+    def test_run_in_process_passes_script_arguments(self) -> None:
+        command = _build_calibration_command(_Args(), Path("calibration_21012026.zip"))
+        calibration_main = types.ModuleType("calibration.main")
+        calibration_main.run = mock.Mock(return_value=0)
+
+        with mock.patch.dict(sys.modules, {"calibration.main": calibration_main}):
+            self.assertEqual(_run_in_process(command, None), 0)
+
+        calibration_main.run.assert_called_once_with(command[3:], None)
+
     def test_publish_reduced_summary_copies_json_to_output_root(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             output_root = Path(tmp_dir)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from calibration.helpers.batch_manifest import BatchManifest, tool_version
+
+
+class TestBatchManifest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.zip_path = self.root / "calibration_21012026.zip"
+        self.zip_path.write_bytes(b"zip content")
+        self.output = self.root / "calibration_21012026.json"
+        self.output.write_text("{}", encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _recorded_manifest(self) -> BatchManifest:
+        manifest = BatchManifest(self.root, "1.0+abc")
+        fingerprint = manifest.fingerprint(self.zip_path.name, [self.zip_path], ["-n"])
+        manifest.record(self.zip_path.name, fingerprint, [self.output])
+        return BatchManifest(self.root, "1.0+abc")
+
+    def test_recorded_item_is_up_to_date_without_hashing_again(self):
+        manifest = self._recorded_manifest()
+
+        with mock.patch("calibration.helpers.batch_manifest.file_sha256") as sha256:
+            fingerprint = manifest.fingerprint(self.zip_path.name, [self.zip_path], ["-n"])
+        sha256.assert_not_called()
+        self.assertTrue(manifest.is_up_to_date(self.zip_path.name, fingerprint))
+        self.assertEqual(manifest.items[self.zip_path.name]["outputs"], ["calibration_21012026.json"])
+
+    def test_changes_invalidate_the_record(self):
+        manifest = self._recorded_manifest()
+        key = self.zip_path.name
+
+        self.assertFalse(manifest.is_up_to_date(key, manifest.fingerprint(key, [self.zip_path], ["-n", "-d"])))
+        updated = BatchManifest(self.root, "1.0+def")
+        self.assertFalse(updated.is_up_to_date(key, updated.fingerprint(key, [self.zip_path], ["-n"])))
+
+        self.zip_path.write_bytes(b"new zip content")
+        self.assertFalse(manifest.is_up_to_date(key, manifest.fingerprint(key, [self.zip_path], ["-n"])))
+
+    def test_changed_dependencies_invalidate_the_record(self):
+        manifest = BatchManifest(self.root, "1.0+abc")
+        key = self.zip_path.name
+        fingerprint = manifest.fingerprint(key, [self.zip_path], ["-n"])
+        fingerprint["depends_on"] = {"calibration_20012026.zip": "aa"}
+        manifest.record(key, fingerprint, [self.output])
+        manifest = BatchManifest(self.root, "1.0+abc")
+
+        fingerprint = manifest.fingerprint(key, [self.zip_path], ["-n"])
+        fingerprint["depends_on"] = {"calibration_20012026.zip": "aa"}
+        self.assertTrue(manifest.is_up_to_date(key, fingerprint))
+        fingerprint["depends_on"] = {"calibration_20012026.zip": "bb"}
+        self.assertFalse(manifest.is_up_to_date(key, fingerprint))
+        fingerprint["depends_on"] = {"calibration_19012026.zip": "cc", "calibration_20012026.zip": "aa"}
+        self.assertFalse(manifest.is_up_to_date(key, fingerprint))
+
+    def test_missing_outputs_and_forgotten_items_are_not_up_to_date(self):
+        manifest = self._recorded_manifest()
+        key = self.zip_path.name
+        fingerprint = manifest.fingerprint(key, [self.zip_path], ["-n"])
+
+        self.output.unlink()
+        self.assertFalse(manifest.is_up_to_date(key, fingerprint))
+
+        manifest.forget(key)
+        self.assertNotIn(key, BatchManifest(self.root, "1.0+abc").items)
+
+    def test_invalid_manifest_is_ignored(self):
+        (self.root / "batch_manifest.json").write_text("{not json", encoding="utf-8")
+
+        self.assertEqual(BatchManifest(self.root, "1.0").items, {})
+
+    def test_tool_version_digests_the_package_sources(self):
+        version = tool_version("calibration")
+
+        self.assertEqual(version, tool_version("calibration"))
+        self.assertNotEqual(version, tool_version("calibration", "calib_report"))
+        self.assertNotEqual(tool_version("calibration", "calib_report"), tool_version("calibration", "calib_report", "base_report"))
+
+
+if __name__ == "__main__":
+    unittest.main()
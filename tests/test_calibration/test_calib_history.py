@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from calibration.helpers.calib_history import CalibrationHistory
+
+
+def _summary(slope: float, min_ts: float = 1_700_000_000.0) -> dict:
+    return {
+        'acquisition_time': {'min_ts': min_ts},
+        'filesets': {
+            '1064_FW5': {
+                'full_dataset_linreg': {'slope': slope, 'stderr': 0.1, 'intercept': 0.5, 'intercept_stderr': 0.01},
+                'pedestals': {
+                    'pm': {'weighted': True, 'w_mean': 1e-3, 'w_stderr': 1e-5, 'mean': 2e-3, 'std': 1e-4},
+                    'refpd': {'weighted': False, 'mean': 0.2, 'std': 0.01},
+                },
+            },
+            '532_FW4': {'full_dataset_linreg': None, 'pedestals': {}},
+        },
+    }
+
+
+class TestCalibrationHistory(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        self.history = CalibrationHistory(os.path.join(self.root, 'history.sqlite'))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name: str, summary: dict):
+        with open(os.path.join(self.root, name), 'w', encoding='utf-8') as f:
+            json.dump(summary, f)
+
+    def test_record_and_query(self):
+        self.history.record('calibration_01012026', _summary(130.0))
+
+        entries = self.history.fileset_history('1064_FW5')
+        self.assertEqual(len(entries), 1)
+        entry = entries[0]
+        self.assertEqual(entry['label'], 'calibration_01012026')
+        self.assertEqual((entry['slope'], entry['slope_err'], entry['intercept'], entry['intercept_err']), (130.0, 0.1, 0.5, 0.01))
+        self.assertEqual((entry['pm_ped'], entry['pm_ped_err']), (1e-3, 1e-5))
+        self.assertEqual((entry['refpd_ped'], entry['refpd_ped_err']), (0.2, 0.01))
+        self.assertEqual(self.history.fileset_history('532_FW4'), [])
+
+        self.history.record('calibration_01012026', _summary(131.0))
+        self.assertEqual([e['slope'] for e in self.history.fileset_history('1064_FW5')], [131.0])
+
+    def test_history_before_a_calibration_only_has_earlier_dates(self):
+        for calib_id in ('calibration_01012026', 'calibration_05012026', 'calibration_02022026'):
+            self.history.record(calib_id, _summary(130.0))
+
+        entries = self.history.fileset_history('1064_FW5', before='calibration_05012026')
+        self.assertEqual([e['label'] for e in entries], ['calibration_01012026'])
+        self.assertEqual(len(self.history.fileset_history('1064_FW5', before='my_calibration')), 3)
+
+    def test_sync_only_parses_new_or_modified_summaries(self):
+        self._write('calibration_01012026.json', _summary(130.0))
+        self._write('calibration_02012026.json', _summary(129.0))
+        self._write('other.json', _summary(1.0))
+        self.history.sync_directory(self.root)
+        self.assertEqual(len(self.history.fileset_history('1064_FW5')), 2)
+
+        with mock.patch('calibration.helpers.calib_history.json.load') as load:
+            self.history.sync_directory(self.root)
+        load.assert_not_called()
+
+        os.remove(os.path.join(self.root, 'calibration_02012026.json'))
+        self.history.sync_directory(self.root)
+        self.assertEqual([e['label'] for e in self.history.fileset_history('1064_FW5')], ['calibration_01012026'])
+
+    def test_sync_drops_calibrations_whose_summary_was_removed(self):
+        os.mkdir(os.path.join(self.root, 'calibration_04012026'))
+        source_file = os.path.join('calibration_04012026', 'calibration_04012026.json')
+        self._write(source_file, _summary(128.0))
+        self.history.record('calibration_04012026', _summary(128.0), os.stat(os.path.join(self.root, source_file)), source_file)
+        self.history.record('calibration_05012026', _summary(127.0))  # no summary to follow
+        self.history.sync_directory(self.root)
+        self.assertEqual([e['label'] for e in self.history.fileset_history('1064_FW5')], ['calibration_04012026'])
+
+        os.remove(os.path.join(self.root, source_file))
+        self.history.sync_directory(self.root)
+        self.assertEqual(self.history.fileset_history('1064_FW5'), [])
+
+    def test_sync_skips_invalid_files(self):
+        with open(os.path.join(self.root, 'calibration_03012026.json'), 'w', encoding='utf-8') as f:
+            f.write('{not json')
+        self.history.sync_directory(self.root)
+        self.assertEqual(self.history.fileset_history('1064_FW5'), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
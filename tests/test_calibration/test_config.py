@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import threading
+import unittest
+from unittest import mock
+
+from calibration.config import Configuration, config, current_config, run_config
+
+
+class TestRunConfig(unittest.TestCase):
+    def test_threads_use_their_own_configuration(self):
+        barrier = threading.Barrier(2)
+        seen = {}
+
+        def _run(fit_mode):
+            with run_config():
+                config.fit_mode = fit_mode
+                barrier.wait()
+                seen[fit_mode] = config.fit_mode
+
+        threads = [threading.Thread(target=_run, args=(fit_mode,)) for fit_mode in ("ols", "wls")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(seen, {"ols": "ols", "wls": "wls"})
+        self.assertEqual(config.fit_mode, "ols")
+
+    def test_nested_run_config_restores_previous_configuration(self):
+        outer = current_config()
+        custom = Configuration()
+        custom.generate_plots = False
+        with run_config(custom) as active:
+            self.assertIs(active, custom)
+            self.assertFalse(config.generate_plots)
+            with mock.patch.object(config, "fit_mode", "wls"):
+                self.assertEqual(custom.fit_mode, "wls")
+            self.assertEqual(custom.fit_mode, "ols")
+        self.assertIs(current_config(), outer)
+        self.assertTrue(config.generate_plots)
+
+    def test_plot_settings_are_replicated_but_not_exported(self):
+        source = Configuration()
+        source.fit_mode = "wls"
+        source.plot_selection = {"calibration": ["summary"]}
+        source.timeseries_max_points = 500
+        source.rasterize_min_points = 10000
+        replica = Configuration()
+        replica.update_from_dict({**source.to_dict(), **source.plot_settings()})
+
+        self.assertNotIn("plot_selection", source.to_dict())
+        self.assertNotIn("timeseries_max_points", source.to_dict())
+        self.assertNotIn("rasterize_min_points", source.to_dict())
+        self.assertEqual(replica.fit_mode, "wls")
+        self.assertEqual(replica.plot_selection, {"calibration": ["summary"]})
+        self.assertEqual(replica.timeseries_max_points, 500)
+        self.assertEqual(replica.rasterize_min_points, 10000)
+        self.assertIsNone(Configuration().rasterize_min_points)  # rasterizing is opt-in
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from calibration.helpers.downsample import downsample_rows, envelope_indices
+
+
+def _frame(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'datetime': pd.date_range('2026-01-21', periods=n, freq='s'),
+        'pm_mean': np.sin(np.arange(n) / 50.0) + rng.normal(0.0, 0.1, n),
+        'pm_std': rng.uniform(0.01, 0.2, n),
+    })
+
+
+class TestDownsample(unittest.TestCase):
+    def test_short_series_and_disabled_bound_keep_every_row(self):
+        df = _frame(100)
+        self.assertIs(downsample_rows(df, 'pm_mean', 'pm_std', None), df)
+        self.assertIs(downsample_rows(df, 'pm_mean', 'pm_std', 100), df)
+        np.testing.assert_array_equal(envelope_indices(df['pm_mean'], max_points=0), np.arange(100))
+
+    def test_rows_are_bounded_and_keep_the_envelope(self):
+        df = _frame(10_000)
+        rows = downsample_rows(df, 'pm_mean', max_points=500)
+
+        self.assertLessEqual(len(rows), 500)
+        self.assertTrue(rows['datetime'].is_monotonic_increasing)
+        self.assertEqual(rows.index[0], 0)
+        self.assertEqual(rows.index[-1], 9_999)
+        self.assertEqual(rows['pm_mean'].min(), df['pm_mean'].min())
+        self.assertEqual(rows['pm_mean'].max(), df['pm_mean'].max())
+
+    def test_error_bars_envelope_is_kept(self):
+        df = _frame(10_000)
+        df.loc[1234, 'pm_std'] = 5.0  # widest bar, on an unremarkable value
+        rows = downsample_rows(df, 'pm_mean', 'pm_std', max_points=500)
+
+        self.assertIn(1234, rows.index)
+        low, high = df['pm_mean'] - df['pm_std'], df['pm_mean'] + df['pm_std']
+        self.assertEqual((rows['pm_mean'] - rows['pm_std']).min(), low.min())
+        self.assertEqual((rows['pm_mean'] + rows['pm_std']).max(), high.max())
+
+    def test_nan_values_are_not_preferred(self):
+        values = np.arange(1000.0)
+        values[::2] = np.nan
+        indices = envelope_indices(values, max_points=10)
+
+        self.assertTrue(np.all(np.isfinite(values[indices[1:]])))
+
+
+if __name__ == '__main__':
+    unittest.main()
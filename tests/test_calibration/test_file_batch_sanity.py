@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from calibration.elements.base_element import DataHolderLevel
+from calibration.elements.sanity.file_batch import FileBatchSanityChecker
+from calibration.elements.sanity.sanity_base import SanityBase
+
+
+class _FakeFile:
+    def __init__(self, df: pd.DataFrame, df_pedestals: pd.DataFrame):
+        self.df = df
+        self.df_pedestals = df_pedestals
+        self.df_full = pd.concat([df, df_pedestals], ignore_index=True)
+        self.level_header = 'file'
+
+    def project(self, columns: list[str], kind: str = 'df') -> pd.DataFrame:
+        return getattr(self, kind)[columns]
+
+
+def _file(rng, n: int, zero_std: int = 0, zero_pedestal: bool = False) -> _FakeFile:
+    start = pd.Timestamp('2026-01-21 10:00:00', tz='UTC') + pd.Timedelta(minutes=int(rng.integers(0, 600)))
+    df = pd.DataFrame({
+        'temperature': rng.normal(20.0, 0.8, n),
+        'RH': rng.uniform(30.0, 70.0, n),
+        'datetime': start + pd.to_timedelta(np.sort(rng.uniform(0, 3600, n)), unit='s'),
+        'pm_std': rng.uniform(0.1, 1.0, n),
+        'ref_pd_std': rng.uniform(0.1, 1.0, n),
+    })
+    df.loc[:zero_std - 1, 'pm_std'] = 0.0
+    pedestals = pd.DataFrame({
+        'pm_mean': [0.0 if zero_pedestal else 1e-3, 2e-3],
+        'ref_pd_mean': [0.2, 0.3],
+        'pm_std': [1e-5, 0.0],
+        'ref_pd_std': [0.01, 0.02],
+    })
+    return _FakeFile(df, pedestals)
+
+
+CHECKS = {
+    'max_temperature_swing': [2.0],
+    'avg_temperature_range': [19.0, 21.0],
+    'max_rh': [60],
+    'max_acq_time_span_hours': [0.5],
+    'min_data_points': [25],
+    'no_std_points': [None],
+    'no_std_pedestals': [None],
+    'zero_pedestals': [None],
+}
+
+
+class TestFileBatchSanityChecker(unittest.TestCase):
+    def test_matches_the_per_file_checks(self):
+        rng = np.random.default_rng(7)
+        files = [_file(rng, 40), _file(rng, 12, zero_std=3), _file(rng, 30, zero_pedestal=True), _file(rng, 0)]
+        batch = FileBatchSanityChecker(files)
+
+        for check_name, args in CHECKS.items():
+            results = getattr(batch, f"san_check_{check_name}")(*args, severity='warning')
+            self.assertEqual(len(results), len(files))
+            for calfile, result in zip(files, results):
+                expected = getattr(SanityBase(calfile, DataHolderLevel.FILE), f"san_check_{check_name}")(*args, severity='warning')
+                with self.subTest(check=check_name):
+                    self.assertEqual(result.to_dict(), expected.to_dict())
+
+    def test_frames_are_stacked_once(self):
+        rng = np.random.default_rng(1)
+        files = [_file(rng, 20) for _ in range(3)]
+        calls = []
+        for calfile in files:
+            project = calfile.project
+            calfile.project = lambda columns, kind='df', _project=project: calls.append(kind) or _project(columns, kind)
+        batch = FileBatchSanityChecker(files)
+
+        for check_name in ('max_temperature_swing', 'max_rh', 'min_data_points', 'no_std_points'):
+            getattr(batch, f"san_check_{check_name}")(*CHECKS[check_name], severity='error')
+
+        self.assertEqual(calls, ['df'] * len(files))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+
+from calibration.helpers import file_manage
+
+
+class TestZipInputFiles(unittest.TestCase):
+    def _make_zip(self, tmp_dir: str, members: dict[str, bytes]) -> str:
+        zip_path = os.path.join(tmp_dir, "calibration_21012026.zip")
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for name, content in members.items():
+                zf.writestr(name, content)
+        return zip_path
+
+    def test_lists_flattened_members_sorted_and_reads_in_memory(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = self._make_zip(tmp_dir, {
+                "data/532nm/b_run.txt": b"second",
+                "data/1064nm/a_run.txt": b"first",
+            })
+            files = file_manage.list_input_files(zip_path)
+
+            self.assertEqual([f.name for f in files], ["a_run.txt", "b_run.txt"])
+            self.assertEqual(files[0].read_bytes(), b"first")
+            self.assertEqual(files[1].size, len(b"second"))
+            self.assertEqual(sorted(os.listdir(tmp_dir)), ["calibration_21012026.zip"])
+
+    def test_open_archives_reads_members_through_one_zip_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = self._make_zip(tmp_dir, {f"run_{i}.txt": str(i).encode() for i in range(5)})
+            files = file_manage.list_input_files(zip_path)
+
+            with patch.object(zipfile, "ZipFile", wraps=zipfile.ZipFile) as zip_file:
+                with file_manage.open_archives():
+                    contents = [f.read_bytes() for f in files]
+                self.assertEqual(zip_file.call_count, 1)
+                files[0].read_bytes()  # outside the block the archive is opened for the read
+                self.assertEqual(zip_file.call_count, 2)
+
+        self.assertEqual(contents, [str(i).encode() for i in range(5)])
+
+    def test_rejects_path_traversal_and_collisions(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = self._make_zip(tmp_dir, {"../evil.txt": b"x"})
+            with self.assertRaises(ValueError):
+                file_manage.list_input_files(zip_path)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = self._make_zip(tmp_dir, {"a/run.txt": b"x", "b/run.txt": b"y"})
+            with self.assertRaises(ValueError):
+                file_manage.list_input_files(zip_path)
+
+    def test_enforces_member_limits(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            zip_path = self._make_zip(tmp_dir, {"a.txt": b"x", "b.txt": b"y"})
+            with patch.object(file_manage, "MAX_ZIP_MEMBERS", 1):
+                with self.assertRaises(ValueError):
+                    file_manage.list_input_files(zip_path)
+            with patch.object(file_manage, "MAX_ZIP_SINGLE_FILE_BYTES", 0):
+                with self.assertRaises(ValueError):
+                    file_manage.list_input_files(zip_path)
+
+    def test_lists_regular_files_of_a_folder(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "run.txt"), "wb") as f:
+                f.write(b"abc")
+            os.mkdir(os.path.join(tmp_dir, "subdir"))
+            files = file_manage.list_input_files(tmp_dir)
+
+        self.assertEqual([f.name for f in files], ["run.txt"])
+        self.assertEqual(files[0].size, 3)
+        self.assertIsNone(files[0].zip_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
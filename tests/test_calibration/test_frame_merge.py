@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from calibration.helpers.frame_merge import merge_sorted_frames, merged_order
+
+
+class TestFrameMerge(unittest.TestCase):
+    def test_merged_order_matches_stable_sort(self):
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            keys = [np.sort(rng.integers(0, 20, rng.integers(0, 8))) for _ in range(rng.integers(1, 6))]
+            order = merged_order(keys)
+            concat = np.concatenate(keys)
+            expected = np.argsort(concat, kind='stable')
+            got = np.arange(len(concat)) if order is None else order
+            np.testing.assert_array_equal(got, expected)
+
+    def test_disjoint_children_are_not_reordered(self):
+        self.assertIsNone(merged_order([np.array([1, 2]), np.array([3, 5]), np.array([], dtype=np.int64)]))
+
+    def test_merge_interleaved_frames_with_projection(self):
+        a = pd.DataFrame({'timestamp': [1, 4, 6], 'pm_mean': [1.0, 4.0, 6.0], 'RH': [10, 40, 60]})
+        b = pd.DataFrame({'timestamp': [2, 4, 5], 'pm_mean': [2.0, 4.5, 5.0], 'RH': [20, 45, 50]})
+        merged = merge_sorted_frames([a, b], columns=['timestamp', 'pm_mean'])
+
+        self.assertEqual(list(merged.columns), ['timestamp', 'pm_mean'])
+        self.assertEqual(list(merged['pm_mean']), [1.0, 2.0, 4.0, 4.5, 5.0, 6.0])
+        self.assertIsInstance(merged.index, pd.RangeIndex)
+
+    def test_unsorted_child_is_sorted_first(self):
+        a = pd.DataFrame({'timestamp': [3, 1], 'x': [3, 1]})
+        b = pd.DataFrame({'timestamp': [2], 'x': [2]})
+        self.assertEqual(list(merge_sorted_frames([a, b])['x']), [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
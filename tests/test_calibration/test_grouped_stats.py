@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from calibration.helpers.grouped_stats import grouped_means
+
+
+class TestGroupedMeans(unittest.TestCase):
+    def test_matches_per_group_weighted_mean(self):
+        rng = np.random.default_rng(3)
+        values = rng.normal(10.0, 2.0, (40, 2))
+        stds = rng.uniform(0.1, 1.0, (40, 2))
+        stds[5, 0] = 0.0
+        groups = rng.integers(0, 3, 40)
+        means = grouped_means(values, stds, groups, 3)
+
+        for g in range(3):
+            for c in range(2):
+                vals = values[groups == g, c]
+                std = stds[groups == g, c]
+                self.assertAlmostEqual(means.mean[g, c], pd.Series(vals).mean(), places=12)
+                self.assertAlmostEqual(means.std[g, c], pd.Series(vals).std(), places=12)
+                self.assertEqual(means.samples[g, c], len(vals))
+                kept = std > 0
+                w = 1.0 / std[kept] ** 2
+                w_mean = np.sum(w * vals[kept]) / np.sum(w)
+                self.assertAlmostEqual(means.w_mean[g, c], w_mean, places=12)
+                self.assertAlmostEqual(means.w_stderr[g, c], np.sqrt(1.0 / np.sum(w)), places=12)
+                self.assertAlmostEqual(means.chi2[g, c], np.sum(w * (vals[kept] - w_mean) ** 2), places=9)
+                self.assertEqual(means.ndof[g, c], kept.sum() - 1)
+                self.assertEqual(means.zero_std[g, c], (~kept).sum())
+
+    def test_empty_groups_and_nan_values(self):
+        means = grouped_means(np.array([1.0, np.nan, 3.0]), np.array([1.0, 1.0, 1.0]), np.array([0, 0, 0]), 2)
+
+        self.assertEqual(means.mean[0, 0], 2.0)
+        self.assertEqual(means.samples[0, 0], 3)
+        self.assertEqual(means.ndof[0, 0], 1)
+        self.assertEqual(means.samples[1, 0], 0)
+        self.assertTrue(np.isnan(means.mean[1, 0]))
+        self.assertEqual(means.ndof[1, 0], -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
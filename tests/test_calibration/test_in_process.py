@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import unittest
+
+from calibration.config import config
+from calibration.helpers import add_file_handler, get_logger
+from calibration.helpers.in_process import run_main
+
+
+class TestRunMain(unittest.TestCase):
+    def test_resets_configuration_and_log_handlers(self):
+        handlers = list(get_logger().handlers)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            def _main(argv):
+                config.fit_mode = "wls"
+                add_file_handler(os.path.join(tmp_dir, "run.log"))
+                print("run output", *argv)
+                raise SystemExit(3)
+
+            returncode = run_main(_main, ["a"], os.path.join(tmp_dir, "console.log"))
+            with open(os.path.join(tmp_dir, "console.log"), encoding="utf-8") as f:
+                console = f.read()
+
+        self.assertEqual(returncode, 3)
+        self.assertEqual(console, "run output a\n")
+        self.assertEqual(config.fit_mode, "ols")
+        self.assertEqual(get_logger().handlers, handlers)
+
+    def test_exceptions_become_exit_codes(self):
+        def _main(argv):
+            raise ValueError("broken run")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_path = os.path.join(tmp_dir, "console.log")
+            self.assertEqual(run_main(_main, [], output_path), 1)
+            with open(output_path, encoding="utf-8") as f:
+                self.assertIn("ValueError: broken run", f.read())
+        self.assertEqual(run_main(lambda argv: None, []), 0)
+        self.assertEqual(run_main(lambda argv: sys.exit(), []), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
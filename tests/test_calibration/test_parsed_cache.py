@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from calibration.helpers.parsed_cache import ParsedDataCache
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        'datetime': pd.to_datetime([1_700_000_000, 1_700_000_024], unit='s', utc=True),
+        'pm_mean': [1.5, 2.5],
+        'samples': np.array([99, 100], dtype=np.int64),
+        'laser_sp_532': pd.array([pd.NA, 3.14], dtype='Float64'),
+    })
+
+
+class TestParsedDataCache(unittest.TestCase):
+    def test_round_trip_preserves_dtypes_and_meta(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ParsedDataCache(tmp_dir)
+            key = cache.make_key(b"raw", "run.txt", {'subtract_pedestals': True})
+            self.assertIsNone(cache.load(key))
+
+            cache.store(key, {'full': _frame()}, {'data_prep_info': {'original_num_rows': 2}})
+            frames, meta = cache.load(key)
+
+        pd.testing.assert_frame_equal(frames['full'], _frame())
+        self.assertEqual(meta, {'data_prep_info': {'original_num_rows': 2}})
+
+    def test_key_depends_on_content_name_and_flags(self):
+        key = ParsedDataCache.make_key(b"raw", "run.txt", {'subtract_pedestals': True})
+        self.assertNotEqual(key, ParsedDataCache.make_key(b"raw2", "run.txt", {'subtract_pedestals': True}))
+        self.assertNotEqual(key, ParsedDataCache.make_key(b"raw", "run2.txt", {'subtract_pedestals': True}))
+        self.assertNotEqual(key, ParsedDataCache.make_key(b"raw", "run.txt", {'subtract_pedestals': False}))
+
+    def test_evicts_least_recently_used_entries(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ParsedDataCache(tmp_dir)
+            cache.store('a', {'full': _frame()}, {})
+            entry_size = os.path.getsize(os.path.join(tmp_dir, 'a.npz'))
+            os.utime(os.path.join(tmp_dir, 'a.npz'), (0, 0))
+            cache.max_bytes = entry_size
+            cache.store('b', {'full': _frame()}, {})
+
+            self.assertIsNone(cache.load('a'))
+            self.assertIsNotNone(cache.load('b'))
+
+    def test_discards_corrupted_entries(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ParsedDataCache(tmp_dir)
+            with open(os.path.join(tmp_dir, 'bad.npz'), 'wb') as f:
+                f.write(b"not a npz file")
+
+            self.assertIsNone(cache.load('bad'))
+            self.assertFalse(os.path.exists(os.path.join(tmp_dir, 'bad.npz')))
+
+
+if __name__ == "__main__":
+    unittest.main()
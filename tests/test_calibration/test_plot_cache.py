@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from calibration.helpers import plot_cache
+from calibration.helpers.plot_cache import PlotRenderCache
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# builds the same figure as _figure() and prints its key, run in fresh interpreters
+_KEY_SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {tests!r})
+from test_plot_cache import _figure
+from calibration.helpers.plot_cache import PlotRenderCache
+print(PlotRenderCache.make_key(_figure(), 'pdf'))
+"""
+
+
+def _figure(offset: float = 0.0, title: str = 'pm vs time') -> Figure:
+    fig = Figure(figsize=(4, 3))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(nrows=2, sharex=True)
+    times = pd.date_range('2026-01-21', periods=20, freq='min')
+    ax1.errorbar(times, np.arange(20.0) + offset, yerr=np.full(20, 0.5), fmt='.', label='pm')
+    ax1.twinx().plot(times, np.linspace(20, 21, 20), color='#17becf')
+    ax1.legend()
+    ax2.scatter(times, np.sin(np.arange(20.0)))
+    ax1.set_title(title)
+    fig.tight_layout()
+    return fig
+
+
+class TestPlotRenderCache(unittest.TestCase):
+    def test_key_depends_on_data_labels_and_format(self):
+        key = PlotRenderCache.make_key(_figure(), 'pdf')
+
+        self.assertEqual(key, PlotRenderCache.make_key(_figure(), 'pdf'))
+        self.assertTrue(key.endswith('.pdf'))
+        self.assertNotEqual(key, PlotRenderCache.make_key(_figure(offset=1e-9), 'pdf'))
+        self.assertNotEqual(key, PlotRenderCache.make_key(_figure(title='pm vs temperature'), 'pdf'))
+        self.assertNotEqual(key, PlotRenderCache.make_key(_figure(), 'png'))
+        self.assertNotEqual(key, PlotRenderCache.make_key(_figure(), 'pdf', {'dpi': 200}))
+
+    def test_key_is_stable_across_processes(self):
+        script = _KEY_SCRIPT.format(root=ROOT, tests=os.path.dirname(os.path.abspath(__file__)))
+        keys = {
+            subprocess.run(
+                [sys.executable, '-c', script], check=True, capture_output=True, text=True,
+                env={**os.environ, 'PYTHONHASHSEED': seed},
+            ).stdout.strip()
+            for seed in ('1', '2')
+        }
+        self.assertEqual(keys, {PlotRenderCache.make_key(_figure(), 'pdf')})
+
+    def test_save_figure_reuses_the_file_of_an_identical_figure(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = PlotRenderCache(os.path.join(tmp_dir, plot_cache.CACHE_DIR_NAME))
+            first, second = os.path.join(tmp_dir, 'first.png'), os.path.join(tmp_dir, 'second.png')
+            plot_cache.set_cache(cache)
+            self.addCleanup(plot_cache.set_cache, None)
+
+            plot_cache.save_figure(_figure(), first, 'png')
+            with patch.object(Figure, 'savefig') as savefig:
+                plot_cache.save_figure(_figure(), second, 'png')
+                savefig.assert_not_called()
+                plot_cache.save_figure(_figure(offset=1.0), os.path.join(tmp_dir, 'third.png'), 'png')
+                savefig.assert_called_once()
+
+            with open(first, 'rb') as f1, open(second, 'rb') as f2:
+                self.assertEqual(f1.read(), f2.read())
+            self.assertEqual(len(os.listdir(cache.cache_dir)), 1)
+
+    def test_disabled_cache_renders(self):
+        plot_cache.set_cache(None)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'plot.svg')
+            plot_cache.save_figure(_figure(), path, 'svg')
+
+            self.assertTrue(os.path.getsize(path) > 0)
+            self.assertEqual(os.listdir(tmp_dir), ['plot.svg'])
+
+    def test_evicts_least_recently_used_entries(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = PlotRenderCache(os.path.join(tmp_dir, 'cache'))
+            source = os.path.join(tmp_dir, 'plot.png')
+            _figure().savefig(source)
+            cache.store('a.png', source)
+            os.utime(os.path.join(cache.cache_dir, 'a.png'), (0, 0))
+            cache.max_bytes = os.path.getsize(source)
+            cache.store('b.png', source)
+
+            self.assertFalse(cache.fetch('a.png', os.path.join(tmp_dir, 'a.png')))
+            self.assertTrue(cache.fetch('b.png', os.path.join(tmp_dir, 'b.png')))
+
+
+if __name__ == '__main__':
+    unittest.main()
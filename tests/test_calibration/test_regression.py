@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+from scipy.stats import linregress
+
+from calibration.helpers.regression import RegressionStats, fit_stats, linregress_groups, linregress_many
+
+
+class TestBatchedRegression(unittest.TestCase):
+    def assert_matches_linregress(self, result, x, y):
+        expected = linregress(x, y)
+        for field in ('slope', 'intercept', 'rvalue', 'pvalue', 'stderr', 'intercept_stderr'):
+            np.testing.assert_allclose(getattr(result, field), getattr(expected, field), rtol=1e-6, atol=1e-300, err_msg=field)
+
+    def test_matches_linregress_for_many_groups(self):
+        rng = np.random.default_rng(0)
+        pairs = []
+        for _ in range(50):
+            n = int(rng.integers(3, 40))
+            x = rng.uniform(0, 100, n)
+            pairs.append((x, 2.5 * x + 1.0 + rng.normal(0, 20, n)))
+        for result, (x, y) in zip(linregress_many(pairs), pairs):
+            self.assert_matches_linregress(result, x, y)
+
+    def test_two_points_and_constant_y_follow_linregress_conventions(self):
+        pairs = [
+            (np.array([1.0, 2.0]), np.array([3.0, 5.0])),
+            (np.array([1.0, 2.0]), np.array([3.0, 3.0])),
+            (np.array([1.0, 2.0, 3.0]), np.array([4.0, 4.0, 4.0])),
+        ]
+        results = linregress_many(pairs)
+        self.assertEqual((results[0].pvalue, results[0].stderr, results[0].intercept_stderr), (0.0, 0.0, 0.0))
+        self.assertEqual(results[1].pvalue, 1.0)
+        self.assertTrue(np.isnan(results[2].rvalue))
+        for result, (x, y) in zip(results, pairs):
+            self.assert_matches_linregress(result, x, y)
+
+    def test_rejects_identical_x_and_empty_groups(self):
+        with self.assertRaises(ValueError):
+            linregress_many([(np.array([1.0, 1.0]), np.array([1.0, 2.0]))])
+        with self.assertRaises(ValueError):
+            linregress_groups(np.array([1.0, 2.0]), np.array([1.0, 2.0]), np.array([0, 0]), 2)
+
+
+class TestMergedRegressionStats(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.xs = [rng.uniform(0, 1e3, n) for n in (7, 1, 25, 0, 12)]
+        self.ys = [3.0 * x - 5.0 + rng.normal(0, 10, len(x)) for x in self.xs]
+        self.ws = [rng.uniform(0.5, 2.0, len(x)) for x in self.xs]
+        self.stats = RegressionStats.from_pairs(list(zip(self.xs, self.ys)), weights=self.ws)
+
+    def test_merged_groups_match_the_concatenated_samples(self):
+        merged = RegressionStats.merge([self.stats.take([i]) for i in range(len(self.xs))])
+        direct = RegressionStats.from_pairs(
+            [(np.concatenate(self.xs), np.concatenate(self.ys))], weights=[np.concatenate(self.ws)]
+        )
+        for name, value in vars(direct).items():
+            np.testing.assert_allclose(getattr(merged, name), value, rtol=1e-12, err_msg=name)
+        x, y = np.concatenate(self.xs), np.concatenate(self.ys)
+        TestBatchedRegression().assert_matches_linregress(merged.linregress()[0], x, y)
+
+    def test_combine_by_labels(self):
+        combined = self.stats.combine(np.array([0, 1, 0, 1, 1]), 2)
+        np.testing.assert_array_equal(combined.n, [32, 13])
+        self.assertEqual(combined.y_first[1], self.ys[1][0])
+        self.assertEqual(combined.y_last[1], self.ys[4][-1])
+        np.testing.assert_allclose(combined.mean_x[0], np.concatenate([self.xs[0], self.xs[2]]).mean(), rtol=1e-12)
+
+    def test_unweighted_statistics_drop_weighted_moments_on_concat(self):
+        unweighted = RegressionStats.from_pairs([(self.xs[0], self.ys[0])])
+        self.assertFalse(RegressionStats.concat([unweighted, self.stats.take([0])]).weighted)
+        self.assertTrue(self.stats.take([0, 2]).weighted)
+
+
+class TestWeightedFit(unittest.TestCase):
+    def test_matches_polyfit_with_known_sigmas(self):
+        rng = np.random.default_rng(2)
+        fits = []
+        for n in (5, 30, 12):
+            x = rng.uniform(0, 50, n)
+            sigma_y = rng.uniform(0.5, 3.0, n)
+            fits.append((x, 1.5 * x + 4.0 + rng.normal(0, sigma_y), None, sigma_y))
+        results = fit_stats(fits, weighted=True).fit()
+        for result, (x, y, _, sigma_y) in zip(results, fits):
+            coeffs, cov = np.polyfit(x, y, 1, w=1.0 / sigma_y, cov='unscaled')
+            np.testing.assert_allclose([result.slope, result.intercept], coeffs, rtol=1e-9)
+            np.testing.assert_allclose([result.stderr, result.intercept_stderr], np.sqrt(np.diag(cov)), rtol=1e-9)
+            chi2 = np.sum(((y - np.polyval(coeffs, x)) / sigma_y) ** 2)
+            np.testing.assert_allclose(result.chi2, chi2, rtol=1e-9)
+            self.assertEqual(result.ndof, len(x) - 2)
+
+    def test_chi2_with_small_sigmas(self):
+        x = np.arange(101.0)
+        sigma_y = np.full(101, 1e-9)
+        y = 0.01 * x + np.random.default_rng(3).normal(0, sigma_y)  # chi2 ~ 100, wsyy ~ 1e19
+        result, = fit_stats([(x, y, None, sigma_y)], weighted=True).fit()
+        chi2 = np.sum(((y - result.intercept - result.slope * x) / sigma_y) ** 2)
+        np.testing.assert_allclose(result.chi2, chi2, rtol=1e-6)
+
+        # same chi2 when the samples are reduced in parts and merged
+        parts = [(x[:40], y[:40], None, sigma_y[:40]), (x[40:], y[40:], None, sigma_y[40:])]
+        merged, = RegressionStats.merge([fit_stats([part], weighted=True) for part in parts]).fit()
+        np.testing.assert_allclose(merged.chi2, chi2, rtol=1e-6)
+
+    def test_samples_without_positive_sigma_are_left_out(self):
+        x = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+        y = np.array([2.0, 4.1, 5.9, 100.0, 10.2])
+        sigma_y = np.array([0.1, 0.1, 0.1, 0.0, 0.1])
+        stats = fit_stats([(x, y, None, sigma_y)], weighted=True)
+        self.assertEqual(stats.n[0], 4)
+        kept = sigma_y > 0
+        self.assertAlmostEqual(stats.wls()[0].slope, linregress(x[kept], y[kept]).slope, places=9)
+
+    def test_unweighted_statistics_fit_with_linregress(self):
+        x = np.arange(6.0)
+        result, = fit_stats([(x, 2 * x + 1, None, np.ones(6))]).fit()
+        self.assertFalse(hasattr(result, 'chi2'))
+        with self.assertRaises(ValueError):
+            RegressionStats.from_pairs([(x, 2 * x)]).wls()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import io
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from calibration.helpers.run_file_parser import CALIB_RUN_COLUMNS, decode_timestamps, parse_calibration_run
+
+RUN_FILE = (
+    b"2024-07-24-09:05:35\t0.000\t-0.000014000\t0.000000000\t0.000001697\t0.000000267\t20.6\t37.0\t99\n"
+    b"2024-07-24-09:05:59\t2.190\t-0.000006000\t0.000000000\t0.010948951\t0.000044293\t20.6\t37.0\t99\n"
+    b"2024-07-24-09:06:23\t3.140\t0.000004000\t0.000000000\t0.025001093\t0.000129406\t20.7\t37.0\t98\n"
+    b"2024-12-31-23:59:59\t0.000\t-0.000001000\t0.000000012\t0.000001700\t0.000000270\t20.7\t37.1\t100\n"
+)
+
+
+class TestRunFileParser(unittest.TestCase):
+    def test_matches_pandas_parser(self):
+        cols = parse_calibration_run(RUN_FILE)
+        df = pd.read_csv(io.BytesIO(RUN_FILE), delimiter='\t', header=None)
+        df.columns = CALIB_RUN_COLUMNS
+        for col in CALIB_RUN_COLUMNS[1:]:
+            expected = df[col].to_numpy()
+            self.assertEqual(cols[col].dtype, expected.dtype, col)
+            self.assertEqual(cols[col].tobytes(), expected.tobytes(), col)
+        expected_dt = pd.to_datetime(df['datetime'], format="%Y-%m-%d-%H:%M:%S", utc=True)
+        np.testing.assert_array_equal(
+            cols['timestamp'],
+            expected_dt.astype('datetime64[ns, UTC]').astype('int64').to_numpy() // 1_000_000_000,
+        )
+
+    def test_accepts_crlf_and_trailing_blank_lines(self):
+        cols = parse_calibration_run(RUN_FILE.replace(b"\n", b"\r\n") + b"\r\n")
+        self.assertEqual(len(cols['timestamp']), 4)
+        np.testing.assert_array_equal(cols['samples'], [99, 99, 98, 100])
+
+    def test_decode_timestamps_handles_leap_years(self):
+        raw = np.array([b"2024-02-29-12:00:00", b"2000-03-01-00:00:00", b"1970-01-01-00:00:01"], dtype='S19')
+        np.testing.assert_array_equal(decode_timestamps(raw), [1709208000, 951868800, 1])
+
+    def test_rejects_malformed_content(self):
+        with self.assertRaises(ValueError):
+            parse_calibration_run(RUN_FILE.replace(b"2024-07-24-09:05:35", b"2024-02-30-09:05:35"))
+        with self.assertRaises(ValueError):
+            parse_calibration_run(RUN_FILE + b"2024-07-24-09:05:35\t1.0\n")
+        with self.assertRaises(ValueError):
+            parse_calibration_run(RUN_FILE.replace(b"\t20.6\t", b"\tNA_\t", 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import pickle
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from calibration.elements.run_store import RunStore
+
+
+class TestRunStore(unittest.TestCase):
+    def setUp(self):
+        self.frame = pd.DataFrame({'timestamp': np.arange(5), 'pm_mean': np.arange(5) * 1.5})
+        self.store = RunStore(self.frame)
+
+    def test_slice_selection_is_a_view_with_default_index(self):
+        self.store.select('df', slice(1, -1))
+        view = self.store.view('df')
+
+        self.assertEqual(list(view['timestamp']), [1, 2, 3])
+        self.assertIsInstance(view.index, pd.RangeIndex)
+        self.assertEqual(view.index.start, 0)
+        self.assertTrue(np.shares_memory(view['pm_mean'].to_numpy(), self.frame['pm_mean'].to_numpy()))
+        self.assertEqual(self.store.count('df'), 3)
+
+    def test_mask_and_index_selections(self):
+        self.store.select('sat', self.frame['timestamp'].to_numpy() >= 3)
+        self.store.select('pedestals', np.array([0, 4]))
+
+        self.assertEqual(list(self.store.view('sat')['timestamp']), [3, 4])
+        self.assertEqual(list(self.store.view('pedestals')['timestamp']), [0, 4])
+        np.testing.assert_array_equal(self.store.rows('sat'), [3, 4])
+
+    def test_contiguous_index_selection_is_a_view(self):
+        self.store.select('sat', self.frame['timestamp'].to_numpy() >= 3)
+
+        self.assertEqual(self.store._rows['sat'], slice(3, 5))
+        self.assertTrue(np.shares_memory(self.store.view('sat')['pm_mean'].to_numpy(), self.frame['pm_mean'].to_numpy()))
+
+    def test_views_are_kept_until_the_store_changes(self):
+        self.store.select('df', slice(1, -1))
+        self.store.select('pedestals', np.array([0, 4]))
+        view = self.store.view('pedestals')
+        self.assertIs(self.store.view('pedestals'), view)
+
+        self.store.set_column('pm_zeroed', self.frame['pm_mean'] - 1.0)
+        self.assertEqual(list(self.store.view('pedestals')['pm_zeroed']), [-1.0, 5.0])
+        self.assertIn('pm_zeroed', self.store.view('df'))
+
+        self.store.select('pedestals', np.array([0, 2, 4]))
+        self.assertEqual(list(self.store.view('pedestals')['timestamp']), [0, 2, 4])
+        self.assertEqual(pickle.loads(pickle.dumps(self.store))._views, {})
+
+    def test_frames_round_trip(self):
+        self.store.select('pedestals', np.array([0, 4]))
+        self.store.select('df', slice(1, -1))
+        restored = RunStore.from_frames(self.store.to_frames())
+
+        pd.testing.assert_frame_equal(restored.view('df'), self.store.view('df'))
+        pd.testing.assert_frame_equal(restored.view('pedestals'), self.store.view('pedestals'))
+
+
+if __name__ == "__main__":
+    unittest.main()
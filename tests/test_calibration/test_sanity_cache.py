@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import itertools
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from calibration.helpers import sanity_cache
+
+
+def _result(passed: bool) -> dict:
+    return {'check_name': 'min_data_points', 'check_args': '25', 'passed': passed, 'info': '', 'severity': 'warning',
+            'exec_error': False, 'internal': False, 'check_explanation': ''}
+
+
+class TestSanityResultCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = sanity_cache.SanityResultCache(os.path.join(self._tmp.name, sanity_cache.CACHE_FILE_NAME))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_keys_depend_on_data_and_normalized_parameters(self):
+        key = sanity_cache.check_key('data', 'file', 'warning', 'avg_temperature_range', {'min_avg': 19.0, 'max_avg': 21.0})
+
+        self.assertEqual(key, sanity_cache.check_key('data', 'file', 'warning', 'avg_temperature_range', {'max_avg': 21.0, 'min_avg': 19.0}))
+        self.assertNotEqual(key, sanity_cache.check_key('data', 'file', 'warning', 'avg_temperature_range', {'min_avg': 19.0, 'max_avg': 22.0}))
+        self.assertNotEqual(key, sanity_cache.check_key('data', 'file', 'error', 'avg_temperature_range', {'min_avg': 19.0, 'max_avg': 21.0}))
+        self.assertNotEqual(key, sanity_cache.check_key('other', 'file', 'warning', 'avg_temperature_range', {'min_avg': 19.0, 'max_avg': 21.0}))
+
+    def test_round_trip(self):
+        self.cache.put_many({'a': _result(True), 'b': _result(False)})
+
+        reopened = sanity_cache.SanityResultCache(self.cache.path)
+        self.assertEqual(reopened.get_many(['a', 'b', 'c']), {'a': _result(True), 'b': _result(False)})
+        self.assertEqual(reopened.get_many([f"k{i}" for i in range(1200)]), {})
+
+    def test_least_recently_used_entries_are_evicted(self):
+        self.cache.max_entries = 2
+        with mock.patch('calibration.helpers.sanity_cache.time.time', side_effect=itertools.count(1.0)):
+            self.cache.put_many({'old': _result(True)})
+            self.cache.put_many({'used': _result(True)})
+            self.cache.get_many(['old'])
+            self.cache.put_many({'new': _result(False)})
+
+        self.assertEqual(set(self.cache.get_many(['old', 'used', 'new'])), {'old', 'new'})
+
+    def test_unusable_database_disables_the_cache(self):
+        path = os.path.join(self._tmp.name, 'not_a_database.sqlite')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('not sqlite' * 100)
+
+        self.assertIsNone(sanity_cache.open_cache(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from matplotlib import pyplot as plt
+
+from characterization.elements.plots.figures import add_grid_subplot, new_figure, new_subplots, rasterize_dense_layers
+
+
+def _render(index: int) -> bytes:
+    fig, (ax1, ax2) = new_subplots(nrows=2, ncols=1, figsize=(4, 3), sharex=True)
+    ax1.plot(range(10), [index * x for x in range(10)], label=f'line {index}')
+    ax1.legend()
+    ax2.bar(range(5), [index + x for x in range(5)])
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png')
+    return buffer.getvalue()
+
+
+class TestFigures(unittest.TestCase):
+    def test_figures_are_not_registered_in_pyplot(self):
+        before = plt.get_fignums()
+        fig = new_figure(figsize=(4, 3))
+        fig.add_subplot().plot([0, 1])
+        fig.savefig(io.BytesIO(), format='pdf')
+
+        self.assertEqual(plt.get_fignums(), before)
+
+    def test_grid_subplots_share_the_grid_of_their_shape(self):
+        fig = new_figure()
+        top = add_grid_subplot(fig, (5, 1), (0, 0), rowspan=2)
+        bottom = add_grid_subplot(fig, (5, 1), (4, 0))
+
+        self.assertIs(top.get_subplotspec().get_gridspec(), bottom.get_subplotspec().get_gridspec())
+        self.assertEqual(top.get_subplotspec().rowspan, range(0, 2))
+
+    def test_concurrent_rendering_matches_serial(self):
+        serial = [_render(i) for i in range(8)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            concurrent = list(pool.map(_render, range(8)))
+
+        self.assertEqual(concurrent, serial)
+
+    def test_dense_marker_layers_are_rasterized(self):
+        fig, (dense, sparse) = new_subplots(nrows=2, ncols=1)
+        x = np.arange(600.0)
+        dense.errorbar(x, x, yerr=np.ones(600), fmt='o')
+        fit, = dense.plot(x, 2 * x)
+        scatter = dense.scatter(x, x)
+        sparse.scatter(x[:10], x[:10])
+
+        self.assertTrue(rasterize_dense_layers(fig, 1000))
+
+        self.assertTrue(all(artist.get_rasterized() for artist in (*dense.collections, dense.lines[0], scatter)))
+        self.assertFalse(fit.get_rasterized())
+        self.assertFalse(any(artist.get_rasterized() for artist in (*sparse.collections, *sparse.lines)))
+        self.assertFalse(dense.title.get_rasterized())
+
+    def test_rasterization_threshold(self):
+        fig, ax = new_subplots()
+        ax.scatter(range(100), range(100))
+
+        self.assertFalse(rasterize_dense_layers(fig, 101))
+        self.assertFalse(rasterize_dense_layers(fig, None))
+        self.assertFalse(ax.collections[0].get_rasterized())
+        self.assertTrue(rasterize_dense_layers(fig, 100))
+        fig.savefig(io.BytesIO(), format='pdf', dpi=200)
+
+
+if __name__ == '__main__':
+    unittest.main()
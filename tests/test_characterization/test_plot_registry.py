@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import unittest
+
+from characterization.config import Configuration, run_config
+from characterization.elements.plots.characterization_plots import CharacterizationPlots
+from characterization.elements.plots.file_plots import FilePlots
+from characterization.elements.plots.fileset_plots import FilesetPlots
+from characterization.elements.plots.photodiode_plots import PhotodiodePlots
+from characterization.elements.plots.plot_base import BasePlots
+from characterization.elements.plots.plot_registry import producer
+from characterization_report.main import report_plots
+
+PLOTTERS = (CharacterizationPlots, PhotodiodePlots, FilesetPlots, FilePlots)
+
+
+class _RecordingPlots(BasePlots):
+    plot_level = 'fileset'
+    PLOT_PRODUCERS = (
+        producer('_record', 'timeseries', name='timeseries'),
+        producer('_record', r'linregs_\d+', name='linregs'),
+        producer('_record', r'linregs_\d+_simp', name='linregs_simp'),
+    )
+
+    def __init__(self):
+        super().__init__()
+        self.rendered = []
+
+    @property
+    def output_path(self) -> str:
+        return '.'
+
+    def generate_plots(self):
+        self.render_plots()
+
+    def _record(self, name: str):
+        self.rendered.append(name)
+
+
+class _RecordingScheduler:
+    def __init__(self):
+        self.jobs = []
+
+    def add(self, plotter, method='generate_plots'):
+        self.jobs.append((plotter, method))
+
+
+def _render(selection: dict | None) -> list[str]:
+    with run_config(Configuration()) as configuration:
+        configuration.plot_selection = selection
+        plotter = _RecordingPlots()
+        plotter.generate_plots()
+    return plotter.rendered
+
+
+class TestPlotRegistry(unittest.TestCase):
+    def test_without_selection_every_producer_runs_in_order(self):
+        self.assertEqual(_render(None), ['timeseries', 'linregs', 'linregs_simp'])
+
+    def test_only_the_producers_of_selected_figures_run(self):
+        self.assertEqual(_render({'fileset': ['linregs_532_simp']}), ['linregs_simp'])
+        self.assertEqual(_render({'fileset': ['linregs_1064', 'timeseries']}), ['timeseries', 'linregs'])
+        self.assertEqual(_render({'file': ['timeseries']}), [])
+
+    def test_plotters_without_selected_figures_are_not_scheduled(self):
+        with run_config(Configuration()) as configuration:
+            scheduler = _RecordingScheduler()
+            configuration.plot_selection = {'characterization': ['power_range_by_sensor_1064']}
+            _RecordingPlots().schedule_plots(scheduler)
+            self.assertEqual(scheduler.jobs, [])
+
+            configuration.plot_selection = {'fileset': ['timeseries']}
+            _RecordingPlots().schedule_plots(scheduler)
+            self.assertEqual(len(scheduler.jobs), 1)
+
+    def test_report_figures_have_producers(self):
+        producers = {plotter.plot_level: plotter.PLOT_PRODUCERS for plotter in PLOTTERS}
+        for level, fig_ids in report_plots().items():
+            for fig_id in fig_ids:
+                with self.subTest(level=level, fig_id=fig_id):
+                    self.assertTrue(any(p.produces(fig_id) for p in producers[level]))
+
+    def test_producers_name_existing_methods(self):
+        for plotter in PLOTTERS:
+            for plot_producer in plotter.PLOT_PRODUCERS:
+                with self.subTest(plotter=plotter.__name__, method=plot_producer.method):
+                    self.assertTrue(callable(getattr(plotter, plot_producer.method, None)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import unittest
+
+from characterization.config import config, run_config
+from characterization.elements.plots.plot_scheduler import PlotScheduler
+from characterization.helpers import file_manage
+
+
+class _FakePlots:
+    """Registers one plot per figure name, recording the process that rendered it"""
+
+    def __init__(self, name: str, figures: list[str]):
+        self.name = name
+        self.figures = figures
+        self.plots = {}
+        self.pids: set[int] = set()
+
+    def generate_plots(self):
+        for fig_id in self.figures:
+            self.plots[fig_id] = os.path.join(
+                file_manage.get_base_output_path(), self.name, f"{fig_id}.{config.plot_output_format}"
+            )
+        self.plots['pid'] = os.getpid()
+
+    def generate_extra_plots(self):
+        self.plots['extra'] = f"{self.name}/extra.{config.plot_output_format}"
+
+
+def _schedule(scheduler: PlotScheduler) -> tuple[dict, list[_FakePlots]]:
+    """Schedule a parent with children plots linked after its own figures, as PhotodiodePlots does"""
+    parent = _FakePlots('pd', ['timeseries', 'histogram'])
+    children = [_FakePlots(f'sweep{i}', ['dut_vs_laser_setpoint']) for i in range(5)]
+    scheduler.add(parent)
+    for child in children:
+        scheduler.add(child)
+        scheduler.add(child, 'generate_extra_plots')
+
+    def link():
+        files = parent.plots.setdefault('files', {})
+        for child in children:
+            files[child.name] = child.plots
+
+    scheduler.call(link)
+    return parent.plots, children
+
+
+def _without_pids(plots: dict) -> dict:
+    return {
+        key: _without_pids(value) if isinstance(value, dict) else value
+        for key, value in plots.items() if key != 'pid'
+    }
+
+
+class TestPlotScheduler(unittest.TestCase):
+    def setUp(self):
+        file_manage.set_base_output_path('/out')
+        self.addCleanup(file_manage.set_base_output_path, None)
+
+    def _run(self, jobs: int) -> tuple[dict, list[_FakePlots]]:
+        with run_config():
+            config.plot_output_format = 'png'
+            scheduler = PlotScheduler(jobs)
+            plots, children = _schedule(scheduler)
+            scheduler.run()
+        return plots, children
+
+    def test_serial_renders_in_order_in_this_process(self):
+        plots, children = self._run(1)
+
+        self.assertEqual(list(plots), ['timeseries', 'histogram', 'pid', 'files'])
+        self.assertEqual(plots['timeseries'], '/out/pd/timeseries.png')
+        self.assertEqual(list(plots['files']), [child.name for child in children])
+        self.assertEqual(plots['files']['sweep3'], {
+            'dut_vs_laser_setpoint': '/out/sweep3/dut_vs_laser_setpoint.png', 'pid': os.getpid(),
+            'extra': 'sweep3/extra.png',
+        })
+
+    @unittest.skipUnless('fork' in multiprocessing.get_all_start_methods(), "requires fork")
+    def test_workers_return_the_same_plots_in_the_same_order(self):
+        serial, _ = self._run(1)
+        parallel, children = self._run(3)
+
+        self.assertEqual(_without_pids(parallel), _without_pids(serial))
+        self.assertEqual(list(parallel), list(serial))
+        self.assertEqual(list(parallel['files']['sweep0']), list(serial['files']['sweep0']))
+        self.assertNotEqual(parallel['pid'], os.getpid())
+        # the children dictionaries are the plotters' own ones, updated in this process
+        self.assertIs(parallel['files']['sweep4'], children[4].plots)
+
+
+if __name__ == '__main__':
+    unittest.main()
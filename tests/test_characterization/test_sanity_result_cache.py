@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from characterization.elements.helpers import SanityCheckResult
+from characterization.elements.sanity_checks import Counter, SanityChecks
+from characterization.helpers import sanity_cache
+
+
+class _Checker:
+    level_name = 'sweepfile'
+
+    def __init__(self):
+        self.calls = []
+
+    def san_check_minimum_linreg_points(self, minimum_linreg_points, severity='warning'):
+        self.calls.append(minimum_linreg_points)
+        return SanityCheckResult(severity, 'minimum_linreg_points', minimum_linreg_points, minimum_linreg_points <= 10)
+
+    def san_check_broken(self, severity='warning'):
+        self.calls.append('broken')
+        raise RuntimeError('cannot check')
+
+
+def _sanity_checks(cache, fingerprints: dict[int, str]) -> SanityChecks:
+    san = SanityChecks.__new__(SanityChecks)
+    san._c = Counter()
+    san._cache = cache
+    san._fingerprints = fingerprints
+    san._cached, san._new_results = {}, {}
+    return san
+
+
+class TestSanityResultCacheUse(unittest.TestCase):
+    def test_only_checks_with_changed_parameters_are_evaluated_again(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = sanity_cache.SanityResultCache(os.path.join(tmp_dir, sanity_cache.CACHE_FILE_NAME))
+            config = {'warning': {'minimum_linreg_points': 7, 'broken': None}}
+
+            sweep = object()
+
+            def _run(checks_config) -> tuple[dict, _Checker, SanityChecks]:
+                san = _sanity_checks(cache, {id(sweep): 'sweep-data'})
+                keys = san._cache_keys('sweepfile', sweep, checks_config)
+                san._cached = cache.get_many(keys.values())
+                checker = _Checker()
+                results = san._run_check_methods('warning', checks_config['warning'], checker, cache_keys=keys)
+                cache.put_many(san._new_results)
+                return results, checker, san
+
+            first, checker, _ = _run(config)
+            self.assertEqual(checker.calls, [7, 'broken'])
+
+            second, checker, san = _run(config)
+            self.assertEqual(checker.calls, ['broken'])  # failed executions are not cached
+            self.assertEqual(second, first)
+            self.assertEqual(san._c.to_dict()['details'], {'warning_passed': 1, 'warning_failed': 1})
+
+            _, checker, _ = _run({'warning': {'minimum_linreg_points': 20, 'broken': None}})
+            self.assertEqual(checker.calls, [20, 'broken'])
+
+
+if __name__ == "__main__":
+    unittest.main()
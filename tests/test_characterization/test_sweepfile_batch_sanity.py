@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from characterization.elements.run_store import RunStore
+from characterization.elements.sanity.sweepfile import SweepFileSanityChecker
+from characterization.elements.sanity.sweepfile_batch import SweepFileBatchSanityChecker
+from characterization.elements.sanity_checks import Counter, SanityChecks
+
+
+class _FakeSweep:
+    def __init__(self, total_counts, mean_adc, valid: bool = True):
+        self.valid = valid
+        self.level_header = f"sweep_{len(total_counts)}"
+        self._store = RunStore(pd.DataFrame({'total_counts': total_counts, 'mean_adc': mean_adc}))
+        saturated = np.asarray(mean_adc) >= 4095
+        self._store.select('sat', saturated)
+        self._store.select('df', ~saturated)
+
+    @property
+    def df(self):
+        return self._store.view('df')
+
+    @property
+    def df_full(self):
+        return self._store.frame
+
+    @property
+    def df_sat(self):
+        return self._store.view('sat')
+
+    def row_count(self, kind: str = 'df') -> int:
+        return self._store.count({'df': 'df', 'df_sat': 'sat'}[kind])
+
+
+def _sweeps() -> list[_FakeSweep]:
+    rng = np.random.default_rng(5)
+    return [
+        _FakeSweep(rng.uniform(300, 1000, 12), np.r_[rng.uniform(0, 4000, 8), [4095] * 4]),
+        _FakeSweep(np.r_[rng.uniform(0, 200, 3), rng.uniform(300, 1000, 6)], rng.uniform(0, 4000, 9)),
+        _FakeSweep([], []),
+        _FakeSweep([100.0, 500.0], [4095, 10], valid=False),
+    ]
+
+
+class _NoRLinreg(SweepFileSanityChecker):
+    """Sweep checker without linear regression results (minimum_linreg_r is not evaluated in batch)"""
+
+    def __init__(self, sweep_file):
+        super().__init__(sweep_file)
+        self.sw.anal = type('Anal', (), {'lr_refpd_vs_adc': None})()
+
+
+CHECKS = {'minimum_linreg_points': 7, 'minimum_saturated_points': 3, 'low_total_counts': 250}
+
+
+class TestSweepFileBatchSanityChecker(unittest.TestCase):
+    def test_matches_the_per_sweep_checks(self):
+        sweeps = _sweeps()
+        batch = SweepFileBatchSanityChecker(sweeps)
+
+        for check_name, arg in CHECKS.items():
+            results = getattr(batch, f"san_check_{check_name}")(arg, severity='warning')
+            self.assertIsNone(results[-1])
+            for sw, result in zip(sweeps[:-1], results):
+                expected = getattr(SweepFileSanityChecker(sw), f"san_check_{check_name}")(arg, severity='warning')
+                with self.subTest(check=check_name, sweep=sw.level_header):
+                    self.assertEqual(result.to_dict(), expected.to_dict())
+
+    def test_batch_results_and_fallback_produce_the_per_sweep_results(self):
+        sweeps = _sweeps()
+        checks_config = {'error': {'minimum_saturated_points': 3, 'minimum_linreg_r': 0.999}, 'warning': dict(CHECKS)}
+        san = SanityChecks.__new__(SanityChecks)
+        san._c = Counter()
+        san._fingerprints, san._cached, san._new_results = {}, {}, {}
+
+        precomputed = san._run_batch_check_methods(checks_config, SweepFileBatchSanityChecker(sweeps), 'sweepfile')
+        batched = [
+            {severity: san._run_check_methods(severity, checks, _NoRLinreg(sw), element.get(severity)) for severity, checks in checks_config.items()}
+            for sw, element in zip(sweeps, precomputed)
+        ]
+        batched_counts = san._c.to_dict()
+        san._c = Counter()
+        single = [
+            {severity: san._run_check_methods(severity, checks, _NoRLinreg(sw)) for severity, checks in checks_config.items()}
+            for sw in sweeps
+        ]
+
+        self.assertEqual(batched, single)
+        self.assertEqual(batched_counts, san._c.to_dict())
+        self.assertEqual(precomputed[-1], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from matplotlib import colormaps
+from matplotlib.collections import QuadMesh
+from matplotlib.figure import Figure
+
+from crossboard.config import Configuration, run_config
+from crossboard.dataframe import CrossboardDataFrame
+from crossboard.plotter import CrossboardPlotter
+from crossboard.style_spec import PLOT_STYLE
+
+
+def _make_plotter(tmp_path, n_boards: int) -> CrossboardPlotter:
+    rng = np.random.default_rng(0)
+    rows = [
+        {"board_id": f"B{board:02d}R0", "wavelength": wavelength, "gain": "1", "a2p_slope": 100.0 + rng.normal(0.0, 2.0)}
+        for board in range(n_boards)
+        for wavelength in ("532", "1064")
+    ]
+    rows[0]["a2p_slope"] = 500.0  # far outlier, clipped at +10
+    crossboard_df = CrossboardDataFrame()
+    crossboard_df.dataframe = pd.DataFrame(rows)
+    return CrossboardPlotter(crossboard_df, str(tmp_path))
+
+
+def _render_heatmap(plotter: CrossboardPlotter, **settings) -> Figure:
+    figures = []
+    with run_config(Configuration()) as configuration, patch.object(
+        Figure, "savefig", autospec=True, side_effect=lambda fig, *args, **kwargs: figures.append(fig)
+    ):
+        for key, value in settings.items():
+            setattr(configuration, key, value)
+        plotter.generate_a2p_robust_zscore_heatmap()
+    assert len(figures) == 1
+    return figures[0]
+
+
+def test_heatmap_cells_are_one_mesh_with_clipped_colors(tmp_path) -> None:
+    fig = _render_heatmap(_make_plotter(tmp_path, 12))
+    ax = fig.axes[0]
+
+    meshes = [artist for artist in ax.collections if isinstance(artist, QuadMesh)]
+    assert len(meshes) == 1
+    assert not ax.patches
+    values = np.asarray(meshes[0].get_array()).reshape(2, 12)
+    assert values.max() == 10.0
+    expected = colormaps[PLOT_STYLE["heatmap_cmap"]]((values.ravel() + 10.0) / 20.0)
+    np.testing.assert_allclose(meshes[0].to_rgba(values).reshape(-1, 4), expected)
+    # colorbar axes next to the heatmap
+    assert len(fig.axes) == 2
+    assert fig.axes[1].get_ylabel() == "Robust z-score"
+
+
+def test_heatmap_cell_labels_follow_the_size_threshold(tmp_path) -> None:
+    plotter = _make_plotter(tmp_path, 12)
+
+    labelled = _render_heatmap(plotter)
+    unlabelled = _render_heatmap(plotter, heatmap_cell_labels_max_cells=23)
+
+    assert len(labelled.axes[0].texts) == 24
+    assert not unlabelled.axes[0].texts
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from pipeline.graph import BLOCKED, DONE, FAILED, UP_TO_DATE, Node, PipelineGraph, run_graph
+from characterization.helpers.dated_files import collect_dated_files
+from pipeline.main import build_graph
+from pipeline.state import NodeCache
+
+
+def _args(**overrides) -> argparse.Namespace:
+    values = {"plot_format": "png", "no_plots": True, "no_gen_report": True, "fit_mode": "ols", "rasterize_min_points": None}
+    values.update(overrides)
+    return argparse.Namespace(**values)
+
+
+class TestBuildGraph(unittest.TestCase):
+    def test_characterizations_depend_on_previous_calibration_and_board_history(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            for folder, names in (
+                ("calibs", ["calibration_21012026.zip", "calibration_05022026.zip"]),
+                ("chars", ["01012026_30R1.zip", "25012026_30R1.zip", "10022026_30R1.zip", "10022026_31R1.zip"]),
+            ):
+                (root / folder).mkdir()
+                for name in names:
+                    (root / folder / name).write_bytes(b"")
+            calibrations = collect_dated_files(root / "calibs", "*.zip")
+            characterizations = collect_dated_files(root / "chars", "*.zip")
+
+            graph, skipped = build_graph(calibrations, characterizations, root / "out", _args())
+
+        self.assertEqual([item.path.name for item in skipped], ["01012026_30R1.zip"])
+        nodes = graph.nodes
+        self.assertEqual(nodes["characterization_25012026_30R1"].deps, ["calibration_21012026"])
+        self.assertEqual(
+            nodes["characterization_10022026_30R1"].deps,
+            ["calibration_05022026", "characterization_25012026_30R1"],
+        )
+        self.assertEqual(nodes["characterization_10022026_31R1"].deps, ["calibration_05022026"])
+        self.assertIn(root / "out" / "calibrations" / "calibration_05022026.json", nodes["characterization_10022026_31R1"].inputs)
+        self.assertEqual(
+            nodes["crossboard"].deps,
+            ["characterization_25012026_30R1", "characterization_10022026_30R1", "characterization_10022026_31R1"],
+        )
+
+    def test_calibration_plots_depend_on_the_earlier_published_summaries(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            (root / "calibs").mkdir()
+            for name in ("calibration_05022026.zip", "calibration_21012026.zip"):
+                (root / "calibs" / name).write_bytes(b"")
+            calibrations = collect_dated_files(root / "calibs", "*.zip")
+
+            graph, _ = build_graph(calibrations, [], root / "out", _args(no_plots=False))
+
+        nodes = graph.nodes
+        self.assertEqual(
+            list(nodes),
+            ["calibration_21012026", "calibration_05022026", "calibration_21012026_plots", "calibration_05022026_plots"],
+        )
+        self.assertIn("-n", nodes["calibration_21012026"].command)
+        self.assertNotIn("-n", nodes["calibration_21012026_plots"].command)
+        self.assertEqual(nodes["calibration_21012026_plots"].deps, ["calibration_21012026"])
+        self.assertEqual(nodes["calibration_05022026_plots"].deps, ["calibration_21012026", "calibration_05022026"])
+        self.assertIn(root / "out" / "calibrations" / "calibration_21012026.json", nodes["calibration_05022026_plots"].inputs)
+        self.assertNotIn(root / "out" / "calibrations" / "calibration_05022026.json", nodes["calibration_21012026_plots"].inputs)
+
+    def test_new_calibration_only_invalidates_its_nodes_and_the_paired_characterizations(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            for folder, names in (
+                ("calibs", ["calibration_21012026.zip"]),
+                ("chars", ["25012026_30R1.zip", "10022026_31R1.zip"]),
+            ):
+                (root / folder).mkdir()
+                for name in names:
+                    (root / folder / name).write_text(name, encoding="utf-8")
+            characterizations = collect_dated_files(root / "chars", "*.zip")
+            cache = NodeCache(root / "out")
+
+            def _run(calibrations):
+                def _fake_run(cmd, log_path):
+                    node = next(node for node in graph.nodes.values() if node.command == cmd)
+                    runs.append(node.node_id)
+                    for output in node.outputs:
+                        output.parent.mkdir(parents=True, exist_ok=True)
+                        output.write_text(" ".join(cmd), encoding="utf-8")
+                    return 0
+
+                runs: list[str] = []
+                graph, _ = build_graph(calibrations, characterizations, root / "out", _args(no_plots=False))
+                with mock.patch("builtins.print"):
+                    run_graph(graph, cache, 2, root / "logs", run_command=_fake_run)
+                return sorted(runs)
+
+            _run(collect_dated_files(root / "calibs", "*.zip"))
+            (root / "calibs" / "calibration_05022026.zip").write_text("new", encoding="utf-8")
+            runs = _run(collect_dated_files(root / "calibs", "*.zip"))
+
+        self.assertEqual(
+            runs,
+            ["calibration_05022026", "calibration_05022026_plots", "characterization_10022026_31R1", "crossboard"],
+        )
+
+    def test_unknown_dependencies_are_rejected(self):
+        graph = PipelineGraph()
+
+        with self.assertRaises(ValueError):
+            graph.add(Node("b", ["cmd"], deps=["a"]))
+
+
+class TestRunGraph(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.inputs = {name: self.root / f"{name}.zip" for name in ("cal_a", "cal_b", "char_a", "char_b")}
+        for path in self.inputs.values():
+            path.write_text(path.stem, encoding="utf-8")
+        self.graph = PipelineGraph()
+        for cal in ("cal_a", "cal_b"):
+            self.graph.add(Node(cal, ["python", cal], inputs=[self.inputs[cal]], outputs=[self.root / f"{cal}.json"]))
+        for char, cal in (("char_a", "cal_a"), ("char_b", "cal_b")):
+            self.graph.add(Node(
+                char, ["python", char],
+                inputs=[self.inputs[char], self.root / f"{cal}.json"],
+                outputs=[self.root / f"{char}.json"],
+                deps=[cal],
+            ))
+        self.graph.add(Node(
+            "crossboard", ["python", "crossboard"],
+            inputs=[self.root / "char_a.json", self.root / "char_b.json"],
+            outputs=[self.root / "crossboard.json"],
+            deps=["char_a", "char_b"],
+        ))
+        self.runs: list[str] = []
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _run(self, failing: tuple[str, ...] = ()) -> dict[str, str]:
+        def _fake_run(cmd, log_path):
+            node = self.graph.nodes[cmd[1]]
+            self.runs.append(node.node_id)
+            if node.node_id in failing:
+                return 1
+            content = "".join(path.read_text(encoding="utf-8") for path in node.inputs)
+            for output in node.outputs:
+                output.write_text(f"{node.node_id}({content})", encoding="utf-8")
+            return 0
+
+        self.runs.clear()
+        with mock.patch("builtins.print"):
+            return run_graph(self.graph, NodeCache(self.root), 2, self.root / "logs", run_command=_fake_run)
+
+    def test_only_nodes_downstream_of_a_changed_input_run_again(self):
+        self.assertEqual(set(self._run().values()), {DONE})
+        self.assertEqual(set(self._run().values()), {UP_TO_DATE})
+        self.assertEqual(self.runs, [])
+
+        self.inputs["cal_b"].write_text("new calibration content", encoding="utf-8")
+        status = self._run()
+
+        self.assertEqual(sorted(self.runs), ["cal_b", "char_b", "crossboard"])
+        self.assertEqual(status["cal_a"], UP_TO_DATE)
+        self.assertEqual(status["char_a"], UP_TO_DATE)
+
+    def test_failed_nodes_block_their_dependents(self):
+        status = self._run(failing=("cal_a",))
+
+        self.assertEqual(status["cal_a"], FAILED)
+        self.assertEqual(status["char_a"], BLOCKED)
+        self.assertEqual(status["crossboard"], BLOCKED)
+        self.assertEqual(status["char_b"], DONE)
+        self.assertEqual(sorted(self._run().values()), sorted([DONE, DONE, DONE, UP_TO_DATE, UP_TO_DATE]))
+
+
+if __name__ == "__main__":
+    unittest.main()